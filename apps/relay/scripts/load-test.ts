@@ -0,0 +1,245 @@
+/**
+ * Load test for server-authoritative rooms.
+ *
+ * Spawns the relay server as its own process (so it gets a core to itself),
+ * points its auth at a stub signaling endpoint, then drives one host and N
+ * WebSocket players through a full game and reports broadcast fan-out
+ * spread (first to last player receiving each question), answer-ack
+ * latency and server CPU.
+ *
+ *   bun run scripts/load-test.ts --players 1000 --questions 3
+ */
+import { parseArgs } from "util";
+
+const { values: args } = parseArgs({
+  args: Bun.argv.slice(2),
+  options: {
+    players: { type: "string", default: "1000" },
+    questions: { type: "string", default: "3" },
+    port: { type: "string", default: "3901" },
+    "question-ms": { type: "string", default: "5000" },
+    "max-p95-ms": { type: "string", default: "250" },
+  },
+});
+
+const PLAYERS = Number(args.players);
+const QUESTIONS = Number(args.questions);
+const PORT = Number(args.port);
+const QUESTION_MS = Number(args["question-ms"]);
+const MAX_P95_MS = Number(args["max-p95-ms"]);
+const ROOM_ID = "LOAD01";
+const CONNECT_BATCH = 100;
+
+function percentile(samples: number[], p: number): number {
+  if (samples.length === 0) {
+    return NaN;
+  }
+  const sorted = [...samples].sort((a, b) => a - b);
+  const index = Math.min(sorted.length - 1, Math.ceil(p * sorted.length) - 1);
+  return sorted[Math.max(0, index)];
+}
+
+function summarize(label: string, samples: number[]): void {
+  console.log(
+    `${label.padEnd(24)} n=${String(samples.length).padStart(6)}  ` +
+      `p50=${percentile(samples, 0.5).toFixed(1)}ms  ` +
+      `p95=${percentile(samples, 0.95).toFixed(1)}ms  ` +
+      `p99=${percentile(samples, 0.99).toFixed(1)}ms  ` +
+      `max=${Math.max(...samples).toFixed(1)}ms`,
+  );
+}
+
+// Accepts every token; the relay still performs its real HTTP auth round trip.
+const signaling = Bun.serve({
+  port: 0,
+  fetch: () => Response.json({ ok: true }),
+});
+
+const relay = Bun.spawn(["bun", "run", "src/server.ts"], {
+  cwd: new URL("..", import.meta.url).pathname,
+  env: {
+    ...process.env,
+    RELAY_PORT: String(PORT),
+    SIGNALING_URL: `http://localhost:${signaling.port}`,
+  },
+  stdout: "ignore",
+  stderr: "inherit",
+});
+
+async function health(): Promise<{ cpuMs: number; rssMb: number }> {
+  const response = await fetch(`http://localhost:${PORT}/health`);
+  return response.json();
+}
+
+async function waitForRelay(): Promise<void> {
+  for (let attempt = 0; attempt < 50; attempt++) {
+    try {
+      await health();
+      return;
+    } catch {
+      await Bun.sleep(100);
+    }
+  }
+  throw new Error("Relay did not start");
+}
+
+function socketUrl(params: Record<string, string>): string {
+  const url = new URL(`ws://localhost:${PORT}/game`);
+  Object.entries(params).forEach(([key, value]) =>
+    url.searchParams.set(key, value),
+  );
+  return url.toString();
+}
+
+function open(url: string): Promise<WebSocket> {
+  return new Promise((resolve, reject) => {
+    const socket = new WebSocket(url);
+    socket.onopen = () => resolve(socket);
+    socket.onerror = () => reject(new Error(`Failed to open ${url}`));
+  });
+}
+
+const fanoutMs: number[] = [];
+const ackMs: number[] = [];
+const firstReceipt = new Map<string, number>();
+const revealsSeen = new Map<string, number>();
+let endedCount = 0;
+let resolveEnded: () => void = () => {};
+const ended = new Promise<void>((resolve) => {
+  resolveEnded = resolve;
+});
+
+async function connectPlayer(index: number): Promise<WebSocket> {
+  const playerId = `bot-${index}`;
+  const socket = await open(
+    socketUrl({
+      role: "player",
+      roomId: ROOM_ID,
+      token: "load",
+      playerId,
+      nickname: `Bot ${index}`,
+    }),
+  );
+  let answerSentAt = 0;
+
+  socket.onmessage = (event) => {
+    const msg = JSON.parse(event.data as string);
+
+    if (msg.type === "question") {
+      const receivedAt = performance.now();
+      const first = firstReceipt.get(msg.payload.id) ?? receivedAt;
+      firstReceipt.set(msg.payload.id, first);
+      fanoutMs.push(receivedAt - first);
+
+      const choices = msg.payload.choices;
+      const delay = Math.random() * Math.min(2000, QUESTION_MS / 2);
+      setTimeout(() => {
+        answerSentAt = performance.now();
+        socket.send(
+          JSON.stringify({
+            type: "answer",
+            questionId: msg.payload.id,
+            choiceId: choices[index % choices.length].id,
+            timeMs: Math.round(delay),
+          }),
+        );
+      }, delay);
+    } else if (msg.type === "answer.ack") {
+      ackMs.push(performance.now() - answerSentAt);
+    } else if (msg.type === "reveal") {
+      revealsSeen.set(playerId, (revealsSeen.get(playerId) ?? 0) + 1);
+    } else if (msg.type === "ended") {
+      endedCount += 1;
+      if (endedCount === PLAYERS) {
+        resolveEnded();
+      }
+    }
+  };
+
+  return socket;
+}
+
+async function main(): Promise<void> {
+  await waitForRelay();
+
+  const host = await open(
+    socketUrl({ role: "host", roomId: ROOM_ID, token: "load" }),
+  );
+
+  host.send(
+    JSON.stringify({
+      type: "host.setup",
+      payload: {
+        questions: Array.from({ length: QUESTIONS }, (_, index) => ({
+          id: `q${index + 1}`,
+          type: "mcq",
+          prompt: `Load question ${index + 1}`,
+          choices: ["a", "b", "c", "d"].map((id) => ({ id, text: id })),
+          answer: { choiceId: "b" },
+        })),
+        settings: { questionTimeLimit: QUESTION_MS, showLeaderboard: false },
+      },
+    }),
+  );
+
+  const connectStarted = performance.now();
+  const sockets: WebSocket[] = [];
+  for (let start = 0; start < PLAYERS; start += CONNECT_BATCH) {
+    const batch = Array.from(
+      { length: Math.min(CONNECT_BATCH, PLAYERS - start) },
+      (_, offset) => connectPlayer(start + offset),
+    );
+    sockets.push(...(await Promise.all(batch)));
+  }
+  const connectMs = performance.now() - connectStarted;
+  console.log(
+    `Connected ${sockets.length} players in ${connectMs.toFixed(0)}ms`,
+  );
+
+  const before = await health();
+  const gameStarted = performance.now();
+
+  host.send(JSON.stringify({ type: "host.start" }));
+  await ended;
+
+  const wallMs = performance.now() - gameStarted;
+  const after = await health();
+  const cpuPercent = ((after.cpuMs - before.cpuMs) / wallMs) * 100;
+
+  console.log("");
+  summarize("question fan-out spread", fanoutMs);
+  summarize("answer -> ack", ackMs);
+  console.log(
+    `server cpu ${cpuPercent.toFixed(1)}% of one core over ` +
+      `${(wallMs / 1000).toFixed(1)}s, rss ${after.rssMb}MB`,
+  );
+
+  const missingQuestions = QUESTIONS * PLAYERS - fanoutMs.length;
+  const missingReveals =
+    QUESTIONS * PLAYERS -
+    Array.from(revealsSeen.values()).reduce((sum, count) => sum + count, 0);
+  const p95 = Math.max(percentile(fanoutMs, 0.95), percentile(ackMs, 0.95));
+
+  sockets.forEach((socket) => socket.close());
+  host.close();
+  relay.kill();
+  signaling.stop();
+
+  if (missingQuestions > 0 || missingReveals > 0 || p95 > MAX_P95_MS) {
+    console.error(
+      `FAIL: missing questions=${missingQuestions} ` +
+        `reveals=${missingReveals}, p95=${p95.toFixed(1)}ms ` +
+        `(limit ${MAX_P95_MS}ms)`,
+    );
+    process.exit(1);
+  }
+
+  console.log("PASS");
+}
+
+main().catch((error) => {
+  console.error("Load test failed:", error);
+  relay.kill();
+  signaling.stop();
+  process.exit(1);
+});
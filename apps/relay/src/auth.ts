@@ -0,0 +1,52 @@
+import type { RelayClient } from "./rooms";
+
+/**
+ * Resolves a relay connection request to a client identity by checking the
+ * supplied token against the existing signaling routes, so the relay never
+ * needs its own copy of the session store.
+ */
+export async function authenticate(
+  url: URL,
+  signalingUrl: string,
+): Promise<RelayClient | null> {
+  const role = url.searchParams.get("role");
+  const roomId = url.searchParams.get("roomId");
+  const token = url.searchParams.get("token");
+
+  if (!roomId || !token) {
+    return null;
+  }
+
+  const sessionUrl = `${signalingUrl}/api/session/${encodeURIComponent(roomId)}`;
+
+  try {
+    if (role === "host") {
+      const response = await fetch(
+        `${sessionUrl}/offer?hostToken=${encodeURIComponent(token)}`,
+      );
+      return response.ok ? { role: "host", roomId } : null;
+    }
+
+    const playerId = url.searchParams.get("playerId");
+    if (role !== "player" || !playerId) {
+      return null;
+    }
+
+    const response = await fetch(
+      `${sessionUrl}/answer?playerId=${encodeURIComponent(playerId)}&playerToken=${encodeURIComponent(token)}`,
+    );
+    if (!response.ok) {
+      return null;
+    }
+
+    return {
+      role: "player",
+      roomId,
+      playerId,
+      nickname: url.searchParams.get("nickname") ?? undefined,
+    };
+  } catch (error) {
+    console.error("Relay auth error:", error);
+    return null;
+  }
+}
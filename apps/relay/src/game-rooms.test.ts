@@ -0,0 +1,143 @@
+import { describe, it, expect, vi, beforeEach, afterEach } from "vitest";
+import { GameRoomRegistry, STATE_FLUSH_MS } from "./game-rooms";
+import type { RelayClient } from "./rooms";
+
+function socket() {
+  return { send: vi.fn(), close: vi.fn() };
+}
+
+function frames(target: ReturnType<typeof socket>) {
+  return target.send.mock.calls.map(([frame]) => JSON.parse(frame));
+}
+
+const host: RelayClient = { role: "host", roomId: "ROOM01" };
+const player = (playerId: string): RelayClient => ({
+  role: "player",
+  roomId: "ROOM01",
+  playerId,
+  nickname: playerId.toUpperCase(),
+});
+
+const setup = {
+  type: "host.setup",
+  payload: {
+    questions: [
+      {
+        id: "q1",
+        type: "mcq",
+        prompt: "2 + 2?",
+        choices: [
+          { id: "a", text: "3" },
+          { id: "b", text: "4" },
+        ],
+        answer: { choiceId: "b" },
+      },
+    ],
+    settings: { questionTimeLimit: 5000 },
+  },
+};
+
+describe("GameRoomRegistry", () => {
+  beforeEach(() => {
+    vi.useFakeTimers();
+  });
+
+  afterEach(() => {
+    vi.useRealTimers();
+  });
+
+  it("runs a game for players while the host only controls", () => {
+    const registry = new GameRoomRegistry();
+    const hostSocket = socket();
+    const alice = socket();
+    const bob = socket();
+
+    registry.join(host, hostSocket);
+    registry.handleFrame(host, JSON.stringify(setup));
+    registry.join(player("alice"), alice);
+    registry.join(player("bob"), bob);
+    registry.handleFrame(host, JSON.stringify({ type: "host.start" }));
+
+    vi.advanceTimersByTime(3000);
+    expect(frames(alice)[0]).toMatchObject({
+      type: "question",
+      payload: { id: "q1", durationMs: 5000 },
+    });
+
+    registry.handleFrame(
+      player("alice"),
+      JSON.stringify({ type: "answer", choiceId: "b", timeMs: 1000 }),
+    );
+    registry.handleFrame(
+      player("bob"),
+      JSON.stringify({ type: "answer", choiceId: "a", timeMs: 1000 }),
+    );
+    vi.advanceTimersByTime(400);
+
+    const reveal = frames(bob).find((frame) => frame.type === "reveal");
+    expect(reveal.payload.resultsByPlayer).toEqual({
+      alice: { correct: true, score: 800 },
+      bob: { correct: false, score: 0 },
+    });
+
+    vi.advanceTimersByTime(3000);
+    expect(frames(alice).at(-1)).toEqual({ type: "ended" });
+    expect(hostSocket.send.mock.calls.length).toBeGreaterThan(1);
+  });
+
+  it("streams batched state diffs to the host with maps as entries", () => {
+    const registry = new GameRoomRegistry();
+    const hostSocket = socket();
+    registry.join(host, hostSocket);
+
+    expect(frames(hostSocket)[0]).toMatchObject({
+      type: "state",
+      payload: { phase: "lobby", roomId: "ROOM01", scores: [] },
+    });
+
+    registry.join(player("alice"), socket());
+    registry.join(player("bob"), socket());
+    vi.advanceTimersByTime(STATE_FLUSH_MS);
+
+    const updates = frames(hostSocket).slice(1);
+    expect(updates).toHaveLength(1);
+    expect(updates[0].payload.players).toHaveLength(2);
+    expect(updates[0].payload.scores).toEqual([
+      ["alice", 0],
+      ["bob", 0],
+    ]);
+  });
+
+  it("ignores host controls that do not fit the phase", () => {
+    const registry = new GameRoomRegistry();
+    const alice = socket();
+    registry.join(host, socket());
+    registry.join(player("alice"), alice);
+
+    registry.handleFrame(host, JSON.stringify({ type: "host.start" }));
+    registry.handleFrame(host, JSON.stringify({ type: "host.reveal" }));
+    vi.advanceTimersByTime(5000);
+
+    expect(alice.send).not.toHaveBeenCalled();
+  });
+
+  it("keeps the game running without a host and catches up rejoining players", () => {
+    const registry = new GameRoomRegistry();
+    const hostSocket = socket();
+    registry.join(host, hostSocket);
+    registry.handleFrame(host, JSON.stringify(setup));
+    registry.join(player("alice"), socket());
+    registry.handleFrame(host, JSON.stringify({ type: "host.start" }));
+    registry.leave(host, hostSocket);
+
+    vi.advanceTimersByTime(4000);
+    const rejoined = socket();
+    registry.join(player("alice"), rejoined);
+
+    expect(frames(rejoined)[0]).toMatchObject({
+      type: "question",
+      payload: { id: "q1", durationMs: 4000 },
+    });
+    expect(registry.getStats()).toEqual({ rooms: 1, players: 1 });
+  });
+});
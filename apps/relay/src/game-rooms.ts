@@ -0,0 +1,265 @@
+import {
+  browserScheduler,
+  buildQuestionPayload,
+  choiceShuffleFor,
+  GameEngine,
+  type EngineScheduler,
+  type EngineTiming,
+} from "@/lib/game-engine";
+import { FrameDecoder } from "@/lib/frame-decoder";
+import { diffState, pickStateData } from "@/lib/host-pipeline";
+import { encodeStatePatch, type HostControlMessage } from "@/lib/server-game";
+import {
+  createGameStore,
+  type GameState,
+  type GameStoreApi,
+} from "@/stores/gameStoreCore";
+import type { RelayClient, RelaySocket } from "./rooms";
+
+export const STATE_FLUSH_MS = 100;
+
+interface GameRoom {
+  host: RelaySocket | null;
+  players: Map<string, RelaySocket>;
+  store: GameStoreApi;
+  engine: GameEngine;
+  pending: Partial<GameState>;
+  flushTimer: ReturnType<typeof setTimeout> | null;
+  unsubscribe: () => void;
+}
+
+// Rate limits are per player and per room; ids are only unique within a room.
+function peerKey(client: { roomId: string; playerId: string }): string {
+  return `${client.roomId}:${client.playerId}`;
+}
+
+/**
+ * Server-authoritative rooms. Each room runs the same GameEngine the host
+ * page uses, against its own store; players talk to the engine directly and
+ * the host socket becomes a controller that receives batched state diffs.
+ * The game therefore outlives the host tab.
+ */
+export class GameRoomRegistry {
+  private rooms: Map<string, GameRoom> = new Map();
+  private timing?: Partial<EngineTiming>;
+  private scheduler: EngineScheduler;
+  private now: () => number;
+  private decoder: FrameDecoder;
+
+  constructor(
+    options: {
+      timing?: Partial<EngineTiming>;
+      scheduler?: EngineScheduler;
+      now?: () => number;
+    } = {},
+  ) {
+    this.timing = options.timing;
+    this.scheduler = options.scheduler ?? browserScheduler;
+    this.now = options.now ?? Date.now;
+    this.decoder = new FrameDecoder({ now: this.now });
+  }
+
+  private getRoom(roomId: string): GameRoom {
+    const existing = this.rooms.get(roomId);
+    if (existing) {
+      return existing;
+    }
+
+    const store = createGameStore();
+    store.getState().setRoomId(roomId);
+    store.getState().setPhase("lobby");
+
+    const players = new Map<string, RelaySocket>();
+    const engine = new GameEngine({
+      store,
+      now: this.now,
+      timing: this.timing,
+      scheduler: this.scheduler,
+      getRecipients: () => Array.from(players.keys()),
+      emit: ({ to, message }) => {
+        const frame = JSON.stringify(message);
+        if (to === "*") {
+          players.forEach((socket) => socket.send(frame));
+        } else {
+          players.get(to)?.send(frame);
+        }
+      },
+    });
+
+    const room: GameRoom = {
+      host: null,
+      players,
+      store,
+      engine,
+      pending: {},
+      flushTimer: null,
+      unsubscribe: () => {},
+    };
+    room.unsubscribe = store.subscribe((next, previous) =>
+      this.queueState(room, diffState(previous, next)),
+    );
+
+    this.rooms.set(roomId, room);
+    return room;
+  }
+
+  join(client: RelayClient, socket: RelaySocket): void {
+    const room = this.getRoom(client.roomId);
+
+    if (client.role === "host") {
+      room.host?.close(4000, "Replaced by a newer host connection");
+      room.host = socket;
+      socket.send(this.stateFrame(pickStateData(room.store.getState())));
+      return;
+    }
+
+    room.players
+      .get(client.playerId)
+      ?.close(4000, "Replaced by a newer player connection");
+    room.players.set(client.playerId, socket);
+
+    room.engine.dispatch({
+      type: "player.join",
+      playerId: client.playerId,
+      nickname: client.nickname,
+    });
+    room.engine.dispatch({ type: "player.ready", playerId: client.playerId });
+    this.catchUp(room, socket);
+  }
+
+  leave(client: RelayClient, socket: RelaySocket): void {
+    const room = this.rooms.get(client.roomId);
+    if (!room) {
+      return;
+    }
+
+    if (client.role === "host") {
+      if (room.host === socket) {
+        room.host = null;
+      }
+    } else if (room.players.get(client.playerId) === socket) {
+      room.players.delete(client.playerId);
+      this.decoder.forget(peerKey(client));
+      const { phase } = room.store.getState();
+      if (phase === "lobby" || phase === "idle") {
+        room.engine.dispatch({
+          type: "player.leave",
+          playerId: client.playerId,
+        });
+      } else {
+        room.store.getState().setPlayerConnected(client.playerId, false);
+      }
+    }
+
+    if (!room.host && room.players.size === 0) {
+      this.closeRoom(client.roomId, room);
+    }
+  }
+
+  handleFrame(client: RelayClient, frame: string): void {
+    const room = this.rooms.get(client.roomId);
+    if (!room) {
+      return;
+    }
+
+    if (client.role === "host") {
+      let data: unknown;
+      try {
+        data = JSON.parse(frame);
+      } catch {
+        return;
+      }
+      this.handleControl(room, data as HostControlMessage);
+      return;
+    }
+
+    const decoded = this.decoder.decode(peerKey(client), frame);
+    if (decoded.ok) {
+      room.engine.dispatch({
+        type: "message",
+        playerId: client.playerId,
+        data: decoded.data,
+      });
+    }
+  }
+
+  getStats(): { rooms: number; players: number } {
+    let players = 0;
+    this.rooms.forEach((room) => {
+      players += room.players.size;
+    });
+    return { rooms: this.rooms.size, players };
+  }
+
+  private handleControl(room: GameRoom, msg: HostControlMessage): void {
+    const state = room.store.getState();
+
+    switch (msg?.type) {
+      case "host.setup":
+        if (state.phase === "lobby" || state.phase === "idle") {
+          state.setQuestions(msg.payload?.questions ?? []);
+          state.updateSettings(msg.payload?.settings ?? {});
+        }
+        break;
+      case "host.start":
+        if (state.phase === "lobby" && state.questions.length > 0) {
+          room.engine.dispatch({ type: "start" });
+        }
+        break;
+      case "host.reveal":
+        room.engine.dispatch({ type: "reveal" });
+        break;
+      case "host.next":
+        room.engine.dispatch({ type: "next" });
+        break;
+    }
+  }
+
+  /** Sends a reconnecting player the question that is currently open. */
+  private catchUp(room: GameRoom, socket: RelaySocket): void {
+    const state = room.store.getState();
+    const question = state.questions[state.currentQuestionIndex];
+    if (state.phase !== "question" || !question) {
+      return;
+    }
+
+    const elapsed = this.now() - (state.questionStartTime ?? this.now());
+    socket.send(
+      JSON.stringify(
+        buildQuestionPayload(
+          question,
+          Math.max(0, state.settings.questionTimeLimit - elapsed),
+          choiceShuffleFor(state),
+        ),
+      ),
+    );
+  }
+
+  private stateFrame(patch: Partial<GameState>): string {
+    return JSON.stringify({ type: "state", payload: encodeStatePatch(patch) });
+  }
+
+  private queueState(room: GameRoom, patch: Partial<GameState>): void {
+    Object.assign(room.pending, patch);
+
+    if (!room.flushTimer) {
+      room.flushTimer = setTimeout(() => {
+        room.flushTimer = null;
+        const pending = room.pending;
+        room.pending = {};
+        if (Object.keys(pending).length > 0) {
+          room.host?.send(this.stateFrame(pending));
+        }
+      }, STATE_FLUSH_MS);
+    }
+  }
+
+  private closeRoom(roomId: string, room: GameRoom): void {
+    room.engine.stop();
+    room.unsubscribe();
+    if (room.flushTimer) {
+      clearTimeout(room.flushTimer);
+    }
+    this.rooms.delete(roomId);
+  }
+}
@@ -0,0 +1,111 @@
+import { describe, it, expect, vi } from "vitest";
+import { RelayRoomRegistry, type RelayClient } from "./rooms";
+
+function socket() {
+  return { send: vi.fn(), close: vi.fn() };
+}
+
+const host: RelayClient = { role: "host", roomId: "ROOM01" };
+const alice: RelayClient = {
+  role: "player",
+  roomId: "ROOM01",
+  playerId: "alice",
+  nickname: "Alice",
+};
+const bob: RelayClient = { role: "player", roomId: "ROOM01", playerId: "bob" };
+
+describe("RelayRoomRegistry", () => {
+  it("announces players to the host, including ones that joined first", () => {
+    const registry = new RelayRoomRegistry();
+    const hostSocket = socket();
+
+    registry.join(alice, socket());
+    registry.join(host, hostSocket);
+    registry.join(bob, socket());
+
+    const frames = hostSocket.send.mock.calls.map(([frame]) =>
+      JSON.parse(frame),
+    );
+    expect(frames).toEqual([
+      { type: "peer.join", playerId: "alice", nickname: "Alice" },
+      { type: "peer.join", playerId: "bob" },
+    ]);
+  });
+
+  it("wraps player frames with the authenticated player id", () => {
+    const registry = new RelayRoomRegistry();
+    const hostSocket = socket();
+    registry.join(host, hostSocket);
+    registry.join(alice, socket());
+    hostSocket.send.mockClear();
+
+    registry.handleFrame(
+      alice,
+      JSON.stringify({ type: "answer", playerId: "bob", choiceId: "a" }),
+    );
+    registry.handleFrame(alice, "not json");
+
+    expect(hostSocket.send).toHaveBeenCalledTimes(1);
+    expect(JSON.parse(hostSocket.send.mock.calls[0][0])).toEqual({
+      type: "peer.message",
+      playerId: "alice",
+      data: { type: "answer", playerId: "bob", choiceId: "a" },
+    });
+  });
+
+  it("routes host frames to one player or broadcasts to all", () => {
+    const registry = new RelayRoomRegistry();
+    const aliceSocket = socket();
+    const bobSocket = socket();
+    registry.join(host, socket());
+    registry.join(alice, aliceSocket);
+    registry.join(bob, bobSocket);
+
+    registry.handleFrame(
+      host,
+      JSON.stringify({ to: "bob", data: { type: "answer.ack" } }),
+    );
+    registry.handleFrame(
+      host,
+      JSON.stringify({ to: "*", data: { type: "ended" } }),
+    );
+
+    expect(aliceSocket.send.mock.calls).toEqual([['{"type":"ended"}']]);
+    expect(bobSocket.send.mock.calls).toEqual([
+      ['{"type":"answer.ack"}'],
+      ['{"type":"ended"}'],
+    ]);
+  });
+
+  it("notifies the host on leave and ignores stale sockets", () => {
+    const registry = new RelayRoomRegistry();
+    const hostSocket = socket();
+    const firstAlice = socket();
+    const secondAlice = socket();
+    registry.join(host, hostSocket);
+    registry.join(alice, firstAlice);
+    registry.join(alice, secondAlice);
+    hostSocket.send.mockClear();
+
+    expect(firstAlice.close).toHaveBeenCalled();
+
+    registry.leave(alice, firstAlice);
+    expect(hostSocket.send).not.toHaveBeenCalled();
+
+    registry.leave(alice, secondAlice);
+    expect(JSON.parse(hostSocket.send.mock.calls[0][0])).toEqual({
+      type: "peer.leave",
+      playerId: "alice",
+    });
+  });
+
+  it("drops empty rooms", () => {
+    const registry = new RelayRoomRegistry();
+    const hostSocket = socket();
+    registry.join(host, hostSocket);
+
+    registry.leave(host, hostSocket);
+
+    expect(registry.getStats()).toEqual({ rooms: 0, players: 0 });
+  });
+});
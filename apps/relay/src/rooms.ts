@@ -0,0 +1,135 @@
+export const MAX_PLAYER_FRAME_BYTES = 16 * 1024;
+
+export interface RelaySocket {
+  send(frame: string): void;
+  close(code?: number, reason?: string): void;
+}
+
+export type RelayClient =
+  | { role: "host"; roomId: string }
+  | { role: "player"; roomId: string; playerId: string; nickname?: string };
+
+interface RelayRoom {
+  host: RelaySocket | null;
+  players: Map<string, { socket: RelaySocket; nickname?: string }>;
+}
+
+function joinFrame(playerId: string, nickname?: string): string {
+  return JSON.stringify({ type: "peer.join", playerId, nickname });
+}
+
+/**
+ * Routes frames between one host socket and any number of player sockets
+ * per room. Players talk only to the host; the host addresses a single
+ * player or `"*"` for a broadcast that is serialized once per frame.
+ */
+export class RelayRoomRegistry {
+  private rooms: Map<string, RelayRoom> = new Map();
+
+  private getRoom(roomId: string): RelayRoom {
+    let room = this.rooms.get(roomId);
+    if (!room) {
+      room = { host: null, players: new Map() };
+      this.rooms.set(roomId, room);
+    }
+    return room;
+  }
+
+  join(client: RelayClient, socket: RelaySocket): void {
+    const room = this.getRoom(client.roomId);
+
+    if (client.role === "host") {
+      room.host?.close(4000, "Replaced by a newer host connection");
+      room.host = socket;
+      room.players.forEach((player, playerId) => {
+        socket.send(joinFrame(playerId, player.nickname));
+      });
+      return;
+    }
+
+    room.players
+      .get(client.playerId)
+      ?.socket.close(4000, "Replaced by a newer player connection");
+    room.players.set(client.playerId, { socket, nickname: client.nickname });
+    room.host?.send(joinFrame(client.playerId, client.nickname));
+  }
+
+  leave(client: RelayClient, socket: RelaySocket): void {
+    const room = this.rooms.get(client.roomId);
+    if (!room) {
+      return;
+    }
+
+    if (client.role === "host") {
+      if (room.host === socket) {
+        room.host = null;
+      }
+    } else if (room.players.get(client.playerId)?.socket === socket) {
+      room.players.delete(client.playerId);
+      room.host?.send(
+        JSON.stringify({ type: "peer.leave", playerId: client.playerId }),
+      );
+    }
+
+    if (!room.host && room.players.size === 0) {
+      this.rooms.delete(client.roomId);
+    }
+  }
+
+  handleFrame(client: RelayClient, frame: string): void {
+    const room = this.rooms.get(client.roomId);
+    if (!room) {
+      return;
+    }
+
+    if (client.role === "host") {
+      this.routeFromHost(room, frame);
+      return;
+    }
+
+    if (frame.length > MAX_PLAYER_FRAME_BYTES || !room.host) {
+      return;
+    }
+
+    // Re-serialize so a player cannot smuggle extra envelope fields.
+    let data: unknown;
+    try {
+      data = JSON.parse(frame);
+    } catch {
+      return;
+    }
+
+    room.host.send(
+      JSON.stringify({
+        type: "peer.message",
+        playerId: client.playerId,
+        data,
+      }),
+    );
+  }
+
+  private routeFromHost(room: RelayRoom, frame: string): void {
+    let envelope: { to?: unknown; data?: unknown };
+    try {
+      envelope = JSON.parse(frame);
+    } catch {
+      return;
+    }
+
+    const message = JSON.stringify(envelope.data);
+
+    if (envelope.to === "*") {
+      room.players.forEach((player) => player.socket.send(message));
+    } else if (typeof envelope.to === "string") {
+      room.players.get(envelope.to)?.socket.send(message);
+    }
+  }
+
+  getStats(): { rooms: number; players: number } {
+    let players = 0;
+    this.rooms.forEach((room) => {
+      players += room.players.size;
+    });
+    return { rooms: this.rooms.size, players };
+  }
+}
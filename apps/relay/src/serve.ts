@@ -0,0 +1,68 @@
+import type { Server, ServerWebSocket } from "bun";
+import { authenticate } from "./auth";
+import { GAME_SERVER_PATH } from "@/lib/server-game";
+import { GameRoomRegistry } from "./game-rooms";
+import { RelayRoomRegistry, type RelayClient } from "./rooms";
+
+interface ConnectionData {
+  client: RelayClient;
+  registry: RelayRoomRegistry | GameRoomRegistry;
+}
+
+/**
+ * Serves both the plain relay (any path) and server-authoritative game rooms
+ * (`/game`). Both authenticate against the web app's signaling routes.
+ */
+export function startRelayServer(options: {
+  port: number;
+  signalingUrl: string;
+}): Server {
+  const relayRegistry = new RelayRoomRegistry();
+  const gameRegistry = new GameRoomRegistry();
+  const decoder = new TextDecoder();
+
+  return Bun.serve({
+    port: options.port,
+    async fetch(request, server) {
+      const url = new URL(request.url);
+
+      if (url.pathname === "/health") {
+        const cpu = process.cpuUsage();
+        return Response.json({
+          ok: true,
+          ...relayRegistry.getStats(),
+          games: gameRegistry.getStats(),
+          cpuMs: Math.round((cpu.user + cpu.system) / 1000),
+          rssMb: Math.round(process.memoryUsage().rss / 1024 / 1024),
+        });
+      }
+
+      const client = await authenticate(url, options.signalingUrl);
+      if (!client) {
+        return new Response("Unauthorized", { status: 401 });
+      }
+
+      const registry =
+        url.pathname === GAME_SERVER_PATH ? gameRegistry : relayRegistry;
+      if (server.upgrade(request, { data: { client, registry } })) {
+        return undefined;
+      }
+
+      return new Response("Upgrade required", { status: 426 });
+    },
+    websocket: {
+      open(ws: ServerWebSocket<ConnectionData>) {
+        ws.data.registry.join(ws.data.client, ws);
+      },
+      message(ws: ServerWebSocket<ConnectionData>, message: string | Buffer) {
+        ws.data.registry.handleFrame(
+          ws.data.client,
+          typeof message === "string" ? message : decoder.decode(message),
+        );
+      },
+      close(ws: ServerWebSocket<ConnectionData>) {
+        ws.data.registry.leave(ws.data.client, ws);
+      },
+    },
+  });
+}
@@ -0,0 +1,10 @@
+import { startRelayServer } from "./serve";
+
+const port = Number(process.env.RELAY_PORT ?? 3001);
+const signalingUrl = process.env.SIGNALING_URL ?? "http://localhost:3000";
+
+const server = startRelayServer({ port, signalingUrl });
+
+console.log(
+  `Relay listening on ws://localhost:${server.port} (signaling ${signalingUrl})`,
+);
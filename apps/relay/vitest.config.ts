@@ -0,0 +1,24 @@
+import { defineConfig } from "vitest/config";
+import path from "path";
+
+export default defineConfig({
+  test: {
+    globals: true,
+    environment: "node",
+    include: ["src/**/*.test.ts", "src/**/*.spec.ts"],
+  },
+  resolve: {
+    alias: {
+      "@/lib": path.resolve(__dirname, "../web/src/lib"),
+      "@/stores": path.resolve(__dirname, "../web/src/stores"),
+      "@opentriiva/pack-schema": path.resolve(
+        __dirname,
+        "../../packages/pack-schema/src",
+      ),
+      "@opentriiva/protocol": path.resolve(
+        __dirname,
+        "../../packages/protocol/src",
+      ),
+    },
+  },
+});
@@ -1,6 +1,26 @@
+// Versions the player service worker cache; see public/sw.js.
+const appVersion =
+  process.env.VERCEL_GIT_COMMIT_SHA ||
+  process.env.APP_VERSION ||
+  Date.now().toString(36);
+
 /** @type {import('next').NextConfig} */
 const nextConfig = {
   reactStrictMode: true,
+  env: {
+    NEXT_PUBLIC_APP_VERSION: appVersion,
+  },
+  async headers() {
+    return [
+      {
+        source: "/sw.js",
+        headers: [
+          { key: "Cache-Control", value: "no-cache" },
+          { key: "Service-Worker-Allowed", value: "/" },
+        ],
+      },
+    ];
+  },
   transpilePackages: ["@opentriiva/protocol", "@opentriiva/pack-schema"],
   typescript: {
     ignoreBuildErrors: true,
@@ -0,0 +1,134 @@
+/*
+ * Player app-shell service worker.
+ *
+ * Precaches the /join and /player shells plus the static chunks they load,
+ * then serves them cache-first so repeat joins render without waiting on the
+ * venue network. The cache name carries the app version from the
+ * registration URL (`/sw.js?v=<version>`); a new deploy registers a new
+ * worker, which rebuilds the cache and drops the old ones. API, signaling
+ * and host routes are never intercepted and always go to the network.
+ */
+const CACHE_PREFIX = "opentriiva-shell-";
+const VERSION = new URL(self.location.href).searchParams.get("v") || "dev";
+const CACHE_NAME = `${CACHE_PREFIX}${VERSION}`;
+
+// Player pages read the room from `location`, so one shell serves every
+// /player/<room> URL and every /join?room=<code> link.
+const SHELLS = [
+  { key: "/join", url: "/join", matches: (path) => path === "/join" },
+  {
+    key: "/player/shell",
+    url: "/player/shell",
+    matches: (path) => path.startsWith("/player/"),
+  },
+];
+
+const STATIC_ASSET = /(?:src|href)="(\/_next\/static\/[^"]+)"/g;
+
+function staticAssetsIn(html) {
+  const assets = new Set();
+  let match;
+  while ((match = STATIC_ASSET.exec(html)) !== null) {
+    assets.add(match[1].replace(/&amp;/g, "&"));
+  }
+  STATIC_ASSET.lastIndex = 0;
+  return Array.from(assets);
+}
+
+async function precacheShell(cache, shell) {
+  const response = await fetch(shell.url, { cache: "no-store" });
+  if (!response.ok) {
+    return;
+  }
+
+  const html = await response.clone().text();
+  await cache.put(shell.key, response);
+  await Promise.all(
+    staticAssetsIn(html).map((asset) => cache.add(asset).catch(() => {})),
+  );
+}
+
+async function precache() {
+  const cache = await caches.open(CACHE_NAME);
+  await Promise.all(
+    SHELLS.map((shell) =>
+      precacheShell(cache, shell).catch((error) =>
+        console.error("Failed to precache shell:", error),
+      ),
+    ),
+  );
+}
+
+async function removeStaleCaches() {
+  const names = await caches.keys();
+  await Promise.all(
+    names
+      .filter((name) => name.startsWith(CACHE_PREFIX) && name !== CACHE_NAME)
+      .map((name) => caches.delete(name)),
+  );
+}
+
+// Hashed chunk URLs never change content, so a cached copy is always valid.
+async function cacheFirst(request) {
+  const cache = await caches.open(CACHE_NAME);
+  const cached = await cache.match(request);
+  if (cached) {
+    return cached;
+  }
+
+  const response = await fetch(request);
+  if (response.ok) {
+    await cache.put(request, response.clone());
+  }
+  return response;
+}
+
+// Serve the cached shell immediately and refresh it in the background.
+async function shellFirst(event, shell) {
+  const cache = await caches.open(CACHE_NAME);
+  const cached = await cache.match(shell.key);
+  const refresh = fetch(event.request).then(async (response) => {
+    if (response.ok) {
+      await cache.put(shell.key, response.clone());
+    }
+    return response;
+  });
+
+  if (cached) {
+    event.waitUntil(refresh.catch(() => {}));
+    return cached;
+  }
+  return refresh;
+}
+
+self.addEventListener("install", (event) => {
+  event.waitUntil(precache().then(() => self.skipWaiting()));
+});
+
+self.addEventListener("activate", (event) => {
+  event.waitUntil(removeStaleCaches().then(() => self.clients.claim()));
+});
+
+self.addEventListener("fetch", (event) => {
+  const { request } = event;
+  if (request.method !== "GET") {
+    return;
+  }
+
+  const url = new URL(request.url);
+  if (url.origin !== self.location.origin) {
+    return;
+  }
+
+  if (url.pathname.startsWith("/_next/static/")) {
+    event.respondWith(cacheFirst(request));
+    return;
+  }
+
+  if (request.mode === "navigate") {
+    const shell = SHELLS.find((candidate) => candidate.matches(url.pathname));
+    if (shell) {
+      event.respondWith(shellFirst(event, shell));
+    }
+  }
+});
@@ -0,0 +1,454 @@
+/**
+ * Join-storm benchmark for the signaling API. Runs the real route handlers
+ * in-process against the in-memory store, the in-process Redis stand-in
+ * and, with --redis-url, a local Redis. Each scenario creates a room and
+ * has N players offer and trickle K candidates while the host polls, then
+ * the host answers everyone it sees and the players poll for the answer.
+ *
+ * Reports requests per join, Redis round trips (and, for the stand-in,
+ * commands) per join, store bytes per join, lost joins and per-route
+ * latency percentiles, and compares them with bench/signaling-baseline.json.
+ *
+ *   bun run scripts/bench-signaling.ts [--players 10,100] [--candidates 4]
+ *     [--redis-url redis://localhost:6379] [--output result.json]
+ *     [--update-baseline]
+ *
+ * Exits non-zero when any join is lost, on every backend, or when a count
+ * metric exceeds its baseline by more than --tolerance. Latency is
+ * machine-specific, so it only fails with --strict. A run that loses joins
+ * is never written to the baseline.
+ */
+import { existsSync, readFileSync, writeFileSync } from "fs";
+import { parseArgs } from "util";
+import Redis from "ioredis";
+import { NextRequest } from "next/server";
+import { setRedisClient, type RedisClient } from "@/app/api/_lib/redis";
+import { getRouteMetrics, resetRouteMetrics } from "@/app/api/_lib/tracing";
+import * as createRoute from "@/app/api/session/create/route";
+import * as offerRoute from "@/app/api/session/[roomId]/offer/route";
+import * as answerRoute from "@/app/api/session/[roomId]/answer/route";
+import * as candidateRoute from "@/app/api/session/[roomId]/candidate/route";
+import {
+  clearSessionCache,
+  getMemoryStoreFootprint,
+} from "@/app/api/session/store";
+import { RedisStandIn } from "@/test/redis-stand-in";
+
+const BASELINE_PATH = new URL(
+  "../bench/signaling-baseline.json",
+  import.meta.url,
+);
+
+const { values: args } = parseArgs({
+  args: process.argv.slice(2),
+  options: {
+    players: { type: "string", default: "10,100" },
+    candidates: { type: "string", default: "4" },
+    polls: { type: "string", default: "3" },
+    "host-polls": { type: "string", default: "3" },
+    backends: { type: "string", default: "memory,redis-stand-in" },
+    "redis-url": { type: "string" },
+    "redis-latency": { type: "string", default: "1" },
+    tolerance: { type: "string", default: "0.1" },
+    "latency-tolerance": { type: "string", default: "0.5" },
+    strict: { type: "boolean", default: false },
+    output: { type: "string" },
+    "update-baseline": { type: "boolean", default: false },
+  },
+});
+
+const PLAYER_COUNTS = args.players.split(",").map(Number);
+const CANDIDATES = Number(args.candidates);
+const ANSWER_POLLS = Number(args.polls);
+const HOST_POLLS = Number(args["host-polls"]);
+const TOLERANCE = Number(args.tolerance);
+const LATENCY_TOLERANCE = Number(args["latency-tolerance"]);
+
+// Roughly the size of a browser's data-channel-only offer.
+const SDP = [
+  "v=0",
+  "o=- 4611731400430051336 2 IN IP4 127.0.0.1",
+  "s=-",
+  "t=0 0",
+  "a=group:BUNDLE 0",
+  "a=extmap-allow-mixed",
+  "a=msid-semantic: WMS",
+  "m=application 9 UDP/DTLS/SCTP webrtc-datachannel",
+  "c=IN IP4 0.0.0.0",
+  "a=ice-ufrag:Ub7s",
+  "a=ice-pwd:gXo3Z7sV0l9Rk1ZpUJm2Yb4N",
+  "a=ice-options:trickle",
+  "a=fingerprint:sha-256 " +
+    "7B:8B:F0:65:5F:78:E2:51:3B:AC:6F:F3:3F:46:1B:35:" +
+    "DC:B8:5F:64:1A:24:C2:43:F0:A1:58:D0:A1:2C:19:08",
+  "a=setup:actpass",
+  "a=mid:0",
+  "a=sctp-port:5000",
+  "a=max-message-size:262144",
+  "",
+].join("\r\n");
+
+const candidate = (index: number) => ({
+  candidate:
+    `candidate:${842163049 + index} 1 udp 1677729535 ` +
+    `203.0.113.${index + 1} ${50000 + index} typ srflx raddr 0.0.0.0 ` +
+    "rport 0 generation 0 ufrag Ub7s network-cost 999",
+  sdpMid: "0",
+  sdpMLineIndex: 0,
+});
+
+type RouteHandler = (
+  request: NextRequest,
+  context: { params: Promise<{ roomId: string }> },
+) => Promise<Response>;
+
+let requestCount = 0;
+
+async function call(
+  handler: RouteHandler,
+  roomId: string,
+  client: string,
+  init: { query?: Record<string, string>; body?: unknown },
+): Promise<Record<string, unknown>> {
+  requestCount += 1;
+  const url = new URL(`http://bench.local/api/session/${roomId}`);
+  Object.entries(init.query ?? {}).forEach(([key, value]) =>
+    url.searchParams.set(key, value),
+  );
+  const request = new NextRequest(url, {
+    method: init.body === undefined ? "GET" : "POST",
+    headers: {
+      "Content-Type": "application/json",
+      "X-Forwarded-For": client,
+    },
+    body: init.body === undefined ? undefined : JSON.stringify(init.body),
+  });
+  const response = await handler(request, {
+    params: Promise.resolve({ roomId }),
+  });
+  return (await response.json()) as Record<string, unknown>;
+}
+
+async function joinStorm(playerCount: number): Promise<number> {
+  const host = "10.0.0.1";
+  const created = await call(createRoute.POST as RouteHandler, "create", host, {
+    body: {},
+  });
+  const roomId = created.roomId as string;
+  const hostToken = created.hostToken as string;
+
+  const players = Array.from({ length: playerCount }, (_, index) => ({
+    playerId: `bench-player-${String(index).padStart(4, "0")}`,
+    playerToken: "",
+    client: `10.1.${index >> 8}.${index & 255}`,
+  }));
+
+  // Every player offers and trickles candidates while the host polls.
+  const hostPolls = (async () => {
+    for (let poll = 0; poll < HOST_POLLS; poll++) {
+      await call(offerRoute.GET, roomId, host, { query: { hostToken } });
+    }
+  })();
+  await Promise.all([
+    hostPolls,
+    ...players.map(async (player, index) => {
+      const auth = await call(offerRoute.POST, roomId, player.client, {
+        body: {
+          roomId,
+          playerId: player.playerId,
+          nickname: `Bench ${index}`,
+          offer: { type: "offer", sdp: SDP },
+        },
+      });
+      player.playerToken = (auth.playerToken as string) ?? "";
+      for (let k = 0; k < CANDIDATES; k++) {
+        await call(candidateRoute.POST, roomId, player.client, {
+          body: {
+            roomId,
+            playerId: player.playerId,
+            playerToken: player.playerToken,
+            candidate: candidate(k),
+          },
+        });
+      }
+    }),
+  ]);
+
+  // The host answers everyone it can see.
+  const listed = await call(offerRoute.GET, roomId, host, {
+    query: { hostToken },
+  });
+  const seen = (listed.players as { playerId: string }[] | undefined) ?? [];
+  await Promise.all(
+    seen.map(async ({ playerId }) => {
+      await call(offerRoute.GET, roomId, host, {
+        query: { hostToken, playerId },
+      });
+      await call(answerRoute.POST, roomId, host, {
+        body: {
+          roomId,
+          playerId,
+          hostToken,
+          answer: { type: "answer", sdp: SDP },
+        },
+      });
+      for (let k = 0; k < CANDIDATES; k++) {
+        await call(candidateRoute.POST, roomId, host, {
+          body: { roomId, playerId, hostToken, candidate: candidate(k) },
+        });
+      }
+    }),
+  );
+  await call(candidateRoute.GET, roomId, host, { query: { hostToken } });
+
+  // Players poll for their answer and the host's candidates.
+  let connected = 0;
+  await Promise.all(
+    players.map(async ({ playerId, playerToken, client }) => {
+      let answered = false;
+      for (let poll = 0; poll < ANSWER_POLLS; poll++) {
+        const data = await call(answerRoute.GET, roomId, client, {
+          query: { playerId, playerToken },
+        });
+        answered ||= !!data.answer;
+      }
+      await call(candidateRoute.GET, roomId, client, {
+        query: { playerId, playerToken, afterIndex: "0" },
+      });
+      if (answered) {
+        connected += 1;
+      }
+    }),
+  );
+  return connected;
+}
+
+interface Backend {
+  name: string;
+  client: RedisClient | null;
+  commands: () => number | null;
+  storedBytes: () => number | null;
+}
+
+function createBackend(name: string): Backend {
+  switch (name) {
+    case "memory":
+      return {
+        name,
+        client: null,
+        commands: () => null,
+        storedBytes: () => getMemoryStoreFootprint().bytes,
+      };
+    case "redis-stand-in": {
+      const standIn = new RedisStandIn({
+        latencyMs: Number(args["redis-latency"]),
+      });
+      return {
+        name,
+        client: standIn,
+        commands: () => standIn.commands,
+        storedBytes: () => standIn.storedBytes(),
+      };
+    }
+    case "redis":
+      if (!args["redis-url"]) {
+        throw new Error("--redis-url is required for the redis backend");
+      }
+      return {
+        name,
+        client: new Redis(args["redis-url"], { enableAutoPipelining: true }),
+        commands: () => null,
+        storedBytes: () => null,
+      };
+    default:
+      throw new Error(`Unknown backend ${name}`);
+  }
+}
+
+interface RouteLatency {
+  count: number;
+  p50Ms: number;
+  p95Ms: number;
+  p99Ms: number;
+}
+
+interface ScenarioResult {
+  wallMs: number;
+  lostJoins: number;
+  requestsPerJoin: number;
+  redisRoundTripsPerJoin: number;
+  redisCommandsPerJoin: number | null;
+  storeBytesPerJoin: number | null;
+  routes: Record<string, RouteLatency>;
+}
+
+const COUNT_METRICS = [
+  "requestsPerJoin",
+  "redisRoundTripsPerJoin",
+  "redisCommandsPerJoin",
+  "storeBytesPerJoin",
+] as const;
+
+const perJoin = (value: number, players: number) =>
+  Number((value / players).toFixed(2));
+
+async function runScenario(
+  backend: Backend,
+  players: number,
+): Promise<ScenarioResult> {
+  setRedisClient(backend.client);
+  clearSessionCache();
+  resetRouteMetrics();
+  requestCount = 0;
+  const commandsBefore = backend.commands();
+  const bytesBefore = backend.storedBytes();
+
+  const startedAt = performance.now();
+  const connected = await joinStorm(players);
+  const wallMs = performance.now() - startedAt;
+
+  const routes = getRouteMetrics();
+  const roundTrips = routes.reduce(
+    (sum, route) => sum + route.redisCallsPerRequest * route.count,
+    0,
+  );
+  const commandsAfter = backend.commands();
+  const bytesAfter = backend.storedBytes();
+
+  return {
+    wallMs: Number(wallMs.toFixed(1)),
+    lostJoins: players - connected,
+    requestsPerJoin: perJoin(requestCount, players),
+    redisRoundTripsPerJoin: perJoin(roundTrips, players),
+    redisCommandsPerJoin:
+      commandsBefore === null || commandsAfter === null
+        ? null
+        : perJoin(commandsAfter - commandsBefore, players),
+    storeBytesPerJoin:
+      bytesBefore === null || bytesAfter === null
+        ? null
+        : perJoin(bytesAfter - bytesBefore, players),
+    routes: Object.fromEntries(
+      routes.map(({ route, count, p50Ms, p95Ms, p99Ms }) => [
+        route,
+        { count, p50Ms, p95Ms, p99Ms },
+      ]),
+    ),
+  };
+}
+
+type Baseline = Record<string, Partial<ScenarioResult>>;
+
+function compare(
+  key: string,
+  result: ScenarioResult,
+  baseline: Partial<ScenarioResult> | undefined,
+): { regressions: string[]; warnings: string[] } {
+  const regressions: string[] = [];
+  const warnings: string[] = [];
+  // A lost join is a correctness bug whatever the baseline says.
+  if (result.lostJoins > 0) {
+    regressions.push(`${key}: lostJoins ${result.lostJoins} (must be 0)`);
+  }
+  if (!baseline) {
+    warnings.push(`${key}: no baseline`);
+    return { regressions, warnings };
+  }
+
+  COUNT_METRICS.forEach((metric) => {
+    const expected = baseline[metric];
+    const actual = result[metric];
+    if (typeof actual !== "number") {
+      return;
+    }
+    if (typeof expected !== "number") {
+      warnings.push(`${key}: no baseline for ${metric}`);
+      return;
+    }
+    if (actual > expected * (1 + TOLERANCE) + 0.01) {
+      regressions.push(`${key}: ${metric} ${actual} (baseline ${expected})`);
+    }
+  });
+
+  Object.entries(baseline.routes ?? {}).forEach(([route, expected]) => {
+    const actual = result.routes[route];
+    if (actual && actual.p95Ms > expected.p95Ms * (1 + LATENCY_TOLERANCE)) {
+      const message =
+        `${key}: ${route} p95 ${actual.p95Ms}ms ` +
+        `(baseline ${expected.p95Ms}ms)`;
+      (args.strict ? regressions : warnings).push(message);
+    }
+  });
+  return { regressions, warnings };
+}
+
+function formatResult(key: string, result: ScenarioResult): string {
+  const lines = [
+    `${key}: ${result.requestsPerJoin} req/join, ` +
+      `${result.redisRoundTripsPerJoin} Redis round trips/join` +
+      (result.redisCommandsPerJoin === null
+        ? ""
+        : ` (${result.redisCommandsPerJoin} commands)`) +
+      (result.storeBytesPerJoin === null
+        ? ""
+        : `, ${result.storeBytesPerJoin} B/join`) +
+      `, ${result.lostJoins} lost, ${result.wallMs}ms`,
+  ];
+  Object.entries(result.routes).forEach(([route, latency]) =>
+    lines.push(
+      `  ${route.padEnd(38)} n=${String(latency.count).padStart(5)} ` +
+        `p50=${latency.p50Ms}ms p95=${latency.p95Ms}ms p99=${latency.p99Ms}ms`,
+    ),
+  );
+  return lines.join("\n");
+}
+
+const baseline: Baseline = existsSync(BASELINE_PATH)
+  ? JSON.parse(readFileSync(BASELINE_PATH, "utf8")).scenarios
+  : {};
+const results: Record<string, ScenarioResult> = {};
+const regressions: string[] = [];
+const warnings: string[] = [];
+
+const backendNames = args.backends.split(",");
+if (args["redis-url"] && !backendNames.includes("redis")) {
+  backendNames.push("redis");
+}
+
+for (const name of backendNames) {
+  const backend = createBackend(name);
+  for (const players of PLAYER_COUNTS) {
+    const key = `${name}/${players}`;
+    const result = await runScenario(backend, players);
+    results[key] = result;
+    console.log(formatResult(key, result));
+
+    const outcome = compare(key, result, baseline[key]);
+    regressions.push(...outcome.regressions);
+    warnings.push(...outcome.warnings);
+  }
+  if (backend.client instanceof Redis) {
+    backend.client.disconnect();
+  }
+}
+
+warnings.forEach((warning) => console.log(`warning: ${warning}`));
+regressions.forEach((regression) => console.error(`REGRESSION ${regression}`));
+
+if (args.output) {
+  writeFileSync(args.output, JSON.stringify(results, null, 2));
+}
+const lostJoins = Object.values(results).some((result) => result.lostJoins > 0);
+if (args["update-baseline"] && lostJoins) {
+  console.error("not updating the baseline: joins were lost");
+} else if (args["update-baseline"]) {
+  writeFileSync(
+    BASELINE_PATH,
+    JSON.stringify({ scenarios: { ...baseline, ...results } }, null, 2) + "\n",
+  );
+  console.log(`baseline written to ${BASELINE_PATH.pathname}`);
+}
+
+process.exit(
+  lostJoins || (regressions.length > 0 && !args["update-baseline"]) ? 1 : 0,
+);
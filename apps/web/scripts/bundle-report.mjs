@@ -0,0 +1,144 @@
+/**
+ * Player bundle budget.
+ *
+ * Runs after `next build` and sums the gzipped client JavaScript each
+ * budgeted route loads on first visit (framework/root chunks plus every
+ * layout and page entry on the route). Writes `.next/bundle-report.json`
+ * and exits non-zero when a route is over its budget in `bundle-budget.json`.
+ *
+ *   node scripts/bundle-report.mjs            # enforce
+ *   BUNDLE_BUDGET=warn node scripts/bundle-report.mjs
+ */
+import fs from "fs";
+import path from "path";
+import vm from "vm";
+import zlib from "zlib";
+
+const ROOT = path.resolve(
+  path.dirname(new URL(import.meta.url).pathname),
+  "..",
+);
+const NEXT_DIR = path.join(ROOT, ".next");
+const budget = JSON.parse(
+  fs.readFileSync(path.join(ROOT, "bundle-budget.json"), "utf8"),
+);
+const warnOnly = process.env.BUNDLE_BUDGET === "warn";
+
+function readJson(file) {
+  const fullPath = path.join(NEXT_DIR, file);
+  return fs.existsSync(fullPath)
+    ? JSON.parse(fs.readFileSync(fullPath, "utf8"))
+    : null;
+}
+
+/** Segments whose layouts wrap `route`: "/a/b" -> ["", "/a", "/a/b"]. */
+function segmentsOf(route) {
+  const parts = route.split("/").filter(Boolean);
+  return [
+    "",
+    ...parts.map((_, index) => `/${parts.slice(0, index + 1).join("/")}`),
+  ];
+}
+
+function entriesFromAppBuildManifest(manifest, route) {
+  const keys = [
+    ...segmentsOf(route).map((segment) => `${segment}/layout`),
+    `${route}/page`,
+  ];
+  return keys.flatMap((key) => manifest.pages[key] ?? []);
+}
+
+// Newer Next.js builds drop app-build-manifest.json; the per-page client
+// reference manifest lists the same entry chunks.
+function entriesFromClientReferenceManifest(route) {
+  const file = path.join(
+    NEXT_DIR,
+    "server/app",
+    route,
+    "page_client-reference-manifest.js",
+  );
+  if (!fs.existsSync(file)) {
+    return null;
+  }
+
+  const sandbox = {};
+  sandbox.globalThis = sandbox;
+  vm.runInNewContext(fs.readFileSync(file, "utf8"), sandbox);
+  const manifest = Object.values(sandbox.__RSC_MANIFEST ?? {})[0];
+  return Object.values(manifest?.entryJSFiles ?? {}).flat();
+}
+
+function measure(file) {
+  const contents = fs.readFileSync(path.join(NEXT_DIR, file));
+  return {
+    file,
+    bytes: contents.length,
+    gzipBytes: zlib.gzipSync(contents, { level: 9 }).length,
+  };
+}
+
+function main() {
+  const buildManifest = readJson("build-manifest.json");
+  if (!buildManifest) {
+    console.error("No .next/build-manifest.json; run `next build` first.");
+    process.exit(1);
+  }
+
+  const appBuildManifest = readJson("app-build-manifest.json");
+  const rootFiles = [
+    ...(buildManifest.polyfillFiles ?? []),
+    ...(buildManifest.rootMainFiles ?? []),
+  ];
+
+  const report = { generatedAt: new Date().toISOString(), routes: {} };
+  let failed = false;
+
+  Object.entries(budget.routes).forEach(([route, limitKb]) => {
+    const entries = appBuildManifest
+      ? entriesFromAppBuildManifest(appBuildManifest, route)
+      : entriesFromClientReferenceManifest(route);
+    if (!entries) {
+      console.error(`No client manifest found for ${route}`);
+      failed = true;
+      return;
+    }
+
+    const files = Array.from(new Set([...rootFiles, ...entries]))
+      .filter((file) => file.endsWith(".js"))
+      .map(measure)
+      .sort((a, b) => b.gzipBytes - a.gzipBytes);
+    const gzipKb = files.reduce((sum, file) => sum + file.gzipBytes, 0) / 1024;
+    const overBudget = gzipKb > limitKb;
+    failed ||= overBudget;
+
+    report.routes[route] = {
+      limitKb,
+      gzipKb: Number(gzipKb.toFixed(1)),
+      overBudget,
+      files,
+    };
+
+    console.log(
+      `${overBudget ? "OVER" : "ok  "} ${route.padEnd(20)} ` +
+        `${gzipKb.toFixed(1)} kB gzip / ${limitKb} kB budget`,
+    );
+    files.slice(0, 5).forEach((file) => {
+      const kb = (file.gzipBytes / 1024).toFixed(1).padStart(6);
+      console.log(`       ${kb} kB  ${file.file}`);
+    });
+  });
+
+  fs.writeFileSync(
+    path.join(NEXT_DIR, "bundle-report.json"),
+    `${JSON.stringify(report, null, 2)}\n`,
+  );
+
+  if (failed && !warnOnly) {
+    console.error(
+      "Player bundle budget exceeded (BUNDLE_BUDGET=warn to skip).",
+    );
+    process.exit(1);
+  }
+}
+
+main();
@@ -0,0 +1,119 @@
+/**
+ * Compares `vitest bench` JSON results against a stored baseline.
+ *
+ *   npm run bench:json
+ *   bun run scripts/compare-bench.ts [--results bench/results.json]
+ *     [--baseline bench/baseline.json] [--fail-above 25] [--update]
+ *
+ * Prints ops/sec and mean time per benchmark with the change against the
+ * baseline. With --fail-above, exits non-zero when any benchmark's mean
+ * grew by more than that many percent. --update stores the results as the
+ * new baseline.
+ */
+import { copyFileSync, existsSync, readFileSync } from "fs";
+import { parseArgs } from "util";
+
+const { values: args } = parseArgs({
+  args: process.argv.slice(2),
+  options: {
+    results: { type: "string", default: "bench/results.json" },
+    baseline: { type: "string", default: "bench/baseline.json" },
+    "fail-above": { type: "string" },
+    update: { type: "boolean", default: false },
+  },
+});
+
+interface BenchResult {
+  hz: number;
+  mean: number;
+}
+
+/**
+ * Flattens a reporter's output into `suite > bench` keys. Walks the tree
+ * rather than assuming one layout, since the JSON shape differs between
+ * vitest versions.
+ */
+function collect(
+  node: unknown,
+  path: string[] = [],
+  out = new Map<string, BenchResult>(),
+): Map<string, BenchResult> {
+  if (Array.isArray(node)) {
+    node.forEach((item) => collect(item, path, out));
+    return out;
+  }
+  if (typeof node !== "object" || node === null) {
+    return out;
+  }
+
+  const record = node as Record<string, unknown>;
+  if (typeof record.name === "string" && typeof record.hz === "number") {
+    out.set([...path, record.name].join(" > "), {
+      hz: record.hz,
+      mean: Number(record.mean),
+    });
+    return out;
+  }
+
+  // vitest 1.x keys suites by name under `testResults`; later versions
+  // nest `files[].groups[].benchmarks[]` with a `fullName` per group.
+  const isContainer =
+    typeof record.fullName === "string" || typeof record.filepath === "string";
+  const nextPath =
+    typeof record.fullName === "string" ? [...path, record.fullName] : path;
+  Object.entries(record).forEach(([key, value]) => {
+    if (key === "samples" || typeof value !== "object") {
+      return;
+    }
+    const skipKey = isContainer || key === "testResults" || key === "files";
+    collect(value, skipKey ? nextPath : [...nextPath, key], out);
+  });
+  return out;
+}
+
+function load(path: string): Map<string, BenchResult> {
+  return collect(JSON.parse(readFileSync(path, "utf8")));
+}
+
+if (!existsSync(args.results)) {
+  console.error(`${args.results} not found; run \`npm run bench:json\` first`);
+  process.exit(1);
+}
+
+if (args.update) {
+  copyFileSync(args.results, args.baseline);
+  console.log(`baseline updated from ${args.results}`);
+  process.exit(0);
+}
+
+const results = load(args.results);
+const baseline = existsSync(args.baseline)
+  ? load(args.baseline)
+  : new Map<string, BenchResult>();
+if (baseline.size === 0) {
+  console.log(`no baseline at ${args.baseline}; store one with --update`);
+}
+
+const failAbove =
+  args["fail-above"] === undefined ? Infinity : Number(args["fail-above"]);
+const regressions: string[] = [];
+
+results.forEach((result, name) => {
+  const before = baseline.get(name);
+  let line =
+    `${name}: ${Math.round(result.hz).toLocaleString()} ops/s, ` +
+    `${(result.mean * 1000).toFixed(1)}µs`;
+  if (before) {
+    const change = ((result.mean - before.mean) / before.mean) * 100;
+    line += ` (${change >= 0 ? "+" : ""}${change.toFixed(1)}% vs baseline)`;
+    if (change > failAbove) {
+      regressions.push(`${name}: mean +${change.toFixed(1)}%`);
+    }
+  } else if (baseline.size > 0) {
+    line += " (new)";
+  }
+  console.log(line);
+});
+
+regressions.forEach((regression) => console.error(`REGRESSION ${regression}`));
+process.exit(regressions.length > 0 ? 1 : 0);
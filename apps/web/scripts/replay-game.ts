@@ -0,0 +1,43 @@
+/**
+ * Replays recorded host game logs (the NDJSON from "DOWNLOAD GAME LOG" on
+ * the host's game-over screen) through a headless game store at full speed,
+ * checks the final scores match the recorded game and reports throughput.
+ *
+ *   bun run scripts/replay-game.ts game-ABC123-1700000000000.ndjson [--runs 5]
+ *
+ * Exits non-zero if any log replays to different scores.
+ */
+import { readFileSync } from "fs";
+import { parseArgs } from "util";
+import { parseGameLog } from "@/lib/game-log";
+import { formatReplayReport, replayGameLog } from "@/lib/game-replay";
+
+const { values: args, positionals: files } = parseArgs({
+  args: process.argv.slice(2),
+  allowPositionals: true,
+  options: {
+    runs: { type: "string", default: "1" },
+  },
+});
+
+const RUNS = Math.max(1, Number(args.runs));
+
+if (files.length === 0) {
+  console.error("usage: replay-game.ts <log.ndjson>... [--runs N]");
+  process.exit(2);
+}
+
+let failed = false;
+
+for (const file of files) {
+  const records = parseGameLog(readFileSync(file, "utf8"));
+  const results = Array.from({ length: RUNS }, () => replayGameLog(records));
+  // Report the fastest run; earlier ones include JIT warm-up.
+  const best = results.reduce((a, b) => (b.wallMs < a.wallMs ? b : a));
+
+  console.log(`${file} (${records.length} records, best of ${RUNS})`);
+  console.log(formatReplayReport(best));
+  failed ||= results.some((result) => result.expectedScores && !result.matches);
+}
+
+process.exit(failed ? 1 : 0);
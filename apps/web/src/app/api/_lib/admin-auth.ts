@@ -0,0 +1,21 @@
+import type { NextRequest } from "next/server";
+
+/**
+ * Operator endpoints are open in development. In production they need the
+ * configured token, sent as a bearer token or `?token=`, and stay closed
+ * when none is set.
+ */
+export function isOperatorAuthorized(
+  request: NextRequest,
+  token: string | undefined,
+): boolean {
+  if (!token) {
+    return process.env.NODE_ENV !== "production";
+  }
+
+  const header = request.headers.get("authorization");
+  const provided =
+    header?.replace(/^Bearer\s+/i, "") ??
+    new URL(request.url).searchParams.get("token");
+  return provided === token;
+}
@@ -0,0 +1,45 @@
+import { describe, expect, it } from "vitest";
+import { LocalCache } from "./local-cache";
+
+describe("LocalCache", () => {
+  it("serves fresh entries, then only stale reads until they expire", () => {
+    let now = 0;
+    const cache = new LocalCache<string>({
+      ttlMs: 100,
+      staleMs: 1000,
+      now: () => now,
+    });
+
+    cache.set("room", "v1");
+    expect(cache.get("room")).toBe("v1");
+
+    now = 100;
+    expect(cache.get("room")).toBeUndefined();
+    expect(cache.getStale("room")).toBe("v1");
+
+    now = 1000;
+    expect(cache.getStale("room")).toBeUndefined();
+    expect(cache.size).toBe(0);
+  });
+
+  it("evicts the oldest write past maxEntries", () => {
+    const cache = new LocalCache<number>({ ttlMs: 1000, maxEntries: 2 });
+
+    cache.set("a", 1);
+    cache.set("b", 2);
+    cache.set("a", 3);
+    cache.set("c", 4);
+
+    expect(cache.get("b")).toBeUndefined();
+    expect(cache.get("a")).toBe(3);
+    expect(cache.get("c")).toBe(4);
+  });
+
+  it("stores nothing when the TTL is zero", () => {
+    const cache = new LocalCache<string>({ ttlMs: 0 });
+    cache.set("room", "v1");
+
+    expect(cache.enabled).toBe(false);
+    expect(cache.getStale("room")).toBeUndefined();
+  });
+});
@@ -0,0 +1,86 @@
+interface Entry<T> {
+  value: T;
+  storedAt: number;
+}
+
+/**
+ * Small in-process cache with a freshness TTL. Entries stay around past
+ * their TTL (up to `staleMs`) so they can still be served when the backing
+ * store is down, and the least recently written entry is evicted once
+ * `maxEntries` is reached.
+ */
+export class LocalCache<T> {
+  private entries: Map<string, Entry<T>> = new Map();
+  private ttlMs: number;
+  private staleMs: number;
+  private maxEntries: number;
+  private now: () => number;
+
+  constructor(options: {
+    ttlMs: number;
+    staleMs?: number;
+    maxEntries?: number;
+    now?: () => number;
+  }) {
+    this.ttlMs = options.ttlMs;
+    this.staleMs = Math.max(options.staleMs ?? 0, options.ttlMs);
+    this.maxEntries = options.maxEntries ?? 1000;
+    this.now = options.now ?? Date.now;
+  }
+
+  get enabled(): boolean {
+    return this.ttlMs > 0;
+  }
+
+  get size(): number {
+    return this.entries.size;
+  }
+
+  /** The value if it was stored less than `ttlMs` ago. */
+  get(key: string): T | undefined {
+    return this.read(key, this.ttlMs);
+  }
+
+  /** The value if it was stored less than `staleMs` ago. */
+  getStale(key: string): T | undefined {
+    return this.read(key, this.staleMs);
+  }
+
+  set(key: string, value: T): void {
+    if (!this.enabled) {
+      return;
+    }
+
+    this.entries.delete(key);
+    this.entries.set(key, { value, storedAt: this.now() });
+
+    if (this.entries.size > this.maxEntries) {
+      const oldest = this.entries.keys().next().value;
+      if (oldest !== undefined) {
+        this.entries.delete(oldest);
+      }
+    }
+  }
+
+  delete(key: string): void {
+    this.entries.delete(key);
+  }
+
+  clear(): void {
+    this.entries.clear();
+  }
+
+  private read(key: string, maxAgeMs: number): T | undefined {
+    const entry = this.entries.get(key);
+    if (!entry) {
+      return undefined;
+    }
+    if (this.now() - entry.storedAt >= maxAgeMs) {
+      if (this.now() - entry.storedAt >= this.staleMs) {
+        this.entries.delete(key);
+      }
+      return undefined;
+    }
+    return entry.value;
+  }
+}
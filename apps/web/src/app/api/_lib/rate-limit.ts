@@ -1,4 +1,5 @@
 import type { NextRequest } from "next/server";
+import { span } from "./tracing";
 
 interface Bucket {
   count: number;
@@ -21,6 +22,17 @@ export function isRateLimited(
   scope: string,
   limit: number,
   windowMs: number,
+): boolean {
+  return span("rate-limit", () =>
+    checkRateLimit(request, scope, limit, windowMs),
+  );
+}
+
+function checkRateLimit(
+  request: NextRequest,
+  scope: string,
+  limit: number,
+  windowMs: number,
 ): boolean {
   const now = Date.now();
   const ip = getClientIp(request);
@@ -0,0 +1,100 @@
+import { afterEach, describe, expect, it } from "vitest";
+import { RedisStandIn } from "@/test/redis-stand-in";
+import {
+  CircuitBreaker,
+  RedisUnavailableError,
+  getRedisHealth,
+  runRedis,
+  setRedisClient,
+  storeUnavailableResponse,
+} from "./redis";
+
+describe("CircuitBreaker", () => {
+  it("opens after consecutive failures and probes after the cooldown", () => {
+    let now = 0;
+    const breaker = new CircuitBreaker({
+      failureThreshold: 3,
+      baseCooldownMs: 1000,
+      now: () => now,
+    });
+
+    breaker.recordFailure();
+    breaker.recordFailure();
+    expect(breaker.allowRequest()).toBe(true);
+    breaker.recordFailure();
+
+    expect(breaker.state).toBe("open");
+    expect(breaker.allowRequest()).toBe(false);
+    expect(breaker.retryAfterMs()).toBe(1000);
+
+    now = 1000;
+    expect(breaker.allowRequest()).toBe(true);
+    expect(breaker.state).toBe("half-open");
+    // Only the probe goes through while half-open.
+    expect(breaker.allowRequest()).toBe(false);
+
+    breaker.recordSuccess();
+    expect(breaker.state).toBe("closed");
+    expect(breaker.consecutiveFailures).toBe(0);
+  });
+
+  it("doubles the cooldown while probes keep failing", () => {
+    let now = 0;
+    const breaker = new CircuitBreaker({
+      failureThreshold: 1,
+      baseCooldownMs: 1000,
+      maxCooldownMs: 3000,
+      now: () => now,
+    });
+
+    breaker.recordFailure();
+    expect(breaker.retryAfterMs()).toBe(1000);
+
+    now = 1000;
+    breaker.allowRequest();
+    breaker.recordFailure();
+    expect(breaker.retryAfterMs()).toBe(2000);
+
+    now = 3000;
+    breaker.allowRequest();
+    breaker.recordFailure();
+    expect(breaker.retryAfterMs()).toBe(3000);
+  });
+});
+
+describe("runRedis", () => {
+  afterEach(() => {
+    setRedisClient(null);
+  });
+
+  it("sheds requests once the circuit opens", async () => {
+    const redis = new RedisStandIn();
+    setRedisClient(redis);
+    redis.failing = true;
+
+    for (let attempt = 0; attempt < 5; attempt++) {
+      await expect(runRedis((r) => r.get("key"))).rejects.toBeInstanceOf(
+        RedisUnavailableError,
+      );
+    }
+    expect(redis.commands).toBe(5);
+    expect(getRedisHealth()).toMatchObject({
+      backend: "redis",
+      circuit: "open",
+      lastError: "Connection is closed.",
+    });
+
+    await expect(runRedis((r) => r.get("key"))).rejects.toBeInstanceOf(
+      RedisUnavailableError,
+    );
+    expect(redis.commands).toBe(5);
+  });
+
+  it("maps unavailability to a 503 with Retry-After", () => {
+    const response = storeUnavailableResponse(new RedisUnavailableError(2500));
+
+    expect(response?.status).toBe(503);
+    expect(response?.headers.get("Retry-After")).toBe("3");
+    expect(storeUnavailableResponse(new Error("boom"))).toBeNull();
+  });
+});
@@ -0,0 +1,239 @@
+import Redis from "ioredis";
+import { NextResponse } from "next/server";
+import { countRedisCall } from "./tracing";
+
+/**
+ * Shared Redis access for the signaling API.
+ *
+ * One auto-pipelining client is reused for the life of the process, so
+ * commands issued in the same tick (e.g. concurrent joins) go out as one
+ * write. Every command runs through `runRedis`, which feeds a circuit
+ * breaker: after repeated failures Redis is skipped entirely for a cooldown
+ * that doubles while it keeps failing, and callers get a
+ * `RedisUnavailableError` to degrade on instead of waiting on timeouts.
+ */
+
+/** The subset of the ioredis API the session store uses. */
+export type RedisClient = Pick<
+  Redis,
+  | "get"
+  | "set"
+  | "setex"
+  | "expire"
+  | "del"
+  | "hset"
+  | "hget"
+  | "hdel"
+  | "hlen"
+  | "hgetall"
+  | "rpush"
+  | "lrange"
+  | "zadd"
+  | "zcount"
+  | "zrangebyscore"
+  | "zremrangebyscore"
+>;
+
+const COMMAND_TIMEOUT_MS = 1000;
+const FAILURE_THRESHOLD = 5;
+const BASE_COOLDOWN_MS = 1000;
+const MAX_COOLDOWN_MS = 30_000;
+
+export type CircuitState = "closed" | "open" | "half-open";
+
+export class RedisUnavailableError extends Error {
+  readonly retryAfterMs: number;
+
+  constructor(retryAfterMs: number, options?: { cause?: unknown }) {
+    super("Session store temporarily unavailable", options);
+    this.name = "RedisUnavailableError";
+    this.retryAfterMs = retryAfterMs;
+  }
+}
+
+/**
+ * Closed until `failureThreshold` consecutive failures, then open for a
+ * cooldown. The first request after the cooldown is let through as a probe
+ * (half-open); success closes the circuit, failure reopens it with twice
+ * the cooldown, up to `maxCooldownMs`.
+ */
+export class CircuitBreaker {
+  private failureThreshold: number;
+  private baseCooldownMs: number;
+  private maxCooldownMs: number;
+  private now: () => number;
+  private cooldownMs: number;
+  private openUntil = 0;
+  state: CircuitState = "closed";
+  consecutiveFailures = 0;
+
+  constructor(
+    options: {
+      failureThreshold?: number;
+      baseCooldownMs?: number;
+      maxCooldownMs?: number;
+      now?: () => number;
+    } = {},
+  ) {
+    this.failureThreshold = options.failureThreshold ?? FAILURE_THRESHOLD;
+    this.baseCooldownMs = options.baseCooldownMs ?? BASE_COOLDOWN_MS;
+    this.maxCooldownMs = options.maxCooldownMs ?? MAX_COOLDOWN_MS;
+    this.now = options.now ?? Date.now;
+    this.cooldownMs = this.baseCooldownMs;
+  }
+
+  allowRequest(): boolean {
+    if (this.state === "closed") {
+      return true;
+    }
+    if (this.state === "open" && this.now() >= this.openUntil) {
+      this.state = "half-open";
+      return true;
+    }
+    return false;
+  }
+
+  retryAfterMs(): number {
+    return Math.max(0, this.openUntil - this.now());
+  }
+
+  recordSuccess(): void {
+    this.state = "closed";
+    this.consecutiveFailures = 0;
+    this.cooldownMs = this.baseCooldownMs;
+  }
+
+  recordFailure(): void {
+    this.consecutiveFailures += 1;
+
+    if (this.state === "half-open") {
+      this.cooldownMs = Math.min(this.cooldownMs * 2, this.maxCooldownMs);
+      this.open();
+    } else if (
+      this.state === "closed" &&
+      this.consecutiveFailures >= this.failureThreshold
+    ) {
+      this.open();
+    }
+  }
+
+  private open(): void {
+    this.state = "open";
+    this.openUntil = this.now() + this.cooldownMs;
+  }
+}
+
+let client: RedisClient | null = null;
+let clientResolved = false;
+let lastError: string | null = null;
+const breaker = new CircuitBreaker();
+
+function createClient(): RedisClient | null {
+  const redisUrl = process.env.REDIS_URL;
+  const useRedisInDev = process.env.ENABLE_REDIS_IN_DEV === "true";
+  const shouldUseRedis =
+    !!redisUrl && (process.env.NODE_ENV === "production" || useRedisInDev);
+
+  if (shouldUseRedis && redisUrl) {
+    try {
+      const redis = new Redis(redisUrl, {
+        enableAutoPipelining: true,
+        commandTimeout: COMMAND_TIMEOUT_MS,
+        maxRetriesPerRequest: 1,
+        // Keep reconnecting in the background; the breaker decides when
+        // requests try Redis again.
+        retryStrategy: (times) => Math.min(times * 200, MAX_COOLDOWN_MS),
+      });
+
+      redis.on("connect", () => console.log("Redis: connected"));
+      redis.on("error", (e) => console.log("Redis: error", e.message));
+
+      return redis;
+    } catch (e) {
+      console.error("Failed to connect to Redis:", e);
+      return null;
+    }
+  }
+
+  if (redisUrl && process.env.NODE_ENV !== "production" && !useRedisInDev) {
+    console.log("Redis configured but disabled in dev, using in-memory");
+  } else {
+    console.log("No Redis URL found, using in-memory");
+  }
+
+  return null;
+}
+
+/** The shared client, or null when sessions are kept in memory. */
+export function getRedis(): RedisClient | null {
+  if (!clientResolved) {
+    client = createClient();
+    clientResolved = true;
+  }
+  return client;
+}
+
+/** Swap in a client (or an in-memory stand-in) for tests and benchmarks. */
+export function setRedisClient(next: RedisClient | null): void {
+  client = next;
+  clientResolved = true;
+  lastError = null;
+  breaker.recordSuccess();
+}
+
+export async function runRedis<T>(
+  command: (redis: RedisClient) => Promise<T>,
+): Promise<T> {
+  const redis = getRedis();
+  if (!redis) {
+    throw new Error("Redis is not configured");
+  }
+  if (!breaker.allowRequest()) {
+    throw new RedisUnavailableError(breaker.retryAfterMs());
+  }
+
+  countRedisCall();
+  try {
+    const result = await command(redis);
+    breaker.recordSuccess();
+    return result;
+  } catch (error) {
+    breaker.recordFailure();
+    lastError = error instanceof Error ? error.message : String(error);
+    throw new RedisUnavailableError(breaker.retryAfterMs(), { cause: error });
+  }
+}
+
+/** A 503 with `Retry-After` when `error` means Redis is being shed. */
+export function storeUnavailableResponse(error: unknown): NextResponse | null {
+  if (!(error instanceof RedisUnavailableError)) {
+    return null;
+  }
+
+  const retryAfterSeconds = Math.max(1, Math.ceil(error.retryAfterMs / 1000));
+  return NextResponse.json(
+    { error: "Session store unavailable" },
+    { status: 503, headers: { "Retry-After": String(retryAfterSeconds) } },
+  );
+}
+
+export interface RedisHealth {
+  backend: "redis" | "memory";
+  connection: string | null;
+  circuit: CircuitState;
+  consecutiveFailures: number;
+  retryAfterMs: number;
+  lastError: string | null;
+}
+
+export function getRedisHealth(): RedisHealth {
+  const redis = getRedis();
+  return {
+    backend: redis ? "redis" : "memory",
+    connection: redis instanceof Redis ? redis.status : null,
+    circuit: breaker.state,
+    consecutiveFailures: breaker.consecutiveFailures,
+    retryAfterMs: breaker.retryAfterMs(),
+    lastError,
+  };
+}
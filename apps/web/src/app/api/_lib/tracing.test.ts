@@ -0,0 +1,93 @@
+import { beforeEach, describe, expect, it } from "vitest";
+import {
+  LatencyHistogram,
+  countRedisCall,
+  formatServerTiming,
+  getRouteMetrics,
+  resetRouteMetrics,
+  span,
+  withTracing,
+} from "./tracing";
+
+describe("LatencyHistogram", () => {
+  it("reports percentiles within bucket resolution", () => {
+    const histogram = new LatencyHistogram();
+    for (let ms = 1; ms <= 100; ms++) {
+      histogram.record(ms);
+    }
+
+    expect(histogram.count).toBe(100);
+    expect(histogram.percentile(0.5)).toBeGreaterThanOrEqual(50);
+    expect(histogram.percentile(0.5)).toBeLessThan(56);
+    expect(histogram.percentile(0.99)).toBeGreaterThanOrEqual(99);
+    expect(histogram.percentile(0.99)).toBeLessThanOrEqual(100);
+  });
+
+  it("never reports more than the slowest sample", () => {
+    const histogram = new LatencyHistogram();
+    histogram.record(3);
+
+    expect(histogram.percentile(0.5)).toBe(3);
+    expect(new LatencyHistogram().percentile(0.5)).toBe(0);
+  });
+});
+
+describe("formatServerTiming", () => {
+  it("lists spans, repeat counts and redis round trips", () => {
+    const header = formatServerTiming(
+      {
+        spans: new Map([
+          ["redis-get", { durMs: 2.34, count: 2 }],
+          ["body-parse", { durMs: 0.5, count: 1 }],
+        ]),
+        redisCalls: 3,
+      },
+      12.345,
+    );
+
+    expect(header).toBe(
+      'total;dur=12.3, redis-get;dur=2.3;desc="x2", body-parse;dur=0.5, ' +
+        'redis;desc="3 round trips"',
+    );
+  });
+});
+
+describe("withTracing", () => {
+  beforeEach(() => {
+    resetRouteMetrics();
+  });
+
+  it("passes work through untouched outside a trace", async () => {
+    expect(span("noop", () => 42)).toBe(42);
+    await expect(span("noop", async () => "done")).resolves.toBe("done");
+    expect(() => countRedisCall()).not.toThrow();
+    expect(getRouteMetrics()).toEqual([]);
+  });
+
+  it("sets Server-Timing and aggregates per-route metrics", async () => {
+    const handler = withTracing("GET /test", async (status: number) => {
+      await span("redis-get", async () => countRedisCall());
+      span("session-parse", () => JSON.parse("{}"));
+      return new Response(null, { status });
+    });
+
+    const response = await handler(200);
+    await handler(404);
+
+    const header = response.headers.get("Server-Timing") ?? "";
+    expect(header).toMatch(/^total;dur=\d+\.\d/);
+    expect(header).toContain("redis-get;dur=");
+    expect(header).toContain("session-parse;dur=");
+    expect(header).toContain('redis;desc="1 round trips"');
+
+    const [metrics] = getRouteMetrics();
+    expect(metrics.route).toBe("GET /test");
+    expect(metrics.count).toBe(2);
+    expect(metrics.redisCallsPerRequest).toBe(1);
+    expect(metrics.statusCounts).toEqual({ 200: 1, 404: 1 });
+    expect(Object.keys(metrics.spanMeanMs)).toEqual([
+      "redis-get",
+      "session-parse",
+    ]);
+  });
+});
@@ -0,0 +1,232 @@
+import { AsyncLocalStorage } from "async_hooks";
+
+/**
+ * Request tracing for the signaling API.
+ *
+ * `withTracing` runs a route handler inside a trace; `span` times a piece of
+ * work against whatever trace is current (and is a plain call outside one),
+ * and `countRedisCall` tallies store round trips. Each response gets a
+ * `Server-Timing` header and feeds a fixed-bucket latency histogram per
+ * route, so the cost per request is a few `performance.now()` calls and
+ * array increments.
+ */
+
+interface SpanTotals {
+  durMs: number;
+  count: number;
+}
+
+interface Trace {
+  spans: Map<string, SpanTotals>;
+  redisCalls: number;
+}
+
+const traces = new AsyncLocalStorage<Trace>();
+
+// Geometric buckets from 0.05ms to ~2 minutes with ~10% resolution.
+const HISTOGRAM_MIN_MS = 0.05;
+const HISTOGRAM_GROWTH = 1.1;
+const HISTOGRAM_BUCKETS = 160;
+const LOG_GROWTH = Math.log(HISTOGRAM_GROWTH);
+
+export const SLOW_REQUEST_MS = Number(process.env.TRACE_SLOW_MS) || 1000;
+
+export class LatencyHistogram {
+  private buckets = new Uint32Array(HISTOGRAM_BUCKETS);
+  count = 0;
+  sumMs = 0;
+  maxMs = 0;
+
+  record(ms: number): void {
+    const index =
+      ms <= HISTOGRAM_MIN_MS
+        ? 0
+        : Math.min(
+            HISTOGRAM_BUCKETS - 1,
+            Math.ceil(Math.log(ms / HISTOGRAM_MIN_MS) / LOG_GROWTH),
+          );
+    this.buckets[index] += 1;
+    this.count += 1;
+    this.sumMs += ms;
+    this.maxMs = Math.max(this.maxMs, ms);
+  }
+
+  /** Upper bound of the bucket holding the `p`-th percentile (0-1). */
+  percentile(p: number): number {
+    if (this.count === 0) {
+      return 0;
+    }
+
+    const rank = Math.max(1, Math.ceil(p * this.count));
+    let seen = 0;
+    for (let index = 0; index < HISTOGRAM_BUCKETS; index++) {
+      seen += this.buckets[index];
+      if (seen >= rank) {
+        return Math.min(
+          this.maxMs,
+          HISTOGRAM_MIN_MS * Math.pow(HISTOGRAM_GROWTH, index),
+        );
+      }
+    }
+    return this.maxMs;
+  }
+}
+
+interface RouteStats {
+  latency: LatencyHistogram;
+  redisCalls: number;
+  statusCounts: Record<string, number>;
+  spans: Map<string, SpanTotals>;
+}
+
+const routes = new Map<string, RouteStats>();
+
+function routeStats(route: string): RouteStats {
+  let stats = routes.get(route);
+  if (!stats) {
+    stats = {
+      latency: new LatencyHistogram(),
+      redisCalls: 0,
+      statusCounts: {},
+      spans: new Map(),
+    };
+    routes.set(route, stats);
+  }
+  return stats;
+}
+
+function addSpan(
+  spans: Map<string, SpanTotals>,
+  name: string,
+  durMs: number,
+): void {
+  const totals = spans.get(name);
+  if (totals) {
+    totals.durMs += durMs;
+    totals.count += 1;
+  } else {
+    spans.set(name, { durMs, count: 1 });
+  }
+}
+
+export function span<T>(name: string, work: () => T): T {
+  const trace = traces.getStore();
+  if (!trace) {
+    return work();
+  }
+
+  const startedAt = performance.now();
+  const finish = () =>
+    addSpan(trace.spans, name, performance.now() - startedAt);
+  const result = work();
+
+  if (result instanceof Promise) {
+    return result.finally(finish) as T;
+  }
+  finish();
+  return result;
+}
+
+export function countRedisCall(): void {
+  const trace = traces.getStore();
+  if (trace) {
+    trace.redisCalls += 1;
+  }
+}
+
+export function formatServerTiming(trace: Trace, totalMs: number): string {
+  const metrics = [`total;dur=${totalMs.toFixed(1)}`];
+  trace.spans.forEach(({ durMs, count }, name) => {
+    metrics.push(
+      count > 1
+        ? `${name};dur=${durMs.toFixed(1)};desc="x${count}"`
+        : `${name};dur=${durMs.toFixed(1)}`,
+    );
+  });
+  metrics.push(`redis;desc="${trace.redisCalls} round trips"`);
+  return metrics.join(", ");
+}
+
+export function withTracing<Args extends unknown[]>(
+  route: string,
+  handler: (...args: Args) => Promise<Response>,
+): (...args: Args) => Promise<Response> {
+  return async (...args: Args) => {
+    const trace: Trace = { spans: new Map(), redisCalls: 0 };
+    const startedAt = performance.now();
+    const response = await traces.run(trace, () => handler(...args));
+    const totalMs = performance.now() - startedAt;
+
+    const stats = routeStats(route);
+    stats.latency.record(totalMs);
+    stats.redisCalls += trace.redisCalls;
+    stats.statusCounts[response.status] =
+      (stats.statusCounts[response.status] ?? 0) + 1;
+    trace.spans.forEach(({ durMs }, name) => addSpan(stats.spans, name, durMs));
+
+    response.headers.set("Server-Timing", formatServerTiming(trace, totalMs));
+
+    if (totalMs >= SLOW_REQUEST_MS || process.env.TRACE_LOG === "true") {
+      console.log(
+        JSON.stringify({
+          msg: "trace",
+          route,
+          status: response.status,
+          durMs: Number(totalMs.toFixed(1)),
+          redisCalls: trace.redisCalls,
+          spans: Object.fromEntries(
+            Array.from(trace.spans, ([name, { durMs }]) => [
+              name,
+              Number(durMs.toFixed(1)),
+            ]),
+          ),
+        }),
+      );
+    }
+
+    return response;
+  };
+}
+
+export interface RouteMetrics {
+  route: string;
+  count: number;
+  p50Ms: number;
+  p95Ms: number;
+  p99Ms: number;
+  maxMs: number;
+  meanMs: number;
+  redisCallsPerRequest: number;
+  statusCounts: Record<string, number>;
+  spanMeanMs: Record<string, number>;
+}
+
+export function getRouteMetrics(): RouteMetrics[] {
+  return Array.from(routes, ([route, stats]) => {
+    const { latency } = stats;
+    const round = (value: number) => Number(value.toFixed(2));
+    return {
+      route,
+      count: latency.count,
+      p50Ms: round(latency.percentile(0.5)),
+      p95Ms: round(latency.percentile(0.95)),
+      p99Ms: round(latency.percentile(0.99)),
+      maxMs: round(latency.maxMs),
+      meanMs: round(latency.count ? latency.sumMs / latency.count : 0),
+      redisCallsPerRequest: round(
+        latency.count ? stats.redisCalls / latency.count : 0,
+      ),
+      statusCounts: { ...stats.statusCounts },
+      spanMeanMs: Object.fromEntries(
+        Array.from(stats.spans, ([name, { durMs, count }]) => [
+          name,
+          round(durMs / count),
+        ]),
+      ),
+    };
+  });
+}
+
+export function resetRouteMetrics(): void {
+  routes.clear();
+}
@@ -0,0 +1,53 @@
+import { NextRequest, NextResponse } from "next/server";
+import { getRoomIdCollisions, listRooms } from "../../session/store";
+import { isOperatorAuthorized } from "../../_lib/admin-auth";
+import { storeUnavailableResponse } from "../../_lib/redis";
+import { withTracing } from "../../_lib/tracing";
+
+const DEFAULT_PAGE_SIZE = 50;
+const MAX_PAGE_SIZE = 200;
+
+function readInt(value: string | null, fallback: number): number {
+  const parsed = value === null ? NaN : parseInt(value, 10);
+  return Number.isNaN(parsed) ? fallback : parsed;
+}
+
+async function handleGet(request: NextRequest) {
+  if (!isOperatorAuthorized(request, process.env.ADMIN_TOKEN)) {
+    return NextResponse.json({ error: "Unauthorized" }, { status: 401 });
+  }
+
+  try {
+    const { searchParams } = new URL(request.url);
+    const offset = Math.max(0, readInt(searchParams.get("cursor"), 0));
+    const limit = Math.min(
+      MAX_PAGE_SIZE,
+      Math.max(1, readInt(searchParams.get("limit"), DEFAULT_PAGE_SIZE)),
+    );
+
+    const { total, rooms } = await listRooms({ offset, limit });
+    const nextOffset = offset + rooms.length;
+
+    return NextResponse.json(
+      {
+        total,
+        rooms,
+        nextCursor: nextOffset < total ? String(nextOffset) : null,
+        roomIdCollisions: getRoomIdCollisions(),
+      },
+      { headers: { "Cache-Control": "no-store" } },
+    );
+  } catch (error) {
+    const unavailable = storeUnavailableResponse(error);
+    if (unavailable) {
+      return unavailable;
+    }
+    console.error("Room list error:", error);
+    return NextResponse.json(
+      { error: "Failed to list rooms" },
+      { status: 500 },
+    );
+  }
+}
+
+export const GET = withTracing("GET /api/admin/rooms", handleGet);
@@ -0,0 +1,15 @@
+import { NextRequest, NextResponse } from "next/server";
+import { isOperatorAuthorized } from "../_lib/admin-auth";
+import { getRedisHealth } from "../_lib/redis";
+import { getRouteMetrics } from "../_lib/tracing";
+
+export async function GET(request: NextRequest) {
+  if (!isOperatorAuthorized(request, process.env.METRICS_TOKEN)) {
+    return NextResponse.json({ error: "Unauthorized" }, { status: 401 });
+  }
+
+  return NextResponse.json(
+    { store: getRedisHealth(), routes: getRouteMetrics() },
+    { headers: { "Cache-Control": "no-store" } },
+  );
+}
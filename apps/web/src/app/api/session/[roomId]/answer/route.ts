@@ -1,15 +1,17 @@
 import { NextRequest, NextResponse } from "next/server";
 import { getSession, setPlayerAnswer, getPlayer } from "../../store";
+import { storeUnavailableResponse } from "../../../_lib/redis";
 import { isRateLimited } from "../../../_lib/rate-limit";
+import { span, withTracing } from "../../../_lib/tracing";
 
 interface RouteParams {
   params: Promise<{ roomId: string }>;
 }
 
-export async function POST(request: NextRequest, { params }: RouteParams) {
+async function handlePost(request: NextRequest, { params }: RouteParams) {
   try {
     const { roomId } = await params;
-    const body = await request.json();
+    const body = await span("body-parse", () => request.json());
     const { playerId, answer, hostToken } = body;
 
     if (
@@ -47,6 +49,10 @@ export async function POST(request: NextRequest, { params }: RouteParams) {
 
     return NextResponse.json({ success: true });
   } catch (error) {
+    const unavailable = storeUnavailableResponse(error);
+    if (unavailable) {
+      return unavailable;
+    }
     console.error("Answer error:", error);
     return NextResponse.json(
       { error: "Failed to set answer" },
@@ -55,48 +61,76 @@ export async function POST(request: NextRequest, { params }: RouteParams) {
   }
 }
 
-export async function GET(request: NextRequest, { params }: RouteParams) {
-  const { roomId } = await params;
-  const { searchParams } = new URL(request.url);
-  const playerId = searchParams.get("playerId");
-  const playerToken = searchParams.get("playerToken");
-
-  if (
-    isRateLimited(
-      request,
-      `session:answer:get:${roomId}:${playerId || "none"}`,
-      240,
-      60_000,
-    )
-  ) {
-    return NextResponse.json({ error: "Too many requests" }, { status: 429 });
-  }
+async function handleGet(request: NextRequest, { params }: RouteParams) {
+  try {
+    const { roomId } = await params;
+    const { searchParams } = new URL(request.url);
+    const playerId = searchParams.get("playerId");
+    const playerToken = searchParams.get("playerToken");
 
-  if (!roomId) {
-    return NextResponse.json({ error: "roomId is required" }, { status: 400 });
-  }
+    if (
+      isRateLimited(
+        request,
+        `session:answer:get:${roomId}:${playerId || "none"}`,
+        240,
+        60_000,
+      )
+    ) {
+      return NextResponse.json({ error: "Too many requests" }, { status: 429 });
+    }
 
-  const session = await getSession(roomId);
+    if (!roomId) {
+      return NextResponse.json(
+        { error: "roomId is required" },
+        { status: 400 },
+      );
+    }
 
-  if (!session) {
-    return NextResponse.json({ error: "Session not found" }, { status: 404 });
-  }
+    const session = await getSession(roomId);
 
-  if (playerId) {
-    const player = await getPlayer(roomId, playerId);
-    if (!player) {
-      return NextResponse.json({ error: "Player not found" }, { status: 404 });
+    if (!session) {
+      return NextResponse.json({ error: "Session not found" }, { status: 404 });
     }
 
-    if (playerToken !== player.playerToken) {
-      return NextResponse.json(
-        { error: "Invalid player token" },
-        { status: 403 },
-      );
+    if (playerId) {
+      const player = await getPlayer(roomId, playerId);
+      if (!player) {
+        return NextResponse.json(
+          { error: "Player not found" },
+          { status: 404 },
+        );
+      }
+
+      if (playerToken !== player.playerToken) {
+        return NextResponse.json(
+          { error: "Invalid player token" },
+          { status: 403 },
+        );
+      }
+
+      return NextResponse.json({ answer: player.answer });
     }
 
-    return NextResponse.json({ answer: player.answer });
+    return NextResponse.json(
+      { error: "playerId is required" },
+      { status: 400 },
+    );
+  } catch (error) {
+    const unavailable = storeUnavailableResponse(error);
+    if (unavailable) {
+      return unavailable;
+    }
+    console.error("Answer lookup error:", error);
+    return NextResponse.json(
+      { error: "Failed to load answer" },
+      { status: 500 },
+    );
   }
-
-  return NextResponse.json({ error: "playerId is required" }, { status: 400 });
 }
+
+export const POST = withTracing(
+  "POST /api/session/[roomId]/answer",
+  handlePost,
+);
+
+export const GET = withTracing("GET /api/session/[roomId]/answer", handleGet);
@@ -1,15 +1,22 @@
 import { NextRequest, NextResponse } from "next/server";
-import { getSession, addCandidate, getPlayer } from "../../store";
+import {
+  getSession,
+  addCandidate,
+  getPlayer,
+  getPlayerToken,
+} from "../../store";
+import { storeUnavailableResponse } from "../../../_lib/redis";
 import { isRateLimited } from "../../../_lib/rate-limit";
+import { span, withTracing } from "../../../_lib/tracing";
 
 interface RouteParams {
   params: Promise<{ roomId: string }>;
 }
 
-export async function POST(request: NextRequest, { params }: RouteParams) {
+async function handlePost(request: NextRequest, { params }: RouteParams) {
   try {
     const { roomId } = await params;
-    const body = await request.json();
+    const body = await span("body-parse", () => request.json());
     const { playerId, playerToken, candidate, hostToken } = body;
 
     if (
@@ -44,8 +51,10 @@ export async function POST(request: NextRequest, { params }: RouteParams) {
         );
       }
     } else {
-      const player = await getPlayer(roomId, playerId);
-      if (!player || player.playerToken !== playerToken) {
+      // From the store, not the cache: candidates are sent right after the
+      // offer and are never retried.
+      const expectedToken = await getPlayerToken(roomId, playerId);
+      if (!expectedToken || expectedToken !== playerToken) {
         return NextResponse.json(
           { error: "Invalid player token" },
           { status: 403 },
@@ -57,6 +66,10 @@ export async function POST(request: NextRequest, { params }: RouteParams) {
 
     return NextResponse.json({ success: true });
   } catch (error) {
+    const unavailable = storeUnavailableResponse(error);
+    if (unavailable) {
+      return unavailable;
+    }
     console.error("Candidate error:", error);
     return NextResponse.json(
       { error: "Failed to add candidate" },
@@ -65,69 +78,97 @@ export async function POST(request: NextRequest, { params }: RouteParams) {
   }
 }
 
-export async function GET(request: NextRequest, { params }: RouteParams) {
-  const { roomId } = await params;
-  const { searchParams } = new URL(request.url);
-  const playerId = searchParams.get("playerId");
-  const playerToken = searchParams.get("playerToken");
-  const hostToken = searchParams.get("hostToken");
-  const afterIndex = searchParams.get("afterIndex");
-
-  if (
-    isRateLimited(
-      request,
-      `session:candidate:get:${roomId}:${playerId || hostToken || "none"}`,
-      240,
-      60_000,
-    )
-  ) {
-    return NextResponse.json({ error: "Too many requests" }, { status: 429 });
-  }
-
-  if (!roomId) {
-    return NextResponse.json({ error: "roomId is required" }, { status: 400 });
-  }
-
-  const session = await getSession(roomId);
-
-  if (!session) {
-    return NextResponse.json({ error: "Session not found" }, { status: 404 });
-  }
+async function handleGet(request: NextRequest, { params }: RouteParams) {
+  try {
+    const { roomId } = await params;
+    const { searchParams } = new URL(request.url);
+    const playerId = searchParams.get("playerId");
+    const playerToken = searchParams.get("playerToken");
+    const hostToken = searchParams.get("hostToken");
+    const afterIndex = searchParams.get("afterIndex");
 
-  if (playerId) {
-    const player = await getPlayer(roomId, playerId);
-    if (!player) {
-      return NextResponse.json({ error: "Player not found" }, { status: 404 });
+    if (
+      isRateLimited(
+        request,
+        `session:candidate:get:${roomId}:${playerId || hostToken || "none"}`,
+        240,
+        60_000,
+      )
+    ) {
+      return NextResponse.json({ error: "Too many requests" }, { status: 429 });
     }
 
-    if (playerToken !== player.playerToken) {
+    if (!roomId) {
       return NextResponse.json(
-        { error: "Invalid player token" },
-        { status: 403 },
+        { error: "roomId is required" },
+        { status: 400 },
       );
     }
 
-    let candidates = player.candidates;
-    if (afterIndex !== null) {
-      const idx = parseInt(afterIndex, 10);
-      if (!isNaN(idx)) {
-        candidates = candidates.slice(idx);
+    const session = await getSession(roomId);
+
+    if (!session) {
+      return NextResponse.json({ error: "Session not found" }, { status: 404 });
+    }
+
+    if (playerId) {
+      const player = await getPlayer(roomId, playerId);
+      if (!player) {
+        return NextResponse.json(
+          { error: "Player not found" },
+          { status: 404 },
+        );
+      }
+
+      if (playerToken !== player.playerToken) {
+        return NextResponse.json(
+          { error: "Invalid player token" },
+          { status: 403 },
+        );
       }
+
+      let candidates = player.candidates;
+      if (afterIndex !== null) {
+        const idx = parseInt(afterIndex, 10);
+        if (!isNaN(idx)) {
+          candidates = candidates.slice(idx);
+        }
+      }
+
+      return NextResponse.json({ candidates });
     }
 
-    return NextResponse.json({ candidates });
-  }
+    if (hostToken === session.hostToken) {
+      const allCandidates: Record<string, RTCIceCandidateInit[]> = {};
+      session.players.forEach((player, pid) => {
+        allCandidates[pid] = player.candidates;
+      });
+      return NextResponse.json({ candidatesByPlayer: allCandidates });
+    }
 
-  if (hostToken === session.hostToken) {
-    const allCandidates: Record<string, RTCIceCandidateInit[]> = {};
-    session.players.forEach((player, pid) => {
-      allCandidates[pid] = player.candidates;
-    });
-    return NextResponse.json({ candidatesByPlayer: allCandidates });
+    return NextResponse.json(
+      { error: "playerId or hostToken required" },
+      { status: 400 },
+    );
+  } catch (error) {
+    const unavailable = storeUnavailableResponse(error);
+    if (unavailable) {
+      return unavailable;
+    }
+    console.error("Candidate lookup error:", error);
+    return NextResponse.json(
+      { error: "Failed to load candidates" },
+      { status: 500 },
+    );
   }
-
-  return NextResponse.json(
-    { error: "playerId or hostToken required" },
-    { status: 400 },
-  );
 }
+
+export const POST = withTracing(
+  "POST /api/session/[roomId]/candidate",
+  handlePost,
+);
+
+export const GET = withTracing(
+  "GET /api/session/[roomId]/candidate",
+  handleGet,
+);
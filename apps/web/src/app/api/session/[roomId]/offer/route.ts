@@ -4,17 +4,20 @@ import {
   setPlayerOffer,
   getPlayerList,
   getPlayer,
+  getPlayerToken,
 } from "../../store";
+import { storeUnavailableResponse } from "../../../_lib/redis";
 import { isRateLimited } from "../../../_lib/rate-limit";
+import { span, withTracing } from "../../../_lib/tracing";
 
 interface RouteParams {
   params: Promise<{ roomId: string }>;
 }
 
-export async function POST(request: NextRequest, { params }: RouteParams) {
+async function handlePost(request: NextRequest, { params }: RouteParams) {
   try {
     const { roomId } = await params;
-    const body = await request.json();
+    const body = await span("body-parse", () => request.json());
     const { playerId, playerToken, nickname, offer, hostToken } = body;
 
     if (
@@ -49,12 +52,10 @@ export async function POST(request: NextRequest, { params }: RouteParams) {
     }
 
     const actualPlayerId = playerId || crypto.randomUUID();
-    const existingPlayer = await getPlayer(roomId, actualPlayerId);
-    if (
-      existingPlayer &&
-      !hostToken &&
-      playerToken !== existingPlayer.playerToken
-    ) {
+    // From the store, not the cache, so a re-offer is always checked
+    // against the token the player was issued.
+    const existingToken = await getPlayerToken(roomId, actualPlayerId);
+    if (existingToken && !hostToken && playerToken !== existingToken) {
       return NextResponse.json(
         { error: "Invalid player token" },
         { status: 403 },
@@ -74,61 +75,93 @@ export async function POST(request: NextRequest, { params }: RouteParams) {
       playerToken: newPlayerToken,
     });
   } catch (error) {
+    const unavailable = storeUnavailableResponse(error);
+    if (unavailable) {
+      return unavailable;
+    }
     console.error("Offer error:", error);
     return NextResponse.json({ error: "Failed to set offer" }, { status: 500 });
   }
 }
 
-export async function GET(request: NextRequest, { params }: RouteParams) {
-  const { roomId } = await params;
-  const { searchParams } = new URL(request.url);
-  const playerId = searchParams.get("playerId");
-  const playerToken = searchParams.get("playerToken");
-  const hostToken = searchParams.get("hostToken");
-
-  const scopeSuffix = playerId || hostToken || "list";
-  if (
-    isRateLimited(
-      request,
-      `session:offer:get:${roomId}:${scopeSuffix}`,
-      600,
-      60_000,
-    )
-  ) {
-    return NextResponse.json({ error: "Too many requests" }, { status: 429 });
-  }
-
-  if (!roomId) {
-    return NextResponse.json({ error: "roomId is required" }, { status: 400 });
-  }
+async function handleGet(request: NextRequest, { params }: RouteParams) {
+  try {
+    const { roomId } = await params;
+    const { searchParams } = new URL(request.url);
+    const playerId = searchParams.get("playerId");
+    const playerToken = searchParams.get("playerToken");
+    const hostToken = searchParams.get("hostToken");
 
-  const session = await getSession(roomId);
+    const scopeSuffix = playerId || hostToken || "list";
+    if (
+      isRateLimited(
+        request,
+        `session:offer:get:${roomId}:${scopeSuffix}`,
+        600,
+        60_000,
+      )
+    ) {
+      return NextResponse.json({ error: "Too many requests" }, { status: 429 });
+    }
 
-  if (!session) {
-    return NextResponse.json({ error: "Session not found" }, { status: 404 });
-  }
+    if (!roomId) {
+      return NextResponse.json(
+        { error: "roomId is required" },
+        { status: 400 },
+      );
+    }
 
-  if (hostToken && hostToken !== session.hostToken) {
-    return NextResponse.json({ error: "Invalid host token" }, { status: 403 });
-  }
+    const session = await getSession(roomId);
 
-  if (playerId) {
-    const player = await getPlayer(roomId, playerId);
-    if (!player) {
-      return NextResponse.json({ error: "Player not found" }, { status: 404 });
+    if (!session) {
+      return NextResponse.json({ error: "Session not found" }, { status: 404 });
     }
 
-    if (hostToken !== session.hostToken && playerToken !== player.playerToken) {
+    if (hostToken && hostToken !== session.hostToken) {
       return NextResponse.json(
-        { error: "Invalid player token" },
+        { error: "Invalid host token" },
         { status: 403 },
       );
     }
 
-    return NextResponse.json({ offer: player.offer });
-  }
+    if (playerId) {
+      const player = await getPlayer(roomId, playerId);
+      if (!player) {
+        return NextResponse.json(
+          { error: "Player not found" },
+          { status: 404 },
+        );
+      }
+
+      if (
+        hostToken !== session.hostToken &&
+        playerToken !== player.playerToken
+      ) {
+        return NextResponse.json(
+          { error: "Invalid player token" },
+          { status: 403 },
+        );
+      }
+
+      return NextResponse.json({ offer: player.offer });
+    }
 
-  const playerList = await getPlayerList(roomId);
+    const playerList = await getPlayerList(roomId);
 
-  return NextResponse.json({ players: playerList });
+    return NextResponse.json({ players: playerList });
+  } catch (error) {
+    const unavailable = storeUnavailableResponse(error);
+    if (unavailable) {
+      return unavailable;
+    }
+    console.error("Offer lookup error:", error);
+    return NextResponse.json(
+      { error: "Failed to load offer" },
+      { status: 500 },
+    );
+  }
 }
+
+export const POST = withTracing("POST /api/session/[roomId]/offer", handlePost);
+
+export const GET = withTracing("GET /api/session/[roomId]/offer", handleGet);
@@ -1,8 +1,10 @@
 import { NextRequest, NextResponse } from "next/server";
 import { createSession, getSession, getPlayerList } from "../store";
+import { storeUnavailableResponse } from "../../_lib/redis";
 import { isRateLimited } from "../../_lib/rate-limit";
+import { withTracing } from "../../_lib/tracing";
 
-export async function POST(request: NextRequest) {
+async function handlePost(request: NextRequest) {
   try {
     if (isRateLimited(request, "session:create", 30, 60_000)) {
       return NextResponse.json({ error: "Too many requests" }, { status: 429 });
@@ -12,6 +14,10 @@ export async function POST(request: NextRequest) {
 
     return NextResponse.json({ roomId, hostToken });
   } catch (error) {
+    const unavailable = storeUnavailableResponse(error);
+    if (unavailable) {
+      return unavailable;
+    }
     console.error("Session create error:", error);
     return NextResponse.json(
       { error: "Failed to create session" },
@@ -20,24 +26,43 @@ export async function POST(request: NextRequest) {
   }
 }
 
-export async function GET(request: NextRequest) {
-  const { searchParams } = new URL(request.url);
-  const roomId = searchParams.get("roomId");
+async function handleGet(request: NextRequest) {
+  try {
+    const { searchParams } = new URL(request.url);
+    const roomId = searchParams.get("roomId");
 
-  if (!roomId) {
-    return NextResponse.json({ error: "roomId is required" }, { status: 400 });
-  }
+    if (!roomId) {
+      return NextResponse.json(
+        { error: "roomId is required" },
+        { status: 400 },
+      );
+    }
 
-  const session = await getSession(roomId);
+    const session = await getSession(roomId);
 
-  if (!session) {
-    return NextResponse.json({ error: "Session not found" }, { status: 404 });
-  }
+    if (!session) {
+      return NextResponse.json({ error: "Session not found" }, { status: 404 });
+    }
 
-  const playerList = await getPlayerList(roomId);
+    const playerList = await getPlayerList(roomId);
 
-  return NextResponse.json({
-    roomId: session.roomId,
-    players: playerList,
-  });
+    return NextResponse.json({
+      roomId: session.roomId,
+      players: playerList,
+    });
+  } catch (error) {
+    const unavailable = storeUnavailableResponse(error);
+    if (unavailable) {
+      return unavailable;
+    }
+    console.error("Session lookup error:", error);
+    return NextResponse.json(
+      { error: "Failed to load session" },
+      { status: 500 },
+    );
+  }
 }
+
+export const POST = withTracing("POST /api/session/create", handlePost);
+
+export const GET = withTracing("GET /api/session/create", handleGet);
@@ -0,0 +1,58 @@
+import { describe, expect, it } from "vitest";
+import {
+  MemoryRoomIndex,
+  parseSummaryHash,
+  summaryToHash,
+  type RoomSummary,
+} from "./room-index";
+
+function summary(roomId: string, expiresAt: number, playerCount = 0) {
+  return { roomId, createdAt: 0, updatedAt: 0, expiresAt, playerCount };
+}
+
+describe("MemoryRoomIndex", () => {
+  it("lists live rooms by expiry and pages through them", () => {
+    const index = new MemoryRoomIndex();
+    index.upsert(summary("CCCCCC", 300));
+    index.upsert(summary("AAAAAA", 100));
+    index.upsert(summary("BBBBBB", 200));
+
+    const page = index.list(150, 0, 1);
+    expect(page.total).toBe(2);
+    expect(page.rooms.map((room) => room.roomId)).toEqual(["BBBBBB"]);
+    expect(index.list(150, 1, 1).rooms[0].roomId).toBe("CCCCCC");
+  });
+
+  it("moves a room when it is saved again", () => {
+    const index = new MemoryRoomIndex();
+    index.upsert(summary("AAAAAA", 100));
+    index.upsert(summary("BBBBBB", 200));
+    index.upsert(summary("AAAAAA", 300, 4));
+
+    expect(index.list(0, 0, 10).rooms.map((room) => room.roomId)).toEqual([
+      "BBBBBB",
+      "AAAAAA",
+    ]);
+    expect(index.get("AAAAAA", 0)?.playerCount).toBe(4);
+    expect(index.size).toBe(2);
+  });
+
+  it("prunes expired rooms", () => {
+    const index = new MemoryRoomIndex();
+    index.upsert(summary("AAAAAA", 100));
+    index.upsert(summary("BBBBBB", 200));
+
+    expect(index.get("AAAAAA", 100)).toBeUndefined();
+    expect(index.prune(100)).toEqual(["AAAAAA"]);
+    expect(index.size).toBe(1);
+  });
+});
+
+describe("room summary hashes", () => {
+  it("round-trips through Redis hash fields", () => {
+    const room: RoomSummary = summary("AAAAAA", 1234, 7);
+
+    expect(parseSummaryHash(summaryToHash(room))).toEqual(room);
+    expect(parseSummaryHash({})).toBeNull();
+  });
+});
@@ -0,0 +1,133 @@
+/**
+ * Directory of live rooms. In Redis it is a sorted set of room ids scored
+ * by expiry (`rooms:index`) plus a small summary hash per room
+ * (`room:<roomId>`), both refreshed whenever the session is saved, so
+ * listing or counting live rooms is a range query instead of a key scan.
+ * `MemoryRoomIndex` keeps the same shape for the in-memory store.
+ */
+
+export const ROOM_INDEX_KEY = "rooms:index";
+
+export function roomSummaryKey(roomId: string): string {
+  return `room:${roomId}`;
+}
+
+export interface RoomSummary {
+  roomId: string;
+  createdAt: number;
+  updatedAt: number;
+  expiresAt: number;
+  playerCount: number;
+}
+
+export interface RoomPage {
+  total: number;
+  rooms: RoomSummary[];
+}
+
+export function summaryToHash(summary: RoomSummary): Record<string, string> {
+  return {
+    roomId: summary.roomId,
+    createdAt: String(summary.createdAt),
+    updatedAt: String(summary.updatedAt),
+    expiresAt: String(summary.expiresAt),
+    playerCount: String(summary.playerCount),
+  };
+}
+
+export function parseSummaryHash(
+  hash: Record<string, string>,
+): RoomSummary | null {
+  if (!hash.roomId) {
+    return null;
+  }
+  return {
+    roomId: hash.roomId,
+    createdAt: Number(hash.createdAt) || 0,
+    updatedAt: Number(hash.updatedAt) || 0,
+    expiresAt: Number(hash.expiresAt) || 0,
+    playerCount: Number(hash.playerCount) || 0,
+  };
+}
+
+/**
+ * Summaries ordered by `(expiresAt, roomId)`, so expired rooms sit at the
+ * front and a page of live rooms is found by binary search.
+ */
+export class MemoryRoomIndex {
+  private order: RoomSummary[] = [];
+  private byId: Map<string, RoomSummary> = new Map();
+
+  get size(): number {
+    return this.byId.size;
+  }
+
+  get(roomId: string, now: number): RoomSummary | undefined {
+    const summary = this.byId.get(roomId);
+    return summary && summary.expiresAt > now ? summary : undefined;
+  }
+
+  upsert(summary: RoomSummary): void {
+    this.remove(summary.roomId);
+    this.order.splice(this.position(summary), 0, summary);
+    this.byId.set(summary.roomId, summary);
+  }
+
+  remove(roomId: string): void {
+    const existing = this.byId.get(roomId);
+    if (!existing) {
+      return;
+    }
+    this.order.splice(this.position(existing), 1);
+    this.byId.delete(roomId);
+  }
+
+  /** Drops rooms that expired at or before `now` and returns their ids. */
+  prune(now: number): string[] {
+    const live = this.firstLive(now);
+    const expired = this.order.splice(0, live);
+    expired.forEach((summary) => this.byId.delete(summary.roomId));
+    return expired.map((summary) => summary.roomId);
+  }
+
+  list(now: number, offset: number, limit: number): RoomPage {
+    const live = this.firstLive(now);
+    return {
+      total: this.order.length - live,
+      rooms: this.order.slice(live + offset, live + offset + limit),
+    };
+  }
+
+  private firstLive(now: number): number {
+    let low = 0;
+    let high = this.order.length;
+    while (low < high) {
+      const mid = (low + high) >> 1;
+      if (this.order[mid].expiresAt <= now) {
+        low = mid + 1;
+      } else {
+        high = mid;
+      }
+    }
+    return low;
+  }
+
+  private position(summary: RoomSummary): number {
+    let low = 0;
+    let high = this.order.length;
+    while (low < high) {
+      const mid = (low + high) >> 1;
+      const entry = this.order[mid];
+      if (
+        entry.expiresAt < summary.expiresAt ||
+        (entry.expiresAt === summary.expiresAt &&
+          entry.roomId < summary.roomId)
+      ) {
+        low = mid + 1;
+      } else {
+        high = mid;
+      }
+    }
+    return low;
+  }
+}
@@ -0,0 +1,105 @@
+import { bench, describe, vi } from "vitest";
+import { RedisStandIn } from "@/test/redis-stand-in";
+import type { Session } from "./store";
+
+const JOINING_PLAYERS = [10, 100];
+const REDIS_LATENCY_MS = 1;
+
+// The cache TTL is read when the store module loads, so each variant gets
+// its own module instance wired to its own stand-in.
+async function loadStore(cacheTtlMs: number) {
+  vi.resetModules();
+  process.env.SESSION_CACHE_TTL_MS = String(cacheTtlMs);
+  const { setRedisClient } = await import("../_lib/redis");
+  const store = await import("./store");
+  setRedisClient(new RedisStandIn({ latencyMs: REDIS_LATENCY_MS }));
+  return store;
+}
+
+const uncached = await loadStore(0);
+const cached = await loadStore(250);
+
+type Store = typeof uncached;
+
+// Mirrors the offer route (session check, player lookup, write) for every
+// player at once, with the host polling the player list alongside, then
+// checks every player made it into a fresh read.
+async function concurrentJoins(store: Store, players: number) {
+  const { roomId } = await store.createSession();
+
+  await Promise.all(
+    Array.from({ length: players }, async (_, index) => {
+      const playerId = `player-${index}`;
+      await store.getSession(roomId);
+      await store.getPlayer(roomId, playerId);
+      await store.setPlayerOffer(roomId, playerId, `Player ${index}`, {
+        type: "offer",
+        sdp: "v=0",
+      });
+      await store.getPlayerList(roomId);
+    }),
+  );
+
+  // A join lost to a concurrent write would only show up here.
+  store.clearSessionCache();
+  const joined = (await store.getPlayerList(roomId)).length;
+  if (joined !== players) {
+    throw new Error(`${players - joined} of ${players} joins were lost`);
+  }
+}
+
+for (const players of JOINING_PLAYERS) {
+  describe(`${players} concurrent joins (${REDIS_LATENCY_MS}ms Redis)`, () => {
+    bench("no local cache", () => concurrentJoins(uncached, players));
+    bench("local cache + shared reads", () =>
+      concurrentJoins(cached, players),
+    );
+  });
+}
+
+const ROOM_SIZES = [10, 100, 1000];
+
+// A player entry after a full join: offer, answer and a few candidates.
+function makeSession(players: number): Session {
+  const sdp = "v=0\r\n" + "a=ice-options:trickle\r\n".repeat(24);
+  const session: Session = {
+    roomId: "BENCH1",
+    hostToken: "host-token",
+    createdAt: Date.now(),
+    players: new Map(),
+  };
+
+  for (let index = 0; index < players; index++) {
+    const playerId = `player-${index}`;
+    session.players.set(playerId, {
+      playerId,
+      playerToken: `token-${index}`,
+      nickname: `Player ${index}`,
+      offer: { type: "offer", sdp },
+      answer: { type: "answer", sdp },
+      candidates: Array.from({ length: 4 }, (_, k) => ({
+        candidate:
+          `candidate:${k} 1 udp 2122260223 10.0.0.${k} ` +
+          `5${k}000 typ host generation 0`,
+        sdpMid: "0",
+        sdpMLineIndex: 0,
+      })),
+      createdAt: Date.now(),
+    });
+  }
+  return session;
+}
+
+for (const players of ROOM_SIZES) {
+  const session = makeSession(players);
+  const serialized = uncached.serializeSession(session);
+
+  describe(`session codec (${players} players)`, () => {
+    bench("serializeSession", () => {
+      uncached.serializeSession(session);
+    });
+    bench("deserializeSession", () => {
+      uncached.deserializeSession(serialized);
+    });
+  });
+}
@@ -1,5 +1,19 @@
-import { describe, expect, it } from "vitest";
-import { createSession, getPlayerList, setPlayerOffer } from "./store";
+import { afterEach, beforeEach, describe, expect, it, vi } from "vitest";
+import { RedisStandIn } from "@/test/redis-stand-in";
+import { RedisUnavailableError, setRedisClient } from "../_lib/redis";
+import {
+  clearSessionCache,
+  createSession,
+  addCandidate,
+  getPlayer,
+  getPlayerList,
+  getPlayerToken,
+  getRoomIdCollisions,
+  getSession,
+  listRooms,
+  setPlayerAnswer,
+  setPlayerOffer,
+} from "./store";
 
 describe("session store metadata", () => {
   it("persists nickname on player offer", async () => {
@@ -17,4 +31,216 @@ describe("session store metadata", () => {
     expect(players[0].nickname).toBe("Alice");
     expect(players[0].hasOffer).toBe(true);
   });
+
+  it("starts a fresh negotiation when a player re-offers", async () => {
+    const { roomId } = await createSession();
+    await setPlayerOffer(roomId, "player-1", "Alice", {
+      type: "offer",
+      sdp: "first-offer",
+    });
+    await setPlayerAnswer(roomId, "player-1", {
+      type: "answer",
+      sdp: "first-answer",
+    });
+    await addCandidate(roomId, "player-1", { candidate: "candidate:1" });
+    const [{ offeredAt: firstOfferedAt }] = await getPlayerList(roomId);
+
+    vi.spyOn(Date, "now").mockReturnValue((firstOfferedAt ?? 0) + 1000);
+    await setPlayerOffer(roomId, "player-1", "Alice", {
+      type: "offer",
+      sdp: "second-offer",
+    });
+    vi.restoreAllMocks();
+
+    const player = await getPlayer(roomId, "player-1");
+    expect(player?.answer).toBeUndefined();
+    expect(player?.candidates).toEqual([]);
+    expect(player?.offeredAt).toBe((firstOfferedAt ?? 0) + 1000);
+  });
+});
+
+describe("room allocation", () => {
+  afterEach(() => {
+    vi.restoreAllMocks();
+  });
+
+  it("picks another code when the generated one is taken", async () => {
+    // 32 draws for the host token and 6 for the room code per attempt: the
+    // second room's first code repeats the first room's.
+    let draws = 0;
+    vi.spyOn(Math, "random").mockImplementation(() =>
+      draws++ < 76 ? 0 : 0.5,
+    );
+    const collisions = getRoomIdCollisions();
+
+    const first = await createSession();
+    const second = await createSession();
+
+    expect(first.roomId).toBe("AAAAAA");
+    expect(second.roomId).not.toBe(first.roomId);
+    expect(getRoomIdCollisions()).toBe(collisions + 1);
+  });
+
+  it("lists live rooms with player counts", async () => {
+    const { roomId } = await createSession();
+    await setPlayerOffer(roomId, "player-1", "Alice", {
+      type: "offer",
+      sdp: "test-offer",
+    });
+
+    const { total, rooms } = await listRooms({ limit: 200 });
+    const room = rooms.find((summary) => summary.roomId === roomId);
+
+    expect(total).toBeGreaterThanOrEqual(1);
+    expect(room?.playerCount).toBe(1);
+    expect(room?.expiresAt).toBeGreaterThan(Date.now());
+  });
+});
+
+describe("redis-backed session store", () => {
+  let redis: RedisStandIn;
+
+  beforeEach(() => {
+    redis = new RedisStandIn({ latencyMs: 1 });
+    setRedisClient(redis);
+    clearSessionCache();
+  });
+
+  afterEach(() => {
+    setRedisClient(null);
+    clearSessionCache();
+  });
+
+  it("shares one round trip between concurrent reads", async () => {
+    const { roomId } = await createSession();
+    clearSessionCache();
+    redis.commands = 0;
+
+    const sessions = await Promise.all([
+      getSession(roomId),
+      getSession(roomId),
+      getPlayerList(roomId),
+    ]);
+
+    expect(sessions[0]?.roomId).toBe(roomId);
+    expect(sessions[1]).toBe(sessions[0]);
+    // One batch: the header, player and answer hashes.
+    expect(redis.commands).toBe(3);
+  });
+
+  it("writes only the joining player's field", async () => {
+    const { roomId } = await createSession();
+    redis.commands = 0;
+
+    await setPlayerOffer(roomId, "player-1", "Alice", {
+      type: "offer",
+      sdp: "test-offer",
+    });
+
+    // GET, HGET and HLEN even though the session is cached, then the
+    // player's HSET, three EXPIREs and the index entry (HSET, EXPIRE, ZADD)
+    // in one pipelined batch.
+    expect(redis.commands).toBe(10);
+    expect(await getPlayerList(roomId)).toHaveLength(1);
+  });
+
+  it("keeps every player and candidate when they arrive at once", async () => {
+    const { roomId } = await createSession();
+    const playerIds = Array.from({ length: 20 }, (_, index) => `p${index}`);
+
+    await Promise.all(
+      playerIds.map((playerId) =>
+        setPlayerOffer(roomId, playerId, playerId, {
+          type: "offer",
+          sdp: `offer-${playerId}`,
+        }),
+      ),
+    );
+    await Promise.all(
+      playerIds.flatMap((playerId) => [
+        setPlayerAnswer(roomId, playerId, {
+          type: "answer",
+          sdp: `answer-${playerId}`,
+        }),
+        addCandidate(roomId, playerId, { candidate: `${playerId}:1` }),
+        addCandidate(roomId, playerId, { candidate: `${playerId}:2` }),
+      ]),
+    );
+
+    const session = await getSession(roomId, { fresh: true });
+    expect(session?.players.size).toBe(playerIds.length);
+    session?.players.forEach((player, playerId) => {
+      expect(player.answer?.sdp).toBe(`answer-${playerId}`);
+      expect(player.candidates.map((c) => c.candidate).sort()).toEqual([
+        `${playerId}:1`,
+        `${playerId}:2`,
+      ]);
+    });
+  });
+
+  it("does not cache or share a read that a write overtook", async () => {
+    const { roomId } = await createSession();
+    clearSessionCache();
+
+    redis.latencyMs = 30;
+    const slowRead = getSession(roomId);
+    redis.latencyMs = 1;
+    await setPlayerOffer(roomId, "player-1", "Alice", {
+      type: "offer",
+      sdp: "test-offer",
+    });
+
+    // The slow read is still in flight, but a read after the write must
+    // not join it.
+    expect(await getPlayerList(roomId)).toHaveLength(1);
+    expect((await slowRead)?.players.size).toBe(0);
+    expect(await getPlayerList(roomId)).toHaveLength(1);
+  });
+
+  it("checks player tokens against the store, not the cache", async () => {
+    const { roomId } = await createSession();
+    await getSession(roomId);
+
+    // Another instance takes the join while this one has the room cached.
+    await redis.hset(`session:${roomId}:players`, {
+      "player-1": JSON.stringify({ playerToken: "token-1", createdAt: 1 }),
+    });
+
+    expect(await getPlayer(roomId, "player-1")).toBeUndefined();
+    expect(await getPlayerToken(roomId, "player-1")).toBe("token-1");
+    expect(await getPlayerToken(roomId, "player-2")).toBeUndefined();
+  });
+
+  it("serves a cached copy during an outage but rejects writes", async () => {
+    const { roomId } = await createSession();
+    redis.failing = true;
+
+    await new Promise((resolve) => setTimeout(resolve, 300));
+    const session = await getSession(roomId);
+    expect(session?.roomId).toBe(roomId);
+
+    await expect(
+      setPlayerOffer(roomId, "player-1", "Alice", {
+        type: "offer",
+        sdp: "test-offer",
+      }),
+    ).rejects.toBeInstanceOf(RedisUnavailableError);
+  });
+
+  it("pages through the room index", async () => {
+    const { roomId } = await createSession();
+    await createSession();
+    await setPlayerOffer(roomId, "player-1", "Alice", {
+      type: "offer",
+      sdp: "test-offer",
+    });
+
+    const firstPage = await listRooms({ limit: 1 });
+    const secondPage = await listRooms({ offset: 1, limit: 1 });
+    const rooms = [...firstPage.rooms, ...secondPage.rooms];
+
+    expect(firstPage.total).toBe(2);
+    expect(rooms.map((room) => room.roomId)).toContain(roomId);
+    expect(rooms.find((room) => room.roomId === roomId)?.playerCount).toBe(1);
+  });
 });
@@ -1,43 +1,20 @@
-import Redis from "ioredis";
-
-let redis: Redis | null = null;
-
-function getRedis(): Redis | null {
-  if (redis) return redis;
-
-  const redisUrl = process.env.REDIS_URL;
-  const useRedisInDev = process.env.ENABLE_REDIS_IN_DEV === "true";
-  const shouldUseRedis =
-    !!redisUrl && (process.env.NODE_ENV === "production" || useRedisInDev);
-
-  if (shouldUseRedis && redisUrl) {
-    try {
-      redis = new Redis(redisUrl, {
-        retryStrategy: (times) => {
-          if (times > 3) return null;
-          return Math.min(times * 100, 3000);
-        },
-        maxRetriesPerRequest: 1,
-      });
-
-      redis.on("connect", () => console.log("Redis: connected"));
-      redis.on("error", (e) => console.log("Redis: error", e.message));
-
-      return redis;
-    } catch (e) {
-      console.error("Failed to connect to Redis:", e);
-      return null;
-    }
-  }
-
-  if (redisUrl && process.env.NODE_ENV !== "production" && !useRedisInDev) {
-    console.log("Redis configured but disabled in dev, using in-memory");
-  } else {
-    console.log("No Redis URL found, using in-memory");
-  }
-
-  return null;
-}
+import { LocalCache } from "../_lib/local-cache";
+import {
+  getRedis,
+  runRedis,
+  RedisUnavailableError,
+  type RedisClient,
+} from "../_lib/redis";
+import { span } from "../_lib/tracing";
+import {
+  MemoryRoomIndex,
+  parseSummaryHash,
+  ROOM_INDEX_KEY,
+  roomSummaryKey,
+  summaryToHash,
+  type RoomPage,
+  type RoomSummary,
+} from "./room-index";
 
 interface PlayerConnection {
   playerId: string;
@@ -47,8 +24,15 @@ interface PlayerConnection {
   answer?: RTCSessionDescriptionInit;
   candidates: RTCIceCandidateInit[];
   createdAt: number;
+  offeredAt?: number;
 }
 
+/** What a player's field in `session:<roomId>:players` holds. */
+type PlayerRecord = Omit<
+  PlayerConnection,
+  "playerId" | "answer" | "candidates"
+>;
+
 export interface Session {
   roomId: string;
   hostToken: string;
@@ -57,6 +41,7 @@ export interface Session {
 }
 
 const inMemorySessions = new Map<string, Session>();
+const memoryIndex = new MemoryRoomIndex();
 
 function generateToken(): string {
   const chars =
@@ -81,7 +66,7 @@ function generateRoomId(): string {
   return result;
 }
 
-function serializeSession(session: Session): string {
+export function serializeSession(session: Session): string {
   const obj = {
     roomId: session.roomId,
     hostToken: session.hostToken,
@@ -91,7 +76,7 @@ function serializeSession(session: Session): string {
   return JSON.stringify(obj);
 }
 
-function deserializeSession(data: string): Session | null {
+export function deserializeSession(data: string): Session | null {
   try {
     const obj = JSON.parse(data);
 
@@ -109,6 +94,7 @@ function deserializeSession(data: string): Session | null {
               ? player.candidates
               : [],
             createdAt: player.createdAt || Date.now(),
+            offeredAt: player.offeredAt,
           },
         ],
       ) || [],
@@ -123,50 +109,384 @@ function deserializeSession(data: string): Session | null {
   }
 }
 
+/*
+ * In Redis a room is spread over several keys so that concurrent writers
+ * for different players never overwrite each other: an immutable header
+ * (claimed with NX), one hash field per player and per answer, and an
+ * append-only candidate list per player. Every write touches only its own
+ * player's entries, so there is no read-modify-write of shared state.
+ */
+function sessionKey(roomId: string): string {
+  return `session:${roomId}`;
+}
+
+function playersKey(roomId: string): string {
+  return `session:${roomId}:players`;
+}
+
+function answersKey(roomId: string): string {
+  return `session:${roomId}:answers`;
+}
+
+function candidatesKey(roomId: string, playerId: string): string {
+  return `session:${roomId}:candidates:${playerId}`;
+}
+
+function parseJson<T>(data: string | null | undefined): T | undefined {
+  if (!data) return undefined;
+  try {
+    return JSON.parse(data) as T;
+  } catch {
+    return undefined;
+  }
+}
+
 const SESSION_TTL = 3600 * 4; // 4 hours
+const SESSION_CACHE_TTL_MS = Number(process.env.SESSION_CACHE_TTL_MS ?? 250);
+const SESSION_CACHE_STALE_MS = 60_000;
+
+// Every poll reads the session, so a short-lived local copy saves most of
+// those round trips. Cached sessions are shared and must not be mutated;
+// writers never build on one and drop it once their write has landed.
+const sessionCache = new LocalCache<Session>({
+  ttlMs: SESSION_CACHE_TTL_MS,
+  staleMs: SESSION_CACHE_STALE_MS,
+});
+const pendingReads = new Map<string, Promise<Session | undefined>>();
+// Bumped by every write to a room. A read that started before the latest
+// write must not be cached or shared: it may predate what was written.
+const writeGenerations = new Map<string, number>();
+
+function writeGeneration(roomId: string): number {
+  return writeGenerations.get(roomId) ?? 0;
+}
 
-async function saveSession(session: Session): Promise<void> {
-  const r = getRedis();
-  if (r) {
-    await r.setex(
-      `session:${session.roomId}`,
-      SESSION_TTL,
-      serializeSession(session),
-    );
-  } else {
+/** Drops the cached copy and any in-flight read once a write has landed. */
+function markWritten(roomId: string): void {
+  writeGenerations.set(roomId, writeGeneration(roomId) + 1);
+  sessionCache.delete(roomId);
+  pendingReads.delete(roomId);
+}
+
+function summarize(
+  session: Session,
+  now: number,
+  playerCount = session.players.size,
+): RoomSummary {
+  return {
+    roomId: session.roomId,
+    createdAt: session.createdAt,
+    updatedAt: now,
+    expiresAt: now + SESSION_TTL * 1000,
+    playerCount,
+  };
+}
+
+function indexCommands(r: RedisClient, summary: RoomSummary) {
+  const key = roomSummaryKey(summary.roomId);
+  return [
+    r.hset(key, summaryToHash(summary)),
+    r.expire(key, SESSION_TTL),
+    r.zadd(ROOM_INDEX_KEY, summary.expiresAt, summary.roomId),
+  ];
+}
+
+function pruneMemorySessions(now: number): void {
+  memoryIndex.prune(now).forEach((roomId) => inMemorySessions.delete(roomId));
+}
+
+/**
+ * Refreshes the TTL of the room's shared keys (plus `keys`) and its index
+ * entry; sent in the same pipelined batch as the write itself.
+ */
+function touchCommands(
+  r: RedisClient,
+  session: Session,
+  playerCount: number,
+  keys: string[] = [],
+) {
+  const { roomId } = session;
+  const shared = [sessionKey(roomId), playersKey(roomId), answersKey(roomId)];
+  return [
+    ...[...shared, ...keys].map((key) => r.expire(key, SESSION_TTL)),
+    ...indexCommands(r, summarize(session, Date.now(), playerCount)),
+  ];
+}
+
+function saveMemorySession(session: Session): void {
+  inMemorySessions.set(session.roomId, session);
+  memoryIndex.upsert(summarize(session, Date.now()));
+}
+
+/** Stores a new session only if no live room already uses its code. */
+async function claimSession(session: Session): Promise<boolean> {
+  const now = Date.now();
+  const summary = summarize(session, now);
+
+  if (!getRedis()) {
+    pruneMemorySessions(now);
+    if (memoryIndex.get(session.roomId, now)) {
+      return false;
+    }
     inMemorySessions.set(session.roomId, session);
+    memoryIndex.upsert(summary);
+    return true;
+  }
+
+  const data = span("session-serialize", () => serializeSession(session));
+  const claimed = await span("redis-set", () =>
+    runRedis((r) =>
+      r.set(sessionKey(session.roomId), data, "EX", SESSION_TTL, "NX"),
+    ),
+  );
+  if (claimed !== "OK") {
+    return false;
   }
+
+  await span("redis-index", () =>
+    runRedis((r) => Promise.all(indexCommands(r, summary))),
+  );
+  sessionCache.set(session.roomId, session);
+  return true;
 }
 
+const MAX_ROOM_ID_ATTEMPTS = 10;
+let roomIdCollisions = 0;
+
 export async function createSession(): Promise<{
   roomId: string;
   hostToken: string;
 }> {
-  const roomId = generateRoomId();
   const hostToken = generateToken();
 
-  const session: Session = {
-    roomId,
-    hostToken,
-    createdAt: Date.now(),
-    players: new Map(),
+  for (let attempt = 0; attempt < MAX_ROOM_ID_ATTEMPTS; attempt++) {
+    const session: Session = {
+      roomId: generateRoomId(),
+      hostToken,
+      createdAt: Date.now(),
+      players: new Map(),
+    };
+
+    if (await claimSession(session)) {
+      return { roomId: session.roomId, hostToken };
+    }
+
+    roomIdCollisions += 1;
+    console.log(`Room code ${session.roomId} is taken, picking another`);
+  }
+
+  throw new Error(`No free room code after ${MAX_ROOM_ID_ATTEMPTS} attempts`);
+}
+
+/**
+ * A page of live rooms, soonest to expire first. Expired entries are
+ * trimmed from the index on the way, so each call is a range query plus
+ * one pipelined summary read for the page.
+ */
+export async function listRooms(
+  options: { offset?: number; limit?: number } = {},
+): Promise<RoomPage> {
+  const offset = Math.max(0, options.offset ?? 0);
+  const limit = Math.max(1, options.limit ?? 50);
+  const now = Date.now();
+
+  if (!getRedis()) {
+    pruneMemorySessions(now);
+    return memoryIndex.list(now, offset, limit);
+  }
+
+  const [, total, roomIds] = await span("redis-index", () =>
+    runRedis((r) =>
+      Promise.all([
+        r.zremrangebyscore(ROOM_INDEX_KEY, "-inf", now),
+        r.zcount(ROOM_INDEX_KEY, `(${now}`, "+inf"),
+        r.zrangebyscore(
+          ROOM_INDEX_KEY,
+          `(${now}`,
+          "+inf",
+          "LIMIT",
+          offset,
+          limit,
+        ),
+      ]),
+    ),
+  );
+  if (roomIds.length === 0) {
+    return { total, rooms: [] };
+  }
+
+  const hashes = await span("redis-summaries", () =>
+    runRedis((r) =>
+      Promise.all(roomIds.map((roomId) => r.hgetall(roomSummaryKey(roomId)))),
+    ),
+  );
+  return {
+    total,
+    rooms: hashes
+      .map(parseSummaryHash)
+      .filter((summary): summary is RoomSummary => summary !== null),
   };
+}
 
-  await saveSession(session);
+/** How often a freshly generated room code was already in use. */
+export function getRoomIdCollisions(): number {
+  return roomIdCollisions;
+}
 
-  return { roomId, hostToken };
+/**
+ * The header, player and answer hashes in one pipelined batch, then every
+ * player's candidate list in a second one.
+ */
+async function readSession(roomId: string): Promise<Session | undefined> {
+  const generation = writeGeneration(roomId);
+  const [data, records, answers] = await span("redis-get", () =>
+    runRedis((r) =>
+      Promise.all([
+        r.get(sessionKey(roomId)),
+        r.hgetall(playersKey(roomId)),
+        r.hgetall(answersKey(roomId)),
+      ]),
+    ),
+  );
+  if (!data) {
+    sessionCache.delete(roomId);
+    writeGenerations.delete(roomId);
+    return undefined;
+  }
+
+  const session = span("session-parse", () => deserializeSession(data));
+  if (!session) {
+    return undefined;
+  }
+
+  const playerIds = Object.keys(records);
+  const candidateLists =
+    playerIds.length === 0
+      ? []
+      : await span("redis-candidates", () =>
+          runRedis((r) =>
+            Promise.all(
+              playerIds.map((playerId) =>
+                r.lrange(candidatesKey(roomId, playerId), 0, -1),
+              ),
+            ),
+          ),
+        );
+
+  span("session-parse", () =>
+    playerIds.forEach((playerId, index) => {
+      const record = parseJson<PlayerRecord>(records[playerId]);
+      if (!record) return;
+      session.players.set(playerId, {
+        ...record,
+        playerId,
+        answer: parseJson<RTCSessionDescriptionInit>(answers[playerId]),
+        candidates: candidateLists[index]
+          .map((entry) => parseJson<RTCIceCandidateInit>(entry))
+          .filter((entry): entry is RTCIceCandidateInit => !!entry),
+      });
+    }),
+  );
+  if (writeGeneration(roomId) === generation) {
+    sessionCache.set(roomId, session);
+  }
+  return session;
 }
 
-export async function getSession(roomId: string): Promise<Session | undefined> {
-  const r = getRedis();
-  if (r) {
-    const data = await r.get(`session:${roomId}`);
-    if (data) {
-      return deserializeSession(data) ?? undefined;
-    }
+/**
+ * What a Redis write needs to know first, in one pipelined batch: the room
+ * header, the player's own record and the player count for the index.
+ */
+async function readForWrite(
+  roomId: string,
+  playerId: string,
+): Promise<
+  { session: Session; record?: PlayerRecord; playerCount: number } | undefined
+> {
+  const [data, record, playerCount] = await span("redis-get", () =>
+    runRedis((r) =>
+      Promise.all([
+        r.get(sessionKey(roomId)),
+        r.hget(playersKey(roomId), playerId),
+        r.hlen(playersKey(roomId)),
+      ]),
+    ),
+  );
+  const session = data
+    ? span("session-parse", () => deserializeSession(data))
+    : null;
+  if (!session) {
+    sessionCache.delete(roomId);
     return undefined;
   }
-  return inMemorySessions.get(roomId);
+  // Rooms written before players had their own fields keep them in the
+  // header; treat those as the player's current record.
+  return {
+    session,
+    record: parseJson<PlayerRecord>(record) ?? session.players.get(playerId),
+    playerCount: Math.max(playerCount, session.players.size),
+  };
+}
+
+/**
+ * Reads go through the local cache and concurrent misses for the same room
+ * share one Redis round trip. While Redis is unavailable a recently cached
+ * copy is served instead of failing; `fresh` skips all of that.
+ */
+export async function getSession(
+  roomId: string,
+  options: { fresh?: boolean } = {},
+): Promise<Session | undefined> {
+  if (!getRedis()) {
+    return memoryIndex.get(roomId, Date.now())
+      ? inMemorySessions.get(roomId)
+      : undefined;
+  }
+  if (options.fresh) {
+    return readSession(roomId);
+  }
+
+  const cached = sessionCache.get(roomId);
+  if (cached) {
+    return cached;
+  }
+
+  let pending = pendingReads.get(roomId);
+  if (!pending) {
+    const read: Promise<Session | undefined> = readSession(roomId)
+      .catch((error) => {
+        const stale = sessionCache.getStale(roomId);
+        if (stale && error instanceof RedisUnavailableError) {
+          return stale;
+        }
+        throw error;
+      })
+      .finally(() => {
+        // A write may already have replaced this read with a newer one.
+        if (pendingReads.get(roomId) === read) {
+          pendingReads.delete(roomId);
+        }
+      });
+    pendingReads.set(roomId, read);
+    pending = read;
+  }
+  return pending;
+}
+
+/** Rooms and serialized bytes held by the in-memory store (benchmarks). */
+export function getMemoryStoreFootprint(): { rooms: number; bytes: number } {
+  let bytes = 0;
+  inMemorySessions.forEach((session) => {
+    bytes += serializeSession(session).length;
+  });
+  return { rooms: inMemorySessions.size, bytes };
+}
+
+/** Drops locally cached sessions (tests and benchmarks). */
+export function clearSessionCache(): void {
+  sessionCache.clear();
+  pendingReads.clear();
+  writeGenerations.clear();
 }
 
 export async function setPlayerOffer(
@@ -174,6 +494,51 @@ export async function setPlayerOffer(
   playerId: string,
   nickname: string | undefined,
   offer: RTCSessionDescriptionInit,
+): Promise<string | undefined> {
+  if (!getRedis()) {
+    return setMemoryPlayerOffer(roomId, playerId, nickname, offer);
+  }
+
+  const room = await readForWrite(roomId, playerId);
+  if (!room) return undefined;
+
+  const { record } = room;
+  const now = Date.now();
+  const player: PlayerRecord = {
+    playerToken: record?.playerToken ?? generatePlayerToken(),
+    nickname: nickname || record?.nickname,
+    offer,
+    createdAt: record?.createdAt ?? now,
+    offeredAt: now,
+  };
+  // A new offer starts a new negotiation (a reconnect): the previous
+  // answer and candidates belong to a connection that no longer exists.
+  const renegotiating = !!record?.offer && record.offer.sdp !== offer.sdp;
+
+  await span("redis-set", () =>
+    runRedis((r) =>
+      Promise.all([
+        r.hset(playersKey(roomId), { [playerId]: JSON.stringify(player) }),
+        ...(renegotiating
+          ? [
+              r.hdel(answersKey(roomId), playerId),
+              r.del(candidatesKey(roomId, playerId)),
+            ]
+          : []),
+        ...touchCommands(r, room.session, room.playerCount + (record ? 0 : 1)),
+      ]),
+    ),
+  );
+  markWritten(roomId);
+
+  return player.playerToken;
+}
+
+async function setMemoryPlayerOffer(
+  roomId: string,
+  playerId: string,
+  nickname: string | undefined,
+  offer: RTCSessionDescriptionInit,
 ): Promise<string | undefined> {
   const session = await getSession(roomId);
   if (!session) return undefined;
@@ -189,15 +554,17 @@ export async function setPlayerOffer(
     session.players.set(playerId, player);
   }
 
-  if (!player) {
-    return undefined;
-  }
   if (nickname) {
     player.nickname = nickname;
   }
+  if (player.offer && player.offer.sdp !== offer.sdp) {
+    player.answer = undefined;
+    player.candidates = [];
+  }
   player.offer = offer;
+  player.offeredAt = Date.now();
 
-  await saveSession(session);
+  saveMemorySession(session);
 
   return player.playerToken;
 }
@@ -207,20 +574,59 @@ export async function setPlayerAnswer(
   playerId: string,
   answer: RTCSessionDescriptionInit,
 ): Promise<void> {
-  const session = await getSession(roomId);
-  if (!session) return;
-
-  const player = session.players.get(playerId);
-  if (player) {
-    player.answer = answer;
-    await saveSession(session);
+  if (!getRedis()) {
+    const session = await getSession(roomId);
+    const player = session?.players.get(playerId);
+    if (session && player) {
+      player.answer = answer;
+      saveMemorySession(session);
+    }
+    return;
   }
+
+  const room = await readForWrite(roomId, playerId);
+  if (!room?.record) return;
+
+  await span("redis-set", () =>
+    runRedis((r) =>
+      Promise.all([
+        r.hset(answersKey(roomId), { [playerId]: JSON.stringify(answer) }),
+        ...touchCommands(r, room.session, room.playerCount),
+      ]),
+    ),
+  );
+  markWritten(roomId);
 }
 
 export async function addCandidate(
   roomId: string,
   playerId: string,
   candidate: RTCIceCandidateInit,
+): Promise<void> {
+  if (!getRedis()) {
+    return addMemoryCandidate(roomId, playerId, candidate);
+  }
+
+  const room = await readForWrite(roomId, playerId);
+  if (!room) return;
+
+  // RPUSH keeps arrival order, which the candidate route pages through.
+  const key = candidatesKey(roomId, playerId);
+  await span("redis-set", () =>
+    runRedis((r) =>
+      Promise.all([
+        r.rpush(key, JSON.stringify(candidate)),
+        ...touchCommands(r, room.session, room.playerCount, [key]),
+      ]),
+    ),
+  );
+  markWritten(roomId);
+}
+
+async function addMemoryCandidate(
+  roomId: string,
+  playerId: string,
+  candidate: RTCIceCandidateInit,
 ): Promise<void> {
   const session = await getSession(roomId);
   if (!session) return;
@@ -237,7 +643,24 @@ export async function addCandidate(
   }
   player.candidates.push(candidate);
 
-  await saveSession(session);
+  saveMemorySession(session);
+}
+
+/**
+ * A player's token straight from the store, for authorizing writes: a
+ * cached session may predate the player's join, or come from another
+ * instance that has not seen it yet.
+ */
+export async function getPlayerToken(
+  roomId: string,
+  playerId: string,
+): Promise<string | undefined> {
+  if (!getRedis()) {
+    return (await getSession(roomId))?.players.get(playerId)?.playerToken;
+  }
+
+  const room = await readForWrite(roomId, playerId);
+  return room?.record?.playerToken;
 }
 
 export async function getPlayer(
@@ -264,6 +687,7 @@ export async function getPlayerList(roomId: string): Promise<
     hasOffer: boolean;
     hasAnswer: boolean;
     candidateCount: number;
+    offeredAt?: number;
   }[]
 > {
   const session = await getSession(roomId);
@@ -274,5 +698,6 @@ export async function getPlayerList(roomId: string): Promise<
     hasOffer: !!p.offer,
     hasAnswer: !!p.answer,
     candidateCount: p.candidates.length,
+    offeredAt: p.offeredAt,
   }));
 }
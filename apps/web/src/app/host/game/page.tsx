@@ -1,11 +1,32 @@
 "use client";
 
-import { useEffect, useState, useCallback, useRef } from "react";
+import { useEffect, useState, useMemo, useRef } from "react";
 import { useRouter } from "next/navigation";
 import { useGameStore } from "@/stores/gameStore";
 import { HostWebRTCManager } from "@/lib/webrtc";
-import { getHostWebRTC, setHostWebRTC } from "@/lib/webrtcStore";
-import { buildChoiceStats, type ChoiceStats } from "@/lib/answer-stats";
+import {
+  getHostWebRTC,
+  getServerGame,
+  setHostWebRTC,
+  setServerGame,
+} from "@/lib/webrtcStore";
+import { getRelayUrl } from "@/lib/ws-relay";
+import { usePageStateAttribute } from "@/lib/page-state";
+import { choiceStatsFromTally } from "@/lib/answer-stats";
+import { buildLeaderboard } from "@/lib/game-engine";
+import { HostEnginePipeline } from "@/lib/host-pipeline";
+import { VirtualList } from "@/components/VirtualList";
+import { HostStatsOverlay } from "@/components/HostStatsOverlay";
+import {
+  getPlayerKey,
+  LEADERBOARD_ROW_HEIGHT,
+  LeaderboardRow,
+  PODIUM_ROW_HEIGHT,
+  PodiumRow,
+} from "@/components/PlayerRows";
+
+const LEADERBOARD_MAX_HEIGHT = 560;
+const PODIUM_MAX_HEIGHT = 480;
 
 function getRankDelta(
   previousRanks: Map<string, number> | null,
@@ -25,73 +46,48 @@ function getRankDelta(
   return previousRank - currentRank;
 }
 
-export default function HostGamePage() {
+function HostGameContent() {
   const router = useRouter();
-  const [countdown, setCountdown] = useState(3);
   const [questionTimeRemaining, setQuestionTimeRemaining] = useState(0);
   const webrtcRef = useRef<HostWebRTCManager | null>(null);
-  const revealTimerRef = useRef<ReturnType<typeof setTimeout> | null>(null);
+  const pipelineRef = useRef<HostEnginePipeline | null>(null);
   const previousLeaderboardRanksRef = useRef<Map<string, number> | null>(null);
-  const [leaderboardRankDeltas, setLeaderboardRankDeltas] = useState<
-    Map<string, number | null>
-  >(new Map());
 
   const {
     phase,
-    roomId,
     players,
     settings,
     questions,
     currentQuestionIndex,
     answers,
     scores,
-    setPhase,
-    showQuestion,
-    lockQuestion,
-    revealAnswer,
-    nextQuestion,
+    countdown,
+    answerTally,
     endGame,
     reset,
-    submitAnswer,
   } = useGameStore();
 
   const currentQuestion = questions[currentQuestionIndex];
 
   useEffect(() => {
+    // Server-authoritative games are driven from the relay process.
+    if (getServerGame()) {
+      return;
+    }
+
+    const pipeline = new HostEnginePipeline({ store: useGameStore });
+    pipelineRef.current = pipeline;
+
     const hostToken = sessionStorage.getItem("hostToken");
     const roomIdParam = useGameStore.getState().roomId;
+    let webrtc = getHostWebRTC();
 
     if (hostToken && roomIdParam) {
+      // Frames from the WebSocket relay arrive already parsed.
       const handlePlayerMessage = (playerId: string, data: unknown) => {
-        const msg = data as {
-          type: string;
-          questionId?: string;
-          choiceId?: string;
-          timeMs?: number;
-        };
-        const currentQ =
-          useGameStore.getState().questions[
-            useGameStore.getState().currentQuestionIndex
-          ];
-        if (msg.type === "answer" && currentQ) {
-          const accepted = submitAnswer(
-            playerId,
-            msg.questionId || currentQ.id,
-            [msg.choiceId || ""],
-            msg.timeMs || 0,
-          );
-
-          webrtc?.send(playerId, {
-            type: "answer.ack",
-            payload: {
-              accepted,
-            },
-          });
-        }
+        pipeline.dispatch({ type: "message", playerId, data });
       };
 
-      let webrtc = getHostWebRTC();
-
       if (!webrtc) {
         const signalingUrl =
           typeof window !== "undefined"
@@ -102,6 +98,7 @@ export default function HostGamePage() {
           signalingUrl,
           roomId: roomIdParam,
           hostToken,
+          relayUrl: getRelayUrl(),
           onMessage: handlePlayerMessage,
         });
 
@@ -110,219 +107,136 @@ export default function HostGamePage() {
         webrtc.setOnMessage(handlePlayerMessage);
       }
 
+      webrtc.setOnRawMessage((playerId, raw) =>
+        pipeline.receiveFrame(playerId, raw),
+      );
+      // The engine's roster lives in the pipeline during the game, so joins
+      // and leaves must reach it rather than only the page store.
+      webrtc.setOnPlayerJoin((playerId, nickname) =>
+        pipeline.dispatch({ type: "player.join", playerId, nickname }),
+      );
+      webrtc.setOnPlayerReady((playerId) =>
+        pipeline.dispatch({ type: "player.ready", playerId }),
+      );
+      webrtc.setOnPlayerLeave((playerId) =>
+        pipeline.dispatch({ type: "player.leave", playerId }),
+      );
+      pipeline.attach(webrtc);
       webrtcRef.current = webrtc;
+      webrtc.setGameActive(true);
       webrtc.start();
     }
 
+    pipeline.start();
+
     return () => {
-      // Don't stop on unmount - keep WebRTC alive for the session
+      // Don't stop WebRTC on unmount - keep it alive for the session
+      webrtc?.setOnRawMessage(undefined);
+      webrtc?.setOnPlayerJoin(undefined);
+      webrtc?.setOnPlayerReady(undefined);
+      webrtc?.setOnPlayerLeave(undefined);
+      webrtc?.setGameActive(false);
+      pipeline.stop();
+      pipelineRef.current = null;
     };
   }, []);
 
-  useEffect(() => {
-    if (phase === "countdown" && countdown > 0) {
-      const timer = setTimeout(() => setCountdown(countdown - 1), 1000);
-      return () => clearTimeout(timer);
-    } else if (phase === "countdown" && countdown === 0) {
-      showQuestion();
-      if (webrtcRef.current && currentQuestion) {
-        webrtcRef.current.broadcast({
-          type: "question",
-          payload: {
-            id: currentQuestion.id,
-            prompt: currentQuestion.prompt,
-            choices: currentQuestion.choices,
-            durationMs: settings.questionTimeLimit,
-          },
-        });
-      }
-    }
-  }, [
-    phase,
-    countdown,
-    showQuestion,
-    currentQuestion,
-    settings.questionTimeLimit,
-  ]);
-
-  const getSortedLeaderboard = useCallback(() => {
-    return [...players]
-      .map((p) => ({ ...p, score: scores.get(p.id) || 0 }))
-      .sort((a, b) => b.score - a.score);
-  }, [players, scores]);
-
-  const clearRevealTimer = useCallback(() => {
-    if (revealTimerRef.current) {
-      clearTimeout(revealTimerRef.current);
-      revealTimerRef.current = null;
-    }
-  }, []);
+  const leaderboard = useMemo(
+    () => buildLeaderboard({ players, scores }),
+    [players, scores],
+  );
 
-  const handleReveal = useCallback(() => {
-    if (phase !== "question" || !currentQuestion) {
+  const handleReveal = () => {
+    const serverGame = getServerGame();
+    if (serverGame) {
+      serverGame.reveal();
       return;
     }
-
-    clearRevealTimer();
-    lockQuestion();
-    revealAnswer();
-
-    const { choiceStats } = buildChoiceStats(currentQuestion.choices, answers);
-
-    if (webrtcRef.current) {
-      const resultPlayerIds = new Set<string>([
-        ...players.map((player) => player.id),
-        ...Array.from(answers.keys()),
-        ...webrtcRef.current.getConnectedPlayers(),
-      ]);
-
-      const resultsByPlayer = Array.from(resultPlayerIds).reduce<
-        Record<string, { correct: boolean; score: number }>
-      >((acc, playerId) => {
-        const submittedAnswer = answers.get(playerId) ?? [];
-        const isCorrect = submittedAnswer.includes(
-          currentQuestion.answer.choiceId,
-        );
-
-        acc[playerId] = {
-          correct: isCorrect,
-          score: scores.get(playerId) || 0,
-        };
-
-        return acc;
-      }, {});
-
-      webrtcRef.current.broadcast({
-        type: "reveal",
-        payload: {
-          correctChoiceId: currentQuestion.answer.choiceId,
-          resultsByPlayer,
-          choiceStats,
-        },
-      });
-    }
-
-    revealTimerRef.current = setTimeout(() => {
-      revealTimerRef.current = null;
-      if (currentQuestionIndex < questions.length - 1) {
-        if (settings.showLeaderboard) {
-          setPhase("leaderboard");
-          if (webrtcRef.current) {
-            const leaderboard = getSortedLeaderboard();
-            webrtcRef.current.broadcast({
-              type: "leaderboard",
-              payload: leaderboard,
-            });
-          }
-        } else {
-          nextQuestion();
-          setCountdown(3);
-          setPhase("countdown");
-        }
-      } else {
-        endGame();
-        if (webrtcRef.current) {
-          webrtcRef.current.broadcast({ type: "ended" });
-        }
-      }
-    }, 3000);
-  }, [
-    phase,
-    currentQuestion,
-    clearRevealTimer,
-    lockQuestion,
-    revealAnswer,
-    players,
-    answers,
-    scores,
-    currentQuestionIndex,
-    questions.length,
-    settings.showLeaderboard,
-    setPhase,
-    nextQuestion,
-    getSortedLeaderboard,
-    endGame,
-  ]);
+    pipelineRef.current?.dispatch({ type: "reveal" });
+  };
 
   useEffect(() => {
-    if (phase === "question" && currentQuestion) {
-      const duration = settings.questionTimeLimit;
-      setQuestionTimeRemaining(Math.floor(duration / 1000));
-
-      const countdownTimer = setInterval(() => {
-        setQuestionTimeRemaining((prev) => (prev <= 1 ? 0 : prev - 1));
-      }, 1000);
-
-      const timer = setTimeout(() => {
-        handleReveal();
-      }, duration);
-
-      return () => {
-        clearTimeout(timer);
-        clearInterval(countdownTimer);
-      };
+    if (phase !== "question" || !currentQuestion) {
+      return;
     }
-  }, [phase, currentQuestion, handleReveal, settings.questionTimeLimit]);
 
-  useEffect(() => {
-    if (
-      phase === "question" &&
-      players.length > 0 &&
-      answers.size >= players.length
-    ) {
-      const timer = setTimeout(() => {
-        handleReveal();
-      }, 400);
-      return () => clearTimeout(timer);
-    }
-  }, [phase, players.length, answers.size, handleReveal]);
+    // Display only; the pipeline owns the authoritative question deadline.
+    setQuestionTimeRemaining(Math.floor(settings.questionTimeLimit / 1000));
+    const timer = setInterval(() => {
+      setQuestionTimeRemaining((prev) => (prev <= 1 ? 0 : prev - 1));
+    }, 1000);
 
-  useEffect(() => {
-    return () => {
-      clearRevealTimer();
-    };
-  }, [clearRevealTimer]);
+    return () => clearInterval(timer);
+  }, [phase, currentQuestion, settings.questionTimeLimit]);
 
-  useEffect(() => {
+  // Rank changes and last round's positions (so rows slide from their old
+  // rank on entry) are derived during render: the leaderboard's first frame
+  // already has them. This round's ranks become the previous ones once the
+  // leaderboard has been committed.
+  const leaderboardMotion = useMemo(() => {
     if (phase !== "leaderboard") {
-      return;
+      return null;
     }
 
-    const leaderboard = getSortedLeaderboard();
-    const currentRanks = new Map<string, number>();
+    const previousRanks = previousLeaderboardRanksRef.current;
+    const ranks = new Map<string, number>();
     const deltas = new Map<string, number | null>();
 
     leaderboard.forEach((player, index) => {
       const rank = index + 1;
-      currentRanks.set(player.id, rank);
-      deltas.set(
-        player.id,
-        getRankDelta(previousLeaderboardRanksRef.current, player.id, rank),
-      );
+      ranks.set(player.id, rank);
+      deltas.set(player.id, getRankDelta(previousRanks, player.id, rank));
     });
 
-    setLeaderboardRankDeltas(deltas);
-    previousLeaderboardRanksRef.current = currentRanks;
-  }, [phase, getSortedLeaderboard]);
+    const previousIndexes = previousRanks
+      ? new Map<string, number>(
+          Array.from(previousRanks, ([playerId, rank]) => [playerId, rank - 1]),
+        )
+      : null;
+    return { ranks, deltas, previousIndexes };
+  }, [phase, leaderboard]);
+
+  useEffect(() => {
+    if (leaderboardMotion) {
+      previousLeaderboardRanksRef.current = leaderboardMotion.ranks;
+    }
+  }, [leaderboardMotion]);
+
+  usePageStateAttribute("phase", phase);
+  usePageStateAttribute("questionIndex", currentQuestionIndex);
 
   const handleNext = () => {
-    if (currentQuestionIndex < questions.length - 1) {
-      nextQuestion();
-      setCountdown(3);
-      setPhase("countdown");
-    } else {
-      endGame();
-      if (webrtcRef.current) {
-        webrtcRef.current.broadcast({ type: "ended" });
-      }
+    const serverGame = getServerGame();
+    if (serverGame) {
+      serverGame.next();
+      return;
     }
+    pipelineRef.current?.dispatch({ type: "next" });
   };
 
   const handleEndGame = () => {
     endGame();
   };
 
+  const handleDownloadLog = () => {
+    const log = pipelineRef.current?.getLog();
+    if (!log || log.size === 0) {
+      return;
+    }
+
+    const roomId = useGameStore.getState().roomId || "room";
+    const blob = new Blob([log.toNDJSON()], { type: "application/x-ndjson" });
+    const url = URL.createObjectURL(blob);
+    const link = document.createElement("a");
+    link.href = url;
+    link.download = `game-${roomId}-${Date.now()}.ndjson`;
+    link.click();
+    URL.revokeObjectURL(url);
+  };
+
   const handleExit = () => {
+    getServerGame()?.close();
+    setServerGame(null);
     reset();
     router.push("/");
   };
@@ -361,30 +275,7 @@ export default function HostGamePage() {
     const totalPlayers = players.length;
     const progressPercent =
       totalPlayers > 0 ? (answeredCount / totalPlayers) * 100 : 0;
-    const liveChoiceCounts = currentQuestion
-      ? currentQuestion.choices.reduce<Record<string, number>>(
-          (acc, choice) => {
-            acc[choice.id] = 0;
-            return acc;
-          },
-          {},
-        )
-      : {};
-
-    answers.forEach((choiceIds) => {
-      choiceIds.forEach((choiceId) => {
-        if (liveChoiceCounts[choiceId] !== undefined) {
-          liveChoiceCounts[choiceId] += 1;
-        }
-      });
-    });
-
-    const liveChoicePercents = Object.fromEntries(
-      Object.entries(liveChoiceCounts).map(([choiceId, count]) => [
-        choiceId,
-        answeredCount > 0 ? Math.round((count / answeredCount) * 100) : 0,
-      ]),
-    );
+    const { choiceStats: liveChoiceStats } = choiceStatsFromTally(answerTally);
 
     return (
       <div className="min-h-screen flex flex-col items-center justify-center p-4 relative z-10">
@@ -436,14 +327,14 @@ export default function HostGamePage() {
                         <span className="text-cyber-white">{choice.text}</span>
                       </div>
                       <span className="font-mono text-cyber-white-dim text-sm">
-                        {liveChoiceCounts[choice.id] || 0} votes
+                        {liveChoiceStats[choice.id]?.count ?? 0} votes
                       </span>
                     </div>
                     <div className="h-1.5 bg-cyber-bg-light rounded-full overflow-hidden">
                       <div
                         className="h-full bg-cyber-cyan transition-all duration-300"
                         style={{
-                          width: `${liveChoicePercents[choice.id] || 0}%`,
+                          width: `${liveChoiceStats[choice.id]?.percent ?? 0}%`,
                         }}
                       ></div>
                     </div>
@@ -488,9 +379,7 @@ export default function HostGamePage() {
 
   if (phase === "reveal") {
     const correctChoiceId = currentQuestion?.answer.choiceId;
-    const { choiceStats, totalAnswered } = currentQuestion
-      ? buildChoiceStats(currentQuestion.choices, answers)
-      : { choiceStats: {} as ChoiceStats, totalAnswered: 0 };
+    const { choiceStats, totalAnswered } = choiceStatsFromTally(answerTally);
 
     return (
       <div className="min-h-screen flex flex-col items-center justify-center p-4 relative z-10">
@@ -575,8 +464,6 @@ export default function HostGamePage() {
   }
 
   if (phase === "leaderboard") {
-    const leaderboard = getSortedLeaderboard();
-
     return (
       <div className="min-h-screen flex flex-col items-center justify-center p-4 relative z-10">
         <div className="max-w-4xl w-full">
@@ -589,40 +476,25 @@ export default function HostGamePage() {
               LEADERBOARD
             </h2>
 
-            <div className="space-y-3">
-              {leaderboard.map((player, index) => {
-                const rankDelta = leaderboardRankDeltas.get(player.id) ?? null;
-
-                return (
-                  <div key={player.id} className="cyber-leaderboard-row">
-                    <div className="flex items-center gap-3 min-w-0">
-                      <span className="font-mono text-cyber-white-dim w-8 shrink-0">
-                        #{index + 1}
-                      </span>
-                      <span className="font-medium text-cyber-white truncate max-w-[180px]">
-                        {player.nickname}
-                      </span>
-                      <span
-                        className={`font-mono text-xs sm:text-sm whitespace-nowrap ${
-                          rankDelta === null
-                            ? "text-cyber-white-dim"
-                            : rankDelta > 0
-                              ? "text-cyber-lime"
-                              : "text-cyber-pink"
-                        }`}
-                      >
-                        {rankDelta === null
-                          ? "• --"
-                          : rankDelta > 0
-                            ? `↑ +${rankDelta}`
-                            : `↓ ${rankDelta}`}
-                      </span>
-                    </div>
-                    <span className="cyber-score">{player.score}</span>
-                  </div>
-                );
-              })}
-            </div>
+            <VirtualList
+              items={leaderboard}
+              getKey={getPlayerKey}
+              rowHeight={LEADERBOARD_ROW_HEIGHT}
+              gap={12}
+              maxHeight={LEADERBOARD_MAX_HEIGHT}
+              previousIndexes={leaderboardMotion?.previousIndexes ?? null}
+              ariaLabel="Leaderboard"
+              renderRow={(player, index) => (
+                <LeaderboardRow
+                  rank={index + 1}
+                  nickname={player.nickname}
+                  score={player.score}
+                  rankDelta={
+                    leaderboardMotion?.deltas.get(player.id) ?? null
+                  }
+                />
+              )}
+            />
           </div>
 
           <div className="flex justify-center">
@@ -641,7 +513,6 @@ export default function HostGamePage() {
   }
 
   if (phase === "ended") {
-    const leaderboard = getSortedLeaderboard();
     const winner = leaderboard[0];
     const totalPlayers = leaderboard.length;
     const totalQuestions = questions.length;
@@ -696,38 +567,31 @@ export default function HostGamePage() {
               </div>
             </div>
 
-            <div className="space-y-4 mb-8">
-              {leaderboard.map((player, index) => (
-                <div
-                  key={player.id}
-                  className={`cyber-leaderboard-row ${
-                    index === 0
-                      ? "gold"
-                      : index === 1
-                        ? "silver"
-                        : index === 2
-                          ? "bronze"
-                          : ""
-                  }`}
-                >
-                  <div className="flex items-center gap-4">
-                    <span className="text-3xl font-bold text-cyber-white-dim">
-                      {index === 0
-                        ? "🥇"
-                        : index === 1
-                          ? "🥈"
-                          : index === 2
-                            ? "🥉"
-                            : `#${index + 1}`}
-                    </span>
-                    <span className="text-xl font-semibold text-cyber-white truncate max-w-[220px]">
-                      {player.nickname}
-                    </span>
-                  </div>
-                  <span className="cyber-score text-3xl">{player.score}</span>
-                </div>
-              ))}
-            </div>
+            <VirtualList
+              items={leaderboard}
+              getKey={getPlayerKey}
+              rowHeight={PODIUM_ROW_HEIGHT}
+              gap={16}
+              maxHeight={PODIUM_MAX_HEIGHT}
+              className="mb-8"
+              ariaLabel="Final standings"
+              renderRow={(player, index) => (
+                <PodiumRow
+                  rank={index + 1}
+                  nickname={player.nickname}
+                  score={player.score}
+                />
+              )}
+            />
+
+            {!getServerGame() && (
+              <button
+                onClick={handleDownloadLog}
+                className="cyber-button-secondary w-full py-3 mb-4 font-mono text-sm rounded-xl"
+              >
+                DOWNLOAD GAME LOG
+              </button>
+            )}
 
             <button
               onClick={handleExit}
@@ -743,3 +607,16 @@ export default function HostGamePage() {
 
   return null;
 }
+
+export default function HostGamePage() {
+  const roomId = useGameStore((state) => state.roomId);
+
+  return (
+    <>
+      <HostGameContent />
+      {!getServerGame() && (
+        <HostStatsOverlay getSource={getHostWebRTC} roomId={roomId} />
+      )}
+    </>
+  );
+}
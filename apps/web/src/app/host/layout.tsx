@@ -0,0 +1,9 @@
+import "./host.css";
+
+export default function HostLayout({
+  children,
+}: {
+  children: React.ReactNode;
+}) {
+  return children;
+}
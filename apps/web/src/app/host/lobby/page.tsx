@@ -1,26 +1,59 @@
 "use client";
 
 import { Suspense, useEffect, useState, useRef, useCallback } from "react";
+import dynamic from "next/dynamic";
 import { useRouter, useSearchParams } from "next/navigation";
-import { QRCodeSVG } from "qrcode.react";
 import { useGameStore, type Player } from "@/stores/gameStore";
 import { HostWebRTCManager } from "@/lib/webrtc";
-import { setHostWebRTC } from "@/lib/webrtcStore";
+import {
+  getHostWebRTC,
+  setHostWebRTC,
+  setServerGame,
+} from "@/lib/webrtcStore";
+import { getRelayUrl } from "@/lib/ws-relay";
+import { usePageStateAttribute } from "@/lib/page-state";
+import { ServerGameController } from "@/lib/server-game";
+import { VirtualList } from "@/components/VirtualList";
+import { HostStatsOverlay } from "@/components/HostStatsOverlay";
+import {
+  getPlayerKey,
+  LOBBY_ROW_HEIGHT,
+  LobbyPlayerRow,
+} from "@/components/PlayerRows";
+
+const LOBBY_LIST_MAX_HEIGHT = 480;
+const QR_SIZE = 180;
+
+// The QR renderer is only needed once the host opens it, so it stays out of
+// the lobby's initial chunk.
+const QRCodeSVG = dynamic(
+  () => import("qrcode.react").then((module) => module.QRCodeSVG),
+  {
+    ssr: false,
+    loading: () => <div style={{ width: QR_SIZE, height: QR_SIZE }} />,
+  },
+);
 
 function LobbyContent() {
   const router = useRouter();
   const searchParams = useSearchParams();
   const roomId = searchParams.get("room");
+  const relayMode = searchParams.get("relay") === "1";
+  const relayUrl = getRelayUrl();
+  const serverMode = searchParams.get("mode") === "server" && !!relayUrl;
 
   const [showQR, setShowQR] = useState(false);
   const [copied, setCopied] = useState<"code" | "link" | null>(null);
   const [hostToken, setHostToken] = useState<string | null>(null);
+  const [lobbyLocked, setLobbyLocked] = useState(false);
   const webrtcRef = useRef<HostWebRTCManager | null>(null);
+  const serverGameRef = useRef<ServerGameController | null>(null);
 
   const {
     roomId: storeRoomId,
     players,
     questions,
+    settings,
     setRoomId,
     addPlayer,
     setPlayerReady,
@@ -29,10 +62,13 @@ function LobbyContent() {
   } = useGameStore();
 
   const displayRoomId = roomId || storeRoomId;
+  const joinPath = `/join?room=${displayRoomId}${
+    serverMode ? "&mode=server" : ""
+  }`;
   const joinLink =
     typeof window !== "undefined"
-      ? `${window.location.origin}/join?room=${displayRoomId}`
-      : `/join?room=${displayRoomId}`;
+      ? `${window.location.origin}${joinPath}`
+      : joinPath;
 
   const qrValue = joinLink;
 
@@ -77,7 +113,27 @@ function LobbyContent() {
   }, [roomId, setRoomId]);
 
   useEffect(() => {
-    if (displayRoomId && hostToken) {
+    if (!serverMode || !displayRoomId || !hostToken || !relayUrl) {
+      return;
+    }
+
+    // The relay process runs the game; this page only mirrors its state.
+    const controller = new ServerGameController({
+      relayUrl,
+      roomId: displayRoomId,
+      hostToken,
+      store: useGameStore,
+    });
+    const current = useGameStore.getState();
+    controller.setup(current.questions, current.settings);
+    controller.connect();
+
+    serverGameRef.current = controller;
+    setServerGame(controller);
+  }, [serverMode, displayRoomId, hostToken, relayUrl]);
+
+  useEffect(() => {
+    if (!serverMode && displayRoomId && hostToken) {
       const signalingUrl =
         typeof window !== "undefined"
           ? window.location.origin
@@ -87,6 +143,8 @@ function LobbyContent() {
         signalingUrl,
         roomId: displayRoomId,
         hostToken: hostToken,
+        relay: relayMode ? {} : undefined,
+        relayUrl,
         onPlayerJoin: handlePlayerJoin,
         onPlayerReady: handlePlayerReady,
         onPlayerLeave: handlePlayerLeave,
@@ -99,6 +157,9 @@ function LobbyContent() {
   }, [
     displayRoomId,
     hostToken,
+    relayMode,
+    relayUrl,
+    serverMode,
     handlePlayerJoin,
     handlePlayerReady,
     handlePlayerLeave,
@@ -109,7 +170,14 @@ function LobbyContent() {
     if (!canStartGame) {
       return;
     }
+    if (serverGameRef.current) {
+      serverGameRef.current.setup(questions, settings);
+      serverGameRef.current.start();
+      router.push("/host/game");
+      return;
+    }
     startGame();
+    webrtcRef.current?.activateRelayTree();
     router.push("/host/game");
   };
 
@@ -117,6 +185,11 @@ function LobbyContent() {
     router.push("/host");
   };
 
+  const handleToggleLobbyLock = () => {
+    webrtcRef.current?.setLobbyLocked(!lobbyLocked);
+    setLobbyLocked(!lobbyLocked);
+  };
+
   const handleCopyRoomCode = () => {
     navigator.clipboard.writeText(displayRoomId);
     setCopied("code");
@@ -129,6 +202,10 @@ function LobbyContent() {
     setTimeout(() => setCopied(null), 2000);
   };
 
+  const readyPlayers = players.filter((p) => p.isReady).length;
+  usePageStateAttribute("players", players.length);
+  usePageStateAttribute("readyPlayers", readyPlayers);
+
   if (!displayRoomId) {
     return (
       <div className="min-h-screen flex items-center justify-center relative z-10">
@@ -145,7 +222,6 @@ function LobbyContent() {
     );
   }
 
-  const readyPlayers = players.filter((p) => p.isReady).length;
   const minimumReadyPlayers = Math.min(players.length, 2);
   const canStartGame =
     questions.length > 0 &&
@@ -173,7 +249,7 @@ function LobbyContent() {
               <div className="cyber-qr-container">
                 <QRCodeSVG
                   value={qrValue}
-                  size={180}
+                  size={QR_SIZE}
                   level="M"
                   includeMargin={true}
                 />
@@ -226,29 +302,20 @@ function LobbyContent() {
               </p>
             </div>
           ) : (
-            <div className="space-y-3">
-              {players.map((player) => (
-                <div key={player.id} className="cyber-player-card">
-                  <div className="flex items-center gap-3">
-                    <div className="cyber-avatar w-10 h-10 text-lg">
-                      {player.nickname.charAt(0).toUpperCase()}
-                    </div>
-                    <span className="font-medium text-cyber-white truncate max-w-[180px]">
-                      {player.nickname}
-                    </span>
-                  </div>
-                  <span
-                    className={
-                      player.isReady
-                        ? "cyber-status-ready"
-                        : "cyber-status-waiting"
-                    }
-                  >
-                    {player.isReady ? "READY" : "WAITING"}
-                  </span>
-                </div>
-              ))}
-            </div>
+            <VirtualList
+              items={players}
+              getKey={getPlayerKey}
+              rowHeight={LOBBY_ROW_HEIGHT}
+              gap={12}
+              maxHeight={LOBBY_LIST_MAX_HEIGHT}
+              ariaLabel="Connected players"
+              renderRow={(player) => (
+                <LobbyPlayerRow
+                  nickname={player.nickname}
+                  isReady={player.isReady}
+                />
+              )}
+            />
           )}
         </div>
 
@@ -259,6 +326,15 @@ function LobbyContent() {
               <span className="text-cyber-white-dim">QUESTIONS:</span>{" "}
               {questions.length}
             </span>
+            {!serverMode && (
+              <button
+                onClick={handleToggleLobbyLock}
+                className="cyber-button-secondary ml-auto px-3 py-1 text-xs font-mono rounded-lg"
+                title="A locked lobby only lets players already in the room reconnect"
+              >
+                {lobbyLocked ? "UNLOCK LOBBY" : "LOCK LOBBY"}
+              </button>
+            )}
           </div>
         </div>
 
@@ -392,6 +468,13 @@ function LobbyContent() {
           </p>
         </div>
       </div>
+      {!serverMode && (
+        <HostStatsOverlay
+          getSource={getHostWebRTC}
+          roomId={displayRoomId}
+          defaultOpen={searchParams.get("stats") === "1"}
+        />
+      )}
     </div>
   );
 }
@@ -1,8 +1,9 @@
 "use client";
 
-import { useState } from "react";
+import { useEffect, useState } from "react";
 import { useRouter } from "next/navigation";
 import { useGameStore } from "@/stores/gameStore";
+import { parseTimingProfile, TIMING_PROFILES } from "@/lib/game-engine";
 
 interface QuizPack {
   id: string;
@@ -85,6 +86,21 @@ export default function HostPage() {
   const settings = useGameStore((state) => state.settings);
   const updateSettings = useGameStore((state) => state.updateSettings);
 
+  // `?timing=fast` (or NEXT_PUBLIC_TIMING_PROFILE) shortens every wait for
+  // automated tests and load rehearsals.
+  useEffect(() => {
+    const timingProfile = parseTimingProfile(
+      new URLSearchParams(window.location.search).get("timing") ??
+        process.env.NEXT_PUBLIC_TIMING_PROFILE,
+    );
+    if (timingProfile) {
+      updateSettings({
+        timingProfile,
+        questionTimeLimit: TIMING_PROFILES[timingProfile].questionTimeLimit,
+      });
+    }
+  }, [updateSettings]);
+
   const handleCreateGame = async () => {
     setIsLoading(true);
     setError("");
@@ -161,7 +177,14 @@ export default function HostPage() {
         setQuestions(demoQuestions);
       }
 
-      router.push(`/host/lobby?room=${roomId}`);
+      const params = new URLSearchParams(window.location.search);
+      const relayMode = params.get("relay") === "1";
+      const serverMode = params.get("mode") === "server";
+      router.push(
+        `/host/lobby?room=${roomId}${relayMode ? "&relay=1" : ""}${
+          serverMode ? "&mode=server" : ""
+        }`,
+      );
     } catch (err) {
       setError(err instanceof Error ? err.message : "Failed to create game");
     } finally {
@@ -265,6 +288,12 @@ export default function HostPage() {
                   <option value={15000}>15 seconds</option>
                   <option value={20000}>20 seconds</option>
                   <option value={30000}>30 seconds</option>
+                  {settings.timingProfile === "fast" && (
+                    <option value={TIMING_PROFILES.fast.questionTimeLimit}>
+                      {TIMING_PROFILES.fast.questionTimeLimit / 1000} seconds
+                      (fast)
+                    </option>
+                  )}
                 </select>
               </div>
 
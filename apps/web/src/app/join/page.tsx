@@ -2,6 +2,7 @@
 
 import { useState, useEffect, Suspense } from "react";
 import { useRouter, useSearchParams } from "next/navigation";
+import { ServiceWorkerRegistration } from "@/components/ServiceWorkerRegistration";
 
 function JoinContent() {
   const router = useRouter();
@@ -32,8 +33,11 @@ function JoinContent() {
     sessionStorage.setItem("nickname", nickname);
     sessionStorage.setItem("roomCode", roomCode);
 
+    const serverMode = searchParams.get("mode") === "server";
     router.push(
-      `/player/${roomCode}?playerId=${playerId}&nickname=${encodeURIComponent(nickname)}`,
+      `/player/${roomCode}?playerId=${playerId}&nickname=${encodeURIComponent(nickname)}${
+        serverMode ? "&mode=server" : ""
+      }`,
     );
   };
 
@@ -109,8 +113,11 @@ function LoadingState() {
 
 export default function JoinPage() {
   return (
-    <Suspense fallback={<LoadingState />}>
-      <JoinContent />
-    </Suspense>
+    <>
+      <ServiceWorkerRegistration />
+      <Suspense fallback={<LoadingState />}>
+        <JoinContent />
+      </Suspense>
+    </>
   );
 }
@@ -2,8 +2,12 @@
 
 import { Suspense, useEffect, useState, useRef } from "react";
 import { useRouter, useSearchParams } from "next/navigation";
-import { PlayerWebRTCManager } from "@/lib/webrtc";
+import { PlayerWebRTCManager } from "@/lib/webrtc-player";
 import type { ChoiceStats } from "@/lib/answer-stats";
+import { getRelayUrl } from "@/lib/ws-relay";
+import { usePageStateAttribute } from "@/lib/page-state";
+import { permuteChoices } from "@/lib/shuffle";
+import { ServiceWorkerRegistration } from "@/components/ServiceWorkerRegistration";
 
 type PlayerPhase =
   | "connecting"
@@ -19,6 +23,7 @@ interface QuestionData {
   prompt: string;
   choices: { id: string; text: string }[];
   durationMs: number;
+  shuffle?: { seed: number; questionIndex: number };
 }
 
 interface RevealPayload {
@@ -35,6 +40,12 @@ interface LeaderboardEntry {
 
 interface AnswerAckPayload {
   accepted: boolean;
+  questionId?: string;
+}
+
+interface TimerSyncPayload {
+  questionId: string;
+  remainingMs: number;
 }
 
 interface PlayerState {
@@ -110,6 +121,11 @@ function PlayerGameContent() {
         playerId,
         playerToken: storedPlayerToken,
         nickname: decodeURIComponent(nickname),
+        relayUrl: getRelayUrl(),
+        forceIceFailure:
+          searchParams.get("forceRelay") === "1" ||
+          process.env.NEXT_PUBLIC_FORCE_ICE_FAILURE === "true",
+        serverAuthoritative: searchParams.get("mode") === "server",
         onAuth: (resolvedPlayerId, resolvedPlayerToken) => {
           if (typeof window !== "undefined") {
             const key = `playerToken:${roomId}:${resolvedPlayerId}`;
@@ -123,14 +139,27 @@ function PlayerGameContent() {
               | QuestionData
               | RevealPayload
               | LeaderboardEntry[]
-              | AnswerAckPayload;
+              | AnswerAckPayload
+              | TimerSyncPayload;
           };
           if (msg.type === "question" && msg.payload) {
             const payload = msg.payload as QuestionData;
+            // Choice ids stay canonical, so the answer needs no mapping back.
+            const question = payload.shuffle
+              ? {
+                  ...payload,
+                  choices: permuteChoices(
+                    payload.choices,
+                    payload.shuffle.seed,
+                    playerId,
+                    payload.shuffle.questionIndex,
+                  ),
+                }
+              : payload;
             setSelectedChoice(null);
             setState((prev) => ({
               ...prev,
-              question: payload,
+              question,
               phase: "question",
               timeRemaining: Math.floor(payload.durationMs / 1000),
               lastAnswerCorrect: null,
@@ -141,10 +170,28 @@ function PlayerGameContent() {
             }));
           } else if (msg.type === "answer.ack" && msg.payload) {
             const payload = msg.payload as AnswerAckPayload;
-            setState((prev) => ({
-              ...prev,
-              answerDelivery: payload.accepted ? "accepted" : "rejected",
-            }));
+            if (payload.questionId) {
+              webrtcRef.current?.acknowledge(`answer:${payload.questionId}`);
+            }
+            setState((prev) =>
+              payload.questionId && prev.question?.id !== payload.questionId
+                ? prev
+                : {
+                    ...prev,
+                    answerDelivery: payload.accepted ? "accepted" : "rejected",
+                  },
+            );
+          } else if (msg.type === "timer.sync" && msg.payload) {
+            const payload = msg.payload as TimerSyncPayload;
+            const syncedSeconds = Math.ceil(payload.remainingMs / 1000);
+            setState((prev) =>
+              prev.phase === "question" &&
+              prev.question?.id === payload.questionId &&
+              syncedSeconds > 0 &&
+              syncedSeconds !== prev.timeRemaining
+                ? { ...prev, timeRemaining: syncedSeconds }
+                : prev,
+            );
           } else if (msg.type === "reveal") {
             const payload = msg.payload as RevealPayload | undefined;
             const playerResult = payload?.resultsByPlayer?.[playerId];
@@ -245,6 +292,13 @@ function PlayerGameContent() {
     }
   }, [state.phase, state.question, state.timeRemaining]);
 
+  usePageStateAttribute(
+    "phase",
+    connectionStatus === "connecting" ? "connecting" : state.phase,
+  );
+  usePageStateAttribute("answerDelivery", state.answerDelivery ?? "none");
+  usePageStateAttribute("connection", connectionStatus);
+
   const handleSelectChoice = (choiceId: string) => {
     if (state.phase !== "question") return;
     setSelectedChoice(choiceId);
@@ -262,7 +316,7 @@ function PlayerGameContent() {
       answerDelivery: "pending",
     }));
 
-    webrtcRef.current?.send({
+    webrtcRef.current?.sendWithRetry(`answer:${state.question.id}`, {
       type: "answer",
       playerId: state.playerId,
       questionId: state.question.id,
@@ -526,8 +580,11 @@ function LoadingState() {
 
 export default function PlayerGamePage() {
   return (
-    <Suspense fallback={<LoadingState />}>
-      <PlayerGameContent />
-    </Suspense>
+    <>
+      <ServiceWorkerRegistration />
+      <Suspense fallback={<LoadingState />}>
+        <PlayerGameContent />
+      </Suspense>
+    </>
   );
 }
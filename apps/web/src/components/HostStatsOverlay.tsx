@@ -0,0 +1,167 @@
+"use client";
+
+import { useEffect, useState } from "react";
+import {
+  totalMessages,
+  type PeerStats,
+  type PeerStatsSnapshot,
+} from "@/lib/peer-stats";
+
+export const STATS_SAMPLE_INTERVAL_MS = 2000;
+
+interface StatsSource {
+  collectStats: () => Promise<PeerStatsSnapshot>;
+}
+
+function formatBytes(bytes: number): string {
+  if (bytes < 1024) {
+    return `${bytes} B`;
+  }
+  if (bytes < 1024 * 1024) {
+    return `${(bytes / 1024).toFixed(1)} kB`;
+  }
+  return `${(bytes / 1024 / 1024).toFixed(1)} MB`;
+}
+
+function formatMs(ms: number | null): string {
+  return ms === null ? "--" : `${Math.round(ms)}ms`;
+}
+
+// Connected peers first, slowest on top, so laggards are easy to spot.
+function byLag(a: PeerStats, b: PeerStats): number {
+  if ((a.leftAt === null) !== (b.leftAt === null)) {
+    return a.leftAt === null ? -1 : 1;
+  }
+  return (b.rttMs ?? -1) - (a.rttMs ?? -1);
+}
+
+function downloadSnapshot(
+  snapshot: PeerStatsSnapshot,
+  roomId?: string | null,
+): void {
+  const blob = new Blob([JSON.stringify({ roomId, ...snapshot }, null, 2)], {
+    type: "application/json",
+  });
+  const url = URL.createObjectURL(blob);
+  const link = document.createElement("a");
+  link.href = url;
+  link.download = `host-stats-${roomId ?? "room"}-${snapshot.capturedAt}.json`;
+  link.click();
+  URL.revokeObjectURL(url);
+}
+
+/**
+ * Toggleable per-peer diagnostics panel for the host. Stats are only
+ * sampled while the panel is open.
+ */
+export function HostStatsOverlay({
+  getSource,
+  roomId,
+  defaultOpen = false,
+}: {
+  getSource: () => StatsSource | null;
+  roomId?: string | null;
+  defaultOpen?: boolean;
+}) {
+  const [open, setOpen] = useState(defaultOpen);
+  const [snapshot, setSnapshot] = useState<PeerStatsSnapshot | null>(null);
+
+  useEffect(() => {
+    if (!open) {
+      return;
+    }
+
+    let cancelled = false;
+    const sample = async () => {
+      const source = getSource();
+      if (!source) {
+        return;
+      }
+      const next = await source.collectStats();
+      if (!cancelled) {
+        setSnapshot(next);
+      }
+    };
+
+    sample();
+    const timer = setInterval(sample, STATS_SAMPLE_INTERVAL_MS);
+    return () => {
+      cancelled = true;
+      clearInterval(timer);
+    };
+  }, [open, getSource]);
+
+  const peers = snapshot ? [...snapshot.peers].sort(byLag) : [];
+
+  return (
+    <div className="fixed bottom-4 right-4 z-50 flex flex-col items-end gap-2">
+      {open && (
+        <div className="cyber-card rounded-xl p-4 w-[min(760px,95vw)] max-h-[70vh] overflow-auto">
+          <div className="flex items-center justify-between mb-3">
+            <h2 className="font-mono text-sm text-cyber-cyan">
+              PEER STATS ({peers.filter((peer) => !peer.leftAt).length}{" "}
+              connected)
+            </h2>
+            <button
+              onClick={() => snapshot && downloadSnapshot(snapshot, roomId)}
+              disabled={!snapshot}
+              className="cyber-button-secondary px-3 py-1 text-xs rounded-lg"
+            >
+              EXPORT JSON
+            </button>
+          </div>
+          <table className="w-full font-mono text-xs text-cyber-white">
+            <thead className="text-cyber-white-dim text-left">
+              <tr>
+                <th className="pr-3">PLAYER</th>
+                <th className="pr-3">PATH</th>
+                <th className="pr-3">RTT</th>
+                <th className="pr-3">SENT</th>
+                <th className="pr-3">RECV</th>
+                <th className="pr-3">BUFFERED</th>
+                <th className="pr-3">MSGS OUT/IN</th>
+                <th>CONNECT</th>
+              </tr>
+            </thead>
+            <tbody>
+              {peers.map((peer) => {
+                const sent = totalMessages(peer.messages.out);
+                const received = totalMessages(peer.messages.in);
+                return (
+                  <tr
+                    key={peer.playerId}
+                    className={peer.leftAt ? "opacity-50" : undefined}
+                  >
+                    <td className="pr-3 truncate max-w-[140px]">
+                      {peer.nickname ?? peer.playerId.slice(0, 6)}
+                    </td>
+                    <td className="pr-3">
+                      {peer.transport === "relay"
+                        ? "ws-relay"
+                        : (peer.remoteCandidateType ?? "--")}
+                    </td>
+                    <td className="pr-3">{formatMs(peer.rttMs)}</td>
+                    <td className="pr-3">{formatBytes(peer.bytesSent)}</td>
+                    <td className="pr-3">{formatBytes(peer.bytesReceived)}</td>
+                    <td className="pr-3">{formatBytes(peer.bufferedAmount)}</td>
+                    <td className="pr-3">
+                      {sent.count}/{received.count}
+                    </td>
+                    <td>{formatMs(peer.timeToConnectedMs)}</td>
+                  </tr>
+                );
+              })}
+            </tbody>
+          </table>
+        </div>
+      )}
+      <button
+        onClick={() => setOpen((value) => !value)}
+        aria-pressed={open}
+        className="cyber-button-secondary px-3 py-1 text-xs font-mono rounded-lg"
+      >
+        {open ? "HIDE STATS" : "STATS"}
+      </button>
+    </div>
+  );
+}
@@ -0,0 +1,87 @@
+import { bench, describe } from "vitest";
+import { cleanup, render } from "@testing-library/react";
+import { VirtualList } from "./VirtualList";
+import {
+  getPlayerKey,
+  LEADERBOARD_ROW_HEIGHT,
+  LeaderboardRow,
+} from "./PlayerRows";
+
+const PLAYER_COUNTS = [10, 100, 500];
+
+function makeLeaderboard(count: number) {
+  return Array.from({ length: count }, (_, index) => ({
+    id: `player-${index}`,
+    nickname: `Player ${index}`,
+    score: (count - index) * 100,
+  }));
+}
+
+type Entry = ReturnType<typeof makeLeaderboard>[number];
+
+const renderRow = (player: Entry, index: number) => (
+  <LeaderboardRow
+    rank={index + 1}
+    nickname={player.nickname}
+    score={player.score}
+    rankDelta={null}
+  />
+);
+
+function VirtualLeaderboard({ players }: { players: Entry[] }) {
+  return (
+    <VirtualList
+      items={players}
+      getKey={getPlayerKey}
+      rowHeight={LEADERBOARD_ROW_HEIGHT}
+      gap={12}
+      maxHeight={560}
+      renderRow={renderRow}
+    />
+  );
+}
+
+// The pre-virtualization markup: one full row per player.
+function FullLeaderboard({ players }: { players: Entry[] }) {
+  return (
+    <div className="space-y-3">
+      {players.map((player, index) => (
+        <div key={player.id}>{renderRow(player, index)}</div>
+      ))}
+    </div>
+  );
+}
+
+PLAYER_COUNTS.forEach((count) => {
+  const players = makeLeaderboard(count);
+  // Swap neighbouring pairs so every row changes rank.
+  const reranked = players.map((_, index) =>
+    index % 2 === 0
+      ? players[Math.min(index + 1, count - 1)]
+      : players[index - 1],
+  );
+
+  describe(`leaderboard with ${count} players`, () => {
+    bench("full list: mount", () => {
+      render(<FullLeaderboard players={players} />);
+      cleanup();
+    });
+
+    bench("virtual list: mount", () => {
+      render(<VirtualLeaderboard players={players} />);
+      cleanup();
+    });
+
+    bench("full list: re-rank", () => {
+      const { rerender } = render(<FullLeaderboard players={players} />);
+      rerender(<FullLeaderboard players={reranked} />);
+      cleanup();
+    });
+
+    bench("virtual list: re-rank", () => {
+      const { rerender } = render(<VirtualLeaderboard players={players} />);
+      rerender(<VirtualLeaderboard players={reranked} />);
+      cleanup();
+    });
+  });
+});
@@ -0,0 +1,118 @@
+"use client";
+
+import { memo } from "react";
+
+// Row heights must match the rendered rows: VirtualList positions rows by
+// a fixed pitch instead of measuring them.
+export const LOBBY_ROW_HEIGHT = 74;
+export const LEADERBOARD_ROW_HEIGHT = 58;
+export const PODIUM_ROW_HEIGHT = 70;
+
+export function getPlayerKey(player: { id: string }): string {
+  return player.id;
+}
+
+export const LobbyPlayerRow = memo(function LobbyPlayerRow({
+  nickname,
+  isReady,
+}: {
+  nickname: string;
+  isReady: boolean;
+}) {
+  return (
+    <div className="cyber-player-card h-full">
+      <div className="flex items-center gap-3">
+        <div className="cyber-avatar w-10 h-10 text-lg">
+          {nickname.charAt(0).toUpperCase()}
+        </div>
+        <span className="font-medium text-cyber-white truncate max-w-[180px]">
+          {nickname}
+        </span>
+      </div>
+      <span className={isReady ? "cyber-status-ready" : "cyber-status-waiting"}>
+        {isReady ? "READY" : "WAITING"}
+      </span>
+    </div>
+  );
+});
+
+export const LeaderboardRow = memo(function LeaderboardRow({
+  rank,
+  nickname,
+  score,
+  rankDelta,
+}: {
+  rank: number;
+  nickname: string;
+  score: number;
+  rankDelta: number | null;
+}) {
+  return (
+    <div className="cyber-leaderboard-row h-full">
+      <div className="flex items-center gap-3 min-w-0">
+        <span className="font-mono text-cyber-white-dim w-8 shrink-0">
+          #{rank}
+        </span>
+        <span className="font-medium text-cyber-white truncate max-w-[180px]">
+          {nickname}
+        </span>
+        <span
+          className={`font-mono text-xs sm:text-sm whitespace-nowrap ${
+            rankDelta === null
+              ? "text-cyber-white-dim"
+              : rankDelta > 0
+                ? "text-cyber-lime"
+                : "text-cyber-pink"
+          }`}
+        >
+          {rankDelta === null
+            ? "• --"
+            : rankDelta > 0
+              ? `↑ +${rankDelta}`
+              : `↓ ${rankDelta}`}
+        </span>
+      </div>
+      <span className="cyber-score">{score}</span>
+    </div>
+  );
+});
+
+export const PodiumRow = memo(function PodiumRow({
+  rank,
+  nickname,
+  score,
+}: {
+  rank: number;
+  nickname: string;
+  score: number;
+}) {
+  return (
+    <div
+      className={`cyber-leaderboard-row h-full ${
+        rank === 1
+          ? "gold"
+          : rank === 2
+            ? "silver"
+            : rank === 3
+              ? "bronze"
+              : ""
+      }`}
+    >
+      <div className="flex items-center gap-4">
+        <span className="text-3xl font-bold text-cyber-white-dim">
+          {rank === 1
+            ? "🥇"
+            : rank === 2
+              ? "🥈"
+              : rank === 3
+                ? "🥉"
+                : `#${rank}`}
+        </span>
+        <span className="text-xl font-semibold text-cyber-white truncate max-w-[220px]">
+          {nickname}
+        </span>
+      </div>
+      <span className="cyber-score text-3xl">{score}</span>
+    </div>
+  );
+});
@@ -0,0 +1,29 @@
+"use client";
+
+import { useEffect } from "react";
+
+// The version query names the worker's cache, so each deploy installs a
+// fresh shell cache and retires the previous one.
+export const SERVICE_WORKER_URL = `/sw.js?v=${
+  process.env.NEXT_PUBLIC_APP_VERSION || "dev"
+}`;
+
+/** Registers the player app-shell service worker in production builds. */
+export function ServiceWorkerRegistration() {
+  useEffect(() => {
+    if (
+      process.env.NODE_ENV !== "production" ||
+      !("serviceWorker" in navigator)
+    ) {
+      return;
+    }
+
+    navigator.serviceWorker
+      .register(SERVICE_WORKER_URL)
+      .catch((error) =>
+        console.error("Failed to register service worker:", error),
+      );
+  }, []);
+
+  return null;
+}
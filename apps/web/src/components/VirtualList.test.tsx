@@ -0,0 +1,141 @@
+import { memo } from "react";
+import { describe, expect, it, vi } from "vitest";
+import { fireEvent, render, screen } from "@testing-library/react";
+import { VirtualList } from "./VirtualList";
+
+interface Item {
+  id: string;
+  label: string;
+}
+
+function makeItems(count: number): Item[] {
+  return Array.from({ length: count }, (_, index) => ({
+    id: `p${index}`,
+    label: `Player ${index}`,
+  }));
+}
+
+const getKey = (item: Item) => item.id;
+
+describe("VirtualList", () => {
+  it("mounts only the rows in the viewport", () => {
+    render(
+      <VirtualList
+        items={makeItems(500)}
+        getKey={getKey}
+        rowHeight={50}
+        maxHeight={500}
+        overscan={2}
+        renderRow={(item) => <span>{item.label}</span>}
+      />,
+    );
+
+    expect(screen.getAllByRole("listitem")).toHaveLength(11 + 2);
+    expect(screen.getByText("Player 0")).toBeInTheDocument();
+    expect(screen.queryByText("Player 100")).not.toBeInTheDocument();
+  });
+
+  it("moves the window when scrolled", () => {
+    const { container } = render(
+      <VirtualList
+        items={makeItems(500)}
+        getKey={getKey}
+        rowHeight={50}
+        maxHeight={500}
+        overscan={2}
+        renderRow={(item) => <span>{item.label}</span>}
+      />,
+    );
+    const viewport = container.firstChild as HTMLDivElement;
+
+    viewport.scrollTop = 5000;
+    fireEvent.scroll(viewport);
+
+    expect(screen.getByText("Player 100")).toBeInTheDocument();
+    expect(screen.queryByText("Player 0")).not.toBeInTheDocument();
+  });
+
+  it("does not re-render memoized rows whose props are unchanged", () => {
+    const renders = vi.fn();
+    const Row = memo(function Row({ label }: { label: string }) {
+      renders(label);
+      return <span>{label}</span>;
+    });
+    const items = makeItems(20);
+    const renderRow = (item: Item) => <Row label={item.label} />;
+
+    const { rerender } = render(
+      <VirtualList
+        items={items}
+        getKey={getKey}
+        rowHeight={50}
+        maxHeight={500}
+        renderRow={renderRow}
+      />,
+    );
+    renders.mockClear();
+
+    const updated = [...items];
+    updated[1] = { ...items[1], label: "Renamed" };
+    rerender(
+      <VirtualList
+        items={updated}
+        getKey={getKey}
+        rowHeight={50}
+        maxHeight={500}
+        renderRow={renderRow}
+      />,
+    );
+
+    expect(renders).toHaveBeenCalledTimes(1);
+    expect(renders).toHaveBeenCalledWith("Renamed");
+  });
+
+  it("starts moved rows at their previous position", () => {
+    const items = makeItems(3);
+    const { rerender } = render(
+      <VirtualList
+        items={items}
+        getKey={getKey}
+        rowHeight={50}
+        gap={10}
+        maxHeight={500}
+        renderRow={(item) => <span>{item.label}</span>}
+      />,
+    );
+
+    rerender(
+      <VirtualList
+        items={[items[2], items[0], items[1]]}
+        getKey={getKey}
+        rowHeight={50}
+        gap={10}
+        maxHeight={500}
+        renderRow={(item) => <span>{item.label}</span>}
+      />,
+    );
+
+    const rowFor = (label: string) =>
+      screen.getByText(label).parentElement as HTMLElement;
+    expect(rowFor("Player 2").style.transform).toBe("translateY(120px)");
+    expect(rowFor("Player 0").style.transform).toBe("translateY(-60px)");
+    expect(rowFor("Player 0").style.top).toBe("60px");
+  });
+
+  it("animates from previousIndexes supplied on mount", () => {
+    const items = makeItems(3);
+    render(
+      <VirtualList
+        items={items}
+        getKey={getKey}
+        rowHeight={50}
+        maxHeight={500}
+        previousIndexes={new Map([["p0", 2]])}
+        renderRow={(item) => <span>{item.label}</span>}
+      />,
+    );
+
+    const row = screen.getByText("Player 0").parentElement as HTMLElement;
+    expect(row.style.transform).toBe("translateY(100px)");
+  });
+});
@@ -0,0 +1,171 @@
+"use client";
+
+import {
+  useCallback,
+  useLayoutEffect,
+  useRef,
+  useState,
+  type ReactNode,
+  type UIEvent,
+} from "react";
+import { computeFlipOffsets, computeVirtualWindow } from "@/lib/virtual-window";
+
+export const FLIP_DURATION_MS = 300;
+
+function nextFrame(callback: () => void): void {
+  if (typeof requestAnimationFrame === "function") {
+    requestAnimationFrame(callback);
+  } else {
+    setTimeout(callback, 16);
+  }
+}
+
+function playFlip(element: HTMLElement, offset: number): void {
+  element.style.transition = "none";
+  element.style.transform = `translateY(${offset}px)`;
+
+  nextFrame(() => {
+    element.style.transition = `transform ${FLIP_DURATION_MS}ms ease-out`;
+    element.style.transform = "";
+  });
+}
+
+interface VirtualListProps<T> {
+  items: T[];
+  getKey: (item: T) => string;
+  renderRow: (item: T, index: number) => ReactNode;
+  rowHeight: number;
+  gap?: number;
+  maxHeight: number;
+  overscan?: number;
+  /**
+   * Index each key occupied before this list mounted (e.g. the previous
+   * round's ranks). Rows animate from there once per new map; after that,
+   * reorders while mounted animate from the last rendered positions.
+   */
+  previousIndexes?: ReadonlyMap<string, number> | null;
+  className?: string;
+  ariaLabel?: string;
+}
+
+/**
+ * Renders only the rows inside the scroll viewport (plus overscan) of a
+ * fixed-pitch list. Reorders are animated FLIP-style on the visible rows
+ * only; since every row has the same pitch, the "first" position comes from
+ * the previous index instead of a layout read.
+ */
+export function VirtualList<T>({
+  items,
+  getKey,
+  renderRow,
+  rowHeight,
+  gap = 0,
+  maxHeight,
+  overscan,
+  previousIndexes,
+  className,
+  ariaLabel,
+}: VirtualListProps<T>) {
+  const rowPitch = rowHeight + gap;
+  const [firstRow, setFirstRow] = useState(0);
+  const rowElements = useRef(new Map<string, HTMLDivElement>());
+  const lastIndexes = useRef(new Map<string, number>());
+  const seededFrom = useRef<ReadonlyMap<string, number> | null>(null);
+
+  const { start, end, totalHeight } = computeVirtualWindow({
+    itemCount: items.length,
+    rowPitch,
+    viewportHeight: maxHeight,
+    scrollTop: firstRow * rowPitch,
+    overscan,
+  });
+
+  // Scroll only re-renders when the first visible row changes.
+  const handleScroll = useCallback(
+    (event: UIEvent<HTMLDivElement>) => {
+      const row = Math.floor(event.currentTarget.scrollTop / rowPitch);
+      setFirstRow((current) => (current === row ? current : row));
+    },
+    [rowPitch],
+  );
+
+  const setRowElement = useCallback(
+    (key: string, element: HTMLDivElement | null) => {
+      if (element) {
+        rowElements.current.set(key, element);
+      } else {
+        rowElements.current.delete(key);
+      }
+    },
+    [],
+  );
+
+  useLayoutEffect(() => {
+    const seed =
+      previousIndexes && previousIndexes !== seededFrom.current
+        ? previousIndexes
+        : lastIndexes.current;
+    seededFrom.current = previousIndexes ?? null;
+
+    const keyAt = (index: number) => getKey(items[index]);
+    const offsets = computeFlipOffsets({
+      keyAt,
+      start,
+      end,
+      previousIndexes: seed,
+      rowPitch,
+      maxOffset: maxHeight + rowPitch,
+    });
+
+    offsets.forEach((offset, key) => {
+      const element = rowElements.current.get(key);
+      if (element) {
+        playFlip(element, offset);
+      }
+    });
+
+    const rendered = new Map<string, number>();
+    for (let index = start; index < end; index++) {
+      rendered.set(keyAt(index), index);
+    }
+    lastIndexes.current = rendered;
+  }, [items, getKey, start, end, rowPitch, maxHeight, previousIndexes]);
+
+  const rows: ReactNode[] = [];
+  for (let index = start; index < end; index++) {
+    const item = items[index];
+    const key = getKey(item);
+    rows.push(
+      <div
+        key={key}
+        ref={(element) => setRowElement(key, element)}
+        role="listitem"
+        style={{
+          position: "absolute",
+          top: index * rowPitch,
+          left: 0,
+          right: 0,
+          height: rowHeight,
+        }}
+      >
+        {renderRow(item, index)}
+      </div>,
+    );
+  }
+
+  return (
+    <div
+      className={className}
+      onScroll={handleScroll}
+      style={{ maxHeight, overflowY: "auto" }}
+    >
+      <div
+        role="list"
+        aria-label={ariaLabel}
+        style={{ position: "relative", height: Math.max(0, totalHeight - gap) }}
+      >
+        {rows}
+      </div>
+    </div>
+  );
+}
@@ -1,5 +1,10 @@
 import { describe, expect, it } from "vitest";
-import { buildChoiceStats } from "./answer-stats";
+import {
+  buildChoiceStats,
+  choiceStatsFromTally,
+  createAnswerTally,
+  recordAnswer,
+} from "./answer-stats";
 
 describe("buildChoiceStats", () => {
   it("returns zeroed stats when there are no answers", () => {
@@ -54,3 +59,47 @@ describe("buildChoiceStats", () => {
     });
   });
 });
+
+describe("answer tally", () => {
+  const question = {
+    id: "q1",
+    choices: [{ id: "a" }, { id: "b" }, { id: "c" }],
+    answer: { choiceId: "b" },
+  };
+
+  it("matches buildChoiceStats without rescanning answers", () => {
+    const answers = new Map<string, string[]>([
+      ["p1", ["a"]],
+      ["p2", ["b"]],
+      ["p3", ["b"]],
+      ["p4", ["z"]],
+    ]);
+
+    let tally = createAnswerTally(question, 5000);
+    answers.forEach((choiceIds) => {
+      tally = recordAnswer(tally, choiceIds[0], 1000);
+    });
+
+    expect(choiceStatsFromTally(tally)).toEqual(
+      buildChoiceStats(question.choices, answers),
+    );
+    expect(tally.correctCount).toBe(2);
+  });
+
+  it("buckets response times and clamps late answers", () => {
+    let tally = createAnswerTally(question, 2000);
+    expect(tally.responseTimeHistogram).toEqual([0, 0, 0]);
+
+    tally = recordAnswer(tally, "a", 0);
+    tally = recordAnswer(tally, "a", 1999);
+    tally = recordAnswer(tally, "a", 9000);
+
+    expect(tally.responseTimeHistogram).toEqual([1, 1, 1]);
+  });
+
+  it("returns the same tally for unknown choices", () => {
+    const tally = createAnswerTally(question, 2000);
+    expect(recordAnswer(tally, "z", 100)).toBe(tally);
+    expect(recordAnswer(tally, undefined, 100)).toBe(tally);
+  });
+});
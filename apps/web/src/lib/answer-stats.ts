@@ -35,3 +35,91 @@ export function buildChoiceStats(
 
   return { choiceStats, totalAnswered };
 }
+
+export const RESPONSE_TIME_BUCKET_MS = 1000;
+
+/**
+ * Running per-question totals, updated once per accepted answer so live
+ * views and reveal never rescan the answers map. Copies are proportional to
+ * the number of choices and buckets, not to the number of players.
+ */
+export interface AnswerTally {
+  questionId: string | null;
+  correctChoiceId: string | null;
+  choiceCounts: Record<string, number>;
+  totalAnswered: number;
+  correctCount: number;
+  responseTimeHistogram: number[];
+}
+
+export function createAnswerTally(
+  question?: {
+    id: string;
+    choices: Array<{ id: string }>;
+    answer: { choiceId: string };
+  },
+  timeLimitMs = 0,
+): AnswerTally {
+  const buckets = Math.ceil((timeLimitMs + 1000) / RESPONSE_TIME_BUCKET_MS);
+
+  return {
+    questionId: question?.id ?? null,
+    correctChoiceId: question?.answer.choiceId ?? null,
+    choiceCounts: Object.fromEntries(
+      (question?.choices ?? []).map((choice) => [choice.id, 0]),
+    ),
+    totalAnswered: 0,
+    correctCount: 0,
+    responseTimeHistogram: question ? new Array(buckets).fill(0) : [],
+  };
+}
+
+export function recordAnswer(
+  tally: AnswerTally,
+  choiceId: string | undefined,
+  timeMs: number,
+): AnswerTally {
+  if (!choiceId || tally.choiceCounts[choiceId] === undefined) {
+    return tally;
+  }
+
+  const histogram = [...tally.responseTimeHistogram];
+  const bucket = Math.min(
+    histogram.length - 1,
+    Math.floor(timeMs / RESPONSE_TIME_BUCKET_MS),
+  );
+  if (bucket >= 0) {
+    histogram[bucket] += 1;
+  }
+
+  return {
+    ...tally,
+    choiceCounts: {
+      ...tally.choiceCounts,
+      [choiceId]: tally.choiceCounts[choiceId] + 1,
+    },
+    totalAnswered: tally.totalAnswered + 1,
+    correctCount:
+      tally.correctCount + (choiceId === tally.correctChoiceId ? 1 : 0),
+    responseTimeHistogram: histogram,
+  };
+}
+
+export function choiceStatsFromTally(tally: AnswerTally): {
+  choiceStats: ChoiceStats;
+  totalAnswered: number;
+} {
+  const { choiceCounts, totalAnswered } = tally;
+  const choiceStats: ChoiceStats = {};
+
+  Object.keys(choiceCounts).forEach((choiceId) => {
+    const count = choiceCounts[choiceId];
+    choiceStats[choiceId] = {
+      count,
+      percent:
+        totalAnswered > 0 ? Math.round((count / totalAnswered) * 100) : 0,
+    };
+  });
+
+  return { choiceStats, totalAnswered };
+}
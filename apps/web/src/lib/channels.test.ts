@@ -0,0 +1,67 @@
+import { describe, expect, it, vi } from "vitest";
+import {
+  createFastChannel,
+  FAST_CHANNEL_ID,
+  FAST_CHANNEL_LABEL,
+  pickOpenChannel,
+  selectLane,
+} from "./channels";
+
+function fakeChannel(readyState: RTCDataChannelState) {
+  return { readyState, send: vi.fn() } as unknown as RTCDataChannel;
+}
+
+describe("selectLane", () => {
+  it("routes latency-critical message types to the fast lane", () => {
+    expect(selectLane({ type: "answer" })).toBe("fast");
+    expect(selectLane({ type: "answer.ack" })).toBe("fast");
+    expect(selectLane({ type: "timer.sync" })).toBe("fast");
+  });
+
+  it("keeps bulk state and unknown payloads on the reliable lane", () => {
+    expect(selectLane({ type: "question" })).toBe("reliable");
+    expect(selectLane({ type: "reveal" })).toBe("reliable");
+    expect(selectLane({ type: "leaderboard" })).toBe("reliable");
+    expect(selectLane({})).toBe("reliable");
+    expect(selectLane(null)).toBe("reliable");
+    expect(selectLane("answer")).toBe("reliable");
+  });
+});
+
+describe("pickOpenChannel", () => {
+  it("prefers the fast channel for fast-lane messages when it is open", () => {
+    const reliable = fakeChannel("open");
+    const fast = fakeChannel("open");
+
+    expect(pickOpenChannel("fast", reliable, fast)).toBe(fast);
+    expect(pickOpenChannel("reliable", reliable, fast)).toBe(reliable);
+  });
+
+  it("falls back to the reliable channel when the fast one is not open", () => {
+    const reliable = fakeChannel("open");
+
+    expect(pickOpenChannel("fast", reliable, fakeChannel("connecting"))).toBe(
+      reliable,
+    );
+    expect(pickOpenChannel("fast", reliable, undefined)).toBe(reliable);
+  });
+
+  it("returns null when nothing is open", () => {
+    expect(pickOpenChannel("fast", fakeChannel("closed"), null)).toBeNull();
+    expect(pickOpenChannel("reliable", null, fakeChannel("open"))).toBeNull();
+  });
+});
+
+describe("createFastChannel", () => {
+  it("negotiates an unordered channel with bounded retransmits", () => {
+    const createDataChannel = vi.fn();
+    createFastChannel({ createDataChannel } as unknown as RTCPeerConnection);
+
+    expect(createDataChannel).toHaveBeenCalledWith(FAST_CHANNEL_LABEL, {
+      negotiated: true,
+      id: FAST_CHANNEL_ID,
+      ordered: false,
+      maxRetransmits: 2,
+    });
+  });
+});
@@ -0,0 +1,60 @@
+export type ChannelLane = "reliable" | "fast";
+
+export const ICE_SERVERS: RTCIceServer[] = [
+  { urls: "stun:stun.l.google.com:19302" },
+];
+
+export const RELIABLE_CHANNEL_LABEL = "game";
+export const FAST_CHANNEL_LABEL = "game-fast";
+
+// Negotiated out-of-band on both peers; kept well above the ids the
+// browser hands out to in-band channels so the two never collide.
+export const FAST_CHANNEL_ID = 1000;
+export const FAST_CHANNEL_MAX_RETRANSMITS = 2;
+
+export const ANSWER_RETRY_INTERVAL_MS = 600;
+export const ANSWER_MAX_ATTEMPTS = 6;
+
+// Small, idempotent messages where a stale retransmit is worse than a drop.
+const FAST_LANE_TYPES = new Set(["answer", "answer.ack", "timer.sync"]);
+
+export function getMessageType(data: unknown): string | undefined {
+  if (typeof data !== "object" || data === null) {
+    return undefined;
+  }
+
+  const type = (data as { type?: unknown }).type;
+  return typeof type === "string" ? type : undefined;
+}
+
+export function selectLane(data: unknown): ChannelLane {
+  const type = getMessageType(data);
+  return type && FAST_LANE_TYPES.has(type) ? "fast" : "reliable";
+}
+
+export function createFastChannel(
+  connection: RTCPeerConnection,
+): RTCDataChannel {
+  return connection.createDataChannel(FAST_CHANNEL_LABEL, {
+    negotiated: true,
+    id: FAST_CHANNEL_ID,
+    ordered: false,
+    maxRetransmits: FAST_CHANNEL_MAX_RETRANSMITS,
+  });
+}
+
+export function pickOpenChannel(
+  lane: ChannelLane,
+  reliable: RTCDataChannel | null | undefined,
+  fast: RTCDataChannel | null | undefined,
+): RTCDataChannel | null {
+  if (lane === "fast" && fast && fast.readyState === "open") {
+    return fast;
+  }
+
+  if (reliable && reliable.readyState === "open") {
+    return reliable;
+  }
+
+  return null;
+}
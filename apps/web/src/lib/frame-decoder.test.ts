@@ -0,0 +1,133 @@
+import { describe, expect, it } from "vitest";
+import {
+  FrameDecoder,
+  MAX_FRAME_BYTES,
+  MAX_RELAY_BATCH,
+} from "./frame-decoder";
+
+const ANSWER = {
+  type: "answer",
+  playerId: "p1",
+  questionId: "q1",
+  choiceId: "b",
+  timeMs: 1200,
+};
+
+function relayAnswers(count: number) {
+  return {
+    type: "relay.answers",
+    payload: {
+      answers: Array.from({ length: count }, (_, index) => ({
+        playerId: `p${index}`,
+        message: { ...ANSWER, playerId: `p${index}` },
+      })),
+    },
+  };
+}
+
+describe("FrameDecoder", () => {
+  it("decodes valid answer and relay frames", () => {
+    const decoder = new FrameDecoder();
+
+    expect(decoder.decode("p1", JSON.stringify(ANSWER))).toEqual({
+      ok: true,
+      type: "answer",
+      data: ANSWER,
+    });
+    expect(
+      decoder.decode("r1", JSON.stringify(relayAnswers(3))),
+    ).toMatchObject({ ok: true, type: "relay.answers" });
+    expect(
+      decoder.decode(
+        "r1",
+        JSON.stringify({ type: "relay.ready", payload: { childId: "p2" } }),
+      ),
+    ).toMatchObject({ ok: true, type: "relay.ready" });
+  });
+
+  it("rejects oversized frames before parsing", () => {
+    const decoder = new FrameDecoder();
+    const padded = JSON.stringify({ ...ANSWER, questionId: "q".repeat(600) });
+
+    expect(decoder.decode("p1", padded)).toEqual({
+      ok: false,
+      reason: "oversized",
+    });
+    expect(decoder.decode("p1", "x".repeat(MAX_FRAME_BYTES + 1))).toEqual({
+      ok: false,
+      reason: "oversized",
+    });
+  });
+
+  it("rejects unknown types, malformed JSON and invalid shapes", () => {
+    const decoder = new FrameDecoder();
+
+    expect(
+      decoder.decode("p1", JSON.stringify({ type: "host.start" })),
+    ).toEqual({ ok: false, reason: "unknown-type" });
+    expect(decoder.decode("p1", '{"type":"answer",')).toEqual({
+      ok: false,
+      reason: "malformed",
+    });
+    expect(
+      decoder.decode("p1", JSON.stringify({ ...ANSWER, timeMs: "soon" })),
+    ).toEqual({ ok: false, reason: "invalid" });
+    expect(
+      decoder.decode("r1", JSON.stringify(relayAnswers(MAX_RELAY_BATCH + 1))),
+    ).toEqual({ ok: false, reason: "invalid" });
+    expect(decoder.rejections).toMatchObject({
+      "unknown-type": 1,
+      malformed: 1,
+      invalid: 2,
+    });
+  });
+
+  it("validates frames whose type is not the first key", () => {
+    const decoder = new FrameDecoder();
+    const reordered = JSON.stringify({
+      choiceId: "b",
+      timeMs: 10,
+      type: "answer",
+    });
+
+    expect(decoder.decode("p1", reordered)).toMatchObject({ ok: true });
+    expect(
+      decoder.decode("p1", JSON.stringify({ choiceId: "b", type: "nope" })),
+    ).toEqual({ ok: false, reason: "unknown-type" });
+  });
+
+  it("rate limits each peer with a token bucket", () => {
+    let clock = 0;
+    const decoder = new FrameDecoder({
+      rateLimit: { perSecond: 10, burst: 5 },
+      now: () => clock,
+    });
+    const raw = JSON.stringify(ANSWER);
+
+    const burst = Array.from({ length: 6 }, () => decoder.decode("p1", raw).ok);
+    expect(burst).toEqual([true, true, true, true, true, false]);
+    // Another peer has its own budget.
+    expect(decoder.decode("p2", raw).ok).toBe(true);
+
+    clock = 100;
+    expect(decoder.decode("p1", raw).ok).toBe(true);
+    expect(decoder.decode("p1", raw).ok).toBe(false);
+    expect(decoder.rejections["rate-limited"]).toBe(2);
+
+    decoder.forget("p1");
+    expect(decoder.decode("p1", raw).ok).toBe(true);
+  });
+
+  it("applies the same checks to frames that arrive parsed", () => {
+    const decoder = new FrameDecoder({ rateLimit: { burst: 1 } });
+
+    expect(decoder.accept("p1", { type: "relay.signal" })).toEqual({
+      ok: false,
+      reason: "invalid",
+    });
+    expect(decoder.accept("p1", ANSWER)).toEqual({
+      ok: false,
+      reason: "rate-limited",
+    });
+  });
+});
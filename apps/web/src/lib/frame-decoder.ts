@@ -0,0 +1,223 @@
+import { validateAnswerFrame } from "@opentriiva/protocol";
+import { getMessageType } from "@/lib/channels";
+import { messageTypeOf } from "@/lib/peer-stats";
+
+/** Upper bound for any player frame, checked before anything else. */
+export const MAX_FRAME_BYTES = 16 * 1024;
+
+/** Most answers a relay may forward in one `relay.answers` batch. */
+export const MAX_RELAY_BATCH = 64;
+
+export interface FrameRateLimit {
+  /** Frames per second a peer can sustain. */
+  perSecond: number;
+  /** Frames a peer can send back to back, e.g. trickled ICE candidates. */
+  burst: number;
+}
+
+export const DEFAULT_FRAME_RATE_LIMIT: FrameRateLimit = {
+  perSecond: 20,
+  burst: 100,
+};
+
+export type FrameRejection =
+  | "oversized"
+  | "rate-limited"
+  | "malformed"
+  | "unknown-type"
+  | "invalid";
+
+export type DecodedFrame =
+  | { ok: true; type: string; data: unknown }
+  | { ok: false; reason: FrameRejection };
+
+interface FrameSpec {
+  maxBytes: number;
+  validate: (data: unknown) => boolean;
+}
+
+function payloadOf(data: unknown): Record<string, unknown> | null {
+  const payload = (data as { payload?: unknown }).payload;
+  return typeof payload === "object" && payload !== null
+    ? (payload as Record<string, unknown>)
+    : null;
+}
+
+function isId(value: unknown): value is string {
+  return typeof value === "string" && value.length > 0 && value.length <= 128;
+}
+
+function isOptionalObject(value: unknown): boolean {
+  return value === undefined || (typeof value === "object" && value !== null);
+}
+
+function isRelaySignal(data: unknown): boolean {
+  const payload = payloadOf(data);
+  return (
+    payload !== null &&
+    isId(payload.to) &&
+    isOptionalObject(payload.description) &&
+    isOptionalObject(payload.candidate)
+  );
+}
+
+function isRelayAnswers(data: unknown): boolean {
+  const answers = payloadOf(data)?.answers;
+  if (!Array.isArray(answers) || answers.length > MAX_RELAY_BATCH) {
+    return false;
+  }
+
+  return answers.every(
+    (answer) =>
+      typeof answer === "object" &&
+      answer !== null &&
+      isId(answer.playerId) &&
+      validateAnswerFrame(answer.message),
+  );
+}
+
+// Every frame a player may send the host, keyed by `type`. Anything else is
+// dropped. Size limits are per type so a frame that claims to be an answer
+// cannot carry a 16 KB body into JSON.parse.
+const FRAME_SPECS: Map<string, FrameSpec> = new Map([
+  ["answer", { maxBytes: 512, validate: validateAnswerFrame }],
+  ["relay.signal", { maxBytes: MAX_FRAME_BYTES, validate: isRelaySignal }],
+  [
+    "relay.ready",
+    { maxBytes: 512, validate: (data) => isId(payloadOf(data)?.childId) },
+  ],
+  [
+    "relay.lost",
+    { maxBytes: 512, validate: (data) => isId(payloadOf(data)?.relayId) },
+  ],
+  ["relay.answers", { maxBytes: MAX_FRAME_BYTES, validate: isRelayAnswers }],
+]);
+
+const NO_TYPE = messageTypeOf("");
+
+/**
+ * Host-side gate for player frames. Oversized frames and frames whose
+ * leading type is not one players send are rejected before JSON.parse; the
+ * rest are parsed and checked against the validator for their type, so
+ * callers only ever see well-formed frames. Each peer also gets a token
+ * bucket, so a flooding client costs a length check per frame rather than
+ * a parse and a trip through the engine.
+ */
+export class FrameDecoder {
+  private limit: FrameRateLimit;
+  private now: () => number;
+  private buckets: Map<string, { tokens: number; refilledAt: number }> =
+    new Map();
+  private rejected: Record<FrameRejection, number> = {
+    oversized: 0,
+    "rate-limited": 0,
+    malformed: 0,
+    "unknown-type": 0,
+    invalid: 0,
+  };
+
+  constructor(
+    options: { rateLimit?: Partial<FrameRateLimit>; now?: () => number } = {},
+  ) {
+    this.limit = { ...DEFAULT_FRAME_RATE_LIMIT, ...options.rateLimit };
+    this.now = options.now ?? Date.now;
+  }
+
+  decode(playerId: string, raw: string): DecodedFrame {
+    if (raw.length > MAX_FRAME_BYTES) {
+      return this.reject("oversized");
+    }
+    if (!this.take(playerId)) {
+      return this.reject("rate-limited");
+    }
+
+    // Frames without a leading type (reordered keys) still get parsed and
+    // validated below, just without the early checks.
+    const sniffed = messageTypeOf(raw);
+    if (sniffed !== NO_TYPE) {
+      const spec = FRAME_SPECS.get(sniffed);
+      if (!spec) {
+        return this.reject("unknown-type");
+      }
+      if (raw.length > spec.maxBytes) {
+        return this.reject("oversized");
+      }
+    }
+
+    let data: unknown;
+    try {
+      data = JSON.parse(raw);
+    } catch {
+      return this.reject("malformed");
+    }
+
+    return this.validate(data);
+  }
+
+  /** Same checks for frames that arrive already parsed, e.g. over the relay. */
+  accept(playerId: string, data: unknown): DecodedFrame {
+    if (!this.take(playerId)) {
+      return this.reject("rate-limited");
+    }
+
+    return this.validate(data);
+  }
+
+  /** Drops rate-limit state for players that are no longer connected. */
+  retain(playerIds: Iterable<string>): void {
+    const keep = new Set(playerIds);
+    Array.from(this.buckets.keys()).forEach((playerId) => {
+      if (!keep.has(playerId)) {
+        this.buckets.delete(playerId);
+      }
+    });
+  }
+
+  forget(playerId: string): void {
+    this.buckets.delete(playerId);
+  }
+
+  get rejections(): Readonly<Record<FrameRejection, number>> {
+    return { ...this.rejected };
+  }
+
+  private validate(data: unknown): DecodedFrame {
+    const type = getMessageType(data);
+    const spec = type === undefined ? undefined : FRAME_SPECS.get(type);
+    if (type === undefined || !spec) {
+      return this.reject("unknown-type");
+    }
+    if (!spec.validate(data)) {
+      return this.reject("invalid");
+    }
+
+    return { ok: true, type, data };
+  }
+
+  private take(playerId: string): boolean {
+    const now = this.now();
+    let bucket = this.buckets.get(playerId);
+    if (!bucket) {
+      bucket = { tokens: this.limit.burst, refilledAt: now };
+      this.buckets.set(playerId, bucket);
+    } else {
+      const elapsedMs = Math.max(0, now - bucket.refilledAt);
+      bucket.tokens = Math.min(
+        this.limit.burst,
+        bucket.tokens + (elapsedMs / 1000) * this.limit.perSecond,
+      );
+      bucket.refilledAt = now;
+    }
+
+    if (bucket.tokens < 1) {
+      return false;
+    }
+    bucket.tokens -= 1;
+    return true;
+  }
+
+  private reject(reason: FrameRejection): DecodedFrame {
+    this.rejected[reason] += 1;
+    return { ok: false, reason };
+  }
+}
@@ -0,0 +1,68 @@
+import { bench, describe } from "vitest";
+import type { Question } from "@opentriiva/pack-schema";
+import { createGameStore } from "@/stores/gameStore";
+import {
+  buildLeaderboard,
+  buildQuestionPayload,
+  buildRevealPayload,
+} from "./game-engine";
+
+const ROOM_SIZES = [10, 100, 1000];
+
+const QUESTION: Question = {
+  id: "q1",
+  type: "mcq",
+  prompt: "Which planet is known as the Red Planet?",
+  choices: ["Venus", "Mars", "Jupiter", "Saturn"].map((text, index) => ({
+    id: "abcd"[index],
+    text,
+  })),
+  answer: { choiceId: "b" },
+};
+
+// A room at the end of a round: everyone has answered and has a score.
+function answeredRoom(players: number) {
+  const store = createGameStore();
+  const state = store.getState();
+  for (let index = 0; index < players; index++) {
+    state.addPlayer({
+      id: `p${index}`,
+      nickname: `Player ${index}`,
+      isReady: true,
+      isConnected: true,
+      score: 0,
+    });
+  }
+  state.setQuestions([QUESTION]);
+  state.startGame();
+  state.showQuestion();
+  for (let index = 0; index < players; index++) {
+    store
+      .getState()
+      .submitAnswer(`p${index}`, "q1", ["abcd"[index % 4]], index * 10);
+  }
+  return store.getState();
+}
+
+// What the host encodes per broadcast; the encoded string is then sent to
+// every peer as-is.
+for (const players of ROOM_SIZES) {
+  describe(`broadcast encoding (${players} players)`, () => {
+    const state = answeredRoom(players);
+
+    bench("question", () => {
+      JSON.stringify(buildQuestionPayload(QUESTION, 20_000));
+    });
+
+    bench("reveal", () => {
+      JSON.stringify({
+        type: "reveal",
+        payload: buildRevealPayload(state, QUESTION),
+      });
+    });
+
+    bench("leaderboard", () => {
+      JSON.stringify({ type: "leaderboard", payload: buildLeaderboard(state) });
+    });
+  });
+}
@@ -0,0 +1,267 @@
+import { describe, it, expect } from "vitest";
+import type { Question } from "@opentriiva/pack-schema";
+import {
+  GameEngine,
+  parseTimingProfile,
+  TIMING_PROFILES,
+  type Outbound,
+} from "./game-engine";
+
+const questions: Question[] = [
+  {
+    id: "q1",
+    type: "mcq",
+    prompt: "What is the capital of France?",
+    choices: [
+      { id: "a", text: "London" },
+      { id: "b", text: "Paris" },
+    ],
+    answer: { choiceId: "b" },
+  },
+  {
+    id: "q2",
+    type: "boolean",
+    prompt: "The sky is blue.",
+    choices: [
+      { id: "true", text: "True" },
+      { id: "false", text: "False" },
+    ],
+    answer: { choiceId: "true" },
+  },
+];
+
+function setup(options: { players?: number; showLeaderboard?: boolean } = {}) {
+  let clock = 0;
+  const sent: Outbound[] = [];
+  const engine = new GameEngine({
+    now: () => clock,
+    emit: (outbound) => sent.push(outbound),
+  });
+
+  const state = engine.getState();
+  state.setQuestions(questions);
+  state.updateSettings({
+    questionTimeLimit: 10000,
+    showLeaderboard: options.showLeaderboard ?? true,
+  });
+  for (let i = 0; i < (options.players ?? 2); i++) {
+    engine.dispatch({ type: "player.join", playerId: `p${i}` });
+  }
+
+  const advanceTo = (time: number) => {
+    let deadline = engine.nextDeadline();
+    while (deadline !== null && deadline <= time) {
+      clock = deadline;
+      engine.tick();
+      deadline = engine.nextDeadline();
+    }
+    clock = time;
+  };
+
+  const answer = (playerId: string, questionId: string, choiceId: string) =>
+    engine.dispatch({
+      type: "message",
+      playerId,
+      data: { type: "answer", questionId, choiceId, timeMs: clock - 3000 },
+    });
+
+  const types = () => sent.map((outbound) => outbound.message.type);
+
+  return { engine, sent, advanceTo, answer, types };
+}
+
+describe("GameEngine", () => {
+  it("counts down and broadcasts the first question", () => {
+    const { engine, sent, advanceTo } = setup();
+
+    engine.dispatch({ type: "start" });
+    expect(engine.getState().phase).toBe("countdown");
+    expect(engine.getState().countdown).toBe(3);
+
+    advanceTo(2000);
+    expect(engine.getState().countdown).toBe(1);
+    expect(sent).toHaveLength(0);
+
+    advanceTo(3000);
+    expect(engine.getState().phase).toBe("question");
+    expect(engine.getState().questionStartTime).toBe(3000);
+    expect(sent).toEqual([
+      {
+        to: "*",
+        message: {
+          type: "question",
+          payload: {
+            id: "q1",
+            prompt: questions[0].prompt,
+            choices: questions[0].choices,
+            durationMs: 10000,
+          },
+        },
+      },
+    ]);
+  });
+
+  it("sends canonical choices with a shuffle seed when choices shuffle", () => {
+    const { engine, sent, advanceTo, answer } = setup();
+    engine.getState().updateSettings({ shuffleChoices: true });
+    engine.dispatch({ type: "start" });
+    advanceTo(3000);
+
+    const { shuffleSeed } = engine.getState();
+    expect(sent[0].message.payload).toMatchObject({
+      choices: questions[0].choices,
+      shuffle: { seed: shuffleSeed, questionIndex: 0 },
+    });
+
+    answer("p0", "q1", "b");
+    expect(engine.getState().answers.get("p0")).toEqual(["b"]);
+  });
+
+  it("acks answers, re-acks retries and auto-reveals once all answered", () => {
+    const { engine, sent, advanceTo, answer, types } = setup();
+    engine.dispatch({ type: "start" });
+    advanceTo(4000);
+    sent.length = 0;
+
+    answer("p0", "q1", "b");
+    answer("p0", "q1", "b");
+    answer("p1", "q1", "a");
+
+    expect(sent.map((outbound) => outbound.to)).toEqual(["p0", "p0", "p1"]);
+    expect(sent.every((o) => o.message.type === "answer.ack")).toBe(true);
+    expect(engine.getState().answers.size).toBe(2);
+
+    advanceTo(4400);
+    expect(engine.getState().phase).toBe("reveal");
+    const reveal = sent.find((o) => o.message.type === "reveal");
+    expect(reveal?.message.payload).toMatchObject({
+      correctChoiceId: "b",
+      resultsByPlayer: {
+        p0: { correct: true, score: 900 },
+        p1: { correct: false, score: 0 },
+      },
+      choiceStats: {
+        a: { count: 1, percent: 50 },
+        b: { count: 1, percent: 50 },
+      },
+    });
+    expect(types()).not.toContain("timer.sync");
+  });
+
+  it("reveals on timeout and syncs the timer while the question runs", () => {
+    const { engine, sent, advanceTo } = setup();
+    engine.dispatch({ type: "start" });
+    advanceTo(3000);
+    sent.length = 0;
+
+    advanceTo(13000);
+
+    const syncs = sent.filter((o) => o.message.type === "timer.sync");
+    expect(syncs).toHaveLength(9);
+    expect(syncs[0].message.payload).toEqual({
+      questionId: "q1",
+      remainingMs: 9000,
+    });
+    expect(engine.getState().phase).toBe("reveal");
+  });
+
+  it("runs a full game through leaderboard and end", () => {
+    const { engine, advanceTo, answer, types } = setup();
+    engine.dispatch({ type: "start" });
+    advanceTo(3000);
+    answer("p0", "q1", "b");
+    answer("p1", "q1", "b");
+    advanceTo(10000);
+
+    expect(engine.getState().phase).toBe("leaderboard");
+    expect(engine.nextDeadline()).toBeNull();
+
+    engine.dispatch({ type: "next" });
+    expect(engine.getState().currentQuestionIndex).toBe(1);
+    expect(engine.getState().countdown).toBe(3);
+
+    advanceTo(13000);
+    answer("p0", "q2", "true");
+    answer("p1", "q2", "false");
+    advanceTo(20000);
+
+    expect(engine.getState().phase).toBe("ended");
+    expect(types().filter((type) => type !== "answer.ack")).toEqual([
+      "question",
+      "reveal",
+      "leaderboard",
+      "question",
+      "reveal",
+      "ended",
+    ]);
+  });
+
+  it("skips the leaderboard when disabled", () => {
+    const { engine, advanceTo } = setup({ showLeaderboard: false });
+    engine.dispatch({ type: "start" });
+    advanceTo(13000);
+    expect(engine.getState().phase).toBe("reveal");
+
+    advanceTo(16000);
+    expect(engine.getState().phase).toBe("countdown");
+    expect(engine.getState().currentQuestionIndex).toBe(1);
+  });
+
+  it("paces the game from the settings' timing profile", () => {
+    const { engine, advanceTo, answer } = setup();
+    const fast = TIMING_PROFILES.fast.engine;
+    engine.getState().updateSettings({ timingProfile: "fast" });
+
+    engine.dispatch({ type: "start" });
+    expect(engine.getState().countdown).toBe(fast.countdownSeconds);
+
+    const questionAt = fast.countdownSeconds * fast.countdownTickMs;
+    advanceTo(questionAt);
+    expect(engine.getState().phase).toBe("question");
+
+    answer("p0", "q1", "b");
+    answer("p1", "q1", "a");
+    advanceTo(questionAt + fast.autoRevealDelayMs);
+    expect(engine.getState().phase).toBe("reveal");
+
+    advanceTo(questionAt + fast.autoRevealDelayMs + fast.revealDelayMs);
+    expect(engine.getState().phase).toBe("leaderboard");
+  });
+
+  it("only accepts known timing profile names", () => {
+    expect(parseTimingProfile("fast")).toBe("fast");
+    expect(parseTimingProfile("standard")).toBe("standard");
+    expect(parseTimingProfile("ludicrous")).toBeUndefined();
+    expect(parseTimingProfile(null)).toBeUndefined();
+  });
+
+  it("ignores reveal and next outside their phases", () => {
+    const { engine, sent } = setup();
+    engine.dispatch({ type: "reveal" });
+    engine.dispatch({ type: "next" });
+
+    expect(engine.getState().phase).toBe("idle");
+    expect(sent).toHaveLength(0);
+  });
+
+  it("simulates a large room deterministically", () => {
+    const run = () => {
+      const { engine, sent, advanceTo, answer } = setup({ players: 500 });
+      engine.dispatch({ type: "start" });
+      advanceTo(3000);
+      for (let i = 0; i < 500; i++) {
+        advanceTo(3000 + i * 10);
+        answer(`p${i}`, "q1", i % 3 === 0 ? "a" : "b");
+      }
+      advanceTo(20000);
+      return { state: engine.getState(), sent };
+    };
+
+    const first = run();
+    const second = run();
+
+    expect(first.state.phase).toBe("leaderboard");
+    expect(first.state.scores).toEqual(second.state.scores);
+    expect(first.sent).toEqual(second.sent);
+  });
+});
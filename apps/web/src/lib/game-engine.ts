@@ -0,0 +1,545 @@
+import type { Question } from "@opentriiva/pack-schema";
+import type { AnswerFrame } from "@opentriiva/protocol";
+import { choiceStatsFromTally, type ChoiceStats } from "@/lib/answer-stats";
+import {
+  createGameStore,
+  type GameState,
+  type GameSettings,
+  type GameStoreApi,
+  type Player,
+  type TimingProfileName,
+} from "@/stores/gameStoreCore";
+
+export interface EngineTiming {
+  countdownSeconds: number;
+  countdownTickMs: number;
+  revealDelayMs: number;
+  autoRevealDelayMs: number;
+  timerSyncIntervalMs: number;
+}
+
+export const DEFAULT_ENGINE_TIMING: EngineTiming = {
+  countdownSeconds: 3,
+  countdownTickMs: 1000,
+  revealDelayMs: 3000,
+  autoRevealDelayMs: 400,
+  timerSyncIntervalMs: 1000,
+};
+
+export interface TimingProfile {
+  engine: EngineTiming;
+  questionTimeLimit: number;
+}
+
+/**
+ * Pacing presets carried in `GameSettings.timingProfile`. "fast" keeps every
+ * phase but shrinks the waits, so automated tests and load rehearsals play a
+ * full game in seconds.
+ */
+export const TIMING_PROFILES: Record<TimingProfileName, TimingProfile> = {
+  standard: { engine: DEFAULT_ENGINE_TIMING, questionTimeLimit: 20000 },
+  fast: {
+    engine: {
+      countdownSeconds: 1,
+      countdownTickMs: 250,
+      revealDelayMs: 300,
+      autoRevealDelayMs: 50,
+      timerSyncIntervalMs: 250,
+    },
+    questionTimeLimit: 5000,
+  },
+};
+
+export function parseTimingProfile(
+  value: string | null | undefined,
+): TimingProfileName | undefined {
+  return value === "standard" || value === "fast" ? value : undefined;
+}
+
+export function getTimingProfile(settings: GameSettings): TimingProfile {
+  return TIMING_PROFILES[settings.timingProfile] ?? TIMING_PROFILES.standard;
+}
+
+export interface OutboundMessage {
+  type: string;
+  payload?: unknown;
+}
+
+/** `to` is a player id, or `"*"` for every connected player. */
+export interface Outbound {
+  to: string;
+  message: OutboundMessage;
+}
+
+export type EngineEvent =
+  | { type: "player.join"; playerId: string; nickname?: string }
+  | { type: "player.ready"; playerId: string }
+  | { type: "player.leave"; playerId: string }
+  | { type: "start" }
+  | { type: "message"; playerId: string; data: unknown }
+  | { type: "reveal" }
+  | { type: "next" };
+
+export interface EngineScheduler {
+  set: (callback: () => void, delayMs: number) => unknown;
+  clear: (handle: unknown) => void;
+}
+
+export const browserScheduler: EngineScheduler = {
+  set: (callback, delayMs) => setTimeout(callback, delayMs),
+  clear: (handle) => clearTimeout(handle as ReturnType<typeof setTimeout>),
+};
+
+export interface RevealResult {
+  correct: boolean;
+  score: number;
+}
+
+export interface LeaderboardEntry extends Player {
+  score: number;
+}
+
+/** What a player needs to derive its own choice order (see `lib/shuffle`). */
+export interface ChoiceShuffle {
+  seed: number;
+  questionIndex: number;
+}
+
+export function choiceShuffleFor(
+  state: Pick<GameState, "settings" | "shuffleSeed" | "currentQuestionIndex">,
+): ChoiceShuffle | undefined {
+  return state.settings.shuffleChoices
+    ? { seed: state.shuffleSeed, questionIndex: state.currentQuestionIndex }
+    : undefined;
+}
+
+/**
+ * Choices always go out in canonical order, so one encoded broadcast serves
+ * every player; with `shuffle` set each player reorders them locally.
+ */
+export function buildQuestionPayload(
+  question: Question,
+  durationMs: number,
+  shuffle?: ChoiceShuffle,
+): OutboundMessage {
+  return {
+    type: "question",
+    payload: {
+      id: question.id,
+      prompt: question.prompt,
+      choices: question.choices,
+      durationMs,
+      ...(shuffle && { shuffle }),
+    },
+  };
+}
+
+export function buildLeaderboard(
+  state: Pick<GameState, "players" | "scores">,
+): LeaderboardEntry[] {
+  return [...state.players]
+    .map((player) => ({ ...player, score: state.scores.get(player.id) || 0 }))
+    .sort((a, b) => b.score - a.score);
+}
+
+export function buildRevealPayload(
+  state: GameState,
+  question: Question,
+  recipients: string[] = [],
+): {
+  correctChoiceId: string;
+  resultsByPlayer: Record<string, RevealResult>;
+  choiceStats: ChoiceStats;
+  totalAnswered: number;
+  correctCount: number;
+  responseTimeHistogram: number[];
+} {
+  const { choiceStats, totalAnswered } = choiceStatsFromTally(
+    state.answerTally,
+  );
+  const playerIds = new Set<string>([
+    ...state.players.map((player) => player.id),
+    ...Array.from(state.answers.keys()),
+    ...recipients,
+  ]);
+
+  const resultsByPlayer: Record<string, RevealResult> = {};
+  playerIds.forEach((playerId) => {
+    const submittedAnswer = state.answers.get(playerId) ?? [];
+    resultsByPlayer[playerId] = {
+      correct: submittedAnswer.includes(question.answer.choiceId),
+      score: state.scores.get(playerId) || 0,
+    };
+  });
+
+  return {
+    correctChoiceId: question.answer.choiceId,
+    resultsByPlayer,
+    choiceStats,
+    totalAnswered,
+    correctCount: state.answerTally.correctCount,
+    responseTimeHistogram: state.answerTally.responseTimeHistogram,
+  };
+}
+
+/**
+ * Framework-free host game loop. It drives a game store through countdown,
+ * question, reveal and leaderboard phases from events and an injected
+ * clock, and reports everything players must see through `emit`. Without a
+ * scheduler, callers advance time themselves by calling `tick()` once
+ * `now()` has reached `nextDeadline()`, which keeps simulations
+ * deterministic.
+ */
+export class GameEngine {
+  private store: GameStoreApi;
+  private now: () => number;
+  private emit: (outbound: Outbound) => void;
+  private getRecipients: () => string[];
+  private timing: EngineTiming;
+  private timingOverrides?: Partial<EngineTiming>;
+  private scheduler?: EngineScheduler;
+  private timerHandle: unknown = null;
+  private countdownAt: number | null = null;
+  private questionEndsAt: number | null = null;
+  private autoRevealAt: number | null = null;
+  private timerSyncAt: number | null = null;
+  private revealEndsAt: number | null = null;
+
+  constructor(options: {
+    emit: (outbound: Outbound) => void;
+    store?: GameStoreApi;
+    now?: () => number;
+    getRecipients?: () => string[];
+    timing?: Partial<EngineTiming>;
+    scheduler?: EngineScheduler;
+  }) {
+    this.emit = options.emit;
+    this.store = options.store ?? createGameStore();
+    this.now = options.now ?? Date.now;
+    this.getRecipients = options.getRecipients ?? (() => []);
+    this.timingOverrides = options.timing;
+    this.timing = this.resolveTiming();
+    this.scheduler = options.scheduler;
+  }
+
+  /** The settings' timing profile, with constructor overrides on top. */
+  private resolveTiming(): EngineTiming {
+    return {
+      ...getTimingProfile(this.getState().settings).engine,
+      ...this.timingOverrides,
+    };
+  }
+
+  getStore(): GameStoreApi {
+    return this.store;
+  }
+
+  getState(): GameState {
+    return this.store.getState();
+  }
+
+  dispatch(event: EngineEvent): void {
+    const actions = this.store.getState();
+
+    switch (event.type) {
+      case "player.join":
+        actions.addPlayer({
+          id: event.playerId,
+          nickname: event.nickname || `Player ${event.playerId.slice(0, 6)}`,
+          isReady: false,
+          isConnected: true,
+          score: 0,
+        });
+        break;
+      case "player.ready":
+        actions.setPlayerReady(event.playerId, true);
+        break;
+      case "player.leave":
+        actions.removePlayer(event.playerId);
+        this.checkAllAnswered();
+        break;
+      case "start":
+        this.timing = this.resolveTiming();
+        actions.startGame();
+        this.beginCountdown(this.now());
+        break;
+      case "message":
+        this.handlePlayerMessage(event.playerId, event.data);
+        break;
+      case "reveal":
+        this.reveal(this.now());
+        break;
+      case "next":
+        if (actions.phase === "leaderboard") {
+          this.advance(this.now());
+        }
+        break;
+    }
+
+    this.arm();
+  }
+
+  /** Resumes the countdown for a game whose store is already in "countdown". */
+  resume(): void {
+    if (this.getState().phase === "countdown" && this.countdownAt === null) {
+      this.timing = this.resolveTiming();
+      this.beginCountdown(this.now());
+      this.arm();
+    }
+  }
+
+  nextDeadline(): number | null {
+    const deadlines = [
+      this.countdownAt,
+      this.timerSyncAt,
+      this.autoRevealAt,
+      this.questionEndsAt,
+      this.revealEndsAt,
+    ].filter((deadline): deadline is number => deadline !== null);
+
+    return deadlines.length > 0 ? Math.min(...deadlines) : null;
+  }
+
+  /** Fires every deadline that is due at `now()`, in deadline order. */
+  tick(): void {
+    const now = this.now();
+    let deadline = this.nextDeadline();
+
+    while (deadline !== null && deadline <= now) {
+      this.fire(deadline);
+      deadline = this.nextDeadline();
+    }
+
+    this.arm();
+  }
+
+  stop(): void {
+    this.countdownAt = null;
+    this.clearQuestionTimers();
+    this.revealEndsAt = null;
+    this.disarm();
+  }
+
+  private fire(at: number): void {
+    if (this.countdownAt === at) {
+      this.countdownTick(at);
+    } else if (this.timerSyncAt === at) {
+      this.syncTimer(at);
+    } else if (this.autoRevealAt === at || this.questionEndsAt === at) {
+      this.reveal(at);
+    } else if (this.revealEndsAt === at) {
+      this.revealEndsAt = null;
+      this.afterReveal(at);
+    }
+  }
+
+  private arm(): void {
+    if (!this.scheduler) {
+      return;
+    }
+
+    this.disarm();
+    const deadline = this.nextDeadline();
+    if (deadline !== null) {
+      this.timerHandle = this.scheduler.set(
+        () => {
+          this.timerHandle = null;
+          this.tick();
+        },
+        Math.max(0, deadline - this.now()),
+      );
+    }
+  }
+
+  private disarm(): void {
+    if (this.scheduler && this.timerHandle !== null) {
+      this.scheduler.clear(this.timerHandle);
+      this.timerHandle = null;
+    }
+  }
+
+  private broadcast(message: OutboundMessage): void {
+    this.emit({ to: "*", message });
+  }
+
+  private currentQuestion(): Question | undefined {
+    const state = this.getState();
+    return state.questions[state.currentQuestionIndex];
+  }
+
+  private beginCountdown(at: number): void {
+    this.store.setState({ countdown: this.timing.countdownSeconds });
+
+    if (this.timing.countdownSeconds <= 0) {
+      this.countdownAt = null;
+      this.showQuestion(at);
+      return;
+    }
+
+    this.countdownAt = at + this.timing.countdownTickMs;
+  }
+
+  private countdownTick(at: number): void {
+    const countdown = this.getState().countdown - 1;
+    this.store.setState({ countdown });
+
+    if (countdown > 0) {
+      this.countdownAt = at + this.timing.countdownTickMs;
+      return;
+    }
+
+    this.countdownAt = null;
+    this.showQuestion(at);
+  }
+
+  private showQuestion(at: number): void {
+    const question = this.currentQuestion();
+    if (!question) {
+      return;
+    }
+
+    const { questionTimeLimit } = this.getState().settings;
+    this.getState().showQuestion(at);
+    this.broadcast(
+      buildQuestionPayload(
+        question,
+        questionTimeLimit,
+        choiceShuffleFor(this.getState()),
+      ),
+    );
+
+    this.questionEndsAt = at + questionTimeLimit;
+    this.timerSyncAt = at + this.timing.timerSyncIntervalMs;
+    this.autoRevealAt = null;
+  }
+
+  private syncTimer(at: number): void {
+    const question = this.currentQuestion();
+    if (!question || this.questionEndsAt === null) {
+      this.timerSyncAt = null;
+      return;
+    }
+
+    this.broadcast({
+      type: "timer.sync",
+      payload: {
+        questionId: question.id,
+        remainingMs: Math.max(0, this.questionEndsAt - at),
+      },
+    });
+
+    const nextSync = at + this.timing.timerSyncIntervalMs;
+    this.timerSyncAt = nextSync < this.questionEndsAt ? nextSync : null;
+  }
+
+  /** Frames reach the engine already validated by a `FrameDecoder`. */
+  private handlePlayerMessage(playerId: string, data: unknown): void {
+    const msg = data as AnswerFrame | undefined;
+    const question = this.currentQuestion();
+
+    if (msg?.type !== "answer" || !question) {
+      return;
+    }
+
+    const questionId = msg.questionId || question.id;
+    // Answers are retried until acked, so a repeat for an already-recorded
+    // answer is re-acknowledged rather than rejected.
+    const isRetry =
+      questionId === question.id && this.getState().answers.has(playerId);
+    const accepted =
+      isRetry ||
+      this.getState().submitAnswer(
+        playerId,
+        questionId,
+        [msg.choiceId || ""],
+        msg.timeMs || 0,
+      );
+
+    this.emit({
+      to: playerId,
+      message: { type: "answer.ack", payload: { accepted, questionId } },
+    });
+
+    if (accepted && !isRetry) {
+      this.checkAllAnswered();
+    }
+  }
+
+  private checkAllAnswered(): void {
+    const state = this.getState();
+
+    if (
+      state.phase === "question" &&
+      this.autoRevealAt === null &&
+      state.players.length > 0 &&
+      state.answers.size >= state.players.length
+    ) {
+      this.autoRevealAt = this.now() + this.timing.autoRevealDelayMs;
+    }
+  }
+
+  private clearQuestionTimers(): void {
+    this.questionEndsAt = null;
+    this.autoRevealAt = null;
+    this.timerSyncAt = null;
+  }
+
+  private reveal(at: number): void {
+    const question = this.currentQuestion();
+    const state = this.getState();
+    if (state.phase !== "question" || !question) {
+      return;
+    }
+
+    this.clearQuestionTimers();
+    state.lockQuestion();
+    state.revealAnswer();
+
+    this.broadcast({
+      type: "reveal",
+      payload: buildRevealPayload(
+        this.getState(),
+        question,
+        this.getRecipients(),
+      ),
+    });
+
+    this.revealEndsAt = at + this.timing.revealDelayMs;
+  }
+
+  private afterReveal(at: number): void {
+    const state = this.getState();
+    const isLastQuestion =
+      state.currentQuestionIndex >= state.questions.length - 1;
+
+    if (isLastQuestion) {
+      this.end();
+    } else if (state.settings.showLeaderboard) {
+      state.setPhase("leaderboard");
+      this.broadcast({
+        type: "leaderboard",
+        payload: buildLeaderboard(this.getState()),
+      });
+    } else {
+      this.advance(at);
+    }
+  }
+
+  private advance(at: number): void {
+    const state = this.getState();
+
+    if (state.currentQuestionIndex >= state.questions.length - 1) {
+      this.end();
+      return;
+    }
+
+    state.nextQuestion();
+    state.setPhase("countdown");
+    this.beginCountdown(at);
+  }
+
+  private end(): void {
+    this.getState().endGame();
+    this.broadcast({ type: "ended" });
+  }
+}
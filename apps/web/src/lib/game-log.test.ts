@@ -0,0 +1,76 @@
+import { describe, expect, it } from "vitest";
+import { createGameStore } from "@/stores/gameStoreCore";
+import { GameLogRecorder, parseGameLog, restoreSnapshot } from "./game-log";
+
+function recorder(maxRecords?: number) {
+  let now = 1000;
+  const log = new GameLogRecorder({ now: () => now, maxRecords });
+  return { log, advance: (ms: number) => (now += ms) };
+}
+
+describe("GameLogRecorder", () => {
+  it("ignores records until the game starts", () => {
+    const { log } = recorder();
+    log.frame("p0", "{}");
+
+    expect(log.size).toBe(0);
+  });
+
+  it("stamps records relative to the start and round-trips as NDJSON", () => {
+    const store = createGameStore();
+    store.getState().addPlayer({
+      id: "p0",
+      nickname: "Alice",
+      isReady: true,
+      isConnected: true,
+      score: 0,
+    });
+    const { log, advance } = recorder();
+
+    log.start(store.getState(), { countdownSeconds: 1 });
+    advance(250);
+    log.frame("p0", '{"type":"answer","choiceId":"a"}');
+    log.event({ type: "reveal" });
+    log.send("*", '{"type":"reveal","payload":{}}');
+    log.end(new Map([["p0", 420]]));
+
+    const records = parseGameLog(log.toNDJSON());
+    expect(records.map((record) => [record.t, record.k])).toEqual([
+      [0, "init"],
+      [250, "frame"],
+      [250, "event"],
+      [250, "send"],
+      [250, "end"],
+    ]);
+    expect(records[3]).toMatchObject({ type: "reveal", bytes: 30 });
+
+    const init = records[0];
+    expect(init.k === "init" && init.timing).toEqual({ countdownSeconds: 1 });
+    const restored = init.k === "init" ? restoreSnapshot(init.state) : {};
+    expect(restored.scores).toEqual(new Map([["p0", 0]]));
+  });
+
+  it("stops at the record cap but still records the result", () => {
+    const { log } = recorder(2);
+    log.start(createGameStore().getState());
+    log.frame("p0", "{}");
+    log.frame("p0", "{}");
+    log.end(new Map());
+
+    expect(log.truncated).toBe(true);
+    expect(log.getRecords().map((record) => record.k)).toEqual([
+      "init",
+      "frame",
+      "end",
+    ]);
+  });
+});
+
+describe("parseGameLog", () => {
+  it("rejects logs without a supported init record", () => {
+    expect(() => parseGameLog('{"t":0,"k":"frame"}')).toThrow("init record");
+    expect(() => parseGameLog('{"t":0,"k":"init","v":99}')).toThrow(
+      "version 99",
+    );
+  });
+});
@@ -0,0 +1,168 @@
+import type { Question } from "@opentriiva/pack-schema";
+import type { EngineEvent, EngineTiming } from "@/lib/game-engine";
+import { messageTypeOf } from "@/lib/peer-stats";
+import type {
+  GamePhase,
+  GameSettings,
+  GameState,
+  Player,
+} from "@/stores/gameStoreCore";
+
+export const GAME_LOG_VERSION = 1;
+export const MAX_GAME_LOG_RECORDS = 200_000;
+
+/** The part of the store a game starts from, in JSON-safe form. */
+export interface GameLogSnapshot {
+  phase: GamePhase;
+  roomId: string;
+  players: Player[];
+  settings: GameSettings;
+  questions: Question[];
+  currentQuestionIndex: number;
+  scores: Record<string, number>;
+  countdown: number;
+  /** Absent in logs written before choices were shuffled per player. */
+  shuffleSeed?: number;
+}
+
+/**
+ * One line of the log. `t` is milliseconds since `init`. Inputs (`frame`,
+ * `event`) are what a replay feeds back in; `send`, `phase` and `end` are
+ * what the live game produced, kept to check the replay against.
+ */
+export type GameLogRecord =
+  | {
+      t: number;
+      k: "init";
+      v: number;
+      state: GameLogSnapshot;
+      timing?: Partial<EngineTiming>;
+    }
+  | { t: number; k: "frame"; p: string; raw: string }
+  | { t: number; k: "event"; event: EngineEvent }
+  | { t: number; k: "send"; to: string; type: string; bytes: number }
+  | { t: number; k: "phase"; phase: GamePhase; q: number }
+  | { t: number; k: "end"; scores: Record<string, number> };
+
+type WithoutTime<R> = R extends GameLogRecord ? Omit<R, "t"> : never;
+type RecordBody = WithoutTime<GameLogRecord>;
+
+export function snapshotState(state: GameState): GameLogSnapshot {
+  return {
+    phase: state.phase,
+    roomId: state.roomId,
+    players: state.players,
+    settings: state.settings,
+    questions: state.questions,
+    currentQuestionIndex: state.currentQuestionIndex,
+    scores: Object.fromEntries(state.scores),
+    countdown: state.countdown,
+    shuffleSeed: state.shuffleSeed,
+  };
+}
+
+export function restoreSnapshot(
+  snapshot: GameLogSnapshot,
+): Partial<GameState> {
+  return {
+    ...snapshot,
+    scores: new Map(Object.entries(snapshot.scores)),
+  };
+}
+
+/**
+ * Append-only record of one hosted game: the starting state, every player
+ * frame and host action with its arrival time, and what the host sent and
+ * which phases it went through. Serialized as NDJSON so a log can be
+ * streamed, concatenated or grepped. Recording stops (with `truncated`
+ * set) after `maxRecords` so a runaway game cannot grow it without bound.
+ */
+export class GameLogRecorder {
+  private records: GameLogRecord[] = [];
+  private startedAt = 0;
+  private now: () => number;
+  private maxRecords: number;
+  truncated = false;
+
+  constructor(options: { now?: () => number; maxRecords?: number } = {}) {
+    this.now = options.now ?? Date.now;
+    this.maxRecords = options.maxRecords ?? MAX_GAME_LOG_RECORDS;
+  }
+
+  get size(): number {
+    return this.records.length;
+  }
+
+  start(state: GameState, timing?: Partial<EngineTiming>): void {
+    this.records = [];
+    this.truncated = false;
+    this.startedAt = this.now();
+    this.append({
+      k: "init",
+      v: GAME_LOG_VERSION,
+      state: snapshotState(state),
+      timing,
+    });
+  }
+
+  frame(playerId: string, raw: string): void {
+    this.append({ k: "frame", p: playerId, raw });
+  }
+
+  event(event: EngineEvent): void {
+    this.append({ k: "event", event });
+  }
+
+  send(to: string, message: string): void {
+    this.append({
+      k: "send",
+      to,
+      type: messageTypeOf(message),
+      bytes: message.length,
+    });
+  }
+
+  phase(phase: GamePhase, questionIndex: number): void {
+    this.append({ k: "phase", phase, q: questionIndex });
+  }
+
+  end(scores: Map<string, number>): void {
+    this.append({ k: "end", scores: Object.fromEntries(scores) });
+  }
+
+  getRecords(): GameLogRecord[] {
+    return this.records;
+  }
+
+  toNDJSON(): string {
+    return this.records.map((record) => JSON.stringify(record)).join("\n");
+  }
+
+  private append(body: RecordBody): void {
+    if (this.records.length === 0 && body.k !== "init") {
+      return;
+    }
+    if (this.records.length >= this.maxRecords && body.k !== "end") {
+      this.truncated = true;
+      return;
+    }
+    const t = this.now() - this.startedAt;
+    this.records.push({ t, ...body } as GameLogRecord);
+  }
+}
+
+export function parseGameLog(text: string): GameLogRecord[] {
+  const records = text
+    .split("\n")
+    .filter((line) => line.trim() !== "")
+    .map((line) => JSON.parse(line) as GameLogRecord);
+
+  const init = records[0];
+  if (!init || init.k !== "init") {
+    throw new Error("Game log must start with an init record");
+  }
+  if (init.v !== GAME_LOG_VERSION) {
+    throw new Error(`Unsupported game log version ${init.v}`);
+  }
+  return records;
+}
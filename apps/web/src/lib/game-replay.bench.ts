@@ -0,0 +1,111 @@
+import { readFileSync } from "fs";
+import { bench, describe } from "vitest";
+import type { Question } from "@opentriiva/pack-schema";
+import { DEFAULT_ENGINE_TIMING } from "./game-engine";
+import { parseGameLog, type GameLogRecord } from "./game-log";
+import { replayGameLog } from "./game-replay";
+
+const QUESTION_TIME_LIMIT_MS = 20_000;
+
+function makeQuestion(index: number): Question {
+  return {
+    id: `q${index}`,
+    type: "mcq",
+    prompt: `Question ${index}`,
+    choices: ["a", "b", "c", "d"].map((id) => ({ id, text: id })),
+    answer: { choiceId: "b" },
+  };
+}
+
+/**
+ * A log shaped like a real game: every player answers each question within
+ * 15s, the host advances a second after each leaderboard.
+ */
+function synthesizeGameLog(players: number, questions: number) {
+  const {
+    countdownSeconds,
+    countdownTickMs,
+    autoRevealDelayMs,
+    revealDelayMs,
+  } = DEFAULT_ENGINE_TIMING;
+  const records: GameLogRecord[] = [
+    {
+      t: 0,
+      k: "init",
+      v: 1,
+      state: {
+        phase: "countdown",
+        roomId: "BENCH1",
+        players: Array.from({ length: players }, (_, index) => ({
+          id: `p${index}`,
+          nickname: `Player ${index}`,
+          isReady: true,
+          isConnected: true,
+          score: 0,
+        })),
+        settings: {
+          questionTimeLimit: QUESTION_TIME_LIMIT_MS,
+          showLeaderboard: true,
+          shuffleQuestions: false,
+          shuffleChoices: false,
+          timingProfile: "standard",
+        },
+        questions: Array.from({ length: questions }, (_, index) =>
+          makeQuestion(index),
+        ),
+        currentQuestionIndex: 0,
+        scores: {},
+        countdown: countdownSeconds,
+      },
+    },
+  ];
+
+  let questionStart = countdownSeconds * countdownTickMs;
+  for (let q = 0; q < questions; q++) {
+    const answers = Array.from({ length: players }, (_, index) => ({
+      playerId: `p${index}`,
+      timeMs: ((index * 7919 + q * 104729) % 15_000) + 1,
+      choiceId: "abcd"[(index + q) % 4],
+    })).sort((a, b) => a.timeMs - b.timeMs);
+
+    answers.forEach(({ playerId, timeMs, choiceId }) =>
+      records.push({
+        t: questionStart + timeMs,
+        k: "frame",
+        p: playerId,
+        raw: JSON.stringify({
+          type: "answer",
+          questionId: `q${q}`,
+          choiceId,
+          timeMs,
+        }),
+      }),
+    );
+
+    const lastAnswer = questionStart + answers[answers.length - 1].timeMs;
+    const next = lastAnswer + autoRevealDelayMs + revealDelayMs + 1000;
+    if (q < questions - 1) {
+      records.push({ t: next, k: "event", event: { type: "next" } });
+    }
+    questionStart = next + countdownSeconds * countdownTickMs;
+  }
+  return records;
+}
+
+describe("replay recorded games", () => {
+  for (const players of [50, 500]) {
+    const records = synthesizeGameLog(players, 10);
+    bench(`${players} players x 10 questions`, () => {
+      replayGameLog(records);
+    });
+  }
+
+  // GAME_LOG=path/to/game.ndjson benchmarks a log exported from a real game.
+  const logPath = process.env.GAME_LOG;
+  if (logPath) {
+    const records = parseGameLog(readFileSync(logPath, "utf8"));
+    bench(`recorded game (${records.length} records)`, () => {
+      replayGameLog(records);
+    });
+  }
+});
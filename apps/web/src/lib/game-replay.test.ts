@@ -0,0 +1,135 @@
+import { afterEach, beforeEach, describe, expect, it, vi } from "vitest";
+import type { Question } from "@opentriiva/pack-schema";
+import { createGameStore } from "@/stores/gameStoreCore";
+import { DIFF_FLUSH_MS, HostEnginePipeline } from "./host-pipeline";
+import type { GameLogRecord } from "./game-log";
+import { formatReplayReport, replayGameLog } from "./game-replay";
+
+const question: Question = {
+  id: "q1",
+  type: "mcq",
+  prompt: "What is the capital of France?",
+  choices: [
+    { id: "a", text: "London" },
+    { id: "b", text: "Paris" },
+  ],
+  answer: { choiceId: "b" },
+};
+
+function answer(questionId: string, choiceId: string, timeMs: number) {
+  return JSON.stringify({ type: "answer", questionId, choiceId, timeMs });
+}
+
+/**
+ * Plays a two-question game through the in-process pipeline; `p0Frames` are
+ * what p0 sends for question 2.
+ */
+function recordGame(
+  p0Frames = ["not json", answer("q2", "a", 500)],
+): {
+  records: GameLogRecord[];
+  scores: Map<string, number>;
+} {
+  const store = createGameStore();
+  const state = store.getState();
+  state.setQuestions([question, { ...question, id: "q2" }]);
+  ["p0", "p1", "p2"].forEach((id) =>
+    state.addPlayer({
+      id,
+      nickname: id,
+      isReady: true,
+      isConnected: true,
+      score: 0,
+    }),
+  );
+  state.startGame();
+
+  const pipeline = new HostEnginePipeline({ store, createWorker: () => null });
+  pipeline.attach({
+    sendEncoded: () => {},
+    broadcastEncoded: () => {},
+    receive: () => {},
+    getConnectedPlayers: () => ["p0", "p1", "p2"],
+  });
+  pipeline.start();
+
+  // Question 1 runs out its timer with one player silent.
+  vi.advanceTimersByTime(3000 + 800);
+  pipeline.receiveFrame("p0", answer("q1", "b", 800));
+  vi.advanceTimersByTime(1200);
+  pipeline.receiveFrame("p1", answer("q1", "a", 2000));
+  pipeline.receiveFrame("p1", answer("q1", "a", 2000));
+  vi.advanceTimersByTime(20_000 + 3000);
+  pipeline.dispatch({ type: "next" });
+
+  // Everyone answers question 2, which reveals early and ends the game.
+  vi.advanceTimersByTime(3000 + 300);
+  pipeline.receiveFrame("p2", answer("q2", "b", 300));
+  pipeline.receiveFrame("p1", answer("q2", "b", 450));
+  p0Frames.forEach((raw) => pipeline.receiveFrame("p0", raw));
+  vi.advanceTimersByTime(400 + 3000 + DIFF_FLUSH_MS * 2);
+
+  const records = [...pipeline.getLog().getRecords()];
+  pipeline.stop();
+  return { records, scores: store.getState().scores };
+}
+
+describe("replayGameLog", () => {
+  beforeEach(() => {
+    vi.useFakeTimers();
+  });
+
+  afterEach(() => {
+    vi.useRealTimers();
+  });
+
+  it("reproduces the recorded game's final scores", () => {
+    const { records, scores } = recordGame();
+    expect(records.at(-1)?.k).toBe("end");
+
+    const result = replayGameLog(records);
+
+    expect(result.matches).toBe(true);
+    expect(result.finalScores).toEqual(Object.fromEntries(scores));
+    expect(result.finalScores.p2).toBeGreaterThan(0);
+    expect(result.inputs).toBe(8);
+    expect(result.sendsByType).toEqual(result.expectedSendsByType);
+    expect(result.rejectedFrames.malformed).toBe(1);
+    expect(formatReplayReport(result)).toContain("identical");
+  });
+
+  it("drops the frames the live host rejected", () => {
+    // A correct answer over the size limit: the host never scored it, so
+    // p0's wrong answer that follows is the one that counts.
+    const oversized = JSON.stringify({
+      type: "answer",
+      questionId: "q2",
+      choiceId: "b",
+      timeMs: 500,
+      note: "x".repeat(600),
+    });
+    const { records, scores } = recordGame([oversized, answer("q2", "a", 500)]);
+
+    const result = replayGameLog(records);
+
+    expect(result.matches).toBe(true);
+    expect(result.finalScores).toEqual(Object.fromEntries(scores));
+    expect(result.rejectedFrames.oversized).toBe(1);
+    expect(formatReplayReport(result)).toContain("1 oversized");
+  });
+
+  it("reports scores that diverge from the recording", () => {
+    const { records } = recordGame();
+    const end = records.at(-1);
+    if (end?.k === "end") {
+      end.scores = { ...end.scores, p0: end.scores.p0 + 1 };
+    }
+
+    const result = replayGameLog(records);
+
+    expect(result.matches).toBe(false);
+    expect(result.scoreMismatches).toEqual([
+      expect.objectContaining({ playerId: "p0" }),
+    ]);
+  });
+});
@@ -0,0 +1,180 @@
+import { FrameDecoder, type FrameRejection } from "@/lib/frame-decoder";
+import { GameEngine } from "@/lib/game-engine";
+import { restoreSnapshot, type GameLogRecord } from "@/lib/game-log";
+import { createGameStore } from "@/stores/gameStoreCore";
+
+export interface ScoreMismatch {
+  playerId: string;
+  expected: number | null;
+  actual: number | null;
+}
+
+export interface ReplayResult {
+  inputs: number;
+  gameMs: number;
+  wallMs: number;
+  inputsPerSecond: number;
+  speedup: number;
+  finalScores: Record<string, number>;
+  expectedScores: Record<string, number> | null;
+  scoreMismatches: ScoreMismatch[];
+  sendsByType: Record<string, number>;
+  expectedSendsByType: Record<string, number>;
+  rejectedFrames: Readonly<Record<FrameRejection, number>>;
+  matches: boolean;
+}
+
+function count(byType: Record<string, number>, type: string): void {
+  byType[type] = (byType[type] ?? 0) + 1;
+}
+
+function compareScores(
+  expected: Record<string, number>,
+  actual: Record<string, number>,
+): ScoreMismatch[] {
+  const playerIds = new Set([...Object.keys(expected), ...Object.keys(actual)]);
+  return Array.from(playerIds)
+    .filter((playerId) => expected[playerId] !== actual[playerId])
+    .map((playerId) => ({
+      playerId,
+      expected: expected[playerId] ?? null,
+      actual: actual[playerId] ?? null,
+    }));
+}
+
+/**
+ * Runs a recorded game through a fresh game store and engine as fast as
+ * possible. The engine's clock jumps to each recorded input's timestamp
+ * (firing any deadlines due before it), so timers resolve exactly as they
+ * did live, and the game is then run to its end. Recorded frames are raw,
+ * so they go through a `FrameDecoder` on the same virtual clock and are
+ * dropped or rate limited exactly as the live host did. The result compares
+ * the replayed final scores with the ones the live game recorded.
+ */
+export function replayGameLog(records: GameLogRecord[]): ReplayResult {
+  const [init, ...rest] = records;
+  if (!init || init.k !== "init") {
+    throw new Error("Game log must start with an init record");
+  }
+
+  let clock = 0;
+  const store = createGameStore();
+  store.setState(restoreSnapshot(init.state));
+  const recipients = init.state.players.map((player) => player.id);
+  const sendsByType: Record<string, number> = {};
+  const expectedSendsByType: Record<string, number> = {};
+  let expectedScores: Record<string, number> | null = null;
+  let inputs = 0;
+  const decoder = new FrameDecoder({ now: () => clock });
+
+  const engine = new GameEngine({
+    store,
+    timing: init.timing,
+    now: () => clock,
+    getRecipients: () => recipients,
+    // Serialize like the live pipeline does so the cost is comparable.
+    emit: ({ message }) => {
+      JSON.stringify(message);
+      count(sendsByType, message.type);
+    },
+  });
+
+  const advanceTo = (t: number) => {
+    clock = Math.max(clock, t);
+    engine.tick();
+  };
+
+  const startedAt = performance.now();
+  engine.resume();
+
+  for (const record of rest) {
+    switch (record.k) {
+      case "frame": {
+        advanceTo(record.t);
+        inputs += 1;
+        const frame = decoder.decode(record.p, record.raw);
+        if (frame.ok && !frame.type.startsWith("relay.")) {
+          engine.dispatch({
+            type: "message",
+            playerId: record.p,
+            data: frame.data,
+          });
+        }
+        break;
+      }
+      case "event":
+        advanceTo(record.t);
+        inputs += 1;
+        engine.dispatch(record.event);
+        if (record.event.type === "player.leave") {
+          decoder.forget(record.event.playerId);
+        }
+        break;
+      case "send":
+        count(expectedSendsByType, record.type);
+        break;
+      case "end":
+        expectedScores = record.scores;
+        break;
+    }
+  }
+
+  let deadline = engine.nextDeadline();
+  while (deadline !== null && store.getState().phase !== "ended") {
+    advanceTo(deadline);
+    deadline = engine.nextDeadline();
+  }
+  engine.stop();
+
+  const wallMs = performance.now() - startedAt;
+  const gameMs = records[records.length - 1].t;
+  const finalScores = Object.fromEntries(store.getState().scores);
+  const scoreMismatches = expectedScores
+    ? compareScores(expectedScores, finalScores)
+    : [];
+
+  return {
+    inputs,
+    gameMs,
+    wallMs,
+    inputsPerSecond: wallMs > 0 ? (inputs / wallMs) * 1000 : Infinity,
+    speedup: wallMs > 0 ? gameMs / wallMs : Infinity,
+    finalScores,
+    expectedScores,
+    scoreMismatches,
+    sendsByType,
+    expectedSendsByType,
+    rejectedFrames: decoder.rejections,
+    matches: expectedScores !== null && scoreMismatches.length === 0,
+  };
+}
+
+export function formatReplayReport(result: ReplayResult): string {
+  const lines = [
+    `inputs: ${result.inputs} in ${result.wallMs.toFixed(1)}ms ` +
+      `(${Math.round(result.inputsPerSecond)}/s, ` +
+      `${Math.round(result.speedup)}x real time)`,
+    `players: ${Object.keys(result.finalScores).length}`,
+  ];
+  const rejected = Object.entries(result.rejectedFrames).filter(
+    ([, count]) => count > 0,
+  );
+  if (rejected.length > 0) {
+    lines.push(
+      "rejected frames: " +
+        rejected.map(([reason, count]) => `${count} ${reason}`).join(", "),
+    );
+  }
+
+  if (!result.expectedScores) {
+    lines.push("scores: not verified (log has no end record)");
+  } else if (result.matches) {
+    lines.push("scores: identical to the recorded game");
+  } else {
+    lines.push(`scores: ${result.scoreMismatches.length} mismatch(es)`);
+    result.scoreMismatches.forEach(({ playerId, expected, actual }) =>
+      lines.push(`  ${playerId}: recorded ${expected}, replayed ${actual}`),
+    );
+  }
+  return lines.join("\n");
+}
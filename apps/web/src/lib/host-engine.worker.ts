@@ -0,0 +1,9 @@
+import { HostPipelineCore, type PipelineCommand } from "@/lib/host-pipeline";
+
+const core = new HostPipelineCore({
+  post: (update) => self.postMessage(update),
+});
+
+self.onmessage = (event: MessageEvent<PipelineCommand>) => {
+  core.handle(event.data);
+};
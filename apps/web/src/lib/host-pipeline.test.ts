@@ -0,0 +1,186 @@
+import { describe, it, expect, vi, beforeEach, afterEach } from "vitest";
+import type { Question } from "@opentriiva/pack-schema";
+import { createGameStore } from "@/stores/gameStoreCore";
+import {
+  DIFF_FLUSH_MS,
+  diffState,
+  HostEnginePipeline,
+  type PipelineTransport,
+} from "./host-pipeline";
+
+const question: Question = {
+  id: "q1",
+  type: "mcq",
+  prompt: "What is the capital of France?",
+  choices: [
+    { id: "a", text: "London" },
+    { id: "b", text: "Paris" },
+  ],
+  answer: { choiceId: "b" },
+};
+
+function transport(): PipelineTransport & {
+  sendEncoded: ReturnType<typeof vi.fn>;
+  broadcastEncoded: ReturnType<typeof vi.fn>;
+  receive: ReturnType<typeof vi.fn>;
+} {
+  return {
+    sendEncoded: vi.fn(),
+    broadcastEncoded: vi.fn(),
+    receive: vi.fn(),
+    getConnectedPlayers: () => ["p0", "p1"],
+  };
+}
+
+function setup() {
+  const store = createGameStore();
+  const state = store.getState();
+  state.setQuestions([question, { ...question, id: "q2" }]);
+  state.addPlayer({
+    id: "p0",
+    nickname: "Alice",
+    isReady: true,
+    isConnected: true,
+    score: 0,
+  });
+  state.addPlayer({
+    id: "p1",
+    nickname: "Bob",
+    isReady: true,
+    isConnected: true,
+    score: 0,
+  });
+  state.startGame();
+
+  const sink = transport();
+  const pipeline = new HostEnginePipeline({ store, createWorker: () => null });
+  pipeline.attach(sink);
+  pipeline.start();
+
+  return { store, sink, pipeline };
+}
+
+describe("diffState", () => {
+  it("only includes keys whose reference changed", () => {
+    const store = createGameStore();
+    const before = store.getState();
+    store.getState().setPhase("lobby");
+
+    expect(diffState(before, store.getState())).toEqual({ phase: "lobby" });
+  });
+});
+
+describe("HostEnginePipeline", () => {
+  beforeEach(() => {
+    vi.useFakeTimers();
+  });
+
+  afterEach(() => {
+    vi.useRealTimers();
+  });
+
+  it("falls back to running in-process when no worker is available", () => {
+    const { pipeline } = setup();
+    expect(pipeline.isOffMainThread()).toBe(false);
+    pipeline.stop();
+  });
+
+  it("broadcasts pre-serialized questions and applies batched diffs", () => {
+    const { store, sink, pipeline } = setup();
+
+    vi.advanceTimersByTime(3000);
+    expect(sink.broadcastEncoded).toHaveBeenCalledWith(
+      "reliable",
+      expect.stringContaining('"type":"question"'),
+    );
+    expect(store.getState().phase).toBe("countdown");
+
+    vi.advanceTimersByTime(DIFF_FLUSH_MS);
+    expect(store.getState().phase).toBe("question");
+    expect(store.getState().countdown).toBe(0);
+
+    pipeline.stop();
+  });
+
+  it("decodes frames, acks on the fast lane and passes relay frames back", () => {
+    const { store, sink, pipeline } = setup();
+    vi.advanceTimersByTime(3000);
+
+    pipeline.receiveFrame(
+      "p0",
+      JSON.stringify({
+        type: "answer",
+        questionId: "q1",
+        choiceId: "b",
+        timeMs: 500,
+      }),
+    );
+    pipeline.receiveFrame("p1", "not json");
+    pipeline.receiveFrame(
+      "p1",
+      JSON.stringify({ type: "relay.ready", payload: { childId: "p0" } }),
+    );
+
+    expect(sink.sendEncoded).toHaveBeenCalledTimes(1);
+    const [to, lane, message] = sink.sendEncoded.mock.calls[0];
+    expect([to, lane]).toEqual(["p0", "fast"]);
+    expect(JSON.parse(message)).toEqual({
+      type: "answer.ack",
+      payload: { accepted: true, questionId: "q1" },
+    });
+    expect(sink.receive).toHaveBeenCalledWith("p1", {
+      type: "relay.ready",
+      payload: { childId: "p0" },
+    });
+
+    vi.advanceTimersByTime(DIFF_FLUSH_MS);
+    expect(store.getState().answers.get("p0")).toEqual(["b"]);
+
+    pipeline.stop();
+  });
+
+  it("auto-reveals when the only player yet to answer leaves", () => {
+    const { store, sink, pipeline } = setup();
+    vi.advanceTimersByTime(3000);
+
+    pipeline.receiveFrame(
+      "p0",
+      JSON.stringify({ type: "answer", choiceId: "b", timeMs: 500 }),
+    );
+    sink.getConnectedPlayers = () => ["p0"];
+    pipeline.dispatch({ type: "player.leave", playerId: "p1" });
+    vi.advanceTimersByTime(400 + DIFF_FLUSH_MS);
+
+    expect(store.getState().phase).toBe("reveal");
+    expect(store.getState().players.map((player) => player.id)).toEqual([
+      "p0",
+    ]);
+    expect(sink.broadcastEncoded).toHaveBeenCalledWith(
+      "reliable",
+      expect.stringContaining('"type":"reveal"'),
+    );
+
+    pipeline.stop();
+  });
+
+  it("coalesces bursts of answers into a single store update", () => {
+    const { store, pipeline } = setup();
+    vi.advanceTimersByTime(3000 + DIFF_FLUSH_MS);
+
+    const listener = vi.fn();
+    store.subscribe(listener);
+
+    ["p0", "p1"].forEach((playerId) =>
+      pipeline.receiveFrame(
+        playerId,
+        JSON.stringify({ type: "answer", choiceId: "a", timeMs: 100 }),
+      ),
+    );
+    vi.advanceTimersByTime(DIFF_FLUSH_MS);
+
+    expect(listener).toHaveBeenCalledTimes(1);
+    expect(store.getState().answers.size).toBe(2);
+
+    pipeline.stop();
+  });
+});
@@ -0,0 +1,323 @@
+import { selectLane, type ChannelLane } from "@/lib/channels";
+import { FrameDecoder } from "@/lib/frame-decoder";
+import {
+  browserScheduler,
+  GameEngine,
+  type EngineEvent,
+  type EngineTiming,
+} from "@/lib/game-engine";
+import { GameLogRecorder } from "@/lib/game-log";
+import {
+  createGameStore,
+  type GameState,
+  type GameStoreApi,
+} from "@/stores/gameStoreCore";
+
+export const DIFF_FLUSH_MS = 50;
+
+const STATE_KEYS: Array<keyof GameState> = [
+  "phase",
+  "roomId",
+  "hostId",
+  "players",
+  "settings",
+  "questions",
+  "currentQuestionIndex",
+  "questionStartTime",
+  "answers",
+  "scores",
+  "isLocked",
+  "countdown",
+  "answerTally",
+  "shuffleSeed",
+];
+
+export type PipelineCommand =
+  | { kind: "init"; state: Partial<GameState>; timing?: Partial<EngineTiming> }
+  | { kind: "frame"; playerId: string; raw: string }
+  | { kind: "event"; event: EngineEvent }
+  | { kind: "recipients"; playerIds: string[] }
+  | { kind: "stop" };
+
+export type PipelineUpdate =
+  | { kind: "diff"; patch: Partial<GameState> }
+  | { kind: "send"; to: string; lane: ChannelLane; message: string }
+  | { kind: "passthrough"; playerId: string; data: unknown };
+
+export function pickStateData(state: GameState): Partial<GameState> {
+  const data: Partial<GameState> = {};
+  STATE_KEYS.forEach((key) => {
+    (data as Record<string, unknown>)[key] = state[key];
+  });
+  return data;
+}
+
+/** Store updates are immutable, so a changed key always has a new reference. */
+export function diffState(
+  previous: GameState,
+  next: GameState,
+): Partial<GameState> {
+  const patch: Partial<GameState> = {};
+  STATE_KEYS.forEach((key) => {
+    if (previous[key] !== next[key]) {
+      (patch as Record<string, unknown>)[key] = next[key];
+    }
+  });
+  return patch;
+}
+
+/**
+ * Worker-side half of the host pipeline: decodes player frames, runs the
+ * game engine against its own store, serializes outbound messages once and
+ * coalesces state changes into one diff per flush window.
+ */
+export class HostPipelineCore {
+  private post: (update: PipelineUpdate) => void;
+  private store: GameStoreApi = createGameStore();
+  private engine: GameEngine | null = null;
+  private recipients: string[] = [];
+  private decoder = new FrameDecoder();
+  private pending: Partial<GameState> = {};
+  private flushTimer: ReturnType<typeof setTimeout> | null = null;
+  private unsubscribe: (() => void) | null = null;
+
+  constructor(options: { post: (update: PipelineUpdate) => void }) {
+    this.post = options.post;
+  }
+
+  handle(command: PipelineCommand): void {
+    switch (command.kind) {
+      case "init":
+        this.init(command.state, command.timing);
+        break;
+      case "frame":
+        this.handleFrame(command.playerId, command.raw);
+        break;
+      case "event":
+        this.engine?.dispatch(command.event);
+        break;
+      case "recipients":
+        this.recipients = command.playerIds;
+        this.decoder.retain(command.playerIds);
+        break;
+      case "stop":
+        this.stop();
+        break;
+    }
+  }
+
+  private init(state: Partial<GameState>, timing?: Partial<EngineTiming>) {
+    this.stop();
+    this.store.setState(state);
+    this.unsubscribe = this.store.subscribe((next, previous) =>
+      this.queueDiff(diffState(previous, next)),
+    );
+
+    this.engine = new GameEngine({
+      store: this.store,
+      timing,
+      scheduler: browserScheduler,
+      getRecipients: () => this.recipients,
+      emit: ({ to, message }) =>
+        this.post({
+          kind: "send",
+          to,
+          lane: selectLane(message),
+          message: JSON.stringify(message),
+        }),
+    });
+    this.engine.resume();
+  }
+
+  private handleFrame(playerId: string, raw: string): void {
+    const frame = this.decoder.decode(playerId, raw);
+    if (!frame.ok) {
+      return;
+    }
+
+    if (frame.type.startsWith("relay.")) {
+      // Relay signaling needs the peer connections, which stay on the page.
+      this.post({ kind: "passthrough", playerId, data: frame.data });
+      return;
+    }
+
+    this.engine?.dispatch({ type: "message", playerId, data: frame.data });
+  }
+
+  private queueDiff(patch: Partial<GameState>): void {
+    Object.assign(this.pending, patch);
+
+    if (!this.flushTimer) {
+      this.flushTimer = setTimeout(() => this.flush(), DIFF_FLUSH_MS);
+    }
+  }
+
+  private flush(): void {
+    this.flushTimer = null;
+    if (Object.keys(this.pending).length === 0) {
+      return;
+    }
+
+    const patch = this.pending;
+    this.pending = {};
+    this.post({ kind: "diff", patch });
+  }
+
+  private stop(): void {
+    this.engine?.stop();
+    this.engine = null;
+    this.unsubscribe?.();
+    this.unsubscribe = null;
+    if (this.flushTimer) {
+      clearTimeout(this.flushTimer);
+      this.flushTimer = null;
+    }
+    this.flush();
+  }
+}
+
+export interface PipelineTransport {
+  sendEncoded: (playerId: string, lane: ChannelLane, message: string) => void;
+  broadcastEncoded: (lane: ChannelLane, message: string) => void;
+  receive: (playerId: string, data: unknown) => void;
+  getConnectedPlayers: () => string[];
+}
+
+function createHostWorker(): Worker | null {
+  if (typeof Worker === "undefined") {
+    return null;
+  }
+
+  try {
+    return new Worker(new URL("./host-engine.worker.ts", import.meta.url));
+  } catch (error) {
+    console.error("Failed to start host worker:", error);
+    return null;
+  }
+}
+
+/**
+ * Page-side half of the host pipeline. Runs `HostPipelineCore` in a Web
+ * Worker when one can be started and in-process otherwise; either way the
+ * page only forwards raw frames in and applies batched diffs to its store.
+ * Everything crossing that boundary is also appended to a game log.
+ */
+export class HostEnginePipeline {
+  private store: GameStoreApi;
+  private transport: PipelineTransport | null = null;
+  private worker: Worker | null;
+  private local: HostPipelineCore | null = null;
+  private log: GameLogRecorder;
+
+  constructor(options: {
+    store: GameStoreApi;
+    createWorker?: () => Worker | null;
+    log?: GameLogRecorder;
+  }) {
+    this.store = options.store;
+    this.log = options.log ?? new GameLogRecorder();
+    this.worker = (options.createWorker ?? createHostWorker)();
+
+    if (this.worker) {
+      this.worker.onmessage = (event: MessageEvent<PipelineUpdate>) =>
+        this.apply(event.data);
+    } else {
+      this.local = new HostPipelineCore({
+        post: (update) => this.apply(update),
+      });
+    }
+  }
+
+  isOffMainThread(): boolean {
+    return this.worker !== null;
+  }
+
+  attach(transport: PipelineTransport): void {
+    this.transport = transport;
+  }
+
+  getLog(): GameLogRecorder {
+    return this.log;
+  }
+
+  start(timing?: Partial<EngineTiming>): void {
+    this.log.start(this.store.getState(), timing);
+    this.post({
+      kind: "init",
+      state: pickStateData(this.store.getState()),
+      timing,
+    });
+  }
+
+  receiveFrame(playerId: string, raw: string): void {
+    this.log.frame(playerId, raw);
+    this.post({ kind: "frame", playerId, raw });
+  }
+
+  dispatch(event: EngineEvent): void {
+    this.log.event(event);
+    this.post({ kind: "event", event });
+    if (event.type.startsWith("player.")) {
+      this.refreshRecipients();
+    }
+  }
+
+  stop(): void {
+    this.post({ kind: "stop" });
+    this.worker?.terminate();
+    this.worker = null;
+    this.local = null;
+  }
+
+  private post(command: PipelineCommand): void {
+    if (this.worker) {
+      this.worker.postMessage(command);
+    } else {
+      this.local?.handle(command);
+    }
+  }
+
+  private apply(update: PipelineUpdate): void {
+    switch (update.kind) {
+      case "diff":
+        this.store.setState(update.patch);
+        this.logPhase(update.patch);
+        if (update.patch.phase === "question") {
+          this.refreshRecipients();
+        }
+        break;
+      case "send":
+        this.log.send(update.to, update.message);
+        if (update.to === "*") {
+          this.transport?.broadcastEncoded(update.lane, update.message);
+        } else {
+          this.transport?.sendEncoded(update.to, update.lane, update.message);
+        }
+        break;
+      case "passthrough":
+        this.transport?.receive(update.playerId, update.data);
+        break;
+    }
+  }
+
+  private refreshRecipients(): void {
+    if (this.transport) {
+      this.post({
+        kind: "recipients",
+        playerIds: this.transport.getConnectedPlayers(),
+      });
+    }
+  }
+
+  private logPhase(patch: Partial<GameState>): void {
+    if (!patch.phase) {
+      return;
+    }
+
+    const state = this.store.getState();
+    this.log.phase(patch.phase, state.currentQuestionIndex);
+    if (patch.phase === "ended") {
+      this.log.end(state.scores);
+    }
+  }
+}
@@ -0,0 +1,19 @@
+import { useEffect } from "react";
+
+/**
+ * Mirrors a piece of page state onto `<html data-*>`, e.g. `phase` becomes
+ * `html[data-phase="question"]`. End-to-end tests wait on these attributes
+ * instead of sleeping or polling the page text.
+ */
+export function usePageStateAttribute(
+  name: string,
+  value: string | number,
+): void {
+  useEffect(() => {
+    const { dataset } = document.documentElement;
+    dataset[name] = String(value);
+    return () => {
+      delete dataset[name];
+    };
+  }, [name, value]);
+}
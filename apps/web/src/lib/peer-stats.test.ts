@@ -0,0 +1,168 @@
+import { describe, expect, it } from "vitest";
+import {
+  messageTypeOf,
+  PeerStatsCollector,
+  RTT_HISTORY_LENGTH,
+  summarizeRtcStats,
+  totalMessages,
+} from "./peer-stats";
+
+function statsReport(entries: Array<Record<string, unknown> & { id: string }>) {
+  return new Map(entries.map((entry) => [entry.id, entry]));
+}
+
+const CANDIDATES = [
+  { id: "L1", type: "local-candidate", candidateType: "host" },
+  { id: "L2", type: "local-candidate", candidateType: "srflx" },
+  { id: "R1", type: "remote-candidate", candidateType: "host" },
+  { id: "R2", type: "remote-candidate", candidateType: "relay" },
+];
+
+describe("summarizeRtcStats", () => {
+  it("uses the transport's selected candidate pair", () => {
+    const summary = summarizeRtcStats(
+      statsReport([
+        ...CANDIDATES,
+        {
+          id: "P1",
+          type: "candidate-pair",
+          nominated: true,
+          state: "succeeded",
+          localCandidateId: "L1",
+          remoteCandidateId: "R1",
+          currentRoundTripTime: 0.5,
+        },
+        {
+          id: "P2",
+          type: "candidate-pair",
+          nominated: true,
+          state: "succeeded",
+          localCandidateId: "L2",
+          remoteCandidateId: "R2",
+          currentRoundTripTime: 0.042,
+          bytesSent: 1200,
+          bytesReceived: 300,
+        },
+        { id: "T1", type: "transport", selectedCandidatePairId: "P2" },
+      ]),
+    );
+
+    expect(summary).toEqual({
+      rttMs: 42,
+      bytesSent: 1200,
+      bytesReceived: 300,
+      localCandidateType: "srflx",
+      remoteCandidateType: "relay",
+    });
+  });
+
+  it("falls back to the nominated succeeded pair", () => {
+    const summary = summarizeRtcStats(
+      statsReport([
+        ...CANDIDATES,
+        {
+          id: "P1",
+          type: "candidate-pair",
+          nominated: false,
+          state: "in-progress",
+          localCandidateId: "L2",
+          remoteCandidateId: "R2",
+        },
+        {
+          id: "P2",
+          type: "candidate-pair",
+          nominated: true,
+          state: "succeeded",
+          localCandidateId: "L1",
+          remoteCandidateId: "R1",
+          currentRoundTripTime: 0.01,
+        },
+      ]),
+    );
+
+    expect(summary.rttMs).toBe(10);
+    expect(summary.remoteCandidateType).toBe("host");
+  });
+
+  it("reports nothing before a pair is selected", () => {
+    expect(summarizeRtcStats(statsReport(CANDIDATES)).rttMs).toBeNull();
+  });
+});
+
+describe("messageTypeOf", () => {
+  it("reads the leading type key of a serialized message", () => {
+    expect(messageTypeOf(JSON.stringify({ type: "answer.ack" }))).toBe(
+      "answer.ack",
+    );
+    expect(messageTypeOf('{"payload":{},"type":"late"}')).toBe("unknown");
+    expect(messageTypeOf("not json")).toBe("unknown");
+  });
+});
+
+describe("PeerStatsCollector", () => {
+  it("measures time to connected from the start of the join", () => {
+    let now = 1000;
+    const stats = new PeerStatsCollector({ now: () => now });
+
+    stats.recordJoinStarted("p1", "Ann");
+    now = 1850;
+    stats.recordConnected("p1", "webrtc");
+    stats.recordConnected("p2", "relay", "Bob");
+
+    const [ann, bob] = stats.snapshot().peers;
+    expect(ann).toMatchObject({ nickname: "Ann", timeToConnectedMs: 850 });
+    expect(bob).toMatchObject({
+      nickname: "Bob",
+      transport: "relay",
+      timeToConnectedMs: null,
+    });
+  });
+
+  it("counts messages and bytes per direction and type", () => {
+    const stats = new PeerStatsCollector();
+
+    stats.recordMessage("p1", "out", "question", 200);
+    stats.recordMessage("p1", "out", "question", 220);
+    stats.recordMessage("p1", "out", "timer.sync", 40);
+    stats.recordMessage("p1", "in", "answer", 60);
+
+    const { messages } = stats.snapshot().peers[0];
+    expect(messages.out.question).toEqual({ count: 2, bytes: 420 });
+    expect(totalMessages(messages.out)).toEqual({ count: 3, bytes: 460 });
+    expect(totalMessages(messages.in)).toEqual({ count: 1, bytes: 60 });
+  });
+
+  it("keeps a bounded RTT history and marks peers that left", () => {
+    const stats = new PeerStatsCollector();
+    for (let sample = 0; sample < RTT_HISTORY_LENGTH + 5; sample++) {
+      stats.recordSample(
+        "p1",
+        {
+          rttMs: sample,
+          bytesSent: 0,
+          bytesReceived: 0,
+          localCandidateType: "host",
+          remoteCandidateType: "host",
+        },
+        512,
+      );
+    }
+    stats.recordLeft("p1");
+
+    const [peer] = stats.snapshot().peers;
+    expect(peer.rttHistoryMs).toHaveLength(RTT_HISTORY_LENGTH);
+    expect(peer.rttHistoryMs[0]).toBe(5);
+    expect(peer.bufferedAmount).toBe(512);
+    expect(peer.leftAt).not.toBeNull();
+  });
+
+  it("returns snapshots that later updates do not mutate", () => {
+    const stats = new PeerStatsCollector();
+    stats.recordMessage("p1", "out", "question", 10);
+    const before = stats.snapshot();
+
+    stats.recordMessage("p1", "out", "question", 10);
+
+    expect(before.peers[0].messages.out.question.count).toBe(1);
+  });
+});
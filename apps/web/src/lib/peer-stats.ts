@@ -0,0 +1,239 @@
+export type PeerTransport = "webrtc" | "relay";
+export type MessageDirection = "in" | "out";
+
+export const RTT_HISTORY_LENGTH = 30;
+
+export interface MessageTotals {
+  count: number;
+  bytes: number;
+}
+
+/** What one `getStats()` call says about the selected candidate pair. */
+export interface RtcStatsSummary {
+  rttMs: number | null;
+  bytesSent: number;
+  bytesReceived: number;
+  localCandidateType: string | null;
+  remoteCandidateType: string | null;
+}
+
+export interface PeerStats extends RtcStatsSummary {
+  playerId: string;
+  nickname?: string;
+  transport: PeerTransport;
+  joinStartedAt: number | null;
+  connectedAt: number | null;
+  timeToConnectedMs: number | null;
+  leftAt: number | null;
+  bufferedAmount: number;
+  sampledAt: number | null;
+  rttHistoryMs: number[];
+  messages: Record<MessageDirection, Record<string, MessageTotals>>;
+}
+
+export interface PeerStatsSnapshot {
+  capturedAt: number;
+  peers: PeerStats[];
+}
+
+const EMPTY_SUMMARY: RtcStatsSummary = {
+  rttMs: null,
+  bytesSent: 0,
+  bytesReceived: 0,
+  localCandidateType: null,
+  remoteCandidateType: null,
+};
+
+type StatsEntry = Record<string, unknown> & { id?: string; type?: string };
+
+/**
+ * Picks the pair the transport actually selected (falling back to the
+ * nominated, succeeded pair on browsers without `selectedCandidatePairId`)
+ * and resolves its candidate types, e.g. "host", "srflx" or "relay".
+ */
+export function summarizeRtcStats(report: {
+  forEach: (callback: (entry: StatsEntry, id: string) => void) => void;
+}): RtcStatsSummary {
+  const entries = new Map<string, StatsEntry>();
+  report.forEach((entry, id) => entries.set(id, entry));
+
+  let pair: StatsEntry | undefined;
+  entries.forEach((entry) => {
+    if (entry.type === "transport" && entry.selectedCandidatePairId) {
+      pair = entries.get(entry.selectedCandidatePairId as string) ?? pair;
+    }
+  });
+  if (!pair) {
+    entries.forEach((entry) => {
+      if (
+        !pair &&
+        entry.type === "candidate-pair" &&
+        entry.nominated &&
+        entry.state === "succeeded"
+      ) {
+        pair = entry;
+      }
+    });
+  }
+
+  if (!pair) {
+    return { ...EMPTY_SUMMARY };
+  }
+
+  const candidateType = (id: unknown) =>
+    (entries.get(id as string)?.candidateType as string | undefined) ?? null;
+
+  return {
+    rttMs:
+      typeof pair.currentRoundTripTime === "number"
+        ? pair.currentRoundTripTime * 1000
+        : null,
+    bytesSent: (pair.bytesSent as number | undefined) ?? 0,
+    bytesReceived: (pair.bytesReceived as number | undefined) ?? 0,
+    localCandidateType: candidateType(pair.localCandidateId),
+    remoteCandidateType: candidateType(pair.remoteCandidateId),
+  };
+}
+
+// Every message in the protocol is serialized with `type` as its first key,
+// so reading it off the front of the frame avoids a second parse.
+const LEADING_TYPE = /^\{"type":"([^"]{1,64})"/;
+
+export function messageTypeOf(raw: string): string {
+  return LEADING_TYPE.exec(raw)?.[1] ?? "unknown";
+}
+
+/**
+ * Per-peer diagnostics for the host: join timing, message counts and sizes
+ * by type, and the latest `getStats()` sample. Peers that leave are kept
+ * (with `leftAt`) so an export still shows who dropped.
+ */
+export class PeerStatsCollector {
+  private peers: Map<string, PeerStats> = new Map();
+  private now: () => number;
+
+  constructor(options: { now?: () => number } = {}) {
+    this.now = options.now ?? Date.now;
+  }
+
+  private peer(playerId: string): PeerStats {
+    let peer = this.peers.get(playerId);
+    if (!peer) {
+      peer = {
+        ...EMPTY_SUMMARY,
+        playerId,
+        transport: "webrtc",
+        joinStartedAt: null,
+        connectedAt: null,
+        timeToConnectedMs: null,
+        leftAt: null,
+        bufferedAmount: 0,
+        sampledAt: null,
+        rttHistoryMs: [],
+        messages: { in: {}, out: {} },
+      };
+      this.peers.set(playerId, peer);
+    }
+    return peer;
+  }
+
+  recordJoinStarted(playerId: string, nickname?: string): void {
+    const peer = this.peer(playerId);
+    peer.nickname = nickname ?? peer.nickname;
+    peer.joinStartedAt = this.now();
+    peer.connectedAt = null;
+    peer.timeToConnectedMs = null;
+    peer.leftAt = null;
+  }
+
+  recordConnected(
+    playerId: string,
+    transport: PeerTransport,
+    nickname?: string,
+  ): void {
+    const peer = this.peer(playerId);
+    peer.nickname = nickname ?? peer.nickname;
+    peer.transport = transport;
+    peer.connectedAt = this.now();
+    peer.leftAt = null;
+    peer.timeToConnectedMs =
+      peer.joinStartedAt !== null
+        ? peer.connectedAt - peer.joinStartedAt
+        : null;
+  }
+
+  recordLeft(playerId: string): void {
+    const peer = this.peers.get(playerId);
+    if (peer) {
+      peer.leftAt = this.now();
+    }
+  }
+
+  recordMessage(
+    playerId: string,
+    direction: MessageDirection,
+    type: string,
+    bytes: number,
+  ): void {
+    const byType = this.peer(playerId).messages[direction];
+    const totals = byType[type] ?? (byType[type] = { count: 0, bytes: 0 });
+    totals.count += 1;
+    totals.bytes += bytes;
+  }
+
+  recordSample(
+    playerId: string,
+    summary: RtcStatsSummary,
+    bufferedAmount: number,
+  ): void {
+    const peer = this.peer(playerId);
+    Object.assign(peer, summary);
+    peer.bufferedAmount = bufferedAmount;
+    peer.sampledAt = this.now();
+
+    if (summary.rttMs !== null) {
+      peer.rttHistoryMs.push(summary.rttMs);
+      if (peer.rttHistoryMs.length > RTT_HISTORY_LENGTH) {
+        peer.rttHistoryMs.shift();
+      }
+    }
+  }
+
+  snapshot(): PeerStatsSnapshot {
+    return {
+      capturedAt: this.now(),
+      peers: Array.from(this.peers.values()).map((peer) => ({
+        ...peer,
+        rttHistoryMs: [...peer.rttHistoryMs],
+        messages: {
+          in: cloneTotals(peer.messages.in),
+          out: cloneTotals(peer.messages.out),
+        },
+      })),
+    };
+  }
+
+  clear(): void {
+    this.peers.clear();
+  }
+}
+
+function cloneTotals(
+  byType: Record<string, MessageTotals>,
+): Record<string, MessageTotals> {
+  return Object.fromEntries(
+    Object.entries(byType).map(([type, totals]) => [type, { ...totals }]),
+  );
+}
+
+export function totalMessages(
+  byType: Record<string, MessageTotals>,
+): MessageTotals {
+  return Object.values(byType).reduce(
+    (sum, totals) => ({
+      count: sum.count + totals.count,
+      bytes: sum.bytes + totals.bytes,
+    }),
+    { count: 0, bytes: 0 },
+  );
+}
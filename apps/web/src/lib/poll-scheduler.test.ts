@@ -0,0 +1,136 @@
+import { afterEach, beforeEach, describe, expect, it, vi } from "vitest";
+import { DEFAULT_POLL_SCHEDULE, PollScheduler } from "./poll-scheduler";
+import { ICE_FALLBACK_TIMEOUT_MS } from "./ws-relay";
+
+const SCHEDULE = {
+  minIntervalMs: 1000,
+  maxIntervalMs: 8000,
+  idleMaxIntervalMs: 32_000,
+  backoffFactor: 2,
+  burstPolls: 1,
+};
+
+describe("PollScheduler", () => {
+  beforeEach(() => {
+    vi.useFakeTimers();
+  });
+
+  afterEach(() => {
+    vi.useRealTimers();
+  });
+
+  it("backs off exponentially while polls find nothing", async () => {
+    const poll = vi.fn(async () => false);
+    const scheduler = new PollScheduler(poll, SCHEDULE);
+    scheduler.start();
+
+    const intervals: number[] = [];
+    for (let i = 0; i < 6; i++) {
+      await vi.advanceTimersToNextTimerAsync();
+      intervals.push(scheduler.currentIntervalMs);
+    }
+    scheduler.stop();
+
+    expect(poll).toHaveBeenCalledTimes(6);
+    expect(intervals).toEqual([1000, 2000, 4000, 8000, 8000, 8000]);
+  });
+
+  it("returns to the fastest rate when a poll finds changes", async () => {
+    let changed = false;
+    const scheduler = new PollScheduler(async () => changed, SCHEDULE);
+    scheduler.start();
+    for (let i = 0; i < 4; i++) {
+      await vi.advanceTimersToNextTimerAsync();
+    }
+    expect(scheduler.currentIntervalMs).toBe(8000);
+
+    changed = true;
+    await vi.advanceTimersToNextTimerAsync();
+    scheduler.stop();
+
+    expect(scheduler.currentIntervalMs).toBe(1000);
+  });
+
+  it("polls right away on a burst", async () => {
+    const poll = vi.fn(async () => false);
+    const scheduler = new PollScheduler(poll, SCHEDULE);
+    scheduler.start();
+    for (let i = 0; i < 4; i++) {
+      await vi.advanceTimersToNextTimerAsync();
+    }
+    expect(poll).toHaveBeenCalledTimes(4);
+
+    scheduler.burst();
+    await vi.advanceTimersByTimeAsync(0);
+    scheduler.stop();
+
+    expect(poll).toHaveBeenCalledTimes(5);
+    expect(scheduler.currentIntervalMs).toBe(1000);
+  });
+
+  it("picks up an offer made at full backoff before ICE fallback", async () => {
+    let offeredAt = 0;
+    const seenAt: number[] = [];
+    const scheduler = new PollScheduler(async () => {
+      if (offeredAt > 0 && seenAt.length === 0) {
+        seenAt.push(Date.now());
+        return true;
+      }
+      return false;
+    });
+    scheduler.start();
+    for (let i = 0; i < 20; i++) {
+      await vi.advanceTimersToNextTimerAsync();
+    }
+    expect(scheduler.currentIntervalMs).toBe(
+      DEFAULT_POLL_SCHEDULE.maxIntervalMs,
+    );
+
+    // Worst case: the offer lands just after a poll.
+    offeredAt = Date.now();
+    while (seenAt.length === 0) {
+      await vi.advanceTimersToNextTimerAsync();
+    }
+    scheduler.stop();
+
+    // Leave the player time to receive the answer and finish ICE.
+    expect(seenAt[0] - offeredAt).toBeLessThanOrEqual(
+      ICE_FALLBACK_TIMEOUT_MS / 2,
+    );
+  });
+
+  it("backs off further only while idle", async () => {
+    const poll = vi.fn(async () => false);
+    const scheduler = new PollScheduler(poll, SCHEDULE);
+    scheduler.start();
+    scheduler.setIdle(true);
+    for (let i = 0; i < 8; i++) {
+      await vi.advanceTimersToNextTimerAsync();
+    }
+    expect(scheduler.currentIntervalMs).toBe(32_000);
+
+    const polls = poll.mock.calls.length;
+    scheduler.setIdle(false);
+    await vi.advanceTimersByTimeAsync(0);
+    expect(poll).toHaveBeenCalledTimes(polls + 1);
+    expect(scheduler.currentIntervalMs).toBe(1000);
+
+    for (let i = 0; i < 8; i++) {
+      await vi.advanceTimersToNextTimerAsync();
+    }
+    scheduler.stop();
+    expect(scheduler.currentIntervalMs).toBe(8000);
+  });
+
+  it("stops polling once stopped", async () => {
+    const poll = vi.fn(async () => false);
+    const scheduler = new PollScheduler(poll, SCHEDULE);
+    scheduler.start();
+    await vi.advanceTimersToNextTimerAsync();
+    scheduler.stop();
+
+    await vi.advanceTimersByTimeAsync(60_000);
+
+    expect(poll).toHaveBeenCalledTimes(1);
+  });
+});
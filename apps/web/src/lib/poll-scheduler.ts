@@ -0,0 +1,148 @@
+export interface PollSchedule {
+  /** Interval while something is happening, and right after a burst. */
+  minIntervalMs: number;
+  /**
+   * Ceiling the interval backs off to while nothing changes. Someone may
+   * be waiting on the next poll, so this stays well under the player's ICE
+   * fallback (`ICE_FALLBACK_TIMEOUT_MS`).
+   */
+  maxIntervalMs: number;
+  /** Ceiling while idle, i.e. when nobody is expected to be waiting. */
+  idleMaxIntervalMs: number;
+  backoffFactor: number;
+  /** Polls kept at `minIntervalMs` after the last change before backing off. */
+  burstPolls: number;
+}
+
+export const DEFAULT_POLL_SCHEDULE: PollSchedule = {
+  minIntervalMs: 1500,
+  maxIntervalMs: 3000,
+  idleMaxIntervalMs: 30_000,
+  backoffFactor: 2,
+  burstPolls: 4,
+};
+
+/**
+ * Runs an async poll on a self-adjusting timer. A poll resolves to whether
+ * it found anything new: if it did, the scheduler stays at the fastest rate
+ * for a few more polls, otherwise each empty poll multiplies the interval up
+ * to `maxIntervalMs`, or `idleMaxIntervalMs` while `setIdle(true)`.
+ * `burst()` snaps back to the fastest rate, e.g. when a peer drops and is
+ * expected to reconnect. Polls never overlap.
+ */
+export class PollScheduler {
+  private poll: () => Promise<boolean>;
+  private schedule: PollSchedule;
+  private timer: ReturnType<typeof setTimeout> | null = null;
+  private running = false;
+  private idle = false;
+  private polling = false;
+  private burstRequested = false;
+  private intervalMs: number;
+  private burstRemaining: number;
+
+  constructor(poll: () => Promise<boolean>, schedule?: Partial<PollSchedule>) {
+    this.poll = poll;
+    this.schedule = { ...DEFAULT_POLL_SCHEDULE, ...schedule };
+    this.intervalMs = this.schedule.minIntervalMs;
+    this.burstRemaining = this.schedule.burstPolls;
+  }
+
+  get currentIntervalMs(): number {
+    return this.intervalMs;
+  }
+
+  get isRunning(): boolean {
+    return this.running;
+  }
+
+  start(): void {
+    if (this.running) {
+      return;
+    }
+    this.running = true;
+    this.resetToFastest();
+    this.scheduleNext(0);
+  }
+
+  stop(): void {
+    this.running = false;
+    this.clearTimer();
+  }
+
+  /** Leaving idle polls right away, since someone may be waiting again. */
+  setIdle(idle: boolean): void {
+    if (this.idle === idle) {
+      return;
+    }
+    this.idle = idle;
+    if (!idle) {
+      this.burst();
+    }
+  }
+
+  /** Polls now and stays at the fastest rate for `burstPolls` polls. */
+  burst(): void {
+    if (!this.running) {
+      return;
+    }
+    this.resetToFastest();
+    if (this.polling) {
+      this.burstRequested = true;
+      return;
+    }
+    this.scheduleNext(0);
+  }
+
+  private resetToFastest(): void {
+    this.intervalMs = this.schedule.minIntervalMs;
+    this.burstRemaining = this.schedule.burstPolls;
+  }
+
+  private clearTimer(): void {
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+  }
+
+  private scheduleNext(delayMs: number): void {
+    this.clearTimer();
+    this.timer = setTimeout(() => {
+      this.timer = null;
+      void this.run();
+    }, delayMs);
+  }
+
+  private async run(): Promise<void> {
+    this.polling = true;
+    let changed = false;
+    try {
+      changed = await this.poll();
+    } catch (error) {
+      console.error("Poll error:", error);
+    }
+    this.polling = false;
+
+    if (!this.running) {
+      return;
+    }
+
+    if (changed || this.burstRequested) {
+      this.resetToFastest();
+    } else if (this.burstRemaining > 0) {
+      this.burstRemaining -= 1;
+    } else {
+      this.intervalMs = Math.min(
+        this.idle
+          ? this.schedule.idleMaxIntervalMs
+          : this.schedule.maxIntervalMs,
+        this.intervalMs * this.schedule.backoffFactor,
+      );
+    }
+
+    const delayMs = this.burstRequested ? 0 : this.intervalMs;
+    this.burstRequested = false;
+    this.scheduleNext(delayMs);
+  }
+}
@@ -0,0 +1,115 @@
+import { describe, expect, it } from "vitest";
+import {
+  attachToPlan,
+  planRelayTree,
+  rankRelayCandidates,
+  removeFromPlan,
+  type RelayCandidate,
+  type RelayTreeOptions,
+} from "./relay-tree";
+
+const options: RelayTreeOptions = { fanout: 3, minRoomSize: 4, maxRttMs: 100 };
+
+function candidates(count: number): RelayCandidate[] {
+  return Array.from({ length: count }, (_, index) => ({
+    playerId: `p${index}`,
+    rttMs: 10 + index * 5,
+    connectedAt: index,
+  }));
+}
+
+describe("rankRelayCandidates", () => {
+  it("drops unmeasured and slow peers and orders by RTT", () => {
+    const ranked = rankRelayCandidates(
+      [
+        { playerId: "slow", rttMs: 400, connectedAt: 0 },
+        { playerId: "unknown", rttMs: null, connectedAt: 0 },
+        { playerId: "b", rttMs: 20, connectedAt: 2 },
+        { playerId: "a", rttMs: 20, connectedAt: 1 },
+        { playerId: "fast", rttMs: 5, connectedAt: 3 },
+      ],
+      options,
+    );
+
+    expect(ranked.map((candidate) => candidate.playerId)).toEqual([
+      "fast",
+      "a",
+      "b",
+    ]);
+  });
+});
+
+describe("planRelayTree", () => {
+  it("stays direct for small rooms", () => {
+    const plan = planRelayTree(candidates(3), options);
+
+    expect(plan.relays).toEqual([]);
+    expect(plan.parentOf.size).toBe(0);
+  });
+
+  it("picks the lowest-RTT players as relays and respects fan-out", () => {
+    const plan = planRelayTree(candidates(12), options);
+
+    expect(plan.relays).toEqual(["p0", "p1", "p2"]);
+    plan.relays.forEach((relayId) => {
+      expect(plan.childrenOf.get(relayId)!.length).toBeLessThanOrEqual(3);
+    });
+    expect(plan.parentOf.size).toBe(9);
+    expect(plan.parentOf.has("p0")).toBe(false);
+  });
+
+  it("leaves overflow players on direct connections", () => {
+    const slowRoom = candidates(12).map((candidate, index) => ({
+      ...candidate,
+      rttMs: index === 0 ? 10 : 500,
+    }));
+
+    const plan = planRelayTree(slowRoom, options);
+
+    expect(plan.relays).toEqual(["p0"]);
+    expect(plan.childrenOf.get("p0")).toHaveLength(3);
+    expect(plan.parentOf.size).toBe(3);
+  });
+});
+
+describe("attachToPlan", () => {
+  it("places late joiners under the least-loaded relay", () => {
+    const plan = planRelayTree(candidates(6), options);
+    const before = plan.relays.map(
+      (relayId) => plan.childrenOf.get(relayId)!.length,
+    );
+
+    const relayId = attachToPlan(plan, "late", options);
+
+    expect(relayId).toBeDefined();
+    expect(plan.parentOf.get("late")).toBe(relayId);
+    expect(Math.min(...before)).toBe(
+      plan.childrenOf.get(relayId!)!.length - 1,
+    );
+  });
+});
+
+describe("removeFromPlan", () => {
+  it("redistributes a lost relay's children to surviving relays", () => {
+    const plan = planRelayTree(candidates(8), options);
+    const lostRelay = plan.relays[0];
+    const orphans = [...plan.childrenOf.get(lostRelay)!];
+
+    const moved = removeFromPlan(plan, lostRelay, options);
+
+    expect(moved).toEqual(orphans);
+    expect(plan.relays).not.toContain(lostRelay);
+    orphans.forEach((childId) => {
+      expect(plan.parentOf.get(childId)).not.toBe(lostRelay);
+    });
+  });
+
+  it("detaches a child without touching other assignments", () => {
+    const plan = planRelayTree(candidates(8), options);
+    const [childId, relayId] = plan.parentOf.entries().next().value!;
+
+    expect(removeFromPlan(plan, childId, options)).toEqual([]);
+    expect(plan.parentOf.has(childId)).toBe(false);
+    expect(plan.childrenOf.get(relayId)).not.toContain(childId);
+  });
+});
@@ -0,0 +1,148 @@
+export interface RelayCandidate {
+  playerId: string;
+  rttMs: number | null;
+  connectedAt: number;
+}
+
+export interface RelayTreeOptions {
+  fanout: number;
+  minRoomSize: number;
+  maxRttMs: number;
+}
+
+export interface RelayPlan {
+  relays: string[];
+  parentOf: Map<string, string>;
+  childrenOf: Map<string, string[]>;
+}
+
+export const DEFAULT_RELAY_OPTIONS: RelayTreeOptions = {
+  fanout: 8,
+  minRoomSize: 16,
+  maxRttMs: 150,
+};
+
+export function createEmptyPlan(): RelayPlan {
+  return { relays: [], parentOf: new Map(), childrenOf: new Map() };
+}
+
+export function rankRelayCandidates(
+  candidates: RelayCandidate[],
+  options: RelayTreeOptions,
+): RelayCandidate[] {
+  return candidates
+    .filter(
+      (candidate) =>
+        candidate.rttMs !== null && candidate.rttMs <= options.maxRttMs,
+    )
+    .sort(
+      (a, b) =>
+        (a.rttMs as number) - (b.rttMs as number) ||
+        a.connectedAt - b.connectedAt,
+    );
+}
+
+function findLeastLoadedRelay(
+  plan: RelayPlan,
+  fanout: number,
+): string | undefined {
+  let best: string | undefined;
+  let bestLoad = fanout;
+
+  for (const relayId of plan.relays) {
+    const load = plan.childrenOf.get(relayId)?.length ?? 0;
+    if (load < bestLoad) {
+      best = relayId;
+      bestLoad = load;
+    }
+  }
+
+  return best;
+}
+
+/**
+ * Attaches `playerId` under the relay with the most spare capacity. Players
+ * that do not fit stay on a direct host connection (no parent).
+ */
+export function attachToPlan(
+  plan: RelayPlan,
+  playerId: string,
+  options: RelayTreeOptions,
+): string | undefined {
+  if (plan.parentOf.has(playerId) || plan.childrenOf.has(playerId)) {
+    return plan.parentOf.get(playerId);
+  }
+
+  const relayId = findLeastLoadedRelay(plan, options.fanout);
+  if (!relayId) {
+    return undefined;
+  }
+
+  plan.parentOf.set(playerId, relayId);
+  plan.childrenOf.get(relayId)?.push(playerId);
+  return relayId;
+}
+
+export function planRelayTree(
+  candidates: RelayCandidate[],
+  options: RelayTreeOptions = DEFAULT_RELAY_OPTIONS,
+): RelayPlan {
+  const plan = createEmptyPlan();
+
+  if (candidates.length < options.minRoomSize || options.fanout < 1) {
+    return plan;
+  }
+
+  const ranked = rankRelayCandidates(candidates, options);
+  const relayCount = Math.min(
+    ranked.length,
+    Math.ceil(candidates.length / (options.fanout + 1)),
+  );
+
+  for (const candidate of ranked.slice(0, relayCount)) {
+    plan.relays.push(candidate.playerId);
+    plan.childrenOf.set(candidate.playerId, []);
+  }
+
+  for (const candidate of candidates) {
+    if (!plan.childrenOf.has(candidate.playerId)) {
+      attachToPlan(plan, candidate.playerId, options);
+    }
+  }
+
+  return plan;
+}
+
+/**
+ * Removes a player from the plan. When the player was a relay, its children
+ * are redistributed across the remaining relays; the returned list holds
+ * every child whose parent changed so the host can re-point them.
+ */
+export function removeFromPlan(
+  plan: RelayPlan,
+  playerId: string,
+  options: RelayTreeOptions,
+): string[] {
+  const parentId = plan.parentOf.get(playerId);
+  if (parentId) {
+    plan.parentOf.delete(playerId);
+    const siblings = plan.childrenOf.get(parentId) ?? [];
+    plan.childrenOf.set(
+      parentId,
+      siblings.filter((childId) => childId !== playerId),
+    );
+    return [];
+  }
+
+  const orphans = plan.childrenOf.get(playerId);
+  if (!orphans) {
+    return [];
+  }
+
+  plan.childrenOf.delete(playerId);
+  plan.relays = plan.relays.filter((relayId) => relayId !== playerId);
+  orphans.forEach((childId) => plan.parentOf.delete(childId));
+  orphans.forEach((childId) => attachToPlan(plan, childId, options));
+
+  return orphans;
+}
@@ -0,0 +1,285 @@
+import { getMessageType, ICE_SERVERS } from "@/lib/channels";
+
+export const RELAY_CHANNEL_LABEL = "relay";
+export const RELAY_ANSWER_FLUSH_MS = 50;
+
+export interface RelaySignalPayload {
+  from?: string;
+  to: string;
+  description?: RTCSessionDescriptionInit;
+  candidate?: RTCIceCandidateInit;
+}
+
+export interface RelayedAnswer {
+  playerId: string;
+  message: unknown;
+}
+
+export function isRelayMessage(data: unknown): boolean {
+  return getMessageType(data)?.startsWith("relay.") ?? false;
+}
+
+/**
+ * Player-side half of the relay overlay. A relay accepts peer connections
+ * from the children the host assigned to it, forwards `relay.fanout`
+ * broadcasts down to them and batches their answers back up to the host.
+ * A child opens one extra connection to its relay. All relay signaling is
+ * brokered by the host over the existing data channels.
+ */
+export class PlayerRelayAgent {
+  private sendToHost: (data: unknown) => void;
+  private deliver: (data: unknown) => void;
+  private allowedChildren: Set<string> = new Set();
+  private childConnections: Map<string, RTCPeerConnection> = new Map();
+  private childChannels: Map<string, RTCDataChannel> = new Map();
+  private parentId: string | null = null;
+  private parentConnection: RTCPeerConnection | null = null;
+  private parentChannel: RTCDataChannel | null = null;
+  private answerBatch: RelayedAnswer[] = [];
+  private flushTimer: ReturnType<typeof setTimeout> | null = null;
+
+  constructor(options: {
+    sendToHost: (data: unknown) => void;
+    deliver: (data: unknown) => void;
+  }) {
+    this.sendToHost = options.sendToHost;
+    this.deliver = options.deliver;
+  }
+
+  handle(data: unknown): boolean {
+    if (!isRelayMessage(data)) {
+      return false;
+    }
+
+    const msg = data as { type: string; payload?: unknown };
+
+    switch (msg.type) {
+      case "relay.assign":
+        this.assignChildren(
+          (msg.payload as { children?: string[] } | undefined)?.children ?? [],
+        );
+        break;
+      case "relay.parent":
+        this.connectToParent(
+          (msg.payload as { relayId?: string | null } | undefined)?.relayId ??
+            null,
+        );
+        break;
+      case "relay.signal":
+        this.handleSignal(msg.payload as RelaySignalPayload);
+        break;
+      case "relay.fanout":
+        this.deliver(msg.payload);
+        this.forwardToChildren(JSON.stringify(msg.payload));
+        break;
+    }
+
+    return true;
+  }
+
+  /** Routes answers through the relay when a parent link is open. */
+  sendUpstream(data: unknown): boolean {
+    if (
+      getMessageType(data) !== "answer" ||
+      this.parentChannel?.readyState !== "open"
+    ) {
+      return false;
+    }
+
+    this.parentChannel.send(JSON.stringify(data));
+    return true;
+  }
+
+  close(): void {
+    this.childConnections.forEach((connection) => connection.close());
+    this.childConnections.clear();
+    this.childChannels.clear();
+    this.allowedChildren.clear();
+    this.closeParent();
+    if (this.flushTimer) {
+      clearTimeout(this.flushTimer);
+      this.flushTimer = null;
+    }
+    this.answerBatch = [];
+  }
+
+  private assignChildren(children: string[]): void {
+    this.allowedChildren = new Set(children);
+
+    this.childConnections.forEach((connection, childId) => {
+      if (!this.allowedChildren.has(childId)) {
+        connection.close();
+        this.childConnections.delete(childId);
+        this.childChannels.delete(childId);
+      }
+    });
+  }
+
+  private closeParent(): void {
+    this.parentChannel?.close();
+    this.parentConnection?.close();
+    this.parentChannel = null;
+    this.parentConnection = null;
+    this.parentId = null;
+  }
+
+  private async connectToParent(relayId: string | null): Promise<void> {
+    if (relayId === this.parentId && this.parentConnection) {
+      return;
+    }
+
+    this.closeParent();
+    if (!relayId) {
+      return;
+    }
+
+    const connection = new RTCPeerConnection({ iceServers: ICE_SERVERS });
+    this.parentId = relayId;
+    this.parentConnection = connection;
+
+    connection.onicecandidate = (event) => {
+      if (event.candidate) {
+        this.signal({ to: relayId, candidate: event.candidate.toJSON() });
+      }
+    };
+
+    const channel = connection.createDataChannel(RELAY_CHANNEL_LABEL);
+    this.parentChannel = channel;
+
+    channel.onmessage = (event) => {
+      try {
+        this.deliver(JSON.parse(event.data));
+      } catch (error) {
+        console.error("Failed to parse relayed message:", error);
+      }
+    };
+
+    channel.onclose = () => {
+      if (this.parentChannel === channel) {
+        this.closeParent();
+        this.sendToHost({ type: "relay.lost", payload: { relayId } });
+      }
+    };
+
+    try {
+      const offer = await connection.createOffer();
+      await connection.setLocalDescription(offer);
+      this.signal({ to: relayId, description: offer });
+    } catch (error) {
+      console.error("Failed to offer relay link:", error);
+      this.closeParent();
+    }
+  }
+
+  private async handleSignal(payload: RelaySignalPayload): Promise<void> {
+    const from = payload.from;
+    if (!from) {
+      return;
+    }
+
+    try {
+      if (payload.description?.type === "offer") {
+        await this.acceptChild(from, payload.description);
+      } else if (
+        payload.description?.type === "answer" &&
+        from === this.parentId
+      ) {
+        await this.parentConnection?.setRemoteDescription(payload.description);
+      } else if (payload.candidate) {
+        const connection =
+          from === this.parentId
+            ? this.parentConnection
+            : this.childConnections.get(from);
+        await connection?.addIceCandidate(payload.candidate);
+      }
+    } catch (error) {
+      console.error("Relay signaling error:", error);
+    }
+  }
+
+  private async acceptChild(
+    childId: string,
+    offer: RTCSessionDescriptionInit,
+  ): Promise<void> {
+    if (!this.allowedChildren.has(childId)) {
+      return;
+    }
+
+    this.childConnections.get(childId)?.close();
+
+    const connection = new RTCPeerConnection({ iceServers: ICE_SERVERS });
+    this.childConnections.set(childId, connection);
+
+    connection.onicecandidate = (event) => {
+      if (event.candidate) {
+        this.signal({ to: childId, candidate: event.candidate.toJSON() });
+      }
+    };
+
+    connection.ondatachannel = (event) => {
+      const channel = event.channel;
+
+      channel.onopen = () => {
+        this.childChannels.set(childId, channel);
+        this.sendToHost({ type: "relay.ready", payload: { childId } });
+      };
+
+      channel.onmessage = (messageEvent) => {
+        try {
+          this.queueAnswer(childId, JSON.parse(messageEvent.data));
+        } catch (error) {
+          console.error("Failed to parse child message:", error);
+        }
+      };
+
+      channel.onclose = () => {
+        if (this.childChannels.get(childId) === channel) {
+          this.childChannels.delete(childId);
+        }
+      };
+    };
+
+    await connection.setRemoteDescription(offer);
+    const answer = await connection.createAnswer();
+    await connection.setLocalDescription(answer);
+    this.signal({ to: childId, description: answer });
+  }
+
+  private signal(payload: RelaySignalPayload): void {
+    this.sendToHost({ type: "relay.signal", payload });
+  }
+
+  private forwardToChildren(message: string): void {
+    this.childChannels.forEach((channel) => {
+      if (channel.readyState === "open") {
+        channel.send(message);
+      }
+    });
+  }
+
+  private queueAnswer(childId: string, message: unknown): void {
+    if (getMessageType(message) !== "answer") {
+      return;
+    }
+
+    this.answerBatch.push({ playerId: childId, message });
+
+    if (!this.flushTimer) {
+      this.flushTimer = setTimeout(
+        () => this.flushAnswers(),
+        RELAY_ANSWER_FLUSH_MS,
+      );
+    }
+  }
+
+  private flushAnswers(): void {
+    this.flushTimer = null;
+    if (this.answerBatch.length === 0) {
+      return;
+    }
+
+    const answers = this.answerBatch;
+    this.answerBatch = [];
+    this.sendToHost({ type: "relay.answers", payload: { answers } });
+  }
+}
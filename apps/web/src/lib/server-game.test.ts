@@ -0,0 +1,35 @@
+import { describe, it, expect } from "vitest";
+import {
+  decodeStatePatch,
+  encodeStatePatch,
+  getGameServerUrl,
+} from "./server-game";
+
+describe("getGameServerUrl", () => {
+  it("points at the game path of the relay", () => {
+    expect(getGameServerUrl("ws://localhost:3001")).toBe(
+      "ws://localhost:3001/game",
+    );
+  });
+});
+
+describe("state patch codec", () => {
+  it("round-trips map fields through JSON", () => {
+    const patch = {
+      phase: "question" as const,
+      answers: new Map([["p1", ["a"]]]),
+      scores: new Map([["p1", 800]]),
+    };
+
+    const wire = JSON.parse(JSON.stringify(encodeStatePatch(patch)));
+
+    expect(wire.scores).toEqual([["p1", 800]]);
+    expect(decodeStatePatch(wire)).toEqual(patch);
+  });
+
+  it("leaves patches without maps untouched", () => {
+    expect(decodeStatePatch(encodeStatePatch({ countdown: 2 }))).toEqual({
+      countdown: 2,
+    });
+  });
+});
@@ -0,0 +1,125 @@
+import type { Question } from "@opentriiva/pack-schema";
+import { buildRelaySocketUrl, WebSocketRelayTransport } from "@/lib/ws-relay";
+import type {
+  GameSettings,
+  GameState,
+  GameStoreApi,
+} from "@/stores/gameStoreCore";
+
+export const GAME_SERVER_PATH = "/game";
+
+export type HostControlMessage =
+  | {
+      type: "host.setup";
+      payload: { questions: Question[]; settings: Partial<GameSettings> };
+    }
+  | { type: "host.start" }
+  | { type: "host.reveal" }
+  | { type: "host.next" };
+
+const MAP_KEYS = ["answers", "scores"] as const;
+
+export function getGameServerUrl(relayUrl: string): string {
+  return new URL(GAME_SERVER_PATH, relayUrl).toString();
+}
+
+/** Maps do not survive JSON, so they travel as entry lists. */
+export function encodeStatePatch(
+  patch: Partial<GameState>,
+): Record<string, unknown> {
+  const encoded: Record<string, unknown> = { ...patch };
+  MAP_KEYS.forEach((key) => {
+    const value = patch[key];
+    if (value instanceof Map) {
+      encoded[key] = Array.from(value.entries());
+    }
+  });
+  return encoded;
+}
+
+export function decodeStatePatch(
+  encoded: Record<string, unknown>,
+): Partial<GameState> {
+  const patch = { ...encoded } as Record<string, unknown>;
+  MAP_KEYS.forEach((key) => {
+    if (Array.isArray(encoded[key])) {
+      patch[key] = new Map(encoded[key] as Array<[string, unknown]>);
+    }
+  });
+  return patch as Partial<GameState>;
+}
+
+/**
+ * Host side of a server-authoritative game. The game engine runs in the
+ * relay process; this client only sends controls and mirrors the state
+ * it streams back into the local store for rendering.
+ */
+export class ServerGameController {
+  private store: GameStoreApi;
+  private transport: WebSocketRelayTransport;
+  private setupMessage: HostControlMessage | null = null;
+  private onConnectionChange?: (connected: boolean) => void;
+
+  constructor(options: {
+    relayUrl: string;
+    roomId: string;
+    hostToken: string;
+    store: GameStoreApi;
+    onConnectionChange?: (connected: boolean) => void;
+  }) {
+    this.store = options.store;
+    this.onConnectionChange = options.onConnectionChange;
+    this.transport = new WebSocketRelayTransport({
+      url: buildRelaySocketUrl(getGameServerUrl(options.relayUrl), {
+        role: "host",
+        roomId: options.roomId,
+        token: options.hostToken,
+      }),
+      reconnect: true,
+      onOpen: () => {
+        this.onConnectionChange?.(true);
+        if (this.setupMessage) {
+          this.transport.send(this.setupMessage);
+        }
+      },
+      onClose: () => this.onConnectionChange?.(false),
+      onMessage: (data) => this.handleMessage(data),
+    });
+  }
+
+  connect(): void {
+    this.transport.connect();
+  }
+
+  /** Remembered and replayed on reconnect; the server ignores it mid-game. */
+  setup(questions: Question[], settings: Partial<GameSettings>): void {
+    this.setupMessage = {
+      type: "host.setup",
+      payload: { questions, settings },
+    };
+    this.transport.send(this.setupMessage);
+  }
+
+  start(): void {
+    this.transport.send({ type: "host.start" });
+  }
+
+  reveal(): void {
+    this.transport.send({ type: "host.reveal" });
+  }
+
+  next(): void {
+    this.transport.send({ type: "host.next" });
+  }
+
+  close(): void {
+    this.transport.close();
+  }
+
+  private handleMessage(data: unknown): void {
+    const msg = data as { type?: string; payload?: Record<string, unknown> };
+    if (msg?.type === "state" && msg.payload) {
+      this.store.setState(decodeStatePatch(msg.payload));
+    }
+  }
+}
@@ -0,0 +1,72 @@
+import { describe, expect, it } from "vitest";
+import {
+  choicePermutation,
+  createRandom,
+  hashSeed,
+  permuteChoices,
+  shuffle,
+} from "./shuffle";
+
+const CHOICES = ["a", "b", "c", "d"].map((id) => ({ id, text: id }));
+
+describe("shuffle", () => {
+  it("is deterministic for a seed and keeps every item", () => {
+    const items = Array.from({ length: 20 }, (_, index) => index);
+    const first = shuffle(items, createRandom(7));
+
+    expect(shuffle(items, createRandom(7))).toEqual(first);
+    expect([...first].sort((a, b) => a - b)).toEqual(items);
+    expect(items[0]).toBe(0);
+  });
+
+  it("picks every ordering about equally often", () => {
+    const random = createRandom(hashSeed("uniformity"));
+    const counts = new Map<string, number>();
+    const rounds = 6000;
+    for (let i = 0; i < rounds; i++) {
+      const key = shuffle(["x", "y", "z"], random).join("");
+      counts.set(key, (counts.get(key) ?? 0) + 1);
+    }
+
+    expect(counts.size).toBe(6);
+    counts.forEach((count) => {
+      expect(Math.abs(count - rounds / 6)).toBeLessThan(rounds / 6 / 7);
+    });
+  });
+});
+
+describe("choicePermutation", () => {
+  it("is the same on host and player for a seed, player and question", () => {
+    expect(choicePermutation(99, "p1", 3, 4)).toEqual(
+      choicePermutation(99, "p1", 3, 4),
+    );
+  });
+
+  it("differs between players and questions", () => {
+    const orders = new Set<string>();
+    for (let player = 0; player < 20; player++) {
+      for (let question = 0; question < 5; question++) {
+        orders.add(choicePermutation(1, `p${player}`, question, 4).join(""));
+      }
+    }
+
+    expect(orders.size).toBeGreaterThan(12);
+  });
+});
+
+describe("permuteChoices", () => {
+  it("reorders choices without changing their ids", () => {
+    const permutation = choicePermutation(5, "p1", 0, CHOICES.length);
+    const shown = permuteChoices(CHOICES, 5, "p1", 0);
+
+    shown.forEach((choice, position) => {
+      expect(choice).toBe(CHOICES[permutation[position]]);
+    });
+    expect(shown.map((choice) => choice.id).sort()).toEqual([
+      "a",
+      "b",
+      "c",
+      "d",
+    ]);
+  });
+});
@@ -0,0 +1,82 @@
+/**
+ * Seeded shuffling. The host draws one seed per game; question order and
+ * every player's choice order are derived from it, so a player recomputes
+ * its own choice order from the question broadcast and the host never
+ * sends (or stores) a per-player copy of a question.
+ */
+
+/** 32-bit FNV-1a over the parts, so related keys give unrelated seeds. */
+export function hashSeed(...parts: Array<string | number>): number {
+  const text = parts.join("\u0000");
+  let hash = 0x811c9dc5;
+  for (let i = 0; i < text.length; i++) {
+    hash ^= text.charCodeAt(i);
+    hash = Math.imul(hash, 0x01000193);
+  }
+  return hash >>> 0;
+}
+
+/** mulberry32: a tiny PRNG with good enough spread for shuffling. */
+export function createRandom(seed: number): () => number {
+  let state = seed >>> 0;
+  return () => {
+    state = (state + 0x6d2b79f5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+export function randomSeed(): number {
+  return Math.floor(Math.random() * 4294967296);
+}
+
+/** Fisher–Yates: an unbiased O(n) shuffle into a new array. */
+export function shuffle<T>(items: readonly T[], random: () => number): T[] {
+  const result = [...items];
+  for (let i = result.length - 1; i > 0; i--) {
+    const j = Math.floor(random() * (i + 1));
+    [result[i], result[j]] = [result[j], result[i]];
+  }
+  return result;
+}
+
+export function shuffleQuestions<T>(
+  questions: readonly T[],
+  seed: number,
+): T[] {
+  return shuffle(questions, createRandom(hashSeed(seed, "questions")));
+}
+
+/**
+ * The order one player sees a question's choices in: the choice shown at
+ * position `i` is canonical choice `permutation[i]`.
+ */
+export function choicePermutation(
+  seed: number,
+  playerId: string,
+  questionIndex: number,
+  count: number,
+): number[] {
+  const indices = Array.from({ length: count }, (_, index) => index);
+  return shuffle(
+    indices,
+    createRandom(hashSeed(seed, playerId, questionIndex)),
+  );
+}
+
+/**
+ * Reorders choices for one player. Choices keep their canonical ids, so
+ * whatever the player picks is scored against the canonical answer as is.
+ */
+export function permuteChoices<T>(
+  choices: readonly T[],
+  seed: number,
+  playerId: string,
+  questionIndex: number,
+): T[] {
+  return choicePermutation(seed, playerId, questionIndex, choices.length).map(
+    (index) => choices[index],
+  );
+}
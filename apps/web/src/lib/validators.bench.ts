@@ -0,0 +1,155 @@
+import { bench, describe } from "vitest";
+import { validateQuestion, type Question } from "@opentriiva/pack-schema";
+import {
+  validateAnswerSubmitPayload,
+  validateMessageEnvelope,
+  validatePlayer,
+  validateQuestionShowPayload,
+} from "@opentriiva/protocol";
+import { FrameDecoder } from "./frame-decoder";
+
+const PACK_SIZES = [10, 500, 5000];
+const ROOM_SIZES = [10, 100, 1000];
+
+function makeQuestion(index: number): Question {
+  return {
+    id: `q${index}`,
+    type: index % 5 === 0 ? "boolean" : "mcq",
+    prompt: `Question ${index}: which of these is the right answer?`,
+    choices:
+      index % 5 === 0
+        ? [
+            { id: "true", text: "True" },
+            { id: "false", text: "False" },
+          ]
+        : ["a", "b", "c", "d"].map((id) => ({ id, text: `Choice ${id}` })),
+    answer: { choiceId: index % 5 === 0 ? "true" : "b" },
+  };
+}
+
+for (const size of PACK_SIZES) {
+  describe(`pack validation (${size} questions)`, () => {
+    const questions: unknown[] = Array.from({ length: size }, (_, index) =>
+      makeQuestion(index),
+    );
+    const raw = JSON.stringify(questions);
+
+    bench("validateQuestion", () => {
+      questions.forEach((question) => validateQuestion(question));
+    });
+
+    bench("JSON.parse + validateQuestion", () => {
+      (JSON.parse(raw) as unknown[]).forEach((question) =>
+        validateQuestion(question),
+      );
+    });
+  });
+}
+
+describe("protocol validators (single message)", () => {
+  const questionShow = {
+    questionId: "q1",
+    questionIndex: 0,
+    totalQuestions: 10,
+    prompt: "Which planet is known as the Red Planet?",
+    choices: ["Venus", "Mars", "Jupiter", "Saturn"].map((text, index) => ({
+      id: "abcd"[index],
+      text,
+    })),
+    startTime: Date.now(),
+    durationMs: 20_000,
+  };
+
+  bench("validateQuestionShowPayload", () => {
+    validateQuestionShowPayload(questionShow);
+  });
+});
+
+for (const players of ROOM_SIZES) {
+  describe(`protocol validators (${players} players)`, () => {
+    const answers = Array.from({ length: players }, (_, index) =>
+      JSON.stringify({
+        v: 1,
+        t: "answer.submit",
+        id: `m${index}`,
+        ts: Date.now(),
+        payload: {
+          questionId: "q1",
+          selectedChoiceIds: ["abcd"[index % 4]],
+          submitTime: index * 10,
+        },
+      }),
+    );
+    const roster = Array.from({ length: players }, (_, index) => ({
+      id: `p${index}`,
+      nickname: `Player ${index}`,
+      isReady: true,
+      isConnected: true,
+    }));
+
+    bench("decode + validate a round of answers", () => {
+      answers.forEach((raw) => {
+        const message = JSON.parse(raw);
+        if (validateMessageEnvelope(message)) {
+          validateAnswerSubmitPayload(message.payload);
+        }
+      });
+    });
+
+    // The frames players actually send, through the host's decoder versus a
+    // bare parse. The rate limit is lifted so every frame takes the full path.
+    const frames = Array.from({ length: players }, (_, index) =>
+      JSON.stringify({
+        type: "answer",
+        playerId: `p${index}`,
+        questionId: "q1",
+        choiceId: "abcd"[index % 4],
+        timeMs: index * 10,
+      }),
+    );
+    const decoder = new FrameDecoder({
+      rateLimit: { perSecond: Infinity, burst: Infinity },
+    });
+
+    bench("JSON.parse a round of answer frames", () => {
+      frames.forEach((raw) => JSON.parse(raw));
+    });
+
+    bench("FrameDecoder a round of answer frames", () => {
+      frames.forEach((raw, index) => decoder.decode(`p${index}`, raw));
+    });
+
+    bench("validatePlayer roster", () => {
+      roster.forEach((player) => validatePlayer(player));
+    });
+  });
+}
+
+describe("frame decoder rejections (single frame)", () => {
+  const flooded = new FrameDecoder();
+  const answer = JSON.stringify({ type: "answer", choiceId: "b", timeMs: 1 });
+  for (let i = 0; i < 200; i++) {
+    flooded.decode("flooder", answer);
+  }
+  const decoder = new FrameDecoder({
+    rateLimit: { perSecond: Infinity, burst: Infinity },
+  });
+  const padded = JSON.stringify({
+    type: "answer",
+    choiceId: "b",
+    timeMs: 1,
+    questionId: "q".repeat(4096),
+  });
+
+  bench("rate-limited", () => {
+    flooded.decode("flooder", answer);
+  });
+
+  bench("oversized answer", () => {
+    decoder.decode("p1", padded);
+  });
+
+  bench("unknown type", () => {
+    decoder.decode("p1", '{"type":"host.start"}');
+  });
+});
@@ -0,0 +1,90 @@
+import { describe, expect, it } from "vitest";
+import { computeFlipOffsets, computeVirtualWindow } from "./virtual-window";
+
+describe("computeVirtualWindow", () => {
+  it("renders everything when the list fits in the viewport", () => {
+    expect(
+      computeVirtualWindow({
+        itemCount: 5,
+        rowPitch: 70,
+        viewportHeight: 560,
+        scrollTop: 0,
+      }),
+    ).toEqual({ start: 0, end: 5, totalHeight: 350 });
+  });
+
+  it("limits long lists to the visible rows plus overscan", () => {
+    const window = computeVirtualWindow({
+      itemCount: 500,
+      rowPitch: 70,
+      viewportHeight: 560,
+      scrollTop: 7000,
+      overscan: 2,
+    });
+
+    expect(window.start).toBe(98);
+    expect(window.end).toBe(100 + 9 + 2);
+    expect(window.totalHeight).toBe(35000);
+  });
+
+  it("clamps the window at the end of the list", () => {
+    const window = computeVirtualWindow({
+      itemCount: 20,
+      rowPitch: 70,
+      viewportHeight: 560,
+      scrollTop: 100000,
+    });
+
+    expect(window.end).toBe(20);
+    expect(window.start).toBeLessThan(20);
+  });
+
+  it("returns an empty window for an empty list", () => {
+    expect(
+      computeVirtualWindow({
+        itemCount: 0,
+        rowPitch: 70,
+        viewportHeight: 560,
+        scrollTop: 0,
+      }),
+    ).toEqual({ start: 0, end: 0, totalHeight: 0 });
+  });
+});
+
+describe("computeFlipOffsets", () => {
+  const keys = ["a", "b", "c", "d"];
+
+  it("offsets only rows that moved inside the window", () => {
+    const offsets = computeFlipOffsets({
+      keyAt: (index) => keys[index],
+      start: 0,
+      end: 3,
+      previousIndexes: new Map([
+        ["a", 1],
+        ["b", 0],
+        ["c", 2],
+        ["d", 3],
+      ]),
+      rowPitch: 50,
+      maxOffset: 1000,
+    });
+
+    expect(Array.from(offsets)).toEqual([
+      ["a", 50],
+      ["b", -50],
+    ]);
+  });
+
+  it("skips rows without a previous position and clamps long moves", () => {
+    const offsets = computeFlipOffsets({
+      keyAt: (index) => keys[index],
+      start: 0,
+      end: 4,
+      previousIndexes: new Map([["d", 0]]),
+      rowPitch: 50,
+      maxOffset: 100,
+    });
+
+    expect(Array.from(offsets)).toEqual([["d", -100]]);
+  });
+});
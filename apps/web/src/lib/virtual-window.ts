@@ -0,0 +1,68 @@
+export const DEFAULT_OVERSCAN = 3;
+
+export interface VirtualWindow {
+  /** First rendered index (inclusive). */
+  start: number;
+  /** Last rendered index (exclusive). */
+  end: number;
+  totalHeight: number;
+}
+
+/**
+ * Rows in these lists have a fixed pitch (row height plus gap), so the
+ * visible range follows from scroll position alone and nothing has to be
+ * measured in the DOM.
+ */
+export function computeVirtualWindow(options: {
+  itemCount: number;
+  rowPitch: number;
+  viewportHeight: number;
+  scrollTop: number;
+  overscan?: number;
+}): VirtualWindow {
+  const { itemCount, rowPitch, viewportHeight, scrollTop } = options;
+  const overscan = options.overscan ?? DEFAULT_OVERSCAN;
+  const totalHeight = itemCount * rowPitch;
+
+  if (itemCount === 0 || rowPitch <= 0) {
+    return { start: 0, end: 0, totalHeight };
+  }
+
+  const firstVisible = Math.floor(Math.max(0, scrollTop) / rowPitch);
+  const visibleCount = Math.ceil(viewportHeight / rowPitch) + 1;
+  const start = Math.min(itemCount - 1, Math.max(0, firstVisible - overscan));
+  const end = Math.min(itemCount, firstVisible + visibleCount + overscan);
+
+  return { start, end, totalHeight };
+}
+
+/**
+ * FLIP offsets for the rows in `[start, end)`: how far (in px) each row has
+ * to be shifted so it appears at its previous slot before animating to its
+ * new one. Rows that did not move or were not on screen before are skipped,
+ * and rows arriving from far away start just outside the viewport.
+ */
+export function computeFlipOffsets(options: {
+  keyAt: (index: number) => string;
+  start: number;
+  end: number;
+  previousIndexes: ReadonlyMap<string, number>;
+  rowPitch: number;
+  maxOffset: number;
+}): Map<string, number> {
+  const { keyAt, start, end, previousIndexes, rowPitch, maxOffset } = options;
+  const offsets = new Map<string, number>();
+
+  for (let index = start; index < end; index++) {
+    const key = keyAt(index);
+    const previous = previousIndexes.get(key);
+    if (previous === undefined || previous === index) {
+      continue;
+    }
+
+    const offset = (previous - index) * rowPitch;
+    offsets.set(key, Math.max(-maxOffset, Math.min(maxOffset, offset)));
+  }
+
+  return offsets;
+}
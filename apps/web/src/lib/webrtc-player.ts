@@ -0,0 +1,505 @@
+import {
+  ANSWER_MAX_ATTEMPTS,
+  ANSWER_RETRY_INTERVAL_MS,
+  createFastChannel,
+  ICE_SERVERS,
+  pickOpenChannel,
+  RELIABLE_CHANNEL_LABEL,
+  selectLane,
+} from "@/lib/channels";
+import { PlayerRelayAgent } from "@/lib/relay";
+import { getGameServerUrl } from "@/lib/server-game";
+import {
+  buildRelaySocketUrl,
+  ICE_FALLBACK_TIMEOUT_MS,
+  WebSocketRelayTransport,
+} from "@/lib/ws-relay";
+
+// No TURN servers plus a relay-only policy guarantees ICE never completes,
+// which is how the WebSocket fallback is exercised locally.
+const FORCED_ICE_FAILURE_CONFIG: RTCConfiguration = {
+  iceServers: [],
+  iceTransportPolicy: "relay",
+};
+
+export class PlayerWebRTCManager {
+  private connection: RTCPeerConnection | null = null;
+  private dataChannel: RTCDataChannel | null = null;
+  private fastChannel: RTCDataChannel | null = null;
+  private pendingAcks: Map<string, ReturnType<typeof setInterval>> = new Map();
+  private relayAgent: PlayerRelayAgent;
+  private relayUrl?: string;
+  private relayTransport: WebSocketRelayTransport | null = null;
+  private useRelayTransport = false;
+  private forceIceFailure: boolean;
+  private serverAuthoritative: boolean;
+  private iceFallbackTimer: ReturnType<typeof setTimeout> | null = null;
+  private signalingUrl: string;
+  private roomId: string;
+  private playerId: string;
+  private playerToken?: string;
+  private nickname: string;
+  private pollInterval: ReturnType<typeof setInterval> | null = null;
+  private processedCandidates: number = 0;
+  private pendingLocalCandidates: RTCIceCandidateInit[] = [];
+  private onMessage?: (data: unknown) => void;
+  private onConnected?: () => void;
+  private onDisconnected?: () => void;
+
+  constructor(options: {
+    signalingUrl: string;
+    roomId: string;
+    playerId: string;
+    playerToken?: string;
+    nickname: string;
+    relayUrl?: string;
+    forceIceFailure?: boolean;
+    serverAuthoritative?: boolean;
+    onAuth?: (playerId: string, playerToken: string) => void;
+    onMessage?: (data: unknown) => void;
+    onConnected?: () => void;
+    onDisconnected?: () => void;
+  }) {
+    this.signalingUrl = options.signalingUrl;
+    this.roomId = options.roomId;
+    this.playerId = options.playerId;
+    this.playerToken = options.playerToken;
+    this.nickname = options.nickname;
+    this.onAuth = options.onAuth;
+    this.onMessage = options.onMessage;
+    this.onConnected = options.onConnected;
+    this.onDisconnected = options.onDisconnected;
+    this.relayUrl = options.relayUrl;
+    this.forceIceFailure = options.forceIceFailure ?? false;
+    // In server-authoritative rooms the game runs in the relay process, so
+    // the offer is only sent to obtain a player token.
+    this.serverAuthoritative =
+      (options.serverAuthoritative ?? false) && !!options.relayUrl;
+    this.useRelayTransport = this.serverAuthoritative;
+    this.relayAgent = new PlayerRelayAgent({
+      sendToHost: (data) => this.sendDirect(data),
+      deliver: (data) => this.onMessage?.(data),
+    });
+  }
+
+  private onAuth?: (playerId: string, playerToken: string) => void;
+
+  async connect(): Promise<void> {
+    this.stopPolling();
+    this.clearIceFallbackTimer();
+    this.relayAgent.close();
+    this.relayTransport?.close();
+    this.relayTransport = null;
+    this.teardownPeer();
+    this.processedCandidates = 0;
+    this.pendingLocalCandidates = [];
+
+    // Once ICE has failed on this network, reconnects skip straight to the
+    // relay instead of waiting out another timeout.
+    if (this.useRelayTransport && this.canUseRelayTransport()) {
+      this.connectRelayTransport();
+      return;
+    }
+
+    this.connection = new RTCPeerConnection(
+      this.forceIceFailure
+        ? FORCED_ICE_FAILURE_CONFIG
+        : { iceServers: ICE_SERVERS },
+    );
+
+    this.connection.onicecandidate = (event) => {
+      if (event.candidate) {
+        this.handleLocalCandidate(event.candidate);
+      }
+    };
+
+    this.connection.onconnectionstatechange = () => {
+      if (
+        this.connection?.connectionState === "disconnected" ||
+        this.connection?.connectionState === "failed"
+      ) {
+        this.onDisconnected?.();
+      }
+    };
+
+    this.dataChannel = this.connection.createDataChannel(
+      RELIABLE_CHANNEL_LABEL,
+    );
+    this.setupDataChannel(this.dataChannel);
+    this.fastChannel = createFastChannel(this.connection);
+    this.setupFastChannel(this.fastChannel);
+
+    const offer = await this.connection.createOffer();
+    await this.connection.setLocalDescription(offer);
+
+    let offerSent = false;
+    for (let attempt = 0; attempt < 5; attempt++) {
+      try {
+        const auth = await this.sendOffer(offer);
+        if (auth.playerId) {
+          this.playerId = auth.playerId;
+        }
+        if (auth.playerToken) {
+          this.playerToken = auth.playerToken;
+          this.onAuth?.(this.playerId, auth.playerToken);
+          this.flushPendingLocalCandidates();
+        }
+        offerSent = true;
+        break;
+      } catch (error) {
+        if (attempt === 4) {
+          console.error("Failed to send offer after retries:", error);
+        } else {
+          await this.delay(300);
+        }
+      }
+    }
+
+    if (!offerSent) {
+      this.onDisconnected?.();
+      return;
+    }
+
+    if (this.serverAuthoritative && this.canUseRelayTransport()) {
+      this.teardownPeer();
+      this.connectRelayTransport();
+      return;
+    }
+
+    this.pollInterval = setInterval(() => this.poll(), 1000);
+    this.scheduleIceFallback();
+  }
+
+  private teardownPeer(): void {
+    for (const channel of [this.dataChannel, this.fastChannel]) {
+      if (channel) {
+        channel.onclose = null;
+        channel.close();
+      }
+    }
+    if (this.connection) {
+      this.connection.onconnectionstatechange = null;
+      this.connection.close();
+    }
+    this.dataChannel = null;
+    this.fastChannel = null;
+    this.connection = null;
+  }
+
+  private canUseRelayTransport(): boolean {
+    return !!this.relayUrl && !!this.playerToken;
+  }
+
+  private clearIceFallbackTimer(): void {
+    if (this.iceFallbackTimer) {
+      clearTimeout(this.iceFallbackTimer);
+      this.iceFallbackTimer = null;
+    }
+  }
+
+  private scheduleIceFallback(): void {
+    if (!this.relayUrl) {
+      return;
+    }
+
+    this.iceFallbackTimer = setTimeout(() => {
+      this.iceFallbackTimer = null;
+      if (
+        this.dataChannel?.readyState === "open" ||
+        !this.canUseRelayTransport()
+      ) {
+        return;
+      }
+
+      console.log("ICE timed out, falling back to WebSocket relay");
+      this.useRelayTransport = true;
+      this.stopPolling();
+      this.teardownPeer();
+      this.connectRelayTransport();
+    }, ICE_FALLBACK_TIMEOUT_MS);
+  }
+
+  private connectRelayTransport(): void {
+    const transport = new WebSocketRelayTransport({
+      url: buildRelaySocketUrl(
+        this.serverAuthoritative
+          ? getGameServerUrl(this.relayUrl as string)
+          : (this.relayUrl as string),
+        {
+          role: "player",
+          roomId: this.roomId,
+          token: this.playerToken as string,
+          playerId: this.playerId,
+          nickname: this.nickname,
+        },
+      ),
+      onOpen: () => this.onConnected?.(),
+      onClose: () => {
+        if (this.relayTransport === transport) {
+          this.onDisconnected?.();
+        }
+      },
+      onMessage: (data) => {
+        if (!this.relayAgent.handle(data)) {
+          this.onMessage?.(data);
+        }
+      },
+    });
+
+    this.relayTransport = transport;
+    transport.connect();
+  }
+
+  private stopPolling(): void {
+    if (this.pollInterval) {
+      clearInterval(this.pollInterval);
+      this.pollInterval = null;
+    }
+  }
+
+  private delay(ms: number): Promise<void> {
+    return new Promise((resolve) => setTimeout(resolve, ms));
+  }
+
+  private async poll(): Promise<void> {
+    try {
+      await this.checkForAnswer();
+      await this.checkForCandidates();
+    } catch (error) {
+      console.error("Poll error:", error);
+    }
+  }
+
+  private async sendOffer(
+    offer: RTCSessionDescriptionInit,
+  ): Promise<{ playerId?: string; playerToken?: string }> {
+    const response = await fetch(
+      `${this.signalingUrl}/api/session/${this.roomId}/offer`,
+      {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({
+          roomId: this.roomId,
+          playerId: this.playerId,
+          playerToken: this.playerToken,
+          nickname: this.nickname,
+          offer,
+        }),
+      },
+    );
+
+    if (!response.ok) {
+      throw new Error(`Failed to send offer: ${response.status}`);
+    }
+
+    return (await response.json()) as {
+      playerId?: string;
+      playerToken?: string;
+    };
+  }
+
+  private async sendCandidate(candidate: RTCIceCandidateInit): Promise<void> {
+    if (!this.playerToken) {
+      return;
+    }
+
+    await fetch(`${this.signalingUrl}/api/session/${this.roomId}/candidate`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({
+        roomId: this.roomId,
+        playerId: this.playerId,
+        playerToken: this.playerToken,
+        candidate,
+      }),
+    });
+  }
+
+  private handleLocalCandidate(candidate: RTCIceCandidateInit): void {
+    if (!this.playerToken) {
+      this.pendingLocalCandidates.push(candidate);
+      return;
+    }
+
+    this.sendCandidate(candidate);
+  }
+
+  private flushPendingLocalCandidates(): void {
+    if (!this.playerToken || this.pendingLocalCandidates.length === 0) {
+      return;
+    }
+
+    const pending = [...this.pendingLocalCandidates];
+    this.pendingLocalCandidates = [];
+    pending.forEach((candidate) => {
+      this.sendCandidate(candidate);
+    });
+  }
+
+  private async checkForAnswer(): Promise<void> {
+    try {
+      if (!this.playerToken) {
+        return;
+      }
+
+      const response = await fetch(
+        `${this.signalingUrl}/api/session/${this.roomId}/answer?playerId=${this.playerId}&playerToken=${this.playerToken}`,
+      );
+      const data = await response.json();
+
+      if (
+        data.answer &&
+        this.connection?.signalingState === "have-local-offer"
+      ) {
+        const answer = new RTCSessionDescription(data.answer);
+        await this.connection.setRemoteDescription(answer);
+      }
+    } catch (error) {
+      console.error("Error checking for answer:", error);
+    }
+  }
+
+  private async checkForCandidates(): Promise<void> {
+    if (!this.connection?.remoteDescription || !this.playerToken) {
+      return;
+    }
+
+    try {
+      const response = await fetch(
+        `${this.signalingUrl}/api/session/${this.roomId}/candidate?playerId=${this.playerId}&playerToken=${this.playerToken}&afterIndex=${this.processedCandidates}`,
+      );
+      const data = await response.json();
+
+      if (data.candidates) {
+        for (const candidate of data.candidates) {
+          try {
+            await this.connection?.addIceCandidate(
+              new RTCIceCandidate(candidate),
+            );
+            this.processedCandidates++;
+          } catch (error) {
+            console.error("Error adding ICE candidate:", error);
+          }
+        }
+      }
+    } catch (error) {
+      console.error("Error checking for candidates:", error);
+    }
+  }
+
+  private setupDataChannel(channel: RTCDataChannel): void {
+    channel.onopen = () => {
+      console.log("Player data channel open");
+      this.stopPolling();
+      this.clearIceFallbackTimer();
+      this.onConnected?.();
+    };
+
+    channel.onmessage = (event) => {
+      try {
+        const data = JSON.parse(event.data);
+        if (!this.relayAgent.handle(data)) {
+          this.onMessage?.(data);
+        }
+      } catch (error) {
+        console.error("Failed to parse message:", error);
+      }
+    };
+
+    channel.onclose = () => {
+      console.log("Player data channel closed");
+      this.onDisconnected?.();
+    };
+  }
+
+  private setupFastChannel(channel: RTCDataChannel): void {
+    channel.onmessage = (event) => {
+      try {
+        const data = JSON.parse(event.data);
+        if (!this.relayAgent.handle(data)) {
+          this.onMessage?.(data);
+        }
+      } catch (error) {
+        console.error("Failed to parse message:", error);
+      }
+    };
+  }
+
+  send(data: unknown): void {
+    if (this.relayAgent.sendUpstream(data)) {
+      return;
+    }
+    this.sendDirect(data);
+  }
+
+  private sendDirect(data: unknown): void {
+    if (this.relayTransport) {
+      this.relayTransport.send(data);
+      return;
+    }
+
+    const channel = pickOpenChannel(
+      selectLane(data),
+      this.dataChannel,
+      this.fastChannel,
+    );
+    channel?.send(JSON.stringify(data));
+  }
+
+  /**
+   * Sends `data` and resends it on an interval until `acknowledge(key)` is
+   * called or the attempt budget runs out. The receiver must treat repeats
+   * as idempotent.
+   */
+  sendWithRetry(
+    key: string,
+    data: unknown,
+    intervalMs: number = ANSWER_RETRY_INTERVAL_MS,
+    maxAttempts: number = ANSWER_MAX_ATTEMPTS,
+  ): void {
+    this.acknowledge(key);
+    this.send(data);
+
+    let attempts = 1;
+    const timer = setInterval(() => {
+      if (attempts >= maxAttempts) {
+        this.acknowledge(key);
+        return;
+      }
+      attempts++;
+      this.send(data);
+    }, intervalMs);
+
+    this.pendingAcks.set(key, timer);
+  }
+
+  acknowledge(key: string): void {
+    const timer = this.pendingAcks.get(key);
+    if (timer) {
+      clearInterval(timer);
+      this.pendingAcks.delete(key);
+    }
+  }
+
+  private clearPendingAcks(): void {
+    this.pendingAcks.forEach((timer) => clearInterval(timer));
+    this.pendingAcks.clear();
+  }
+
+  disconnect(): void {
+    this.stopPolling();
+    this.clearIceFallbackTimer();
+    this.clearPendingAcks();
+    this.relayAgent.close();
+    this.relayTransport?.close();
+    this.relayTransport = null;
+    this.dataChannel?.close();
+    this.fastChannel?.close();
+    this.connection?.close();
+    this.dataChannel = null;
+    this.fastChannel = null;
+    this.connection = null;
+    this.processedCandidates = 0;
+    this.pendingLocalCandidates = [];
+  }
+}
@@ -1,3 +1,42 @@
+import {
+  createFastChannel,
+  type ChannelLane,
+  getMessageType,
+  ICE_SERVERS,
+  pickOpenChannel,
+  selectLane,
+} from "@/lib/channels";
+import { FrameDecoder } from "@/lib/frame-decoder";
+import {
+  isRelayMessage,
+  type RelayedAnswer,
+  type RelaySignalPayload,
+} from "@/lib/relay";
+import {
+  buildRelaySocketUrl,
+  WebSocketRelayTransport,
+  type RelayServerEvent,
+} from "@/lib/ws-relay";
+import {
+  messageTypeOf,
+  PeerStatsCollector,
+  summarizeRtcStats,
+  type PeerStatsSnapshot,
+} from "@/lib/peer-stats";
+import {
+  PollScheduler,
+  type PollSchedule,
+} from "@/lib/poll-scheduler";
+import {
+  attachToPlan,
+  DEFAULT_RELAY_OPTIONS,
+  planRelayTree,
+  removeFromPlan,
+  type RelayCandidate,
+  type RelayPlan,
+  type RelayTreeOptions,
+} from "@/lib/relay-tree";
+
 export interface PeerConnection {
   id: string;
   connection: RTCPeerConnection;
@@ -18,27 +57,46 @@ export interface SignalingMessage {
 interface PlayerInfo {
   playerId: string;
   nickname?: string;
+  hasOffer: boolean;
+  offeredAt?: number;
 }
 
 export class HostWebRTCManager {
   private connections: Map<string, RTCPeerConnection> = new Map();
   private dataChannels: Map<string, RTCDataChannel> = new Map();
+  private fastChannels: Map<string, RTCDataChannel> = new Map();
   private signalingUrl: string;
   private roomId: string;
   private hostToken: string;
-  private pollInterval: ReturnType<typeof setInterval> | null = null;
+  private poller: PollScheduler;
+  private lobbyLocked = false;
+  private gameActive = false;
   private processedPlayers: Set<string> = new Set();
+  private handledOffers: Map<string, number | undefined> = new Map();
   private processingPlayers: Set<string> = new Set();
   private onPlayerJoin?: (playerId: string, nickname?: string) => void;
   private onPlayerReady?: (playerId: string) => void;
   private onPlayerLeave?: (playerId: string) => void;
   private onMessage?: (playerId: string, data: unknown) => void;
+  private onRawMessage?: (playerId: string, raw: string) => void;
   private processedCandidates: Map<string, number> = new Map();
+  private connectedAt: Map<string, number> = new Map();
+  private relayOptions: RelayTreeOptions | null;
+  private relayPlan: RelayPlan | null = null;
+  private relayReady: Map<string, Set<string>> = new Map();
+  private relayUrl?: string;
+  private relayTransport: WebSocketRelayTransport | null = null;
+  private relayTransportPlayers: Set<string> = new Set();
+  private stats = new PeerStatsCollector();
+  private decoder = new FrameDecoder();
 
   constructor(options: {
     signalingUrl: string;
     roomId: string;
     hostToken: string;
+    relay?: Partial<RelayTreeOptions>;
+    relayUrl?: string;
+    pollSchedule?: Partial<PollSchedule>;
     onPlayerJoin?: (playerId: string, nickname?: string) => void;
     onPlayerReady?: (playerId: string) => void;
     onPlayerLeave?: (playerId: string) => void;
@@ -51,70 +109,219 @@ export class HostWebRTCManager {
     this.onPlayerReady = options.onPlayerReady;
     this.onPlayerLeave = options.onPlayerLeave;
     this.onMessage = options.onMessage;
+    this.relayOptions = options.relay
+      ? { ...DEFAULT_RELAY_OPTIONS, ...options.relay }
+      : null;
+    this.relayUrl = options.relayUrl;
+    this.poller = new PollScheduler(() => this.poll(), options.pollSchedule);
   }
 
   setOnMessage(handler?: (playerId: string, data: unknown) => void): void {
     this.onMessage = handler;
   }
 
+  setOnPlayerJoin(
+    handler?: (playerId: string, nickname?: string) => void,
+  ): void {
+    this.onPlayerJoin = handler;
+  }
+
+  setOnPlayerReady(handler?: (playerId: string) => void): void {
+    this.onPlayerReady = handler;
+  }
+
+  setOnPlayerLeave(handler?: (playerId: string) => void): void {
+    this.onPlayerLeave = handler;
+  }
+
+  /**
+   * Hands data channel frames over unparsed, so decoding can happen off the
+   * main thread. The receiver is then responsible for validating them (see
+   * `FrameDecoder`); parsed frames must be fed back through `receive()`.
+   */
+  setOnRawMessage(handler?: (playerId: string, raw: string) => void): void {
+    this.onRawMessage = handler;
+  }
+
   async start(): Promise<void> {
-    if (this.pollInterval) {
+    if (this.poller.isRunning) {
       return;
     }
 
-    this.pollInterval = setInterval(() => this.poll(), 1500);
+    this.poller.start();
+    this.connectRelayTransport();
   }
 
-  stop(): void {
-    if (this.pollInterval) {
-      clearInterval(this.pollInterval);
-      this.pollInterval = null;
+  /**
+   * A locked lobby stops admitting new players; signaling is only watched
+   * for players already in the room re-offering after a disconnect.
+   */
+  setLobbyLocked(locked: boolean): void {
+    this.lobbyLocked = locked;
+    this.updatePollIdle();
+  }
+
+  /** Reconnects matter most mid-game, so polling never goes idle then. */
+  setGameActive(active: boolean): void {
+    this.gameActive = active;
+    this.updatePollIdle();
+  }
+
+  private updatePollIdle(): void {
+    this.poller.setIdle(this.lobbyLocked && !this.gameActive);
+  }
+
+  private connectRelayTransport(): void {
+    if (!this.relayUrl || this.relayTransport) {
+      return;
     }
+
+    this.relayTransport = new WebSocketRelayTransport({
+      url: buildRelaySocketUrl(this.relayUrl, {
+        role: "host",
+        roomId: this.roomId,
+        token: this.hostToken,
+      }),
+      reconnect: true,
+      onMessage: (data) =>
+        this.handleRelayServerEvent(data as RelayServerEvent),
+    });
+    this.relayTransport.connect();
+  }
+
+  private handleRelayServerEvent(event: RelayServerEvent): void {
+    switch (event.type) {
+      case "peer.join":
+        this.relayTransportPlayers.add(event.playerId);
+        this.dropPeerConnection(event.playerId);
+        this.stats.recordConnected(event.playerId, "relay", event.nickname);
+        this.processedPlayers.add(event.playerId);
+        this.onPlayerJoin?.(event.playerId, event.nickname);
+        this.onPlayerReady?.(event.playerId);
+        break;
+      case "peer.leave":
+        if (this.relayTransportPlayers.delete(event.playerId)) {
+          this.handlePlayerLeave(event.playerId);
+        }
+        break;
+      case "peer.message":
+        if (this.relayTransportPlayers.has(event.playerId)) {
+          this.stats.recordMessage(
+            event.playerId,
+            "in",
+            getMessageType(event.data) ?? "unknown",
+            JSON.stringify(event.data ?? null).length,
+          );
+          const frame = this.decoder.accept(event.playerId, event.data);
+          if (frame.ok) {
+            this.handleIncoming(event.playerId, frame.data);
+          }
+        }
+        break;
+    }
+  }
+
+  /** Tears down a player's peer connection without reporting a leave. */
+  private dropPeerConnection(playerId: string): void {
+    for (const channel of [
+      this.dataChannels.get(playerId),
+      this.fastChannels.get(playerId),
+    ]) {
+      if (channel) {
+        channel.onclose = null;
+      }
+    }
+    const connection = this.connections.get(playerId);
+    if (connection) {
+      connection.onconnectionstatechange = null;
+      connection.ondatachannel = null;
+      connection.close();
+    }
+    this.connections.delete(playerId);
+    this.dataChannels.delete(playerId);
+    this.fastChannels.delete(playerId);
+  }
+
+  stop(): void {
+    this.poller.stop();
     this.disconnect();
   }
 
-  private async poll(): Promise<void> {
-    try {
-      await this.checkForNewPlayers();
+  /**
+   * One signaling round. Resolves to whether anything moved, which keeps
+   * the scheduler polling fast; otherwise it backs off.
+   */
+  private async poll(): Promise<boolean> {
+    const joined = await this.checkForNewPlayers();
+    // Candidates only matter until a peer's connection is up.
+    const negotiating = this.hasNegotiatingPeers();
+    if (negotiating) {
       await this.checkForCandidates();
-    } catch (error) {
-      console.error("Poll error:", error);
     }
+    return joined || negotiating;
+  }
+
+  private hasNegotiatingPeers(): boolean {
+    if (this.processingPlayers.size > 0) {
+      return true;
+    }
+    for (const connection of this.connections.values()) {
+      if (
+        connection.connectionState === "new" ||
+        connection.connectionState === "connecting"
+      ) {
+        return true;
+      }
+    }
+    return false;
   }
 
-  private async checkForNewPlayers(): Promise<void> {
+  private async checkForNewPlayers(): Promise<boolean> {
+    let changed = false;
     try {
       const response = await fetch(
         `${this.signalingUrl}/api/session/${this.roomId}/offer?hostToken=${this.hostToken}`,
       );
       const data = await response.json();
 
-      if (data.players) {
-        for (const player of data.players as Array<
-          PlayerInfo & { hasOffer: boolean }
-        >) {
-          if (player.hasOffer && !this.processedPlayers.has(player.playerId)) {
-            if (this.processingPlayers.has(player.playerId)) {
-              continue;
-            }
-            await this.handleNewPlayer(player.playerId, player.nickname);
+      for (const player of (data.players ?? []) as PlayerInfo[]) {
+        const { playerId, offeredAt } = player;
+        if (
+          !player.hasOffer ||
+          this.processingPlayers.has(playerId) ||
+          this.relayTransportPlayers.has(playerId)
+        ) {
+          continue;
+        }
+
+        if (this.processedPlayers.has(playerId)) {
+          // A known player with a new offer is reconnecting.
+          if (offeredAt === this.handledOffers.get(playerId)) {
+            continue;
           }
+          this.dropPeerConnection(playerId);
+        } else if (this.lobbyLocked) {
+          continue;
         }
+
+        await this.handleNewPlayer(playerId, player.nickname, offeredAt);
+        changed = true;
       }
     } catch (error) {
       console.error("Error checking for players:", error);
     }
+    return changed;
   }
 
   private async handleNewPlayer(
     playerId: string,
     nickname?: string,
+    offeredAt?: number,
   ): Promise<void> {
     this.processingPlayers.add(playerId);
+    this.stats.recordJoinStarted(playerId, nickname);
 
-    const connection = new RTCPeerConnection({
-      iceServers: [{ urls: "stun:stun.l.google.com:19302" }],
-    });
+    const connection = new RTCPeerConnection({ iceServers: ICE_SERVERS });
 
     connection.onicecandidate = (event) => {
       if (event.candidate) {
@@ -126,6 +333,8 @@ export class HostWebRTCManager {
       this.setupDataChannel(playerId, event.channel);
     };
 
+    this.setupFastChannel(playerId, createFastChannel(connection));
+
     connection.onconnectionstatechange = () => {
       if (
         connection.connectionState === "disconnected" ||
@@ -136,6 +345,7 @@ export class HostWebRTCManager {
     };
 
     this.connections.set(playerId, connection);
+    this.processedCandidates.delete(playerId);
 
     try {
       const response = await fetch(
@@ -162,6 +372,7 @@ export class HostWebRTCManager {
 
     this.processingPlayers.delete(playerId);
     this.processedPlayers.add(playerId);
+    this.handledOffers.set(playerId, offeredAt);
 
     this.onPlayerJoin?.(playerId, nickname);
   }
@@ -217,10 +428,13 @@ export class HostWebRTCManager {
             lastProcessed,
           );
 
-          for (const candidate of newCandidates) {
+          for (const [offset, candidate] of newCandidates.entries()) {
             try {
               await connection.addIceCandidate(new RTCIceCandidate(candidate));
-              this.processedCandidates.set(playerId, lastProcessed + 1);
+              this.processedCandidates.set(
+                playerId,
+                lastProcessed + offset + 1,
+              );
             } catch (error) {
               console.error("Error adding ICE candidate:", error);
             }
@@ -236,337 +450,356 @@ export class HostWebRTCManager {
     channel.onopen = () => {
       console.log(`Data channel open for ${playerId}`);
       this.dataChannels.set(playerId, channel);
+      this.connectedAt.set(playerId, Date.now());
+      this.stats.recordConnected(playerId, "webrtc");
+      this.attachLateJoiner(playerId);
       this.onPlayerReady?.(playerId);
     };
 
-    channel.onmessage = (event) => {
-      try {
-        const data = JSON.parse(event.data);
-        this.onMessage?.(playerId, data);
-      } catch (error) {
-        console.error("Failed to parse message:", error);
-      }
-    };
+    channel.onmessage = (event) => this.handleFrame(playerId, event.data);
 
     channel.onclose = () => {
       console.log(`Data channel closed for ${playerId}`);
-      this.handlePlayerLeave(playerId);
+      if (!this.relayTransportPlayers.has(playerId)) {
+        this.handlePlayerLeave(playerId);
+      }
     };
   }
 
-  private handlePlayerLeave(playerId: string): void {
-    this.connections.get(playerId)?.close();
-    this.connections.delete(playerId);
-    this.dataChannels.delete(playerId);
-    this.onPlayerLeave?.(playerId);
-  }
-
-  send(playerId: string, data: unknown): void {
-    const channel = this.dataChannels.get(playerId);
-    if (channel && channel.readyState === "open") {
-      channel.send(JSON.stringify(data));
-    }
-  }
+  private setupFastChannel(playerId: string, channel: RTCDataChannel): void {
+    channel.onopen = () => {
+      this.fastChannels.set(playerId, channel);
+    };
 
-  broadcast(data: unknown): void {
-    const message = JSON.stringify(data);
-    this.dataChannels.forEach((channel) => {
-      if (channel.readyState === "open") {
-        channel.send(message);
-      }
-    });
-  }
+    channel.onmessage = (event) => this.handleFrame(playerId, event.data);
 
-  getConnectedPlayers(): string[] {
-    return Array.from(this.dataChannels.entries())
-      .filter(([, channel]) => channel.readyState === "open")
-      .map(([playerId]) => playerId);
+    channel.onclose = () => {
+      this.fastChannels.delete(playerId);
+    };
   }
 
-  disconnect(): void {
-    this.connections.forEach((conn) => conn.close());
-    this.connections.clear();
-    this.dataChannels.clear();
-    this.processedPlayers.clear();
-  }
-}
+  private handleFrame(playerId: string, raw: string): void {
+    this.stats.recordMessage(playerId, "in", messageTypeOf(raw), raw.length);
 
-export class PlayerWebRTCManager {
-  private connection: RTCPeerConnection | null = null;
-  private dataChannel: RTCDataChannel | null = null;
-  private signalingUrl: string;
-  private roomId: string;
-  private playerId: string;
-  private playerToken?: string;
-  private nickname: string;
-  private pollInterval: ReturnType<typeof setInterval> | null = null;
-  private processedCandidates: number = 0;
-  private pendingLocalCandidates: RTCIceCandidateInit[] = [];
-  private onMessage?: (data: unknown) => void;
-  private onConnected?: () => void;
-  private onDisconnected?: () => void;
+    if (this.onRawMessage) {
+      this.onRawMessage(playerId, raw);
+      return;
+    }
 
-  constructor(options: {
-    signalingUrl: string;
-    roomId: string;
-    playerId: string;
-    playerToken?: string;
-    nickname: string;
-    onAuth?: (playerId: string, playerToken: string) => void;
-    onMessage?: (data: unknown) => void;
-    onConnected?: () => void;
-    onDisconnected?: () => void;
-  }) {
-    this.signalingUrl = options.signalingUrl;
-    this.roomId = options.roomId;
-    this.playerId = options.playerId;
-    this.playerToken = options.playerToken;
-    this.nickname = options.nickname;
-    this.onAuth = options.onAuth;
-    this.onMessage = options.onMessage;
-    this.onConnected = options.onConnected;
-    this.onDisconnected = options.onDisconnected;
+    const frame = this.decoder.decode(playerId, raw);
+    if (frame.ok) {
+      this.handleIncoming(playerId, frame.data);
+    }
   }
 
-  private onAuth?: (playerId: string, playerToken: string) => void;
+  receive(playerId: string, data: unknown): void {
+    this.handleIncoming(playerId, data);
+  }
 
-  async connect(): Promise<void> {
-    this.stopPolling();
-    this.dataChannel?.close();
-    this.connection?.close();
-    this.dataChannel = null;
-    this.connection = null;
-    this.processedCandidates = 0;
-    this.pendingLocalCandidates = [];
+  private handleIncoming(playerId: string, data: unknown): void {
+    if (isRelayMessage(data)) {
+      this.handleRelayMessage(
+        playerId,
+        data as { type: string; payload?: unknown },
+      );
+      return;
+    }
 
-    this.connection = new RTCPeerConnection({
-      iceServers: [{ urls: "stun:stun.l.google.com:19302" }],
-    });
+    this.onMessage?.(playerId, data);
+  }
 
-    this.connection.onicecandidate = (event) => {
-      if (event.candidate) {
-        this.handleLocalCandidate(event.candidate);
-      }
-    };
+  private handleRelayMessage(
+    playerId: string,
+    msg: { type: string; payload?: unknown },
+  ): void {
+    const plan = this.relayPlan;
+    if (!plan) {
+      return;
+    }
 
-    this.connection.onconnectionstatechange = () => {
-      if (
-        this.connection?.connectionState === "disconnected" ||
-        this.connection?.connectionState === "failed"
-      ) {
-        this.onDisconnected?.();
+    switch (msg.type) {
+      case "relay.signal": {
+        const payload = msg.payload as RelaySignalPayload | undefined;
+        if (!payload?.to) return;
+        const isLinked =
+          plan.parentOf.get(playerId) === payload.to ||
+          plan.parentOf.get(payload.to) === playerId;
+        if (isLinked) {
+          this.send(payload.to, {
+            type: "relay.signal",
+            payload: { ...payload, from: playerId },
+          });
+        }
+        break;
       }
-    };
-
-    this.dataChannel = this.connection.createDataChannel("game");
-    this.setupDataChannel(this.dataChannel);
-
-    const offer = await this.connection.createOffer();
-    await this.connection.setLocalDescription(offer);
-
-    let offerSent = false;
-    for (let attempt = 0; attempt < 5; attempt++) {
-      try {
-        const auth = await this.sendOffer(offer);
-        if (auth.playerId) {
-          this.playerId = auth.playerId;
+      case "relay.ready": {
+        const childId = (msg.payload as { childId?: string } | undefined)
+          ?.childId;
+        if (childId && plan.parentOf.get(childId) === playerId) {
+          this.relayReady.get(playerId)?.add(childId);
         }
-        if (auth.playerToken) {
-          this.playerToken = auth.playerToken;
-          this.onAuth?.(this.playerId, auth.playerToken);
-          this.flushPendingLocalCandidates();
+        break;
+      }
+      case "relay.lost": {
+        const relayId = (msg.payload as { relayId?: string } | undefined)
+          ?.relayId;
+        if (relayId) {
+          this.relayReady.get(relayId)?.delete(playerId);
         }
-        offerSent = true;
         break;
-      } catch (error) {
-        if (attempt === 4) {
-          console.error("Failed to send offer after retries:", error);
-        } else {
-          await this.delay(300);
+      }
+      case "relay.answers": {
+        const answers =
+          (msg.payload as { answers?: RelayedAnswer[] } | undefined)
+            ?.answers ?? [];
+        for (const answer of answers) {
+          // Only accept answers a relay is actually responsible for.
+          if (plan.parentOf.get(answer.playerId) === playerId) {
+            this.onMessage?.(answer.playerId, answer.message);
+          }
         }
+        break;
       }
     }
+  }
 
-    if (!offerSent) {
-      this.onDisconnected?.();
-      return;
+  private async sampleRtt(playerId: string): Promise<number | null> {
+    const connection = this.connections.get(playerId);
+    if (!connection) {
+      return null;
     }
 
-    this.pollInterval = setInterval(() => this.poll(), 1000);
-  }
-
-  private stopPolling(): void {
-    if (this.pollInterval) {
-      clearInterval(this.pollInterval);
-      this.pollInterval = null;
+    try {
+      return summarizeRtcStats(await connection.getStats()).rttMs;
+    } catch {
+      return null;
     }
   }
 
-  private delay(ms: number): Promise<void> {
-    return new Promise((resolve) => setTimeout(resolve, ms));
+  /**
+   * Samples `getStats()` and data channel buffering for every peer and
+   * returns the collected diagnostics. Sampling is on demand so it costs
+   * nothing unless someone is looking.
+   */
+  async collectStats(): Promise<PeerStatsSnapshot> {
+    await Promise.all(
+      Array.from(this.connections.entries()).map(
+        async ([playerId, connection]) => {
+          try {
+            const summary = summarizeRtcStats(await connection.getStats());
+            const bufferedAmount =
+              (this.dataChannels.get(playerId)?.bufferedAmount ?? 0) +
+              (this.fastChannels.get(playerId)?.bufferedAmount ?? 0);
+            this.stats.recordSample(playerId, summary, bufferedAmount);
+          } catch (error) {
+            console.error("Failed to sample peer stats:", error);
+          }
+        },
+      ),
+    );
+
+    return this.stats.snapshot();
   }
 
-  private async poll(): Promise<void> {
-    try {
-      await this.checkForAnswer();
-      await this.checkForCandidates();
-    } catch (error) {
-      console.error("Poll error:", error);
+  /**
+   * Builds the relay fan-out tree from the currently connected players. Call
+   * once the room has settled (e.g. at game start) so lobby churn does not
+   * reshuffle links. No-op unless the manager was created with `relay`.
+   */
+  async activateRelayTree(): Promise<void> {
+    if (!this.relayOptions) {
+      return;
     }
-  }
 
-  private async sendOffer(
-    offer: RTCSessionDescriptionInit,
-  ): Promise<{ playerId?: string; playerToken?: string }> {
-    const response = await fetch(
-      `${this.signalingUrl}/api/session/${this.roomId}/offer`,
-      {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({
-          roomId: this.roomId,
-          playerId: this.playerId,
-          playerToken: this.playerToken,
-          nickname: this.nickname,
-          offer,
-        }),
-      },
+    const peerPlayers = Array.from(this.dataChannels.entries())
+      .filter(([, channel]) => channel.readyState === "open")
+      .map(([playerId]) => playerId);
+
+    const candidates: RelayCandidate[] = await Promise.all(
+      peerPlayers.map(async (playerId) => ({
+        playerId,
+        rttMs: await this.sampleRtt(playerId),
+        connectedAt: this.connectedAt.get(playerId) ?? Date.now(),
+      })),
     );
 
-    if (!response.ok) {
-      throw new Error(`Failed to send offer: ${response.status}`);
+    const plan = planRelayTree(candidates, this.relayOptions);
+    if (plan.relays.length === 0) {
+      return;
     }
 
-    return (await response.json()) as {
-      playerId?: string;
-      playerToken?: string;
-    };
+    this.relayPlan = plan;
+    this.relayReady = new Map<string, Set<string>>(
+      plan.relays.map((relayId) => [relayId, new Set<string>()]),
+    );
+
+    plan.relays.forEach((relayId) => this.sendRelayAssignment(relayId));
+    plan.parentOf.forEach((relayId, childId) => {
+      this.send(childId, { type: "relay.parent", payload: { relayId } });
+    });
+  }
+
+  private sendRelayAssignment(relayId: string): void {
+    this.send(relayId, {
+      type: "relay.assign",
+      payload: { children: this.relayPlan?.childrenOf.get(relayId) ?? [] },
+    });
   }
 
-  private async sendCandidate(candidate: RTCIceCandidateInit): Promise<void> {
-    if (!this.playerToken) {
+  private attachLateJoiner(playerId: string): void {
+    if (!this.relayPlan || !this.relayOptions) {
       return;
     }
 
-    await fetch(`${this.signalingUrl}/api/session/${this.roomId}/candidate`, {
-      method: "POST",
-      headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({
-        roomId: this.roomId,
-        playerId: this.playerId,
-        playerToken: this.playerToken,
-        candidate,
-      }),
-    });
+    const relayId = attachToPlan(this.relayPlan, playerId, this.relayOptions);
+    if (relayId) {
+      this.sendRelayAssignment(relayId);
+      this.send(playerId, { type: "relay.parent", payload: { relayId } });
+    }
   }
 
-  private handleLocalCandidate(candidate: RTCIceCandidateInit): void {
-    if (!this.playerToken) {
-      this.pendingLocalCandidates.push(candidate);
+  private detachFromRelayTree(playerId: string): void {
+    if (!this.relayPlan || !this.relayOptions) {
       return;
     }
 
-    this.sendCandidate(candidate);
-  }
+    this.relayReady.forEach((children) => children.delete(playerId));
+    const wasRelay = this.relayReady.delete(playerId);
+    const moved = removeFromPlan(this.relayPlan, playerId, this.relayOptions);
 
-  private flushPendingLocalCandidates(): void {
-    if (!this.playerToken || this.pendingLocalCandidates.length === 0) {
+    if (!wasRelay) {
       return;
     }
 
-    const pending = [...this.pendingLocalCandidates];
-    this.pendingLocalCandidates = [];
-    pending.forEach((candidate) => {
-      this.sendCandidate(candidate);
+    // Orphans get direct broadcasts until their new relay reports ready.
+    const touchedRelays = new Set<string>();
+    moved.forEach((childId) => {
+      const relayId = this.relayPlan?.parentOf.get(childId) ?? null;
+      if (relayId) touchedRelays.add(relayId);
+      this.send(childId, { type: "relay.parent", payload: { relayId } });
     });
+    touchedRelays.forEach((relayId) => this.sendRelayAssignment(relayId));
   }
 
-  private async checkForAnswer(): Promise<void> {
-    try {
-      if (!this.playerToken) {
-        return;
-      }
+  private handlePlayerLeave(playerId: string): void {
+    this.connections.get(playerId)?.close();
+    this.connections.delete(playerId);
+    this.dataChannels.delete(playerId);
+    this.fastChannels.delete(playerId);
+    this.connectedAt.delete(playerId);
+    this.stats.recordLeft(playerId);
+    this.decoder.forget(playerId);
+    this.detachFromRelayTree(playerId);
+    this.onPlayerLeave?.(playerId);
+    // The player's page re-offers shortly after a drop.
+    this.poller.burst();
+  }
 
-      const response = await fetch(
-        `${this.signalingUrl}/api/session/${this.roomId}/answer?playerId=${this.playerId}&playerToken=${this.playerToken}`,
-      );
-      const data = await response.json();
+  send(playerId: string, data: unknown): void {
+    this.sendEncoded(playerId, selectLane(data), JSON.stringify(data));
+  }
 
-      if (
-        data.answer &&
-        this.connection?.signalingState === "have-local-offer"
-      ) {
-        const answer = new RTCSessionDescription(data.answer);
-        await this.connection.setRemoteDescription(answer);
+  /** Sends a message that was already serialized, e.g. by a worker. */
+  sendEncoded(playerId: string, lane: ChannelLane, message: string): void {
+    if (this.relayTransportPlayers.has(playerId)) {
+      this.relayTransport?.sendEncoded(
+        `{"to":${JSON.stringify(playerId)},"data":${message}}`,
+      );
+    } else {
+      const channel = pickOpenChannel(
+        lane,
+        this.dataChannels.get(playerId),
+        this.fastChannels.get(playerId),
+      );
+      if (!channel) {
+        return;
       }
-    } catch (error) {
-      console.error("Error checking for answer:", error);
+      channel.send(message);
     }
+
+    this.stats.recordMessage(
+      playerId,
+      "out",
+      messageTypeOf(message),
+      message.length,
+    );
   }
 
-  private async checkForCandidates(): Promise<void> {
-    if (!this.connection?.remoteDescription || !this.playerToken) {
-      return;
-    }
+  broadcast(data: unknown): void {
+    this.broadcastEncoded(selectLane(data), JSON.stringify(data));
+  }
 
-    try {
-      const response = await fetch(
-        `${this.signalingUrl}/api/session/${this.roomId}/candidate?playerId=${this.playerId}&playerToken=${this.playerToken}&afterIndex=${this.processedCandidates}`,
+  broadcastEncoded(lane: ChannelLane, message: string): void {
+    const type = messageTypeOf(message);
+    const record = (playerId: string, sent: string) =>
+      this.stats.recordMessage(playerId, "out", type, sent.length);
+
+    if (this.relayTransportPlayers.size > 0) {
+      this.relayTransport?.sendEncoded(`{"to":"*","data":${message}}`);
+      this.relayTransportPlayers.forEach((playerId) =>
+        record(playerId, message),
       );
-      const data = await response.json();
+    }
 
-      if (data.candidates) {
-        for (const candidate of data.candidates) {
-          try {
-            await this.connection?.addIceCandidate(
-              new RTCIceCandidate(candidate),
-            );
-            this.processedCandidates++;
-          } catch (error) {
-            console.error("Error adding ICE candidate:", error);
-          }
+    // Fast-lane messages are tiny and latency-critical, so they always go
+    // direct; bulk state is pushed through the relay tree when one is active.
+    if (!this.relayPlan || lane === "fast") {
+      this.dataChannels.forEach((reliable, playerId) => {
+        const channel = pickOpenChannel(
+          lane,
+          reliable,
+          this.fastChannels.get(playerId),
+        );
+        if (channel) {
+          channel.send(message);
+          record(playerId, message);
         }
-      }
-    } catch (error) {
-      console.error("Error checking for candidates:", error);
+      });
+      return;
     }
-  }
 
-  private setupDataChannel(channel: RTCDataChannel): void {
-    channel.onopen = () => {
-      console.log("Player data channel open");
-      this.stopPolling();
-      this.onConnected?.();
-    };
+    const fanout = `{"type":"relay.fanout","payload":${message}}`;
+    this.dataChannels.forEach((reliable, playerId) => {
+      if (reliable.readyState !== "open") {
+        return;
+      }
 
-    channel.onmessage = (event) => {
-      try {
-        const data = JSON.parse(event.data);
-        this.onMessage?.(data);
-      } catch (error) {
-        console.error("Failed to parse message:", error);
+      if (this.relayReady.has(playerId)) {
+        reliable.send(fanout);
+        record(playerId, fanout);
+        return;
       }
-    };
 
-    channel.onclose = () => {
-      console.log("Player data channel closed");
-      this.onDisconnected?.();
-    };
+      const relayId = this.relayPlan?.parentOf.get(playerId);
+      if (relayId && this.relayReady.get(relayId)?.has(playerId)) {
+        return;
+      }
+
+      reliable.send(message);
+      record(playerId, message);
+    });
   }
 
-  send(data: unknown): void {
-    if (this.dataChannel && this.dataChannel.readyState === "open") {
-      this.dataChannel.send(JSON.stringify(data));
-    }
+  getConnectedPlayers(): string[] {
+    return Array.from(this.dataChannels.entries())
+      .filter(([, channel]) => channel.readyState === "open")
+      .map(([playerId]) => playerId)
+      .concat(Array.from(this.relayTransportPlayers));
   }
 
   disconnect(): void {
-    this.stopPolling();
-    this.dataChannel?.close();
-    this.connection?.close();
-    this.dataChannel = null;
-    this.connection = null;
-    this.processedCandidates = 0;
-    this.pendingLocalCandidates = [];
+    this.connections.forEach((conn) => conn.close());
+    this.connections.clear();
+    this.dataChannels.clear();
+    this.fastChannels.clear();
+    this.connectedAt.clear();
+    this.processedPlayers.clear();
+    this.handledOffers.clear();
+    this.relayPlan = null;
+    this.relayReady.clear();
+    this.relayTransport?.close();
+    this.relayTransport = null;
+    this.relayTransportPlayers.clear();
+    this.stats.clear();
   }
 }
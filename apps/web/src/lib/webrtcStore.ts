@@ -1,4 +1,5 @@
 import { HostWebRTCManager } from "@/lib/webrtc";
+import type { ServerGameController } from "@/lib/server-game";
 
 let hostWebRTC: HostWebRTCManager | null = null;
 
@@ -9,3 +10,13 @@ export function getHostWebRTC(): HostWebRTCManager | null {
 export function setHostWebRTC(webrtc: HostWebRTCManager | null): void {
   hostWebRTC = webrtc;
 }
+
+let serverGame: ServerGameController | null = null;
+
+export function getServerGame(): ServerGameController | null {
+  return serverGame;
+}
+
+export function setServerGame(controller: ServerGameController | null): void {
+  serverGame = controller;
+}
@@ -0,0 +1,35 @@
+import { describe, expect, it } from "vitest";
+import { buildRelaySocketUrl } from "./ws-relay";
+
+describe("buildRelaySocketUrl", () => {
+  it("encodes host credentials", () => {
+    const url = new URL(
+      buildRelaySocketUrl("ws://localhost:3001", {
+        role: "host",
+        roomId: "ABC123",
+        token: "host-token",
+      }),
+    );
+
+    expect(url.searchParams.get("role")).toBe("host");
+    expect(url.searchParams.get("roomId")).toBe("ABC123");
+    expect(url.searchParams.get("token")).toBe("host-token");
+    expect(url.searchParams.has("playerId")).toBe(false);
+  });
+
+  it("encodes player identity and nickname", () => {
+    const url = new URL(
+      buildRelaySocketUrl("wss://relay.example.com/ws", {
+        role: "player",
+        roomId: "ABC123",
+        token: "player-token",
+        playerId: "player-1",
+        nickname: "Zoë & co",
+      }),
+    );
+
+    expect(url.pathname).toBe("/ws");
+    expect(url.searchParams.get("playerId")).toBe("player-1");
+    expect(url.searchParams.get("nickname")).toBe("Zoë & co");
+  });
+});
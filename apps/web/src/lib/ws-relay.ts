@@ -0,0 +1,118 @@
+export const ICE_FALLBACK_TIMEOUT_MS = 8000;
+const RELAY_RECONNECT_DELAY_MS = 2000;
+
+export type RelayServerEvent =
+  | { type: "peer.join"; playerId: string; nickname?: string }
+  | { type: "peer.leave"; playerId: string }
+  | { type: "peer.message"; playerId: string; data: unknown };
+
+export function getRelayUrl(): string | undefined {
+  return process.env.NEXT_PUBLIC_RELAY_URL || undefined;
+}
+
+export function buildRelaySocketUrl(
+  relayUrl: string,
+  params: {
+    role: "host" | "player";
+    roomId: string;
+    token: string;
+    playerId?: string;
+    nickname?: string;
+  },
+): string {
+  const url = new URL(relayUrl);
+  url.searchParams.set("role", params.role);
+  url.searchParams.set("roomId", params.roomId);
+  url.searchParams.set("token", params.token);
+  if (params.playerId) url.searchParams.set("playerId", params.playerId);
+  if (params.nickname) url.searchParams.set("nickname", params.nickname);
+  return url.toString();
+}
+
+/**
+ * Server-relayed transport used when a peer connection cannot be
+ * established. Frames are plain JSON; the relay server in `apps/relay`
+ * handles addressing between the host and players of a room.
+ */
+export class WebSocketRelayTransport {
+  private url: string;
+  private socket: WebSocket | null = null;
+  private reconnect: boolean;
+  private reconnectTimer: ReturnType<typeof setTimeout> | null = null;
+  private closed = false;
+  private onOpen?: () => void;
+  private onClose?: () => void;
+  private onMessage?: (data: unknown) => void;
+
+  constructor(options: {
+    url: string;
+    reconnect?: boolean;
+    onOpen?: () => void;
+    onClose?: () => void;
+    onMessage?: (data: unknown) => void;
+  }) {
+    this.url = options.url;
+    this.reconnect = options.reconnect ?? false;
+    this.onOpen = options.onOpen;
+    this.onClose = options.onClose;
+    this.onMessage = options.onMessage;
+  }
+
+  connect(): void {
+    this.closed = false;
+    const socket = new WebSocket(this.url);
+    this.socket = socket;
+
+    socket.onopen = () => {
+      console.log("Relay transport open");
+      this.onOpen?.();
+    };
+
+    socket.onmessage = (event) => {
+      try {
+        this.onMessage?.(JSON.parse(event.data));
+      } catch (error) {
+        console.error("Failed to parse relay message:", error);
+      }
+    };
+
+    socket.onclose = () => {
+      if (this.socket !== socket) {
+        return;
+      }
+      this.socket = null;
+      this.onClose?.();
+      if (this.reconnect && !this.closed) {
+        this.reconnectTimer = setTimeout(
+          () => this.connect(),
+          RELAY_RECONNECT_DELAY_MS,
+        );
+      }
+    };
+  }
+
+  isOpen(): boolean {
+    return this.socket?.readyState === WebSocket.OPEN;
+  }
+
+  send(data: unknown): void {
+    this.sendEncoded(JSON.stringify(data));
+  }
+
+  sendEncoded(frame: string): void {
+    if (this.socket?.readyState === WebSocket.OPEN) {
+      this.socket.send(frame);
+    }
+  }
+
+  close(): void {
+    this.closed = true;
+    if (this.reconnectTimer) {
+      clearTimeout(this.reconnectTimer);
+      this.reconnectTimer = null;
+    }
+    const socket = this.socket;
+    this.socket = null;
+    socket?.close();
+  }
+}
@@ -0,0 +1,63 @@
+import { bench, describe } from "vitest";
+import type { Question } from "@opentriiva/pack-schema";
+import { createGameStore, type GameStoreApi, type Player } from "./gameStore";
+
+const ROOM_SIZES = [10, 100, 1000];
+
+const QUESTION: Question = {
+  id: "q1",
+  type: "mcq",
+  prompt: "Which planet is known as the Red Planet?",
+  choices: ["a", "b", "c", "d"].map((id) => ({ id, text: id })),
+  answer: { choiceId: "b" },
+};
+
+function makePlayer(index: number): Player {
+  return {
+    id: `p${index}`,
+    nickname: `Player ${index}`,
+    isReady: true,
+    isConnected: true,
+    score: 0,
+  };
+}
+
+function fillLobby(players: number): GameStoreApi {
+  const store = createGameStore();
+  for (let index = 0; index < players; index++) {
+    store.getState().addPlayer(makePlayer(index));
+  }
+  return store;
+}
+
+function openQuestion(players: number): GameStoreApi {
+  const store = fillLobby(players);
+  store.getState().setQuestions([QUESTION]);
+  store.getState().startGame();
+  store.getState().showQuestion();
+  return store;
+}
+
+for (const players of ROOM_SIZES) {
+  describe(`game store (${players} players)`, () => {
+    const full = fillLobby(players);
+    const question = openQuestion(players);
+
+    bench("addPlayer: fill the lobby", () => {
+      fillLobby(players);
+    });
+
+    bench("addPlayer: rejoin a full lobby", () => {
+      full.getState().addPlayer(makePlayer(players >> 1));
+    });
+
+    // showQuestion clears the previous round's answers.
+    bench("submitAnswer: every player answers", () => {
+      const state = question.getState();
+      state.showQuestion();
+      for (let index = 0; index < players; index++) {
+        state.submitAnswer(`p${index}`, "q1", ["abcd"[index % 4]], index);
+      }
+    });
+  });
+}
@@ -1,5 +1,11 @@
 import { describe, it, expect, beforeEach } from "vitest";
-import { useGameStore } from "../stores/gameStore";
+import {
+  selectAnsweredCount,
+  selectAnswerTally,
+  selectCorrectCount,
+  selectResponseTimeHistogram,
+  useGameStore,
+} from "../stores/gameStore";
 
 const mockQuestions = [
   {
@@ -234,6 +240,36 @@ describe("Game Store", () => {
       const questionIds = state.questions.map((q) => q.id);
       expect(questionIds).toContain("q1");
     });
+
+    it("should derive question order from the seed", () => {
+      const { addPlayer, setQuestions, startGame, updateSettings } =
+        useGameStore.getState();
+
+      updateSettings({ shuffleQuestions: true });
+      mockPlayers.forEach(addPlayer);
+      setQuestions(mockQuestions);
+      startGame(42);
+      const first = useGameStore.getState().questions.map((q) => q.id);
+
+      setQuestions(mockQuestions);
+      startGame(42);
+
+      expect(useGameStore.getState().shuffleSeed).toBe(42);
+      expect(useGameStore.getState().questions.map((q) => q.id)).toEqual(
+        first,
+      );
+    });
+
+    it("should keep choices canonical when shuffleChoices is true", () => {
+      const { setQuestions, startGame, updateSettings } =
+        useGameStore.getState();
+
+      updateSettings({ shuffleChoices: true });
+      setQuestions(mockQuestions);
+      startGame();
+
+      expect(useGameStore.getState().questions).toEqual(mockQuestions);
+    });
   });
 
   describe("showQuestion", () => {
@@ -388,6 +424,34 @@ describe("Game Store", () => {
       const answers = useGameStore.getState().answers;
       expect(answers.get("p1")).toEqual(["b"]);
     });
+
+    it("should update the answer tally incrementally", () => {
+      const { showQuestion, submitAnswer } = useGameStore.getState();
+
+      showQuestion();
+      submitAnswer("p1", "q1", ["b"], 1500);
+      submitAnswer("p2", "q1", ["a"], 2500);
+      submitAnswer("p1", "q1", ["a"], 3000);
+
+      const tally = selectAnswerTally(useGameStore.getState());
+      expect(tally.questionId).toBe("q1");
+      expect(tally.choiceCounts).toEqual({ a: 1, b: 1, c: 0, d: 0 });
+      expect(selectAnsweredCount(useGameStore.getState())).toBe(2);
+      expect(selectCorrectCount(useGameStore.getState())).toBe(1);
+      expect(
+        selectResponseTimeHistogram(useGameStore.getState()).slice(0, 3),
+      ).toEqual([0, 1, 1]);
+    });
+
+    it("should reset the tally for each question", () => {
+      const { showQuestion, submitAnswer } = useGameStore.getState();
+
+      showQuestion();
+      submitAnswer("p1", "q1", ["b"], 1500);
+      showQuestion();
+
+      expect(useGameStore.getState().answerTally.totalAnswered).toBe(0);
+    });
   });
 
   describe("nextQuestion", () => {
@@ -0,0 +1,262 @@
+import { createStore, type StateCreator, type StoreApi } from "zustand/vanilla";
+import type { Question } from "@opentriiva/pack-schema";
+import {
+  createAnswerTally,
+  recordAnswer,
+  type AnswerTally,
+} from "@/lib/answer-stats";
+import { randomSeed, shuffleQuestions } from "@/lib/shuffle";
+
+export type GamePhase =
+  | "idle"
+  | "lobby"
+  | "countdown"
+  | "question"
+  | "reveal"
+  | "intermission"
+  | "leaderboard"
+  | "ended";
+
+export interface Player {
+  id: string;
+  nickname: string;
+  avatar?: string;
+  isReady: boolean;
+  isConnected: boolean;
+  score: number;
+}
+
+/** Named pacing for the engine's waits; see TIMING_PROFILES. */
+export type TimingProfileName = "standard" | "fast";
+
+export interface GameSettings {
+  questionTimeLimit: number;
+  showLeaderboard: boolean;
+  shuffleQuestions: boolean;
+  shuffleChoices: boolean;
+  timingProfile: TimingProfileName;
+}
+
+export interface GameState {
+  phase: GamePhase;
+  roomId: string;
+  hostId: string;
+  players: Player[];
+  settings: GameSettings;
+  questions: Question[];
+  currentQuestionIndex: number;
+  questionStartTime: number | null;
+  answers: Map<string, string[]>;
+  scores: Map<string, number>;
+  isLocked: boolean;
+  countdown: number;
+  answerTally: AnswerTally;
+  /** Drawn per game; question and per-player choice order derive from it. */
+  shuffleSeed: number;
+}
+
+export interface GameActions {
+  setRoomId: (roomId: string) => void;
+  setPhase: (phase: GamePhase) => void;
+  addPlayer: (player: Player) => void;
+  removePlayer: (playerId: string) => void;
+  setPlayerReady: (playerId: string, isReady: boolean) => void;
+  setPlayerConnected: (playerId: string, isConnected: boolean) => void;
+  updateSettings: (settings: Partial<GameSettings>) => void;
+  setQuestions: (questions: Question[]) => void;
+  startGame: (seed?: number) => void;
+  showQuestion: (startTime?: number) => void;
+  lockQuestion: () => void;
+  revealAnswer: () => void;
+  submitAnswer: (
+    playerId: string,
+    questionId: string,
+    choiceIds: string[],
+    timeMs: number,
+  ) => boolean;
+  nextQuestion: () => void;
+  endGame: () => void;
+  reset: () => void;
+}
+
+const initialState: GameState = {
+  phase: "idle",
+  roomId: "",
+  hostId: "",
+  players: [],
+  settings: {
+    questionTimeLimit: 20000,
+    showLeaderboard: true,
+    shuffleQuestions: false,
+    shuffleChoices: false,
+    timingProfile: "standard",
+  },
+  questions: [],
+  currentQuestionIndex: 0,
+  questionStartTime: null,
+  answers: new Map(),
+  scores: new Map(),
+  isLocked: false,
+  countdown: 3,
+  answerTally: createAnswerTally(),
+  shuffleSeed: 0,
+};
+
+export type GameStore = GameState & GameActions;
+export type GameStoreApi = StoreApi<GameStore>;
+
+export const gameStoreCreator: StateCreator<GameStore> = (set, get) => ({
+  ...initialState,
+
+  setRoomId: (roomId) => set({ roomId }),
+
+  setPhase: (phase) => set({ phase }),
+
+  addPlayer: (player) =>
+    set((state) => ({
+      players: state.players.some((p) => p.id === player.id)
+        ? state.players.map((existing) =>
+            existing.id === player.id
+              ? {
+                  ...existing,
+                  nickname: player.nickname,
+                  isConnected: true,
+                }
+              : existing,
+          )
+        : [...state.players, player],
+      scores: state.scores.has(player.id)
+        ? new Map(state.scores)
+        : new Map(state.scores).set(player.id, 0),
+    })),
+
+  removePlayer: (playerId) =>
+    set((state) => ({
+      players: state.players.filter((p) => p.id !== playerId),
+    })),
+
+  setPlayerReady: (playerId, isReady) =>
+    set((state) => ({
+      players: state.players.map((p) =>
+        p.id === playerId ? { ...p, isReady } : p,
+      ),
+    })),
+
+  setPlayerConnected: (playerId, isConnected) =>
+    set((state) => ({
+      players: state.players.map((p) =>
+        p.id === playerId ? { ...p, isConnected } : p,
+      ),
+    })),
+
+  updateSettings: (settings) =>
+    set((state) => ({
+      settings: {
+        ...state.settings,
+        ...settings,
+      },
+    })),
+
+  setQuestions: (questions) => set({ questions }),
+
+  // Choices are not reordered here: each player derives its own order from
+  // the seed (see buildQuestionPayload), so questions stay canonical.
+  startGame: (seed = randomSeed()) => {
+    const state = get();
+    const questions = state.settings.shuffleQuestions
+      ? shuffleQuestions(state.questions, seed)
+      : state.questions;
+
+    set({
+      phase: "countdown",
+      questions,
+      currentQuestionIndex: 0,
+      scores: new Map(state.players.map((p) => [p.id, 0])),
+      shuffleSeed: seed,
+    });
+  },
+
+  showQuestion: (startTime = Date.now()) => {
+    const state = get();
+    set({
+      phase: "question",
+      questionStartTime: startTime,
+      answers: new Map(),
+      isLocked: false,
+      answerTally: createAnswerTally(
+        state.questions[state.currentQuestionIndex],
+        state.settings.questionTimeLimit,
+      ),
+    });
+  },
+
+  lockQuestion: () => set({ isLocked: true }),
+
+  revealAnswer: () => {
+    set({ phase: "reveal", isLocked: true });
+  },
+
+  submitAnswer: (playerId, questionId, choiceIds, timeMs) => {
+    const state = get();
+    const question = state.questions[state.currentQuestionIndex];
+
+    if (!question || state.phase !== "question") return false;
+    if (questionId && question.id !== questionId) return false;
+    if (state.answers.has(playerId)) return false;
+
+    const maxAcceptedTime = state.settings.questionTimeLimit + 1000;
+    if (timeMs < 0 || timeMs > maxAcceptedTime) return false;
+
+    const newAnswers = new Map(state.answers);
+    newAnswers.set(playerId, choiceIds);
+
+    const isCorrect = choiceIds.includes(question.answer.choiceId);
+    const remainingRatio = Math.max(
+      0,
+      (state.settings.questionTimeLimit - timeMs) /
+        state.settings.questionTimeLimit,
+    );
+    const scoreDelta = isCorrect ? Math.round(1000 * remainingRatio) : 0;
+
+    const newScores = new Map(state.scores);
+    newScores.set(playerId, (newScores.get(playerId) || 0) + scoreDelta);
+
+    set({
+      answers: newAnswers,
+      scores: newScores,
+      answerTally: recordAnswer(state.answerTally, choiceIds[0], timeMs),
+    });
+
+    return true;
+  },
+
+  nextQuestion: () => {
+    const state = get();
+    const nextIndex = state.currentQuestionIndex + 1;
+
+    if (nextIndex >= state.questions.length) {
+      set({ phase: "ended" });
+    } else {
+      set({
+        phase: "intermission",
+        currentQuestionIndex: nextIndex,
+      });
+    }
+  },
+
+  endGame: () => set({ phase: "ended" }),
+
+  reset: () => set(initialState),
+});
+
+export const selectAnswerTally = (state: GameState) => state.answerTally;
+export const selectAnsweredCount = (state: GameState) =>
+  state.answerTally.totalAnswered;
+export const selectCorrectCount = (state: GameState) =>
+  state.answerTally.correctCount;
+export const selectResponseTimeHistogram = (state: GameState) =>
+  state.answerTally.responseTimeHistogram;
+
+export function createGameStore(): GameStoreApi {
+  return createStore<GameStore>(gameStoreCreator);
+}
@@ -0,0 +1,244 @@
+import type { RedisClient } from "@/app/api/_lib/redis";
+
+type Value = string | string[] | Map<string, string> | Map<string, number>;
+
+function parseMin(bound: number | string): (score: number) => boolean {
+  const text = String(bound);
+  if (text === "-inf") return () => true;
+  if (text.startsWith("(")) {
+    const limit = Number(text.slice(1));
+    return (score) => score > limit;
+  }
+  const limit = Number(text);
+  return (score) => score >= limit;
+}
+
+function parseMax(bound: number | string): (score: number) => boolean {
+  const text = String(bound);
+  if (text === "+inf") return () => true;
+  if (text.startsWith("(")) {
+    const limit = Number(text.slice(1));
+    return (score) => score < limit;
+  }
+  const limit = Number(text);
+  return (score) => score <= limit;
+}
+
+/**
+ * In-process stand-in for the Redis commands the session store issues,
+ * with a configurable per-command latency and an outage switch. Used by the
+ * store tests and benchmarks in place of a real server.
+ */
+export class RedisStandIn implements RedisClient {
+  private data: Map<string, Value> = new Map();
+  private expiries: Map<string, number> = new Map();
+  latencyMs: number;
+  failing = false;
+  commands = 0;
+
+  constructor(options: { latencyMs?: number } = {}) {
+    this.latencyMs = options.latencyMs ?? 0;
+  }
+
+  /** Approximate payload held: key, field and value lengths. */
+  storedBytes(): number {
+    let bytes = 0;
+    this.data.forEach((value, key) => {
+      bytes += key.length;
+      if (typeof value === "string") {
+        bytes += value.length;
+      } else if (Array.isArray(value)) {
+        value.forEach((entry) => {
+          bytes += entry.length;
+        });
+      } else {
+        (value as Map<string, string | number>).forEach((entry, field) => {
+          bytes += field.length + String(entry).length;
+        });
+      }
+    });
+    return bytes;
+  }
+
+  private async roundTrip(): Promise<void> {
+    this.commands += 1;
+    if (this.latencyMs > 0) {
+      await new Promise((resolve) => setTimeout(resolve, this.latencyMs));
+    }
+    if (this.failing) {
+      throw new Error("Connection is closed.");
+    }
+  }
+
+  private read(key: string): Value | undefined {
+    const expiresAt = this.expiries.get(key);
+    if (expiresAt !== undefined && expiresAt <= Date.now()) {
+      this.data.delete(key);
+      this.expiries.delete(key);
+    }
+    return this.data.get(key);
+  }
+
+  private sortedSet(key: string): Map<string, number> {
+    let set = this.read(key) as Map<string, number> | undefined;
+    if (!set) {
+      set = new Map();
+      this.data.set(key, set);
+    }
+    return set;
+  }
+
+  private rangeByScore(
+    key: string,
+    min: number | string,
+    max: number | string,
+  ): [string, number][] {
+    const aboveMin = parseMin(min);
+    const belowMax = parseMax(max);
+    return Array.from(this.sortedSet(key))
+      .filter(([, score]) => aboveMin(score) && belowMax(score))
+      .sort(([a, x], [b, y]) => x - y || (a < b ? -1 : a > b ? 1 : 0));
+  }
+
+  get = (async (key: string) => {
+    await this.roundTrip();
+    const value = this.read(key);
+    return typeof value === "string" ? value : null;
+  }) as RedisClient["get"];
+
+  set = (async (
+    key: string,
+    value: string,
+    _ex: "EX",
+    seconds: number,
+    nx?: "NX",
+  ) => {
+    await this.roundTrip();
+    if (nx && this.read(key) !== undefined) {
+      return null;
+    }
+    this.data.set(key, value);
+    this.expiries.set(key, Date.now() + seconds * 1000);
+    return "OK";
+  }) as unknown as RedisClient["set"];
+
+  setex = (async (key: string, seconds: number, value: string) => {
+    await this.roundTrip();
+    this.data.set(key, value);
+    this.expiries.set(key, Date.now() + seconds * 1000);
+    return "OK";
+  }) as RedisClient["setex"];
+
+  expire = (async (key: string, seconds: number) => {
+    await this.roundTrip();
+    if (this.read(key) === undefined) {
+      return 0;
+    }
+    this.expiries.set(key, Date.now() + seconds * 1000);
+    return 1;
+  }) as unknown as RedisClient["expire"];
+
+  del = (async (...keys: string[]) => {
+    await this.roundTrip();
+    let removed = 0;
+    keys.forEach((key) => {
+      if (this.read(key) !== undefined) {
+        removed += 1;
+      }
+      this.data.delete(key);
+      this.expiries.delete(key);
+    });
+    return removed;
+  }) as unknown as RedisClient["del"];
+
+  hset = (async (key: string, fields: Record<string, string>) => {
+    await this.roundTrip();
+    const hash =
+      (this.read(key) as Map<string, string> | undefined) ?? new Map();
+    this.data.set(key, hash);
+    Object.entries(fields).forEach(([field, value]) => hash.set(field, value));
+    return Object.keys(fields).length;
+  }) as unknown as RedisClient["hset"];
+
+  hget = (async (key: string, field: string) => {
+    await this.roundTrip();
+    const hash = this.read(key) as Map<string, string> | undefined;
+    return hash?.get(field) ?? null;
+  }) as RedisClient["hget"];
+
+  hdel = (async (key: string, ...fields: string[]) => {
+    await this.roundTrip();
+    const hash = this.read(key) as Map<string, string> | undefined;
+    return fields.filter((field) => hash?.delete(field)).length;
+  }) as unknown as RedisClient["hdel"];
+
+  hlen = (async (key: string) => {
+    await this.roundTrip();
+    const hash = this.read(key) as Map<string, string> | undefined;
+    return hash?.size ?? 0;
+  }) as RedisClient["hlen"];
+
+  hgetall = (async (key: string) => {
+    await this.roundTrip();
+    const hash = this.read(key) as Map<string, string> | undefined;
+    return hash ? Object.fromEntries(hash) : {};
+  }) as RedisClient["hgetall"];
+
+  rpush = (async (key: string, ...values: string[]) => {
+    await this.roundTrip();
+    const list = (this.read(key) as string[] | undefined) ?? [];
+    this.data.set(key, list);
+    list.push(...values);
+    return list.length;
+  }) as unknown as RedisClient["rpush"];
+
+  lrange = (async (key: string, start: number, stop: number) => {
+    await this.roundTrip();
+    const list = (this.read(key) as string[] | undefined) ?? [];
+    const end = stop < 0 ? list.length + stop + 1 : stop + 1;
+    return list.slice(start < 0 ? list.length + start : start, end);
+  }) as unknown as RedisClient["lrange"];
+
+  zadd = (async (key: string, score: number, member: string) => {
+    await this.roundTrip();
+    const set = this.sortedSet(key);
+    const added = set.has(member) ? 0 : 1;
+    set.set(member, score);
+    return added;
+  }) as unknown as RedisClient["zadd"];
+
+  zcount = (async (
+    key: string,
+    min: number | string,
+    max: number | string,
+  ) => {
+    await this.roundTrip();
+    return this.rangeByScore(key, min, max).length;
+  }) as RedisClient["zcount"];
+
+  zrangebyscore = (async (
+    key: string,
+    min: number | string,
+    max: number | string,
+    _limit?: "LIMIT",
+    offset = 0,
+    count = Infinity,
+  ) => {
+    await this.roundTrip();
+    return this.rangeByScore(key, min, max)
+      .slice(offset, offset + count)
+      .map(([member]) => member);
+  }) as unknown as RedisClient["zrangebyscore"];
+
+  zremrangebyscore = (async (
+    key: string,
+    min: number | string,
+    max: number | string,
+  ) => {
+    await this.roundTrip();
+    const set = this.sortedSet(key);
+    const removed = this.rangeByScore(key, min, max);
+    removed.forEach(([member]) => set.delete(member));
+    return removed.length;
+  }) as unknown as RedisClient["zremrangebyscore"];
+}
@@ -0,0 +1,160 @@
+import { readFileSync } from "fs";
+import path from "path";
+import { beforeEach, describe, expect, it, vi } from "vitest";
+
+const ORIGIN = "http://localhost:3000";
+const SOURCE = readFileSync(
+  path.resolve(__dirname, "../../public/sw.js"),
+  "utf8",
+);
+
+type Listener = (event: FakeEvent) => void;
+
+interface FakeEvent {
+  request?: { url: string; method: string; mode: string };
+  respondWith: ReturnType<typeof vi.fn>;
+  waitUntil: ReturnType<typeof vi.fn>;
+}
+
+function keyOf(request: string | { url: string }): string {
+  const url = new URL(
+    typeof request === "string" ? request : request.url,
+    ORIGIN,
+  );
+  return `${url.pathname}${url.search}`;
+}
+
+function createWorker(version: string, fetchImpl: typeof fetch) {
+  const listeners = new Map<string, Listener>();
+  const stores = new Map<string, Map<string, Response>>();
+
+  const openStore = (name: string) => {
+    if (!stores.has(name)) {
+      stores.set(name, new Map());
+    }
+    return stores.get(name)!;
+  };
+
+  const caches = {
+    open: async (name: string) => {
+      const store = openStore(name);
+      return {
+        match: async (request: string | { url: string }) =>
+          store.get(keyOf(request))?.clone(),
+        put: async (request: string | { url: string }, response: Response) => {
+          store.set(keyOf(request), response);
+        },
+        add: async (request: string) => {
+          store.set(keyOf(request), await fetchImpl(`${ORIGIN}${request}`));
+        },
+      };
+    },
+    keys: async () => Array.from(stores.keys()),
+    delete: async (name: string) => stores.delete(name),
+  };
+
+  const self = {
+    location: { href: `${ORIGIN}/sw.js?v=${version}`, origin: ORIGIN },
+    addEventListener: (type: string, listener: Listener) =>
+      listeners.set(type, listener),
+    skipWaiting: vi.fn(async () => {}),
+    clients: { claim: vi.fn(async () => {}) },
+  };
+
+  new Function("self", "caches", "fetch", SOURCE)(self, caches, fetchImpl);
+
+  const dispatch = async (type: string, request?: FakeEvent["request"]) => {
+    const event: FakeEvent = {
+      request,
+      respondWith: vi.fn(),
+      waitUntil: vi.fn(),
+    };
+    listeners.get(type)!(event);
+    await Promise.all(event.waitUntil.mock.calls.map(([promise]) => promise));
+    return event;
+  };
+
+  return { dispatch, stores };
+}
+
+const SHELL_HTML =
+  '<html><script src="/_next/static/chunks/main-abc.js" async></script>' +
+  '<link rel="stylesheet" href="/_next/static/css/app-abc.css"></html>';
+
+function htmlResponse(body: string): Response {
+  return new Response(body, { headers: { "Content-Type": "text/html" } });
+}
+
+describe("player service worker", () => {
+  let fetchImpl: ReturnType<typeof vi.fn>;
+
+  beforeEach(() => {
+    fetchImpl = vi.fn(async (input: string | { url: string }) => {
+      const key = keyOf(input);
+      return key.startsWith("/_next/static/")
+        ? new Response(`asset ${key}`)
+        : htmlResponse(`${SHELL_HTML}<!-- ${key} -->`);
+    });
+  });
+
+  it("precaches both shells and their static assets", async () => {
+    const worker = createWorker("v1", fetchImpl as unknown as typeof fetch);
+    await worker.dispatch("install");
+
+    const store = worker.stores.get("opentriiva-shell-v1")!;
+    expect(Array.from(store.keys()).sort()).toEqual([
+      "/_next/static/chunks/main-abc.js",
+      "/_next/static/css/app-abc.css",
+      "/join",
+      "/player/shell",
+    ]);
+  });
+
+  it("serves any player room from the cached shell", async () => {
+    const worker = createWorker("v1", fetchImpl as unknown as typeof fetch);
+    await worker.dispatch("install");
+    // The network never answers, so the response must come from the cache.
+    fetchImpl.mockImplementation(() => new Promise(() => {}));
+
+    const event = await worker.dispatch("fetch", {
+      url: `${ORIGIN}/player/ROOM42?playerId=p1&nickname=Ann`,
+      method: "GET",
+      mode: "navigate",
+    });
+
+    const response: Response = await event.respondWith.mock.calls[0][0];
+    expect(await response.text()).toContain("<!-- /player/shell -->");
+  });
+
+  it("leaves API, signaling and host requests to the network", async () => {
+    const worker = createWorker("v1", fetchImpl as unknown as typeof fetch);
+    const requests = [
+      {
+        url: `${ORIGIN}/api/session/ROOM42/offer`,
+        method: "GET",
+        mode: "cors",
+      },
+      { url: `${ORIGIN}/api/session/create`, method: "POST", mode: "cors" },
+      {
+        url: `${ORIGIN}/host/lobby?room=ROOM42`,
+        method: "GET",
+        mode: "navigate",
+      },
+      { url: "https://relay.example.com/game", method: "GET", mode: "cors" },
+    ];
+
+    for (const request of requests) {
+      const event = await worker.dispatch("fetch", request);
+      expect(event.respondWith).not.toHaveBeenCalled();
+    }
+  });
+
+  it("drops caches from previous versions on activate", async () => {
+    const next = createWorker("v2", fetchImpl as unknown as typeof fetch);
+    next.stores.set("opentriiva-shell-v1", new Map());
+    await next.dispatch("install");
+    await next.dispatch("activate");
+
+    expect(Array.from(next.stores.keys())).toEqual(["opentriiva-shell-v2"]);
+  });
+});
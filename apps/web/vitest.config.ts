@@ -14,6 +14,9 @@ export default defineConfig({
       "src/**/*.spec.ts",
       "src/**/*.spec.tsx",
     ],
+    benchmark: {
+      include: ["src/**/*.bench.ts", "src/**/*.bench.tsx"],
+    },
     coverage: {
       provider: "v8",
       reporter: ["text", "json", "html"],
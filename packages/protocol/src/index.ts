@@ -95,6 +95,20 @@ export interface AnswerSubmitPayload {
   submitTime: number;
 }
 
+/**
+ * What players actually put on the data channel when answering: a flat
+ * frame rather than an `answer.submit` envelope. `questionId` defaults to
+ * the current question and `playerId` is informational; the host trusts
+ * the connection the frame arrived on.
+ */
+export interface AnswerFrame {
+  type: "answer";
+  playerId?: string;
+  questionId?: string;
+  choiceId: string;
+  timeMs: number;
+}
+
 export interface AnswerAckPayload {
   status: "accepted" | "late" | "invalid";
   selectedChoiceIds: string[];
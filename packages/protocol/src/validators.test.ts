@@ -3,6 +3,7 @@ import {
   validateMessageEnvelope,
   validateRoomJoinPayload,
   validateAnswerSubmitPayload,
+  validateAnswerFrame,
   validatePlayer,
   validateGameSettings,
   validateChoice,
@@ -94,6 +95,48 @@ describe("validateAnswerSubmitPayload", () => {
   });
 });
 
+describe("validateAnswerFrame", () => {
+  it("should validate the frame players send", () => {
+    const frame = {
+      type: "answer",
+      playerId: "p1",
+      questionId: "q1",
+      choiceId: "b",
+      timeMs: 4200,
+    };
+    expect(validateAnswerFrame(frame)).toBe(true);
+  });
+
+  it("should accept a frame without ids", () => {
+    expect(
+      validateAnswerFrame({ type: "answer", choiceId: "b", timeMs: 0 }),
+    ).toBe(true);
+  });
+
+  it("should reject a non-finite or negative time", () => {
+    const frame = { type: "answer", choiceId: "b" };
+    expect(validateAnswerFrame({ ...frame, timeMs: NaN })).toBe(false);
+    expect(validateAnswerFrame({ ...frame, timeMs: -1 })).toBe(false);
+    expect(validateAnswerFrame({ ...frame, timeMs: "1000" })).toBe(false);
+  });
+
+  it("should reject a missing or oversized choiceId", () => {
+    expect(validateAnswerFrame({ type: "answer", timeMs: 0 })).toBe(false);
+    expect(
+      validateAnswerFrame({
+        type: "answer",
+        choiceId: "x".repeat(129),
+        timeMs: 0,
+      }),
+    ).toBe(false);
+  });
+
+  it("should reject a non-string questionId", () => {
+    const frame = { type: "answer", choiceId: "b", timeMs: 0, questionId: 1 };
+    expect(validateAnswerFrame(frame)).toBe(false);
+  });
+});
+
 describe("validatePlayer", () => {
   it("should validate correct player", () => {
     const player = {
@@ -3,6 +3,7 @@ import type {
   MessageType,
   RoomJoinPayload,
   AnswerSubmitPayload,
+  AnswerFrame,
   Player,
   LobbyState,
   GameSettings,
@@ -78,6 +79,33 @@ export function validateAnswerSubmitPayload(
   return true;
 }
 
+const MAX_ID_LENGTH = 128;
+
+function isOptionalId(value: unknown): boolean {
+  return (
+    value === undefined ||
+    (typeof value === "string" && value.length <= MAX_ID_LENGTH)
+  );
+}
+
+export function validateAnswerFrame(data: unknown): data is AnswerFrame {
+  if (typeof data !== "object" || data === null) return false;
+
+  const frame = data as Record<string, unknown>;
+
+  if (frame.type !== "answer") return false;
+  if (typeof frame.choiceId !== "string") return false;
+  if (frame.choiceId.length < 1 || frame.choiceId.length > MAX_ID_LENGTH)
+    return false;
+  if (typeof frame.timeMs !== "number" || !Number.isFinite(frame.timeMs))
+    return false;
+  if (frame.timeMs < 0) return false;
+  if (!isOptionalId(frame.questionId)) return false;
+  if (!isOptionalId(frame.playerId)) return false;
+
+  return true;
+}
+
 export function validatePlayer(data: unknown): data is Player {
   if (typeof data !== "object" || data === null) return false;
 
@@ -0,0 +1,364 @@
+"""Load-test a room with hundreds of headless bot players.
+
+A Chromium host tab creates the room and runs the game as usual. Every
+player is an aiortc peer instead of a browser tab: it signals through the
+same `/api/session/<room>/offer`, `/answer` and `/candidate` routes as the
+player page, opens the same `game` and negotiated `game-fast` data channels,
+answers each `question` the host broadcasts after a random think time and
+resends until the host's `answer.ack`, like the player page does. The run
+reports join-time (offer to open channel) and ack-latency percentiles.
+
+Needs `aiortc` and `aiohttp` next to Playwright
+(`pip install aiortc aiohttp`). Intended for a local `bun run dev` server;
+signaling rate limits are per player, so bots do not trip them, but the
+hosted deployment is not the place for this.
+
+    python3 tests/bench_bot_players.py --bots 200 --questions 3
+    python3 tests/bench_bot_players.py --bots 500 --output bots.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import time
+import uuid
+
+import aiohttp
+from aiortc import (
+    RTCConfiguration,
+    RTCIceServer,
+    RTCPeerConnection,
+    RTCSessionDescription,
+)
+from aiortc.sdp import candidate_from_sdp
+from playwright.async_api import async_playwright
+
+BASE_URL = os.environ.get("BASE_URL", "http://localhost:3000")
+
+# Mirrors apps/web/src/lib/channels.ts.
+RELIABLE_CHANNEL_LABEL = "game"
+FAST_CHANNEL_LABEL = "game-fast"
+FAST_CHANNEL_ID = 1000
+FAST_CHANNEL_MAX_RETRANSMITS = 2
+ANSWER_RETRY_INTERVAL_S = 0.6
+ANSWER_MAX_ATTEMPTS = 6
+
+# The player page polls signaling once a second until its channel opens.
+POLL_INTERVAL_S = 1.0
+
+# Bots that timed out may still sit unready in the lobby, so wait for the
+# ready count rather than an all-ready lobby.
+READY_SCRIPT = """
+count => {
+  const match = document.body.innerText.match(/(\\d+)\\/\\d+ ready/);
+  return match !== null && Number(match[1]) >= count;
+}
+"""
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def summarize(values):
+    if not values:
+        return None
+    return {
+        "count": len(values),
+        "p50": statistics.median(values),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values),
+    }
+
+
+def parse_candidate(init):
+    line = init.get("candidate") or ""
+    if not line:
+        return None
+    candidate = candidate_from_sdp(line.split(":", 1)[1])
+    candidate.sdpMid = init.get("sdpMid")
+    candidate.sdpMLineIndex = init.get("sdpMLineIndex")
+    return candidate
+
+
+class BotPlayer:
+    def __init__(self, http, room, index, ice_servers, think_ms):
+        self.http = http
+        self.room = room
+        self.player_id = str(uuid.uuid4())
+        self.player_token = None
+        self.nickname = f"Bot{index:03d}"
+        self.think_ms = think_ms
+        self.pc = RTCPeerConnection(RTCConfiguration(iceServers=ice_servers))
+        self.reliable = None
+        self.fast = None
+        self.opened = asyncio.Event()
+        self.join_ms = None
+        self.pending_acks = {}
+        self.ack_ms = []
+        self.answers_sent = 0
+        self.rejected = 0
+        self.tasks = set()
+
+    def url(self, route):
+        return f"{BASE_URL}/api/session/{self.room}/{route}"
+
+    async def join(self):
+        started = time.perf_counter()
+        self.reliable = self.pc.createDataChannel(RELIABLE_CHANNEL_LABEL)
+        self.fast = self.pc.createDataChannel(
+            FAST_CHANNEL_LABEL,
+            negotiated=True,
+            id=FAST_CHANNEL_ID,
+            ordered=False,
+            maxRetransmits=FAST_CHANNEL_MAX_RETRANSMITS,
+        )
+        self.reliable.on("open", self.opened.set)
+        for channel in (self.reliable, self.fast):
+            channel.on("message", self.on_message)
+
+        # aiortc gathers before setLocalDescription returns, so the offer
+        # already carries every local candidate and only the host trickles.
+        await self.pc.setLocalDescription(await self.pc.createOffer())
+        offer = self.pc.localDescription
+        async with self.http.post(
+            self.url("offer"),
+            json={
+                "roomId": self.room,
+                "playerId": self.player_id,
+                "nickname": self.nickname,
+                "offer": {"type": offer.type, "sdp": offer.sdp},
+            },
+        ) as response:
+            response.raise_for_status()
+            auth = await response.json()
+        self.player_token = auth["playerToken"]
+
+        processed = 0
+        auth_query = f"playerId={self.player_id}&playerToken={self.player_token}"
+        while not self.opened.is_set():
+            if self.pc.signalingState == "have-local-offer":
+                async with self.http.get(
+                    f"{self.url('answer')}?{auth_query}"
+                ) as response:
+                    data = await response.json()
+                if data.get("answer"):
+                    answer = data["answer"]
+                    await self.pc.setRemoteDescription(
+                        RTCSessionDescription(answer["sdp"], answer["type"])
+                    )
+
+            if self.pc.remoteDescription:
+                async with self.http.get(
+                    f"{self.url('candidate')}?{auth_query}&afterIndex={processed}"
+                ) as response:
+                    data = await response.json()
+                for init in data.get("candidates") or []:
+                    processed += 1
+                    candidate = parse_candidate(init)
+                    if candidate:
+                        await self.pc.addIceCandidate(candidate)
+
+            try:
+                await asyncio.wait_for(self.opened.wait(), POLL_INTERVAL_S)
+            except asyncio.TimeoutError:
+                pass
+
+        self.join_ms = (time.perf_counter() - started) * 1000
+
+    def send(self, data):
+        channel = self.fast if self.fast.readyState == "open" else self.reliable
+        if channel.readyState == "open":
+            channel.send(data)
+
+    def on_message(self, raw):
+        try:
+            message = json.loads(raw)
+        except (TypeError, ValueError):
+            return
+        kind = message.get("type")
+        payload = message.get("payload") or {}
+
+        if kind == "question":
+            task = asyncio.ensure_future(self.answer(payload))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+        elif kind == "answer.ack":
+            sent_at = self.pending_acks.pop(payload.get("questionId"), None)
+            if sent_at is not None:
+                self.ack_ms.append((time.perf_counter() - sent_at) * 1000)
+                if not payload.get("accepted"):
+                    self.rejected += 1
+
+    async def answer(self, question):
+        shown_at = time.perf_counter()
+        await asyncio.sleep(random.uniform(0, self.think_ms) / 1000)
+        question_id = question["id"]
+        message = json.dumps(
+            {
+                "type": "answer",
+                "playerId": self.player_id,
+                "questionId": question_id,
+                "choiceId": random.choice(question["choices"])["id"],
+                "timeMs": round((time.perf_counter() - shown_at) * 1000),
+            }
+        )
+
+        self.answers_sent += 1
+        self.pending_acks[question_id] = time.perf_counter()
+        for _ in range(ANSWER_MAX_ATTEMPTS):
+            if question_id not in self.pending_acks:
+                return
+            self.send(message)
+            await asyncio.sleep(ANSWER_RETRY_INTERVAL_S)
+        self.pending_acks.pop(question_id, None)
+
+    async def close(self):
+        for task in list(self.tasks):
+            task.cancel()
+        await self.pc.close()
+
+
+async def create_room(browser):
+    page = await browser.new_page()
+    await page.goto(f"{BASE_URL}/host")
+    await page.wait_for_load_state("networkidle")
+    await page.select_option("#localPack", "science")
+    await page.click('button:has-text("CREATE GAME")')
+    await page.wait_for_url("**/host/lobby**", timeout=20000)
+    room = page.url.split("room=")[1].split("&")[0]
+    return page, room
+
+
+async def join_all(bots, concurrency, timeout_s):
+    gate = asyncio.Semaphore(concurrency)
+
+    async def join(bot):
+        async with gate:
+            try:
+                await asyncio.wait_for(bot.join(), timeout_s)
+                return True
+            except Exception as error:
+                print(f"{bot.nickname} failed to join: {error!r}")
+                return False
+
+    joined = await asyncio.gather(*(join(bot) for bot in bots))
+    return [bot for bot, ok in zip(bots, joined) if ok]
+
+
+async def run_game(host_page, question_limit):
+    """Clicks through the host's game until it ends or the limit is hit."""
+    questions = 1
+    while True:
+        text = await host_page.locator("body").inner_text()
+        if "GAME OVER" in text:
+            return questions
+
+        next_button = host_page.locator('button:has-text("NEXT QUESTION")')
+        results_button = host_page.locator('button:has-text("SEE RESULTS")')
+        if await next_button.is_visible():
+            if question_limit and questions >= question_limit:
+                return questions
+            await next_button.click()
+            questions += 1
+        elif await results_button.is_visible():
+            await results_button.click()
+        await host_page.wait_for_timeout(500)
+
+
+async def run(args):
+    ice_servers = [RTCIceServer(urls=args.stun)] if args.stun else []
+    async with async_playwright() as p, aiohttp.ClientSession() as http:
+        browser = await p.chromium.launch(headless=True)
+        host_page, room = await create_room(browser)
+        print(f"room {room}: joining {args.bots} bots")
+
+        bots = [
+            BotPlayer(http, room, index, ice_servers, args.think_ms)
+            for index in range(args.bots)
+        ]
+        joined = await join_all(bots, args.concurrency, args.join_timeout)
+        if not joined:
+            raise SystemExit("no bot joined the room")
+
+        await host_page.wait_for_function(
+            READY_SCRIPT,
+            arg=len(joined),
+            timeout=120000,
+        )
+        await host_page.click('button:has-text("START GAME")')
+        questions = await run_game(host_page, args.questions)
+        # Let the last round's acks land before tearing peers down.
+        await asyncio.sleep(ANSWER_RETRY_INTERVAL_S * ANSWER_MAX_ATTEMPTS)
+
+        await asyncio.gather(*(bot.close() for bot in bots))
+        await browser.close()
+
+    answers = sum(bot.answers_sent for bot in joined)
+    ack_ms = [ms for bot in joined for ms in bot.ack_ms]
+    return {
+        "bots": args.bots,
+        "joined": len(joined),
+        "questions": questions,
+        "answers": answers,
+        "acked": len(ack_ms),
+        "rejected": sum(bot.rejected for bot in joined),
+        "joinMs": summarize([bot.join_ms for bot in joined]),
+        "ackMs": summarize(ack_ms),
+    }
+
+
+def format_latency(label, stats):
+    if not stats:
+        return f"{label:>5}: no samples"
+    return (
+        f"{label:>5}: n={stats['count']} p50={stats['p50']:.0f}ms "
+        f"p95={stats['p95']:.0f}ms p99={stats['p99']:.0f}ms "
+        f"max={stats['max']:.0f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bots", type=int, default=100)
+    parser.add_argument(
+        "--concurrency", type=int, default=50, help="joins in flight at once"
+    )
+    parser.add_argument("--join-timeout", type=float, default=60.0)
+    parser.add_argument(
+        "--questions", type=int, default=0, help="stop after N (0 = all)"
+    )
+    parser.add_argument(
+        "--think-ms", type=int, default=3000, help="max random answer delay"
+    )
+    parser.add_argument(
+        "--stun",
+        default="stun:stun.l.google.com:19302",
+        help="STUN server for bots ('' for host candidates only)",
+    )
+    parser.add_argument("--output", help="write results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(
+        f"joined {results['joined']}/{results['bots']} bots, "
+        f"{results['questions']} question(s), "
+        f"{results['acked']}/{results['answers']} answers acked "
+        f"({results['rejected']} rejected)"
+    )
+    print(format_latency("join", results["joinMs"]))
+    print(format_latency("ack", results["ackMs"]))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,441 @@
+"""Reconnect and answer delivery under impaired player networks.
+
+Plays a full game per scenario with a Chromium host and a few player tabs,
+impairing some of the players and leaving the rest as a control group:
+
+    baseline   no impairment
+    latency    300 ms each way
+    loss       10% of data-channel transmissions lost: dropped on the
+               unreliable fast lane, retransmitted after a delay on
+               reliable channels
+    bandwidth  32 kB/s with 150 ms latency
+    offline    the player drops off the network for --offline-ms right
+               after answering, every round
+
+DevTools network emulation (`Network.emulateNetworkConditions` over CDP)
+throttles the page's HTTP traffic, which is where signaling and reconnects
+happen. It does not touch WebRTC, so an init script applies the same
+conditions to the pages' data channels and records answers, acks and
+`data-connection` changes. Loss is modelled the way SCTP sees it: only the
+unreliable fast lane ever drops a message. On reliable channels each lost
+transmission costs a retransmission timeout and, since they are ordered,
+holds back everything sent after it. Going offline also closes the player's data
+channels, which is what the page sees once ICE consent checks fail.
+
+Per scenario and group it reports answers sent and lost (never acked),
+duplicate acks, answer-to-ack latency, questions missed while reconnecting,
+disconnects, and time-to-recover from the network coming back to the data
+channel reopening. Run it against a local server before and after a
+reconnect change and compare the saved reports:
+
+    python3 tests/bench_network_impairment.py --output before.json
+    python3 tests/bench_network_impairment.py --compare before.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from playwright.sync_api import sync_playwright
+
+from conftest import TIMEOUT_MS, join_room, open_room
+
+BASE_URL = os.environ.get("BASE_URL", "http://localhost:3000")
+
+SCENARIOS = {
+    "baseline": {},
+    "latency": {"latencyMs": 300},
+    "loss": {"loss": 0.1},
+    "bandwidth": {"latencyMs": 150, "bytesPerSecond": 32000},
+    "offline": {"offline": True},
+}
+
+# Metrics compared against a saved report; higher is worse for all of them.
+COMPARED = ["answersLost", "duplicateAcks", "ackP95Ms", "recoverP50Ms"]
+
+IMPAIRMENT_SCRIPT = """
+(() => {
+  const state = {
+    latencyMs: 0,
+    loss: 0,
+    // Of the order of the SCTP retransmission timeout in Chrome.
+    retransmitMs: 400,
+    bytesPerSecond: 0,
+    offline: false,
+    busyUntil: 0,
+    channels: [],
+    answers: {},
+    acks: {},
+    duplicateAcks: 0,
+    connection: [],
+    restores: [],
+  };
+  window.__impairment = state;
+
+  const unreliable = (channel) =>
+    channel.maxRetransmits !== null || channel.maxPacketLifeTime !== null;
+  const retransmitDelay = () => {
+    let delay = 0;
+    while (Math.random() < state.loss) {
+      delay += state.retransmitMs;
+    }
+    return delay;
+  };
+  const delayFor = (data) => {
+    let delay = state.latencyMs;
+    if (state.bytesPerSecond > 0) {
+      const now = performance.now();
+      const size = typeof data === "string" ? data.length : data.byteLength;
+      state.busyUntil =
+        Math.max(now, state.busyUntil) + (size * 1000) / state.bytesPerSecond;
+      delay += state.busyUntil - now;
+    }
+    return delay;
+  };
+  const later = (delay, fn) => (delay > 0 ? setTimeout(fn, delay) : fn());
+  // When the last message each way on a reliable channel is delivered, so a
+  // retransmitted message never lets later ones overtake it.
+  const releaseAt = { send: new WeakMap(), receive: new WeakMap() };
+  const transmit = (channel, direction, data, deliver) => {
+    if (state.offline) {
+      return;
+    }
+    if (unreliable(channel)) {
+      if (Math.random() >= state.loss) {
+        later(delayFor(data), deliver);
+      }
+      return;
+    }
+    const now = performance.now();
+    const at = Math.max(
+      now + delayFor(data) + retransmitDelay(),
+      releaseAt[direction].get(channel) ?? 0,
+    );
+    releaseAt[direction].set(channel, at);
+    later(at - now, deliver);
+  };
+  const parse = (data) => {
+    try {
+      return JSON.parse(data);
+    } catch {
+      return null;
+    }
+  };
+
+  const createDataChannel = RTCPeerConnection.prototype.createDataChannel;
+  RTCPeerConnection.prototype.createDataChannel = function (...args) {
+    const channel = createDataChannel.apply(this, args);
+    state.channels.push(channel);
+    return channel;
+  };
+
+  const send = RTCDataChannel.prototype.send;
+  RTCDataChannel.prototype.send = function (data) {
+    const message = parse(data);
+    if (message?.type === "answer" && !(message.questionId in state.answers)) {
+      state.answers[message.questionId] = performance.now();
+    }
+    transmit(this, "send", data, () => {
+      if (this.readyState === "open") {
+        send.call(this, data);
+      }
+    });
+  };
+
+  const onmessage = Object.getOwnPropertyDescriptor(
+    RTCDataChannel.prototype,
+    "onmessage",
+  );
+  Object.defineProperty(RTCDataChannel.prototype, "onmessage", {
+    configurable: true,
+    get() {
+      return onmessage.get.call(this);
+    },
+    set(handler) {
+      if (typeof handler !== "function") {
+        onmessage.set.call(this, handler);
+        return;
+      }
+      onmessage.set.call(this, (event) => {
+        transmit(this, "receive", event.data, () => {
+          const message = parse(event.data);
+          const questionId = message?.payload?.questionId;
+          if (message?.type === "answer.ack" && questionId) {
+            if (questionId in state.acks) {
+              state.duplicateAcks += 1;
+            } else {
+              state.acks[questionId] = performance.now();
+            }
+          }
+          handler.call(this, event);
+        });
+      });
+    },
+  });
+
+  new MutationObserver(() => {
+    const value = document.documentElement.dataset.connection;
+    const last = state.connection[state.connection.length - 1];
+    if (value && value !== last?.state) {
+      state.connection.push({ state: value, at: performance.now() });
+    }
+  }).observe(document.documentElement, {
+    attributes: true,
+    attributeFilter: ["data-connection"],
+  });
+})();
+"""
+
+GO_OFFLINE_SCRIPT = """
+() => {
+  const state = window.__impairment;
+  state.offline = true;
+  state.channels.forEach((channel) => channel.close());
+}
+"""
+
+RESTORE_SCRIPT = """
+() => {
+  const state = window.__impairment;
+  state.offline = false;
+  state.restores.push(performance.now());
+}
+"""
+
+CONNECTED_SCRIPT = "document.documentElement.dataset.connection === 'connected'"
+
+
+class ImpairedPlayer:
+    """A player page with a CDP session for network emulation."""
+
+    def __init__(self, player):
+        self.player = player
+        self.page = player.page
+        self.cdp = player.page.context.new_cdp_session(player.page)
+        self.cdp.send("Network.enable")
+        self.missed_questions = 0
+
+    def emulate(self, latency_ms=0, bytes_per_second=0, offline=False):
+        self.cdp.send(
+            "Network.emulateNetworkConditions",
+            {
+                "offline": offline,
+                "latency": latency_ms * 2,
+                "downloadThroughput": bytes_per_second or -1,
+                "uploadThroughput": bytes_per_second or -1,
+            },
+        )
+
+    def impair(self, conditions):
+        self.page.evaluate(
+            "conditions => Object.assign(window.__impairment, conditions)",
+            {
+                "latencyMs": conditions.get("latencyMs", 0),
+                "loss": conditions.get("loss", 0),
+                "bytesPerSecond": conditions.get("bytesPerSecond", 0),
+            },
+        )
+        self.emulate(
+            conditions.get("latencyMs", 0), conditions.get("bytesPerSecond", 0)
+        )
+
+    def go_offline(self):
+        self.emulate(offline=True)
+        self.page.evaluate(GO_OFFLINE_SCRIPT)
+
+    def restore(self):
+        self.emulate()
+        self.page.evaluate(RESTORE_SCRIPT)
+        try:
+            self.page.wait_for_function(CONNECTED_SCRIPT, timeout=TIMEOUT_MS)
+        except PlaywrightTimeoutError:
+            pass
+
+
+def answer(player, choice_index, stats=None):
+    """Answers the current question; a player still reconnecting misses it."""
+    try:
+        player.answer(choice_index)
+    except PlaywrightTimeoutError:
+        if stats is not None:
+            stats.missed_questions += 1
+
+
+def play(room, impaired, control, conditions, offline_ms):
+    room.wait_for_players(len(impaired) + len(control))
+    for subject in impaired:
+        subject.impair(conditions)
+    room.start()
+
+    question_round = 0
+    while True:
+        try:
+            phase = room.wait_for_phase("question", "leaderboard", "ended")
+        except PlaywrightTimeoutError:
+            break
+        if phase == "ended":
+            break
+        if phase == "leaderboard":
+            room.next()
+            question_round += 1
+            continue
+
+        for index, subject in enumerate(impaired):
+            answer(subject.player, index + question_round, subject)
+        if conditions.get("offline"):
+            went_offline = time.monotonic()
+            for subject in impaired:
+                subject.go_offline()
+        for index, player in enumerate(control):
+            answer(player, index + question_round)
+        if conditions.get("offline"):
+            remaining = offline_ms / 1000 - (time.monotonic() - went_offline)
+            time.sleep(max(0, remaining))
+            for subject in impaired:
+                subject.restore()
+
+        try:
+            room.wait_for_phase("reveal", "leaderboard", "ended")
+        except PlaywrightTimeoutError:
+            break
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def collect(pages, missed_questions=0):
+    answers_sent = answers_lost = duplicate_acks = disconnects = 0
+    ack_ms = []
+    recover_ms = []
+    for page in pages:
+        state = page.evaluate("window.__impairment")
+        for question_id, sent_at in state["answers"].items():
+            answers_sent += 1
+            if question_id in state["acks"]:
+                ack_ms.append(state["acks"][question_id] - sent_at)
+            else:
+                answers_lost += 1
+        duplicate_acks += state["duplicateAcks"]
+
+        changes = state["connection"]
+        disconnects += sum(
+            1
+            for previous, change in zip(changes, changes[1:])
+            if previous["state"] == "connected" and change["state"] != "connected"
+        )
+        for restored_at in state["restores"]:
+            reconnected = [
+                change["at"]
+                for change in changes
+                if change["state"] == "connected" and change["at"] >= restored_at
+            ]
+            if reconnected:
+                recover_ms.append(reconnected[0] - restored_at)
+
+    return {
+        "answersSent": answers_sent,
+        "answersLost": answers_lost,
+        "duplicateAcks": duplicate_acks,
+        "ackP50Ms": percentile(ack_ms, 0.5),
+        "ackP95Ms": percentile(ack_ms, 0.95),
+        "missedQuestions": missed_questions,
+        "disconnects": disconnects,
+        "recoveries": len(recover_ms),
+        "recoverP50Ms": statistics.median(recover_ms) if recover_ms else None,
+        "recoverMaxMs": max(recover_ms) if recover_ms else None,
+    }
+
+
+def run_scenario(browser, name, args):
+    conditions = SCENARIOS[name]
+    host_context = browser.new_context()
+    player_context = browser.new_context()
+    for context in (host_context, player_context):
+        context.set_default_timeout(TIMEOUT_MS)
+    player_context.add_init_script(IMPAIRMENT_SCRIPT)
+
+    room = open_room(host_context.new_page(), base_url=BASE_URL)
+    players = [
+        join_room(player_context.new_page(), room, f"Net{i:02d}", BASE_URL)
+        for i in range(args.players)
+    ]
+    impaired = [ImpairedPlayer(player) for player in players[: args.impaired]]
+    control = players[args.impaired :]
+
+    started = time.monotonic()
+    play(room, impaired, control, conditions, args.offline_ms)
+    elapsed = time.monotonic() - started
+    final_phase = room.page.evaluate("document.documentElement.dataset.phase")
+
+    result = {
+        "gameS": round(elapsed, 1),
+        "finished": final_phase == "ended",
+        "impaired": collect(
+            [subject.page for subject in impaired],
+            sum(subject.missed_questions for subject in impaired),
+        ),
+        "control": collect([player.page for player in control]),
+    }
+    host_context.close()
+    player_context.close()
+    return result
+
+
+def format_metric(value):
+    if value is None:
+        return "-"
+    return f"{value:.0f}" if isinstance(value, float) else str(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--impaired", type=int, default=2)
+    parser.add_argument("--offline-ms", type=int, default=5000)
+    parser.add_argument("--output", help="write the report to this file")
+    parser.add_argument("--compare", help="report from a previous run")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    results = {}
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+
+        for name in args.scenarios.split(","):
+            results[name] = run_scenario(browser, name, args)
+            for group in ("impaired", "control"):
+                metrics = results[name][group]
+                line = f"{name:>9} {group:>8}: " + " ".join(
+                    f"{key}={format_metric(value)}" for key, value in metrics.items()
+                )
+                previous = baseline.get(name, {}).get(group, {})
+                deltas = [
+                    f"{key} {metrics[key] - previous[key]:+.0f}"
+                    for key in COMPARED
+                    if metrics[key] is not None and previous.get(key) is not None
+                ]
+                if deltas:
+                    line += f" ({', '.join(deltas)} vs baseline)"
+                print(line)
+
+        browser.close()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Time-to-interactive for the player routes on a throttled 3G profile.
+
+Loads `/join` and `/player/<room>` in a fresh context per run with DevTools
+"Fast 3G" network conditions and 4x CPU slowdown, and reports when the page
+became interactive (React hydrated the rendered content), first contentful
+paint and the JavaScript bytes transferred. Run it against a
+production build (`next build && next start`) before and after a change and
+compare the saved results:
+
+    python3 tests/bench_player_tti.py --runs 5 --output before.json
+    python3 tests/bench_player_tti.py --runs 5 --compare before.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+
+from playwright.sync_api import sync_playwright
+
+BASE_URL = os.environ.get("BASE_URL", "http://localhost:3000")
+
+# Chrome DevTools "Fast 3G" preset.
+FAST_3G = {
+    "offline": False,
+    "latency": 562.5,
+    "downloadThroughput": 180000,
+    "uploadThroughput": 84375,
+}
+CPU_SLOWDOWN = 4
+
+ROUTES = {
+    "/join": "/join?room=TTI001",
+    "/player/[roomId]": "/player/TTI001?playerId=tti&nickname=TTI",
+}
+
+# Hydration attaches React fibers to DOM nodes; once the page content has
+# them, a tap on it is actually handled.
+HYDRATED_SCRIPT = """
+() => Array.from(document.querySelectorAll("main *")).some((node) =>
+  Object.keys(node).some((key) => key.startsWith("__reactFiber$")))
+"""
+
+METRICS_SCRIPT = """
+() => {
+  const paint = performance.getEntriesByName("first-contentful-paint")[0];
+  const scripts = performance
+    .getEntriesByType("resource")
+    .filter((entry) => entry.initiatorType === "script");
+  return {
+    fcpMs: paint ? paint.startTime : null,
+    jsBytes: scripts.reduce((sum, entry) => sum + entry.transferSize, 0),
+  };
+}
+"""
+
+
+def measure(browser, path):
+    context = browser.new_context(viewport={"width": 390, "height": 844})
+    page = context.new_page()
+    cdp = context.new_cdp_session(page)
+    cdp.send("Network.enable")
+    cdp.send("Network.setCacheDisabled", {"cacheDisabled": True})
+    cdp.send("Network.emulateNetworkConditions", FAST_3G)
+    cdp.send("Emulation.setCPUThrottlingRate", {"rate": CPU_SLOWDOWN})
+
+    page.goto(f"{BASE_URL}{path}", wait_until="commit", timeout=120000)
+    page.wait_for_function(HYDRATED_SCRIPT, timeout=120000, polling=50)
+    tti_ms = page.evaluate("performance.now()")
+    metrics = page.evaluate(METRICS_SCRIPT)
+    context.close()
+    return {"ttiMs": tti_ms, **metrics}
+
+
+def summarize(samples):
+    return {
+        "ttiMs": statistics.median(s["ttiMs"] for s in samples),
+        "fcpMs": statistics.median(s["fcpMs"] or 0 for s in samples),
+        "jsBytes": statistics.median(s["jsBytes"] for s in samples),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--output", help="write median results to this file")
+    parser.add_argument("--compare", help="baseline file from a previous run")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    results = {}
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+
+        for route, path in ROUTES.items():
+            samples = [measure(browser, path) for _ in range(args.runs)]
+            results[route] = summarize(samples)
+            line = (
+                f"{route:>18}: tti={results[route]['ttiMs']:.0f}ms "
+                f"fcp={results[route]['fcpMs']:.0f}ms "
+                f"js={results[route]['jsBytes'] / 1024:.1f}kB"
+            )
+            if route in baseline:
+                delta = results[route]["ttiMs"] - baseline[route]["ttiMs"]
+                line += f" (tti {delta:+.0f}ms vs baseline)"
+            print(line)
+
+        browser.close()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
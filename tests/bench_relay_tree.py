@@ -0,0 +1,105 @@
+"""Local multi-tab benchmark for the host relay tree.
+
+Runs the same room twice, once with direct host broadcasts and once with
+`?relay=1`, and reports how long the first question takes to reach every
+player tab after the host shows it. Intended for a local `bun run dev`
+server; large player counts against the hosted deployment will trip the
+signaling rate limits.
+
+    python3 tests/bench_relay_tree.py --players 40
+"""
+
+import argparse
+import os
+import statistics
+
+from playwright.sync_api import sync_playwright
+
+BASE_URL = os.environ.get("BASE_URL", "http://localhost:3000")
+
+# Host and player question views both render `.cyber-answer-btn`; every tab
+# stamps the moment it first rendered one against the shared wall clock.
+SEEN_AT_SCRIPT = """
+(() => {
+  const check = () => {
+    if (window.__seenAt === undefined &&
+        document.querySelector(".cyber-answer-btn")) {
+      window.__seenAt = Date.now();
+    }
+  };
+  new MutationObserver(check).observe(document, {
+    childList: true, subtree: true, characterData: true,
+  });
+})();
+"""
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def run_room(browser, player_count, relay):
+    context = browser.new_context()
+    host_page = context.new_page()
+    host_page.add_init_script(SEEN_AT_SCRIPT)
+    host_page.goto(f"{BASE_URL}/host{'?relay=1' if relay else ''}")
+    host_page.wait_for_load_state("networkidle")
+    host_page.select_option("#localPack", "science")
+    host_page.click('button:has-text("CREATE GAME")')
+    host_page.wait_for_url("**/host/lobby**", timeout=20000)
+    room_code = host_page.url.split("room=")[1].split("&")[0]
+
+    players = []
+    for index in range(player_count):
+        page = context.new_page()
+        page.add_init_script(SEEN_AT_SCRIPT)
+        page.goto(f"{BASE_URL}/join?room={room_code}")
+        page.fill("#roomCode", room_code)
+        page.fill("#nickname", f"Bench{index:03d}")
+        page.click('button:has-text("JOIN GAME")')
+        page.wait_for_url(f"**/player/{room_code}**", timeout=20000)
+        players.append(page)
+
+    host_page.wait_for_function(
+        "count => document.body.innerText.includes(`${count}/${count} ready`)",
+        arg=player_count,
+        timeout=120000,
+    )
+
+    host_page.click('button:has-text("START GAME")')
+    host_page.wait_for_function("window.__seenAt !== undefined", timeout=30000)
+    host_seen_at = host_page.evaluate("window.__seenAt")
+
+    for page in players:
+        page.wait_for_function("window.__seenAt !== undefined", timeout=30000)
+
+    delays = [page.evaluate("window.__seenAt") - host_seen_at for page in players]
+    context.close()
+    return delays
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--players", type=int, default=24)
+    args = parser.parse_args()
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+
+        for relay in (False, True):
+            delays = run_room(browser, args.players, relay)
+            label = "relay" if relay else "direct"
+            print(
+                f"{label:>6}: players={len(delays)} "
+                f"p50={statistics.median(delays):.0f}ms "
+                f"p95={percentile(delays, 95):.0f}ms "
+                f"max={max(delays):.0f}ms"
+            )
+
+        browser.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Shared Playwright fixtures for the end-to-end tests.
+
+Each pytest worker launches one headless Chromium for the whole session and
+gives every test a fresh browser context, so tests run in parallel under
+pytest-xdist (`python3 -m pytest tests -n auto`). Rooms and players come
+from the `create_room` and `join_player` factories.
+
+Pages publish their state as `<html data-*>` attributes (see
+apps/web/src/lib/page-state.ts): `data-phase` on the host game and player
+pages, `data-connection` on the player page, `data-players` and
+`data-ready-players` in the host lobby. The helpers below wait on those
+instead of sleeping or polling page text.
+"""
+
+import os
+
+import pytest
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from playwright.sync_api import sync_playwright
+
+BASE_URL = os.environ.get("BASE_URL", "https://web-five-sage-83.vercel.app")
+TIMEOUT_MS = int(os.environ.get("E2E_TIMEOUT_MS", "20000"))
+
+# A player whose data channel never opens is reloaded, like a real user
+# would, before the test gives up on it.
+JOIN_ATTEMPTS = 3
+
+PHASE_SCRIPT = """
+phases => phases.includes(document.documentElement.dataset.phase)
+"""
+
+AT_LEAST_SCRIPT = """
+([name, count]) => Number(document.documentElement.dataset[name] ?? 0) >= count
+"""
+
+
+def wait_for_phase(page, *phases, timeout=TIMEOUT_MS):
+    """Waits until the page shows one of `phases` and returns it."""
+    page.wait_for_function(PHASE_SCRIPT, arg=list(phases), timeout=timeout)
+    return page.evaluate("document.documentElement.dataset.phase")
+
+
+class HostRoom:
+    def __init__(self, page, code):
+        self.page = page
+        self.code = code
+
+    def text(self):
+        return self.page.locator("body").inner_text()
+
+    def wait_for_players(self, count, ready=True, timeout=TIMEOUT_MS):
+        self.page.wait_for_function(
+            AT_LEAST_SCRIPT,
+            arg=["readyPlayers" if ready else "players", count],
+            timeout=timeout,
+        )
+
+    def wait_for_phase(self, *phases, timeout=TIMEOUT_MS):
+        return wait_for_phase(self.page, *phases, timeout=timeout)
+
+    def start(self):
+        self.page.click('button:has-text("START GAME")')
+        return self.wait_for_phase("countdown", "question")
+
+    def reveal(self):
+        self.page.click('button:has-text("REVEAL ANSWERS")')
+        return self.wait_for_phase("reveal", "leaderboard", "ended")
+
+    def next(self):
+        """Moves on from the leaderboard; the last round ends the game."""
+        question_index = self.page.evaluate(
+            "document.documentElement.dataset.questionIndex"
+        )
+        self.page.click(
+            'button:has-text("NEXT QUESTION"), button:has-text("SEE RESULTS")'
+        )
+        self.page.wait_for_function(
+            """index => {
+              const { dataset } = document.documentElement;
+              return dataset.phase === "ended" ||
+                dataset.questionIndex !== index;
+            }""",
+            arg=question_index,
+            timeout=TIMEOUT_MS,
+        )
+
+
+class Player:
+    def __init__(self, page, nickname):
+        self.page = page
+        self.nickname = nickname
+
+    def text(self):
+        return self.page.locator("body").inner_text()
+
+    def wait_for_phase(self, *phases, timeout=TIMEOUT_MS):
+        return wait_for_phase(self.page, *phases, timeout=timeout)
+
+    def answer(self, choice_index=0):
+        self.wait_for_phase("question")
+        choices = self.page.locator("button.cyber-answer-btn")
+        choices.nth(choice_index % choices.count()).click()
+        self.page.click('button:has-text("SUBMIT ANSWER")')
+        self.wait_for_phase("answered", "reveal", "leaderboard", "ended")
+
+    def wait_for_ack(self, timeout=TIMEOUT_MS):
+        self.page.wait_for_function(
+            "document.documentElement.dataset.answerDelivery !== 'pending'",
+            timeout=timeout,
+        )
+        return self.page.evaluate(
+            "document.documentElement.dataset.answerDelivery"
+        )
+
+
+def open_room(page, pack="science", query="", base_url=BASE_URL):
+    """Creates a room from the host page and returns it in the lobby."""
+    page.goto(f"{base_url}/host{query}")
+    page.select_option("#localPack", pack)
+    page.click('button:has-text("CREATE GAME")')
+    page.wait_for_url("**/host/lobby**")
+    return HostRoom(page, page.url.split("room=")[1].split("&")[0])
+
+
+def join_room(page, room, nickname, base_url=BASE_URL):
+    """Joins `room` as `nickname` and waits for the player's lobby."""
+    page.goto(f"{base_url}/join?room={room.code}")
+    page.fill("#nickname", nickname)
+    page.click('button:has-text("JOIN GAME")')
+    page.wait_for_url(f"**/player/{room.code}**")
+
+    player = Player(page, nickname)
+    for attempt in range(JOIN_ATTEMPTS):
+        try:
+            player.wait_for_phase("lobby", timeout=TIMEOUT_MS // 2)
+            return player
+        except PlaywrightTimeoutError:
+            if attempt == JOIN_ATTEMPTS - 1:
+                raise
+            page.reload()
+    return player
+
+
+@pytest.fixture(scope="session")
+def base_url():
+    return BASE_URL
+
+
+@pytest.fixture(scope="session")
+def playwright_instance():
+    with sync_playwright() as p:
+        yield p
+
+
+@pytest.fixture(scope="session")
+def browser(playwright_instance):
+    browser = playwright_instance.chromium.launch(headless=True)
+    yield browser
+    browser.close()
+
+
+@pytest.fixture
+def context(browser):
+    context = browser.new_context()
+    context.set_default_timeout(TIMEOUT_MS)
+    yield context
+    context.close()
+
+
+@pytest.fixture
+def create_room(context):
+    def create(pack="science", query=""):
+        return open_room(context.new_page(), pack=pack, query=query)
+
+    return create
+
+
+@pytest.fixture
+def join_player(context):
+    def join(room, nickname, page=None):
+        return join_room(page or context.new_page(), room, nickname)
+
+    return join
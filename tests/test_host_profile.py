@@ -0,0 +1,268 @@
+"""Host-tab CPU, heap and long tasks through a full game at 10/50/100 players.
+
+Opt-in, since it opens a browser tab per player: run it against a local
+production build with `HOST_PROFILE=1 python3 -m pytest
+tests/test_host_profile.py`. `HOST_PROFILE_SIZES` overrides the room sizes.
+
+The host page is profiled over CDP: `Performance.getMetrics` before the
+game starts and after it ends (CPU time split into script, layout and style),
+a `longtask` PerformanceObserver injected before the page loads, and a heap
+snapshot after a forced GC once the game is over. Heap per player is the
+growth over the empty room.
+
+The game engine runs in a Web Worker started by the game page, so the page
+metrics leave most of the game's work out. The worker is reached through
+the page's CDP session with `Target.setAutoAttach`: it is CPU-profiled from
+the countdown to the end of the game (sampled time outside idle) and its
+heap is read after a forced GC. Those figures go into the report under
+`worker`, plus the per-answer and per-player costs.
+
+Each size writes `host-profile-<players>.json` (and the `.heapsnapshot`) to
+`HOST_PROFILE_DIR`. The run fails when a cost exceeds its budget in
+`host_profile_thresholds.json`, or in the file named by
+`HOST_PROFILE_THRESHOLDS`.
+"""
+
+import json
+import os
+import time
+
+import pytest
+from conftest import TIMEOUT_MS
+
+HERE = os.path.dirname(__file__)
+SIZES = os.environ.get("HOST_PROFILE_SIZES", "10,50,100").split(",")
+OUTPUT_DIR = os.environ.get("HOST_PROFILE_DIR", "host-profile")
+THRESHOLDS_PATH = os.environ.get(
+    "HOST_PROFILE_THRESHOLDS", os.path.join(HERE, "host_profile_thresholds.json")
+)
+
+LONG_TASK_SCRIPT = """
+window.__longTasks = { count: 0, totalMs: 0, maxMs: 0 };
+new PerformanceObserver((list) => {
+  for (const entry of list.getEntries()) {
+    window.__longTasks.count += 1;
+    window.__longTasks.totalMs += entry.duration;
+    window.__longTasks.maxMs = Math.max(window.__longTasks.maxMs, entry.duration);
+  }
+}).observe({ type: "longtask" });
+"""
+
+RESET_LONG_TASKS_SCRIPT = """
+() => Object.assign(window.__longTasks, { count: 0, totalMs: 0, maxMs: 0 })
+"""
+
+# Picks the first choice and submits, without a round trip per click.
+SUBMIT_SCRIPT = """
+() => {
+  document.querySelector("button.cyber-answer-btn")?.click();
+  const submit = Array.from(document.querySelectorAll("button")).find(
+    (button) => button.textContent.includes("SUBMIT ANSWER"),
+  );
+  submit?.click();
+  return !!submit;
+}
+"""
+
+# Profile nodes that are not the worker running JavaScript.
+NON_SCRIPT_NODES = {"(idle)", "(program)", "(garbage collector)"}
+
+CPU_METRICS = [
+    "TaskDuration",
+    "ScriptDuration",
+    "LayoutDuration",
+    "RecalcStyleDuration",
+]
+
+
+def performance_metrics(cdp):
+    metrics = cdp.send("Performance.getMetrics")["metrics"]
+    return {metric["name"]: metric["value"] for metric in metrics}
+
+
+def take_heap_snapshot(cdp, path):
+    chunks = []
+    cdp.on(
+        "HeapProfiler.addHeapSnapshotChunk",
+        lambda event: chunks.append(event["chunk"]),
+    )
+    cdp.send("HeapProfiler.takeHeapSnapshot", {"reportProgress": False})
+    with open(path, "w") as f:
+        f.write("".join(chunks))
+    return os.path.getsize(path)
+
+
+class WorkerTarget:
+    """CDP access to the page's dedicated worker.
+
+    Playwright only opens CDP sessions on pages and frames, so the worker is
+    auto-attached without flattening and its protocol messages are relayed
+    through the page session. Replies arrive as events, which the sync API
+    only delivers while it waits, hence the short page waits in the loops.
+    """
+
+    def __init__(self, page, cdp):
+        self.page = page
+        self.cdp = cdp
+        self.session_id = None
+        self.last_id = 0
+        self.replies = {}
+        cdp.on("Target.attachedToTarget", self._attached)
+        cdp.on("Target.receivedMessageFromTarget", self._received)
+        cdp.send(
+            "Target.setAutoAttach",
+            {"autoAttach": True, "waitForDebuggerOnStart": False, "flatten": False},
+        )
+
+    def _attached(self, event):
+        if event["targetInfo"]["type"] == "worker":
+            self.session_id = event["sessionId"]
+
+    def _received(self, event):
+        message = json.loads(event["message"])
+        if event["sessionId"] == self.session_id and "id" in message:
+            self.replies[message["id"]] = message
+
+    def _wait(self, ready, what):
+        deadline = time.monotonic() + TIMEOUT_MS / 1000
+        while not ready():
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"no {what} from the engine worker")
+            self.page.wait_for_timeout(20)
+
+    def wait_for_worker(self):
+        self._wait(lambda: self.session_id is not None, "attach")
+
+    def send(self, method, params=None):
+        self.last_id += 1
+        message_id = self.last_id
+        self.cdp.send(
+            "Target.sendMessageToTarget",
+            {
+                "sessionId": self.session_id,
+                "message": json.dumps(
+                    {"id": message_id, "method": method, "params": params or {}}
+                ),
+            },
+        )
+        self._wait(lambda: message_id in self.replies, f"{method} reply")
+        reply = self.replies.pop(message_id)
+        if "error" in reply:
+            raise RuntimeError(f"{method}: {reply['error']}")
+        return reply.get("result", {})
+
+
+def profile_cpu_ms(profile):
+    """Sampled busy and script time, in ms, from a CPU profile."""
+    names = {node["id"]: node["callFrame"]["functionName"] for node in profile["nodes"]}
+    busy_us = script_us = 0
+    for node_id, delta_us in zip(profile["samples"], profile["timeDeltas"]):
+        name = names[node_id]
+        if name != "(idle)":
+            busy_us += delta_us
+        if name not in NON_SCRIPT_NODES:
+            script_us += delta_us
+    return {"busyMs": busy_us / 1000, "scriptMs": script_us / 1000}
+
+
+def play_game(room, players):
+    """Plays every round with all players answering; returns answers sent."""
+    answers = 0
+    while True:
+        phase = room.wait_for_phase("question", "leaderboard", "ended")
+        if phase == "ended":
+            return answers
+        if phase == "leaderboard":
+            room.next()
+            continue
+
+        for player in players:
+            player.wait_for_phase("question")
+            if player.page.evaluate(SUBMIT_SCRIPT):
+                answers += 1
+        room.wait_for_phase("reveal", "leaderboard", "ended")
+
+
+@pytest.mark.skipif(
+    not os.environ.get("HOST_PROFILE"), reason="set HOST_PROFILE=1 to profile"
+)
+@pytest.mark.parametrize("player_count", [int(size) for size in SIZES])
+def test_host_profile(browser, context, create_room, join_player, player_count):
+    with open(THRESHOLDS_PATH) as f:
+        thresholds = json.load(f)
+
+    context.add_init_script(LONG_TASK_SCRIPT)
+    room = create_room()
+    cdp = context.new_cdp_session(room.page)
+    worker = WorkerTarget(room.page, cdp)
+    cdp.send("Performance.enable", {"timeDomain": "threadTicks"})
+    cdp.send("HeapProfiler.enable")
+    cdp.send("HeapProfiler.collectGarbage")
+    empty_heap = performance_metrics(cdp)["JSHeapUsedSize"]
+
+    # Players get their own context so the host's long-task observer and
+    # CDP session see only the host tab.
+    player_context = browser.new_context()
+    players = [
+        join_player(room, f"Load{i:03d}", page=player_context.new_page())
+        for i in range(player_count)
+    ]
+    room.wait_for_players(player_count)
+
+    room.page.evaluate(RESET_LONG_TASKS_SCRIPT)
+    before = performance_metrics(cdp)
+    room.start()
+    # The game page starts the worker on mount, so it is up by the countdown.
+    worker.wait_for_worker()
+    worker.send("Profiler.enable")
+    worker.send("Profiler.start")
+    answers = play_game(room, players)
+    after = performance_metrics(cdp)
+    worker_cpu_ms = profile_cpu_ms(worker.send("Profiler.stop")["profile"])
+    long_tasks = room.page.evaluate("window.__longTasks")
+    player_context.close()
+
+    cdp.send("HeapProfiler.collectGarbage")
+    heap_used = performance_metrics(cdp)["JSHeapUsedSize"]
+    worker.send("HeapProfiler.collectGarbage")
+    worker_heap_used = worker.send("Runtime.getHeapUsage")["usedSize"]
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    snapshot_bytes = take_heap_snapshot(
+        cdp, os.path.join(OUTPUT_DIR, f"host-{player_count}.heapsnapshot")
+    )
+
+    cpu_ms = {name: (after[name] - before[name]) * 1000 for name in CPU_METRICS}
+    per_answer = {
+        "taskMsPerAnswer": cpu_ms["TaskDuration"] / max(answers, 1),
+        "scriptMsPerAnswer": cpu_ms["ScriptDuration"] / max(answers, 1),
+        "longTaskMsPerAnswer": long_tasks["totalMs"] / max(answers, 1),
+        "heapKbPerPlayer": (heap_used - empty_heap) / 1024 / player_count,
+        "workerBusyMsPerAnswer": worker_cpu_ms["busyMs"] / max(answers, 1),
+        "workerScriptMsPerAnswer": worker_cpu_ms["scriptMs"] / max(answers, 1),
+        # The worker only exists once the game page is up, so its whole heap
+        # counts (an idle worker isolate is well under a megabyte).
+        "workerHeapKbPerPlayer": worker_heap_used / 1024 / player_count,
+    }
+    report = {
+        "players": player_count,
+        "answers": answers,
+        "cpuMs": cpu_ms,
+        "longTasks": long_tasks,
+        "jsHeapUsedBytes": heap_used,
+        "emptyRoomHeapBytes": empty_heap,
+        "heapSnapshotBytes": snapshot_bytes,
+        "domNodes": after["Nodes"],
+        "worker": {"cpuMs": worker_cpu_ms, "jsHeapUsedBytes": worker_heap_used},
+        **per_answer,
+    }
+    report_path = os.path.join(OUTPUT_DIR, f"host-profile-{player_count}.json")
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+
+    assert answers > 0
+    over_budget = {
+        name: round(value, 2)
+        for name, value in per_answer.items()
+        if name in thresholds and value > thresholds[name]
+    }
+    assert not over_budget, f"{player_count} players over budget: {over_budget}"